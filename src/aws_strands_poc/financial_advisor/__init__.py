@@ -6,5 +6,6 @@ built using the AWS Strands framework.
 """
 
 from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+from aws_strands_poc.financial_advisor.sessions import SessionManager
 
-__all__ = ["FinancialAdvisor"]
+__all__ = ["FinancialAdvisor", "SessionManager"]
@@ -2,14 +2,28 @@
 Financial Advisor - Main orchestrator agent that routes queries to specialized agents.
 """
 
+import asyncio
+import contextvars
 import logging
 import os
 import sys
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 
 from strands import Agent
+from strands.handlers.callback_handler import CompositeCallbackHandler
+from strands.tools.executor import validate_and_prepare_tools
 from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.models.async_openai_model import AsyncOpenAIDirectModel
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+from aws_strands_poc.financial_advisor.dispatch import (
+    DEFAULT_MAX_PARALLEL_SPECIALISTS,
+    enable_parallel_dispatch,
+)
+from aws_strands_poc.financial_advisor.router import PreRouter
+from aws_strands_poc.financial_advisor.streaming import StreamingCallbackHandler, TokenStream, streaming_to
 from aws_strands_poc.financial_advisor.tools import memory_tool
 
 # Load environment variables from .env file
@@ -22,6 +36,14 @@ from aws_strands_poc.financial_advisor.specialists import (
     tax_specialist
 )
 
+# Specialist tools by name, used when the pre-router bypasses the orchestrator
+SPECIALIST_TOOLS = {
+    "market_analyst": market_analyst,
+    "portfolio_manager": portfolio_manager,
+    "compliance_officer": compliance_officer,
+    "tax_specialist": tax_specialist,
+}
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +51,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger("financial_advisor")
 
+# Worker threads shared by all advisors for the blocking parts of aquery: the whole
+# Strands event loop when the orchestrator has no async model (each in-flight
+# conversation then occupies one thread), otherwise only tool calls.
+ASYNC_QUERY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ADVISOR_MAX_CONCURRENCY", "256")),
+    thread_name_prefix="advisor-query",
+)
+
+# Seconds between attempts to take an advisor's query lock from the event loop
+_LOCK_POLL_INTERVAL = 0.01
+
+
+class QueryCancelledError(Exception):
+    """Raised inside the agent loop when an async query is cancelled or times out."""
+
+
 # Define the system prompt for the Financial Advisor orchestrator
 FINANCIAL_ADVISOR_PROMPT = """
 You are a financial advisory assistant that helps users with financial questions, 
@@ -65,9 +103,10 @@ Your role is to understand financial queries and route them to the appropriate s
    - Tax filing requirements and calculations
 
 For complex queries that span multiple domains, you can coordinate responses from 
-multiple specialists. Always maintain a professional tone, acknowledge financial 
-regulations, and emphasize when information is general advice rather than specific 
-financial recommendations.
+multiple specialists. Call all of the relevant specialists in the same turn so 
+their answers can be prepared at the same time. Always maintain a professional 
+tone, acknowledge financial regulations, and emphasize when information is general 
+advice rather than specific financial recommendations.
 
 When appropriate, use the memory_tool to store important user context or 
 preferences, and retrieve this information to provide personalized responses.
@@ -76,15 +115,37 @@ preferences, and retrieve this information to provide personalized responses.
 class FinancialAdvisor:
     """Financial Advisor orchestrator class that routes queries to specialized agents."""
     
-    def __init__(self, user_id: str = "financial_user", model: Optional[str] = None):
+    def __init__(
+        self,
+        user_id: str = "financial_user",
+        model: Optional[str] = None,
+        parallel_dispatch: bool = True,
+        max_parallel_specialists: int = DEFAULT_MAX_PARALLEL_SPECIALISTS,
+        pre_router: Optional[PreRouter] = None,
+        native_async: bool = True,
+    ):
         """
         Initialize the Financial Advisor.
         
         Args:
             user_id: Identifier for the user (used for memory persistence)
             model: OpenAI model name (if not provided, uses MODEL env var or defaults to gpt-4o-mini)
+            parallel_dispatch: Run the specialist calls of one orchestrator turn concurrently
+                (results are merged in call order); if False they run one after another
+            max_parallel_specialists: Maximum number of specialists running at the same time
+            pre_router: Optional local classifier that sends clear-cut queries straight
+                to a specialist, skipping the orchestrator LLM call
+            native_async: Make aquery's orchestrator model calls with AsyncOpenAI on the
+                caller's event loop; if False, or when the orchestrator is not a plain
+                OpenAIDirectModel (e.g. a cascade), aquery runs the blocking agent loop
+                on the shared worker pool
         """
         self.user_id = user_id
+        self.pre_router = pre_router
+        
+        # One conversation runs at a time per advisor; aquery may cancel it
+        self._query_lock = threading.Lock()
+        self._cancel_event: Optional[threading.Event] = None
         
         # Get model from env var if not provided
         if not model:
@@ -101,9 +162,31 @@ class FinancialAdvisor:
                     compliance_officer,
                     tax_specialist,
                     memory_tool,
-                ]
+                ],
+                max_parallel_tools=1,
+            )
+            
+            if parallel_dispatch:
+                enable_parallel_dispatch(self.agent, max_workers=max_parallel_specialists)
+            
+            # Forward tokens to the active stream, and check for cancellation on
+            # every agent event so aquery can abort mid-loop
+            self.agent.callback_handler = CompositeCallbackHandler(
+                StreamingCallbackHandler("advisor", fallback=self.agent.callback_handler),
+                self._check_cancelled,
             )
             
+            # Async twin of the orchestrator model, used by aquery
+            self.async_model: Optional[AsyncOpenAIDirectModel] = None
+            orchestrator = self.agent.model
+            if native_async and type(orchestrator) is OpenAIDirectModel:
+                self.async_model = AsyncOpenAIDirectModel(
+                    model=orchestrator.model,
+                    temperature=orchestrator.temperature,
+                    max_tokens=orchestrator.max_tokens,
+                    **orchestrator.kwargs,
+                )
+            
             logger.info(f"Financial Advisor initialized with user_id: {user_id}")
         except Exception as e:
             logger.error(f"Error creating agent: {str(e)}")
@@ -124,21 +207,38 @@ class FinancialAdvisor:
             logger.error(f"Failed to initialize memory: {str(e)}")
             return False
             
-    def query(self, message: str):
+    def query(self, message: str, stream: Optional[TokenStream] = None):
         """
         Process a user query through the financial advisor.
         
         Args:
             message: The user's message or query
+            stream: Optional token stream that receives the orchestrator's and the
+                specialists' output as it is generated
             
         Returns:
             The agent's response
         """
+        if stream is not None:
+            with streaming_to(stream):
+                return self._query(message)
+        return self._query(message)
+    
+    def _query(self, message: str):
+        """Process a query in the current streaming context."""
         logger.info(f"Processing query: {message[:50]}...")
         
         # Add user_id to context for memory operations
         formatted_message = f"[User ID: {self.user_id}] {message}"
         
+        # Skip the orchestrator hop when the pre-router is confident
+        if self.pre_router is not None:
+            decision = self.pre_router.route(message)
+            if decision.routed:
+                response_text = SPECIALIST_TOOLS[decision.specialist](message)
+                self._record_exchange(formatted_message, response_text)
+                return response_text
+        
         # Process with the agent
         response = self.agent(formatted_message)
         
@@ -150,3 +250,208 @@ class FinancialAdvisor:
                         return content['text']
             return str(response.message)
         return str(response)
+    
+    def _record_exchange(self, formatted_message: str, response_text: str):
+        """
+        Add a pre-routed exchange to the orchestrator's history so follow-ups keep context.
+        
+        Args:
+            formatted_message: The user message as the orchestrator would have seen it
+            response_text: The specialist's answer
+        """
+        self.agent.messages.append({"role": "user", "content": [{"text": formatted_message}]})
+        self.agent.messages.append({"role": "assistant", "content": [{"text": response_text}]})
+    
+    async def aquery(self, message: str, timeout: Optional[float] = None) -> str:
+        """
+        Process a user query without blocking the event loop.
+        
+        With an async model the orchestrator loop runs on the caller's event
+        loop: model calls are awaited on the loop's shared AsyncOpenAI pool, so a
+        conversation holds no thread while it waits on the orchestrator. The
+        tools (the specialists, which are blocking Strands agents, and
+        memory_tool) still run on worker threads, but only while they execute.
+        Without one, the whole agent loop runs on the shared worker pool.
+        Cancelling the coroutine, or exceeding the timeout, stops the query and
+        rolls the conversation back to where it was before the query.
+        
+        Args:
+            message: The user's message or query
+            timeout: Optional number of seconds before the query is abandoned
+            
+        Returns:
+            The agent's response
+            
+        Raises:
+            asyncio.TimeoutError: If the timeout is exceeded
+            asyncio.CancelledError: If the calling task is cancelled
+        """
+        if self.async_model is None:
+            return await self._aquery_threaded(message, timeout)
+        try:
+            return await asyncio.wait_for(self._aquery(message), timeout=timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            logger.info(f"Query cancelled for user_id: {self.user_id}")
+            raise
+    
+    async def _aquery(self, message: str) -> str:
+        """
+        Run the orchestrator loop on the event loop, undoing history changes if it fails.
+        
+        Args:
+            message: The user's message or query
+            
+        Returns:
+            The agent's response
+        """
+        # One conversation at a time per advisor; polled so waiting never blocks the loop
+        while not self._query_lock.acquire(blocking=False):
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+        history_length = len(self.agent.messages)
+        try:
+            logger.info(f"Processing query: {message[:50]}...")
+            formatted_message = f"[User ID: {self.user_id}] {message}"
+            
+            if self.pre_router is not None:
+                decision = self.pre_router.route(message)
+                if decision.routed:
+                    response_text = await self._run_blocking(SPECIALIST_TOOLS[decision.specialist], message)
+                    self._record_exchange(formatted_message, response_text)
+                    return response_text
+            
+            self.agent.messages.append({"role": "user", "content": [{"text": formatted_message}]})
+            response = await self._orchestrate()
+            self.agent.conversation_manager.apply_management(self.agent.messages)
+            return response
+        except BaseException:
+            # A half-finished turn (e.g. toolUse without toolResult) would break the next request
+            del self.agent.messages[history_length:]
+            raise
+        finally:
+            self._query_lock.release()
+    
+    async def _orchestrate(self) -> str:
+        """
+        Alternate model turns and tool calls until the orchestrator answers.
+        
+        Mirrors the Strands event loop: tool calls of one turn run concurrently
+        (bounded by the parallel dispatch pool) and their results are added in
+        call order.
+        
+        Returns:
+            The text of the orchestrator's final message
+        """
+        agent = self.agent
+        tool_specs = [tool["toolSpec"] for tool in agent.tool_config.get("tools", [])]
+        
+        def on_text(text: str) -> None:
+            agent.callback_handler(data=text)
+        
+        while True:
+            message, stop_reason, _ = await self.async_model.acomplete(
+                agent.messages, tool_specs, agent.system_prompt, on_text=on_text
+            )
+            agent.messages.append(message)
+            if stop_reason != "tool_use":
+                for content in message["content"]:
+                    if "text" in content:
+                        return content["text"]
+                return str(message)
+            
+            tool_uses: List[Dict[str, Any]] = []
+            tool_results: List[Dict[str, Any]] = []
+            invalid_tool_use_ids: List[str] = []
+            validate_and_prepare_tools(message, tool_uses, tool_results, invalid_tool_use_ids)
+            valid = [tool_use for tool_use in tool_uses if tool_use["toolUseId"] not in invalid_tool_use_ids]
+            tool_results.extend(await self._run_tools(valid))
+            agent.messages.append({"role": "user", "content": [{"toolResult": result} for result in tool_results]})
+    
+    async def _run_tools(self, tool_uses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run one turn's tool calls on worker threads.
+        
+        Args:
+            tool_uses: Tool calls to run
+            
+        Returns:
+            Tool results, in the order of the calls
+        """
+        agent = self.agent
+        
+        def process(tool_use: Dict[str, Any]) -> Dict[str, Any]:
+            return agent.tool_handler.process(
+                tool_use,
+                model=agent.model,
+                system_prompt=agent.system_prompt,
+                messages=agent.messages,
+                tool_config=agent.tool_config,
+                callback_handler=agent.callback_handler,
+            )
+        
+        executor = agent.thread_pool_wrapper
+        if executor is None:
+            return [await self._run_blocking(process, tool_use) for tool_use in tool_uses]
+        # The parallel dispatch pool copies the caller's context and bounds the concurrency
+        futures = [asyncio.wrap_future(executor.submit(process, tool_use)) for tool_use in tool_uses]
+        return list(await asyncio.gather(*futures))
+    
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the shared worker pool, carrying context variables (e.g. the token stream)."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(ASYNC_QUERY_EXECUTOR, context.run, fn, *args)
+    
+    async def _aquery_threaded(self, message: str, timeout: Optional[float] = None) -> str:
+        """
+        Run the blocking agent loop on the shared worker pool for aquery.
+        
+        Args:
+            message: The user's message or query
+            timeout: Optional number of seconds before the query is abandoned
+            
+        Returns:
+            The agent's response
+        """
+        cancel_event = threading.Event()
+        loop = asyncio.get_running_loop()
+        # Carry context variables (such as the scheduling lane) onto the worker thread
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(
+            ASYNC_QUERY_EXECUTOR, context.run, self._query_cancellable, message, cancel_event
+        )
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            cancel_event.set()
+            logger.info(f"Query cancelled for user_id: {self.user_id}")
+            raise
+    
+    def _query_cancellable(self, message: str, cancel_event: threading.Event) -> str:
+        """
+        Run query on a worker thread, undoing history changes if it is cancelled.
+        
+        Args:
+            message: The user's message or query
+            cancel_event: Event set by aquery when the caller gives up
+            
+        Returns:
+            The agent's response
+        """
+        with self._query_lock:
+            if cancel_event.is_set():
+                raise QueryCancelledError("Query cancelled before it started")
+            history_length = len(self.agent.messages)
+            self._cancel_event = cancel_event
+            try:
+                return self.query(message)
+            except Exception:
+                # Strands may wrap the cancellation, so check the event rather than the type
+                if cancel_event.is_set():
+                    del self.agent.messages[history_length:]
+                raise
+            finally:
+                self._cancel_event = None
+    
+    def _check_cancelled(self, **kwargs):
+        """Agent callback that aborts the event loop once the current query is cancelled."""
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise QueryCancelledError("Query cancelled")
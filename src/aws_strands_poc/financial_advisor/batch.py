@@ -0,0 +1,217 @@
+"""
+Batch Runner - Non-interactive processing of advisory prompts from JSONL.
+
+Each input line is a JSON object with ``user_id`` and ``message`` (and an optional
+``id``; the line number is used otherwise). Queries for different users run
+concurrently up to a bound, while queries for the same user run in input order
+so each conversation builds on the previous answer.
+
+Results are appended to the output JSONL as they complete, and that file doubles
+as the checkpoint: on restart, inputs whose ``id`` already has a successful
+result are skipped, and a partial last line left by a crash is cut off before
+new results are appended.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+from aws_strands_poc.financial_advisor.models.scheduler import scheduling_lane
+from aws_strands_poc.financial_advisor.sessions import SessionManager
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Return the nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def load_batch(input_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Read batch queries from a JSONL file.
+
+    Args:
+        input_path: Path to the JSONL input
+
+    Returns:
+        List of query records with id, user_id and message
+    """
+    records = []
+    with open(input_path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping invalid JSON on line {line_number}: {str(e)}")
+                continue
+            if "user_id" not in record or "message" not in record:
+                logger.error(f"Skipping line {line_number}: user_id and message are required")
+                continue
+            records.append({
+                "id": str(record.get("id", line_number)),
+                "user_id": str(record["user_id"]),
+                "message": record["message"],
+            })
+    return records
+
+
+def load_checkpoint(output_path: Union[str, Path]) -> Set[str]:
+    """
+    Collect the ids that already have a successful result in the output file.
+
+    Args:
+        output_path: Path to the JSONL output
+
+    Returns:
+        Set of completed query ids
+    """
+    completed: Set[str] = set()
+    path = Path(output_path)
+    if not path.exists():
+        return completed
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partial line from a crash mid-write; that query is re-run
+                continue
+            if "error" not in record:
+                completed.add(str(record.get("id")))
+    return completed
+
+
+def truncate_partial_line(output_path: Union[str, Path]) -> int:
+    """
+    Cut a partial last line, left by a crash mid-write, off the output file.
+
+    Results are appended to the output, so without this the first result of a
+    resumed run would be glued onto the fragment and lost from the checkpoint.
+
+    Args:
+        output_path: Path to the JSONL output
+
+    Returns:
+        Number of bytes removed
+    """
+    path = Path(output_path)
+    if not path.exists():
+        return 0
+    with open(path, "rb+") as f:
+        size = f.seek(0, 2)
+        end = size
+        # Walk back in blocks to the last newline
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+            logger.warning(f"Removed a partial last line ({size - end} bytes) from {path}")
+    return size - end
+
+
+async def run_batch(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    sessions: SessionManager,
+    concurrency: int = 8,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run every pending query from the input file and stream results to the output file.
+
+    Args:
+        input_path: Path to the JSONL input
+        output_path: Path to the JSONL output (also used as the checkpoint)
+        sessions: Session manager providing one advisor per user
+        concurrency: Maximum number of queries in flight
+        timeout: Optional per-query timeout in seconds
+
+    Returns:
+        Summary with counts, throughput and latency percentiles
+    """
+    records = load_batch(input_path)
+    completed = load_checkpoint(output_path)
+    pending = [r for r in records if r["id"] not in completed]
+    logger.info(f"Batch: {len(records)} queries, {len(records) - len(pending)} already done, {len(pending)} to run")
+
+    # Group by user, keeping input order within each user
+    by_user: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for record in pending:
+        by_user.setdefault(record["user_id"], []).append(record)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    truncate_partial_line(output_path)
+    with open(output_path, "a") as output:
+
+        def write(result: Dict[str, Any]) -> None:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+        async def run_user(user_id: str, user_records: List[Dict[str, Any]]) -> None:
+            nonlocal failures
+            for record in user_records:
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        response = await sessions.aquery(user_id, record["message"], timeout=timeout)
+                        result = {"id": record["id"], "user_id": user_id, "response": response}
+                    except Exception as e:
+                        failures += 1
+                        result = {"id": record["id"], "user_id": user_id, "error": str(e) or type(e).__name__}
+                    elapsed = time.perf_counter() - start
+                latencies.append(elapsed)
+                result["latency_ms"] = round(elapsed * 1000, 1)
+                write(result)
+
+        start = time.perf_counter()
+        # Batch requests yield to interactive ones at the rate-limit scheduler
+        with scheduling_lane("batch"):
+            await asyncio.gather(*(run_user(user_id, user_records) for user_id, user_records in by_user.items()))
+        elapsed = time.perf_counter() - start
+
+    sessions.flush()
+    return {
+        "total": len(records),
+        "skipped": len(records) - len(pending),
+        "processed": len(pending),
+        "failed": failures,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_qps": round(len(pending) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+        },
+    }
@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for the Financial Advisor.
+
+Each module can be run directly, e.g.
+``python -m aws_strands_poc.financial_advisor.benchmarks.parallel_dispatch``.
+The benchmarks use local stand-ins instead of live model calls.
+"""
@@ -0,0 +1,104 @@
+"""
+Benchmark: async throughput at 1, 10 and 100 concurrent simulated users.
+
+Measures FinancialAdvisor.aquery against the bundled MockOpenAIServer, once with
+the native async orchestrator (AsyncOpenAI on the event loop) and once with the
+blocking Strands agent loop on the shared advisor worker pool, and reports
+throughput, latency and the peak number of client threads each needs.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import MockOpenAIServer
+
+MODES = {"async": True, "thread-pool": False}
+
+
+def client_threads() -> int:
+    """Count live threads, leaving out the in-process mock server's connection handlers."""
+    return sum(1 for thread in threading.enumerate() if "process_request_thread" not in thread.name)
+
+
+async def run_users(users: int, requests_per_user: int, make_request: Callable[[int], Awaitable]) -> Dict[str, float]:
+    """Run concurrent users, each issuing requests back to back, and summarize latency and threads."""
+    latencies: List[float] = []
+    peak_threads = client_threads()
+    done = False
+
+    async def user(user_index: int):
+        for _ in range(requests_per_user):
+            start = time.perf_counter()
+            await make_request(user_index)
+            latencies.append(time.perf_counter() - start)
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done:
+            peak_threads = max(peak_threads, client_threads())
+            await asyncio.sleep(0.005)
+
+    sampler = asyncio.create_task(sample_threads())
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await sampler
+    return {
+        "throughput_rps": len(latencies) / elapsed,
+        "mean_latency_ms": statistics.mean(latencies) * 1000,
+        "elapsed_s": elapsed,
+        "peak_threads": peak_threads,
+    }
+
+
+async def bench_advisor(user_counts: List[int], requests_per_user: int, latency: float):
+    """Benchmark FinancialAdvisor.aquery in both modes against a mock API."""
+    server = MockOpenAIServer(latency=latency, script=lambda request: "General guidance only.").start()
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    # Every OpenAI client created from here on, shared or not, talks to the mock API
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+
+    print(f"\nFinancialAdvisor.aquery (mock API latency {latency * 1000:.0f}ms)")
+    try:
+        for users in user_counts:
+            for mode, native_async in MODES.items():
+                advisors = [
+                    FinancialAdvisor(user_id=f"bench_user_{i}", native_async=native_async) for i in range(users)
+                ]
+                # Warm up the mode's clients and first connection outside the measurement
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await FinancialAdvisor(user_id="bench_warmup", native_async=native_async).aquery("Hello")
+                # Silence the agents' streamed output while measuring
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = await run_users(
+                        users, requests_per_user, lambda i: advisors[i].aquery("What is compound interest?", timeout=30)
+                    )
+                print(f"  users={users:<4} {mode:<11} throughput={result['throughput_rps']:8.1f} req/s "
+                      f"mean_latency={result['mean_latency_ms']:7.1f}ms peak_threads={result['peak_threads']}")
+    finally:
+        server.stop()
+
+
+def main():
+    """Run the async throughput benchmark."""
+    parser = argparse.ArgumentParser(description="Async throughput benchmark")
+    parser.add_argument("--users", default="1,10,100", help="Comma-separated concurrent user counts")
+    parser.add_argument("--requests", type=int, default=5, help="Requests per user")
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock API latency in seconds")
+    args = parser.parse_args()
+
+    user_counts = [int(u) for u in args.users.split(",")]
+    asyncio.run(bench_advisor(user_counts, args.requests, args.latency))
+
+
+if __name__ == "__main__":
+    main()
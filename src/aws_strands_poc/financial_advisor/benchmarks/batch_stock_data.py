@@ -0,0 +1,110 @@
+"""
+Benchmark: agent latency for a 10-holding portfolio, per-holding vs batched stock_data.
+
+Runs a portfolio-manager agent with the real stock_data tool against a scripted
+streaming model three ways:
+
+- one holding per round: the model asks for one ticker, reads the result and
+  asks for the next, so every holding costs a model round-trip
+- one call per holding, all in one message: a single round, but ten tool calls
+  and ten separate generation passes
+- one batched call: stock_data with tickers=[...], generated in a single pass
+  and returned on one shared date axis
+
+Reports end-to-end latency, model requests, tool time and the prompt tokens the
+model reads across the whole turn.
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from aws_strands_poc.financial_advisor.batch import percentile
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import MockOpenAIClient
+from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+from aws_strands_poc.financial_advisor.tools import stock_data
+
+HOLDINGS = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "JPM", "V", "WMT", "TSLA"]
+ANSWER = "Across the ten holdings, technology led this period while consumer staples lagged."
+MODES = {
+    "sequential": "one holding per round",
+    "parallel": "one call per holding, one message",
+    "batched": "one batched call",
+}
+
+
+def script(mode: str, timeframe: str, prompt_chars: List[int]):
+    """Return the scripted model for a mode, recording the prompt size of every request."""
+
+    def answer(messages: List[Dict[str, Any]]):
+        prompt_chars.append(sum(len(json.dumps(m.get("content") or "")) for m in messages))
+        done = sum(1 for m in messages if m.get("role") == "tool")
+        if mode == "sequential" and done < len(HOLDINGS):
+            return [("stock_data", {"ticker": HOLDINGS[done], "timeframe": timeframe})]
+        if done:
+            return ANSWER
+        if mode == "parallel":
+            return [("stock_data", {"ticker": ticker, "timeframe": timeframe}) for ticker in HOLDINGS]
+        return [("stock_data", {"tickers": HOLDINGS, "timeframe": timeframe})]
+
+    return answer
+
+
+def run(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Ask the portfolio question args.turns times on a fresh agent."""
+    prompt_chars: List[int] = []
+    client = MockOpenAIClient(script(mode, args.timeframe, prompt_chars), args.latency, args.token_interval)
+    agent = create_openai_agent(
+        system_prompt="You are a portfolio manager. Use stock_data to look up every holding.",
+        tools=[stock_data],
+        model_provider=OpenAIDirectModel(client=client, coalesce=False, schedule=False),
+        callback_handler=None,
+        load_tools_from_directory=False,
+    )
+
+    latencies = []
+    for _ in range(args.turns):
+        agent.messages = []
+        start = time.perf_counter()
+        agent(f"How did my {len(HOLDINGS)} holdings do over {args.timeframe}?")
+        latencies.append(time.perf_counter() - start)
+
+    # Time the tool calls of one turn on their own
+    calls = [{"tickers": HOLDINGS}] if mode == "batched" else [{"ticker": ticker} for ticker in HOLDINGS]
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        for call in calls:
+            stock_data(timeframe=args.timeframe, **call)
+    tool_ms = (time.perf_counter() - start) * 1000 / args.turns
+    return {
+        "latencies": latencies,
+        "requests": client.calls / args.turns,
+        "tool_ms": tool_ms,
+        "prompt_tokens": sum(prompt_chars) / 4 / args.turns,
+    }
+
+
+def main():
+    """Run the batched stock_data benchmark."""
+    parser = argparse.ArgumentParser(description="Compare per-holding and batched stock_data calls in an agent")
+    parser.add_argument("--turns", type=int, default=5, help="Portfolio questions per mode")
+    parser.add_argument("--timeframe", default="1mo", help="stock_data timeframe")
+    parser.add_argument("--latency", type=float, default=0.4, help="Model first-token latency in seconds")
+    parser.add_argument("--token_interval", type=float, default=0.01, help="Seconds per generated token")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    print(f"\n{len(HOLDINGS)}-holding portfolio, {args.timeframe} of bars, {args.turns} questions per mode")
+    print(f"  {'mode':<36} {'p50':>8} {'p95':>8} {'requests':>9} {'tool time':>10} {'prompt tokens':>14}")
+    for mode, label in MODES.items():
+        result = run(mode, args)
+        latencies = result["latencies"]
+        print(f"  {label:<36} {percentile(latencies, 50) * 1000:>6.0f}ms {percentile(latencies, 95) * 1000:>6.0f}ms "
+              f"{result['requests']:>9.0f} {result['tool_ms']:>8.1f}ms {result['prompt_tokens']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
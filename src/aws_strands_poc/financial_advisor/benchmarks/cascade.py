@@ -0,0 +1,157 @@
+"""
+Benchmark: model cascade cost, latency and escalations against a single model.
+
+Runs a market-analyst agent with a stock_data tool over a mix of easy and hard
+questions three ways: the strong model alone, the cheap model alone, and a
+cascade that starts on the cheap model. The scripted cheap model answers easy
+questions well, but on hard ones it reports low confidence, refuses, calls the
+tool without its required argument, or calls a tool that does not exist; the strong model is
+slower but always answers well. Reports latency, cost from the reported token
+usage, how many bad answers reached the user, and the cascade's per-tier
+escalation rates and reasons.
+"""
+
+import argparse
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from aws_strands_poc.financial_advisor.batch import percentile
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import (
+    MockOpenAIClient,
+    openai_has_tool_results,
+    openai_last_user_text,
+)
+from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.models.cascade import CascadeMetrics, CascadeModel
+from aws_strands_poc.financial_advisor.tools import stock_data
+
+CHEAP, STRONG = "gpt-4o-mini", "gpt-4o"
+TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "JPM", "WMT", "TSLA"]
+# How the cheap model fails on hard questions, in rotation
+FAILURES = ["low_confidence", "refusal", "missing_tool_arguments", "unknown_tool"]
+GOOD_ANSWER = "{ticker} has traded in a narrow range this month with average volume; no action is needed."
+BAD_ANSWERS = {
+    "low_confidence": "{ticker} might be affected by several factors.",
+    "refusal": "I'm sorry, I can't help with predicting {ticker}.",
+    "missing_tool_arguments": "I could not retrieve the data for {ticker}.",
+    "unknown_tool": "I could not retrieve the data for {ticker}.",
+}
+
+
+def questions(count: int, hard_fraction: float) -> List[Dict[str, Any]]:
+    """Build the question mix, spreading the hard ones evenly."""
+    items = []
+    hard = 0
+    for i in range(count):
+        ticker = TICKERS[i % len(TICKERS)]
+        is_hard = (i + 1) * hard_fraction >= hard + 1
+        failure = FAILURES[hard % len(FAILURES)] if is_hard else None
+        hard += is_hard
+        text = (f"Explain the options skew and earnings risk for {ticker} (#{i})" if is_hard
+                else f"How is {ticker} doing this month? (#{i})")
+        items.append({"text": text, "ticker": ticker, "failure": failure})
+    return items
+
+
+def script(tier: str, by_text: Dict[str, Dict[str, Any]]) -> Callable[[List[Dict[str, Any]]], Any]:
+    """Return the scripted behaviour of one tier: the cheap one fails hard questions."""
+
+    def answer(messages: List[Dict[str, Any]]):
+        question = by_text[openai_last_user_text(messages)]
+        ticker = question["ticker"]
+        failure = question["failure"] if tier == CHEAP else None
+        # Only report confidence when the system prompt asks for it
+        asked = "Confidence:" in (messages[0].get("content") or "")
+        if not openai_has_tool_results(messages):
+            if failure == "refusal":
+                return BAD_ANSWERS[failure].format(ticker=ticker)
+            if failure == "missing_tool_arguments":
+                return [("stock_data", {"timeframe": "1mo"})]
+            if failure == "unknown_tool":
+                return [("stock_quote", {"ticker": ticker})]
+            return [("stock_data", {"ticker": ticker, "timeframe": "1mo"})]
+        if failure is not None:
+            return BAD_ANSWERS[failure].format(ticker=ticker) + ("\nConfidence: 0.4" if asked else "")
+        return GOOD_ANSWER.format(ticker=ticker) + ("\nConfidence: 0.9" if asked else "")
+
+    return answer
+
+
+class TieredClient:
+    """Stand-in OpenAI client that routes each request to a per-model scripted client."""
+
+    def __init__(self, clients: Dict[str, MockOpenAIClient]):
+        self.clients = clients
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, **kwargs: Any) -> Any:
+        return self.clients[model].chat.completions.create(model=model, **kwargs)
+
+
+def run(tiers: List[str], items: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Ask every question on a fresh agent and time each one.
+
+    Single models run as one-tier cascades, which stream like a plain model but
+    record the same usage and cost metrics.
+    """
+    by_text = {item["text"]: item for item in items}
+    client = TieredClient({
+        CHEAP: MockOpenAIClient(script(CHEAP, by_text), args.cheap_latency, args.cheap_token_interval),
+        STRONG: MockOpenAIClient(script(STRONG, by_text), args.strong_latency, args.strong_token_interval),
+    })
+    metrics = CascadeMetrics()
+    agent = create_openai_agent(
+        system_prompt="You are a market analyst. Use stock_data to look up prices.",
+        tools=[stock_data],
+        model_provider=CascadeModel(tiers=tiers, metrics=metrics, client=client, coalesce=False, schedule=False),
+        callback_handler=None,
+        load_tools_from_directory=False,
+    )
+
+    latencies, bad = [], 0
+    for item in items:
+        agent.messages = []
+        start = time.perf_counter()
+        answer = str(agent(item["text"])).strip()
+        latencies.append(time.perf_counter() - start)
+        bad += answer != GOOD_ANSWER.format(ticker=item["ticker"])
+    return {"latencies": latencies, "bad": bad, "stats": metrics.stats()}
+
+
+def main():
+    """Run the cascade benchmark."""
+    parser = argparse.ArgumentParser(description="Compare a cheap-first model cascade against single models")
+    parser.add_argument("--questions", type=int, default=40, help="Number of questions")
+    parser.add_argument("--hard_fraction", type=float, default=0.25,
+                        help="Fraction of questions the cheap model gets wrong")
+    parser.add_argument("--cheap_latency", type=float, default=0.15, help="Cheap model first-token latency")
+    parser.add_argument("--cheap_token_interval", type=float, default=0.003, help="Cheap model seconds per token")
+    parser.add_argument("--strong_latency", type=float, default=0.5, help="Strong model first-token latency")
+    parser.add_argument("--strong_token_interval", type=float, default=0.015, help="Strong model seconds per token")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    items = questions(args.questions, args.hard_fraction)
+    print(f"\n{len(items)} questions, {sum(1 for i in items if i['failure'])} too hard for {CHEAP}")
+    print(f"  {'tiers':<22} {'p50':>8} {'p95':>8} {'total':>8} {'cost':>10} {'bad answers':>12}")
+    results = {}
+    for tiers in ([STRONG], [CHEAP], [CHEAP, STRONG]):
+        label = " -> ".join(tiers)
+        result = results[label] = run(tiers, items, args)
+        latencies = result["latencies"]
+        print(f"  {label:<22} {percentile(latencies, 50) * 1000:>6.0f}ms {percentile(latencies, 95) * 1000:>6.0f}ms "
+              f"{sum(latencies):>7.1f}s {result['stats']['cost_usd'] * 1000:>7.3f}m$ {result['bad']:>12}")
+
+    stats = results[f"{CHEAP} -> {STRONG}"]["stats"]
+    print(f"\nCascade tiers (m$ = thousandths of a dollar)")
+    for tier, tier_stats in stats["tiers"].items():
+        print(f"  {tier:<12} requests={tier_stats['requests']:<4} escalated={tier_stats['escalation_rate']:.0%} "
+              f"p50={tier_stats['p50_ms']:.0f}ms p95={tier_stats['p95_ms']:.0f}ms "
+              f"cost={tier_stats['cost_usd'] * 1000:.3f}m$ reasons={tier_stats['escalation_reasons']}")
+
+
+if __name__ == "__main__":
+    main()
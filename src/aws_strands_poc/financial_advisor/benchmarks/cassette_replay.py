@@ -0,0 +1,120 @@
+"""
+Benchmark: recording a cassette and replaying it offline.
+
+Runs an orchestrator -> specialist -> stock_data tool chain on OpenAIDirectModel
+three times: once against a slow scripted client standing in for the live API
+while recording a cassette, then twice with no client at all, replaying the
+cassette at full speed and with the recorded timings. Checks that the replayed
+answers match the recorded ones and reports the cassette size.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from strands import tool
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import MockOpenAIClient, openai_has_tool_results
+from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.models.cassette import Cassette
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+from aws_strands_poc.financial_advisor.tools import stock_data
+
+QUESTIONS = ["How is AAPL doing?", "Should I hold more MSFT?", "What about NVDA this month?"]
+
+
+def specialist_script(messages: List[Dict[str, Any]]):
+    """Look up the ticker, then answer."""
+    if not openai_has_tool_results(messages):
+        ticker = next(word for word in messages[-1]["content"].split() if word.isupper() and len(word) > 2)
+        return [("stock_data", {"ticker": ticker.strip("?"), "timeframe": "1mo"})]
+    return "The stock has been range-bound this month; keep your position sized to your risk tolerance."
+
+
+def orchestrator_script(messages: List[Dict[str, Any]]):
+    """Ask the market analyst, then summarize its answer."""
+    if not openai_has_tool_results(messages):
+        return [("market_analyst", {"query": messages[-1]["content"]})]
+    return "Based on the market analyst's review: " + messages[-1]["content"]
+
+
+def build_orchestrator(cassette: Cassette, client: Callable[[Callable], Optional[MockOpenAIClient]]):
+    """Create the orchestrator and its specialist on models that use the cassette."""
+    specialist_agent = create_openai_agent(
+        system_prompt="You are a market analyst.",
+        tools=[stock_data],
+        model_provider=OpenAIDirectModel(client=client(specialist_script), cassette=cassette, coalesce=False),
+        callback_handler=None,
+        load_tools_from_directory=False,
+    )
+
+    @tool
+    def market_analyst(query: str) -> str:
+        """
+        Answer market questions.
+
+        Args:
+            query: The market-related query to analyze
+        """
+        specialist_agent.messages = []
+        return str(specialist_agent(query))
+
+    return create_openai_agent(
+        system_prompt="You are a financial advisor.",
+        tools=[market_analyst],
+        model_provider=OpenAIDirectModel(client=client(orchestrator_script), cassette=cassette, coalesce=False),
+        callback_handler=None,
+        load_tools_from_directory=False,
+    )
+
+
+def run(cassette: Cassette, client: Callable[[Callable], Optional[MockOpenAIClient]]) -> Dict[str, Any]:
+    """Ask every question on a fresh orchestrator and time the run."""
+    agent = build_orchestrator(cassette, client)
+    answers = []
+    start = time.perf_counter()
+    for question in QUESTIONS:
+        agent.messages = []
+        answers.append(str(agent(question)).strip())
+    return {"elapsed_s": time.perf_counter() - start, "answers": answers}
+
+
+def main():
+    """Run the cassette benchmark."""
+    parser = argparse.ArgumentParser(description="Record a cassette, then replay it offline")
+    parser.add_argument("--first_token_latency", type=float, default=0.4,
+                        help="Seconds before the first token from the stand-in live API")
+    parser.add_argument("--token_interval", type=float, default=0.01, help="Seconds between stand-in tokens")
+    parser.add_argument("--cassette", default=None, help="Cassette path (defaults to a temporary file)")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = args.cassette or os.path.join(tmpdir, "advisor.cassette.jsonl")
+        if os.path.exists(path):
+            os.remove(path)
+
+        def live(script: Callable) -> MockOpenAIClient:
+            return MockOpenAIClient(script, args.first_token_latency, args.token_interval)
+
+        recording = Cassette(path, mode="record")
+        recorded = run(recording, live)
+
+        fast = Cassette(path, mode="replay", latency=0.0)
+        replayed = run(fast, lambda script: None)
+        timed = run(Cassette(path, mode="replay", latency=None), lambda script: None)
+
+        size = os.path.getsize(path)
+        print(f"\n{len(QUESTIONS)} questions through orchestrator -> market analyst -> stock_data")
+        print(f"  record (stand-in API): {recorded['elapsed_s']:.2f}s, "
+              f"{recording.stats()['recorded']} completions, {size / 1024:.1f} KiB cassette")
+        print(f"  replay, no latency:    {replayed['elapsed_s']:.3f}s "
+              f"({recorded['elapsed_s'] / replayed['elapsed_s']:.0f}x faster), {fast.stats()['hits']} hits")
+        print(f"  replay, recorded time: {timed['elapsed_s']:.2f}s")
+        print(f"  answers identical:     {recorded['answers'] == replayed['answers'] == timed['answers']}")
+
+
+if __name__ == "__main__":
+    main()
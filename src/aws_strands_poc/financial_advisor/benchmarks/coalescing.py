@@ -0,0 +1,72 @@
+"""
+Benchmark: single-flight coalescing of identical concurrent requests.
+
+Simulates a burst of users asking the same question at once, both at the model
+level (concurrent OpenAIDirectModel.generate calls against a mock client) and
+at the specialist level (a stand-in specialist tool that sleeps). Reports the
+upstream calls made and the wall-clock time with and without coalescing.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import MockOpenAIClient
+from aws_strands_poc.financial_advisor.coalesce import SingleFlight, coalesced_specialist
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+
+QUESTIONS = ["Why did the market drop today?", "why did the market drop today", "Why did the market drop today?!"]
+
+
+def burst(fn: Callable[[int], Any], users: int) -> float:
+    """Run fn for every user at the same time and return the elapsed seconds."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(fn, range(users)))
+    return time.perf_counter() - start
+
+
+def model_level(users: int, latency: float, coalesce: bool) -> Dict[str, Any]:
+    """Send the same prompt from every user through OpenAIDirectModel.generate."""
+    client = MockOpenAIClient(first_token_latency=latency)
+    model = OpenAIDirectModel(client=client, coalesce=coalesce, flight=SingleFlight("benchmark"))
+    messages = [{"role": "user", "content": [{"text": QUESTIONS[0]}]}]
+    elapsed = burst(lambda _: model.generate(messages), users)
+    return {"upstream_calls": client.calls, "elapsed_s": elapsed, "stats": model.flight.stats()}
+
+
+def specialist_level(users: int, latency: float, coalesce: bool) -> Dict[str, Any]:
+    """Ask a stand-in specialist near-identical questions from every user."""
+    runs = []
+    flight = SingleFlight("benchmark")
+    flight.enabled = coalesce
+
+    @coalesced_specialist("market_analyst", flight=flight)
+    def market_analyst(query: str) -> str:
+        runs.append(query)
+        time.sleep(latency)
+        return f"Analysis of: {query}"
+
+    elapsed = burst(lambda i: market_analyst(QUESTIONS[i % len(QUESTIONS)]), users)
+    return {"upstream_calls": len(runs), "elapsed_s": elapsed, "stats": flight.stats()}
+
+
+def main():
+    """Run the coalescing benchmark."""
+    parser = argparse.ArgumentParser(description="Single-flight coalescing of identical requests")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent users asking the same question")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock upstream latency in seconds")
+    args = parser.parse_args()
+
+    for name, run in (("OpenAIDirectModel.generate", model_level), ("Specialist tool", specialist_level)):
+        off = run(args.users, args.latency, coalesce=False)
+        on = run(args.users, args.latency, coalesce=True)
+        print(f"\n{name} ({args.users} concurrent identical requests)")
+        print(f"  without coalescing: {off['upstream_calls']} upstream calls in {off['elapsed_s']:.2f}s")
+        print(f"  with coalescing:    {on['upstream_calls']} upstream calls in {on['elapsed_s']:.2f}s "
+              f"(collapsed {on['stats']['collapsed']}, rate {on['stats']['collapse_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
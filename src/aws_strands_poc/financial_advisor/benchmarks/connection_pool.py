@@ -0,0 +1,84 @@
+"""
+Benchmark: per-model OpenAI clients versus the shared connection pool.
+
+Sends chat completions to a local HTTP(S) stand-in, first with a new OpenAI
+client per request (what every short-lived specialist agent used to do) and
+then through the process-wide client registry. The stand-in adds a delay per
+new connection to model the TCP/TLS round trips to a remote API; with --tls the
+TLS handshake is real.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from openai import DefaultHttpxClient, OpenAI
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import MockOpenAIServer
+from aws_strands_poc.financial_advisor.models.client_registry import ClientRegistry
+
+
+def run(server: MockOpenAIServer, get_client: Callable[[], OpenAI], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send requests with clients from get_client and time them."""
+    server.reset_counters()
+    latencies = []
+
+    def one(i: int) -> None:
+        start = time.perf_counter()
+        client = get_client()
+        client.chat.completions.create(model="mock", messages=[{"role": "user", "content": f"Question {i}"}])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return {
+        "elapsed_s": time.perf_counter() - start,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "connections": server.connections,
+    }
+
+
+def main():
+    """Run the connection pool benchmark."""
+    parser = argparse.ArgumentParser(description="Per-model clients vs the shared connection pool")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--handshake_latency", type=float, default=0.03,
+                        help="Seconds added per new connection to model network round trips")
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed certificate")
+    args = parser.parse_args()
+
+    with MockOpenAIServer(handshake_latency=args.handshake_latency, tls=args.tls) as server:
+        verify = server.cert_path if args.tls else True
+
+        def new_client() -> OpenAI:
+            return OpenAI(api_key="benchmark", base_url=server.base_url,
+                          http_client=DefaultHttpxClient(verify=verify))
+
+        registry = ClientRegistry(max_connections=args.concurrency * 2, verify=verify)
+
+        def shared_client() -> OpenAI:
+            return registry.get_client("benchmark", base_url=server.base_url)
+
+        fresh = run(server, new_client, args.requests, args.concurrency)
+        shared = run(server, shared_client, args.requests, args.concurrency)
+        stats = registry.stats()
+
+    print(f"\n{args.requests} requests, {args.concurrency} in flight, "
+          f"{args.handshake_latency * 1000:.0f}ms per new connection{' + TLS' if args.tls else ''}")
+    for name, result in (("client per model", fresh), ("shared pool", shared)):
+        print(f"  {name:<17} {result['elapsed_s']:.2f}s total, {result['mean_ms']:.1f}ms mean, "
+              f"{result['connections']} connections opened")
+    saved = fresh["mean_ms"] - shared["mean_ms"]
+    print(f"  handshake overhead removed: {saved:.1f}ms per request "
+          f"({saved / fresh['mean_ms']:.0%} of mean latency)")
+    print(f"  pool: reuse rate {stats['connection_reuse_rate']:.1%}, "
+          f"peak utilization {stats['peak_utilization']:.0%} of {stats['max_connections']} connections, "
+          f"http2={stats['http2']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: stock_data payload size and prompt tokens with and without downsampling.
+
+For each timeframe, serializes the stock_data response the model would read as
+the earlier one-dict-per-bar rows, as full-resolution columns, and reduced to
+max_points bars with OHLCV buckets and with LTTB, plus a weekly resolution. Reports
+bytes and tokens (exact with tiktoken when installed, otherwise estimated), and
+how far the reduced closing-price line strays from the full one. OHLCV buckets
+are dated by their first bar but close on their last, so their line also lags.
+"""
+
+import argparse
+import json
+from typing import Any, Dict
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.history import count_tokens
+from aws_strands_poc.financial_advisor.tools import stock_data
+from aws_strands_poc.financial_advisor.tools.price_series import COLUMNS
+from aws_strands_poc.financial_advisor.tools.stock_data import MAX_RESPONSE_BARS
+
+END = "2025-05-16"
+# (timeframe, interval) requests from short to long
+REQUESTS = [("1d", "1h"), ("1mo", "1d"), ("3mo", "1d"), ("6mo", "1d"), ("1y", "1d"), ("5y", "1d"), ("5d", "1m")]
+
+
+def as_rows(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite a columnar response into the earlier list of per-bar dicts."""
+    rows = [dict(zip(COLUMNS, values)) for values in zip(*(result[name] for name in COLUMNS))]
+    return {"ticker": result["ticker"], "timeframe": result["timeframe"], "currency": "USD", "data": rows}
+
+
+def shape_error(full: Dict[str, Any], reduced: Dict[str, Any]) -> float:
+    """Mean absolute difference, in percent, between the full closes and the reduced close line."""
+    if len(reduced["date"]) == len(full["date"]):
+        return 0.0
+    full_x = np.array(full["date"], dtype="datetime64[m]").astype(np.int64)
+    reduced_x = np.array(reduced["date"], dtype="datetime64[m]").astype(np.int64)
+    closes = np.array(full["close"])
+    line = np.interp(full_x, reduced_x, reduced["close"])
+    return float(np.mean(np.abs(line / closes - 1)) * 100)
+
+
+def size(payload: Dict[str, Any]) -> str:
+    """Format the serialized size and token count of a tool result."""
+    text = json.dumps(payload)
+    return f"{len(text) / 1024:>6.1f}K {count_tokens(text):>6}t"
+
+
+def main():
+    """Run the downsampling benchmark."""
+    parser = argparse.ArgumentParser(description="Payload size and tokens of stock_data with downsampling")
+    parser.add_argument("--ticker", default="AAPL", help="Ticker to request")
+    parser.add_argument("--max_points", type=int, default=30, help="max_points for the reduced responses")
+    args = parser.parse_args()
+
+    print(f"\nstock_data payloads for {args.ticker} (K = KiB, t = tokens; err = mean close-line error)")
+    print(f"  {'request':<9} {'bars':>6} {'rows (old)':>14} {'columns':>14} "
+          f"{'ohlc ' + str(args.max_points):>14} {'err':>6} {'lttb ' + str(args.max_points):>14} {'err':>6} "
+          f"{'weekly':>14} {'err':>6}")
+    for timeframe, interval in REQUESTS:
+        request = {"ticker": args.ticker, "timeframe": timeframe, "interval": interval, "end": END}
+        # Without max_points long series are capped, so ask for every bar explicitly
+        full = stock_data(**request, max_points=MAX_RESPONSE_BARS)
+        ohlc = stock_data(**request, max_points=args.max_points)
+        lttb = stock_data(**request, max_points=args.max_points, method="lttb")
+        weekly = stock_data(**request, resolution="1wk") if interval != "1m" else full
+        print(f"  {timeframe + '/' + interval:<9} {len(full['date']):>6} {size(as_rows(full)):>14} {size(full):>14} "
+              f"{size(ohlc):>14} {shape_error(full, ohlc):>5.2f}% {size(lttb):>14} {shape_error(full, lttb):>5.2f}% "
+              f"{size(weekly):>14} {shape_error(full, weekly):>5.2f}%")
+
+    summary = stock_data(ticker=args.ticker, timeframe="6mo", end=END)["summary"]
+    print(f"\nSummary sent with every response ({size(summary).strip()}): {summary}")
+
+
+if __name__ == "__main__":
+    main()
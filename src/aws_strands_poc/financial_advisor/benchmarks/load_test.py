@@ -0,0 +1,177 @@
+"""
+Load generator: drive the advisor stack at high concurrency against a mock API.
+
+Starts the bundled MockOpenAIServer (or uses --base_url), points the OpenAI SDK
+at it through OPENAI_BASE_URL, and runs many simulated users at once, each with
+its own FinancialAdvisor (--target advisor) or simple_openai.FinancialAdvisor
+(--target simple) asking a series of questions. Reports throughput and
+p50/p95/p99 latency per stage: advisor setup, time to first token and whole
+query on the client, and the service time of each agent's model calls
+(orchestrator and each specialist) on the server.
+"""
+
+import argparse
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from aws_strands_poc.financial_advisor import advisor, simple_openai
+from aws_strands_poc.financial_advisor.batch import percentile
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import MockOpenAIServer
+from aws_strands_poc.financial_advisor.cache import response_cache
+from aws_strands_poc.financial_advisor.specialists.compliance_officer import COMPLIANCE_OFFICER_PROMPT
+from aws_strands_poc.financial_advisor.specialists.market_analyst import MARKET_ANALYST_PROMPT
+from aws_strands_poc.financial_advisor.specialists.portfolio_manager import PORTFOLIO_MANAGER_PROMPT
+from aws_strands_poc.financial_advisor.specialists.tax_specialist import TAX_SPECIALIST_PROMPT
+from aws_strands_poc.financial_advisor.streaming import TokenStream
+
+QUESTIONS = [
+    "How is {ticker} doing in the market this month?",
+    "How should I rebalance my portfolio with more {ticker}?",
+    "What are the tax implications of selling my {ticker} shares?",
+    "Is trading {ticker} options a compliance concern for my employer?",
+]
+TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "JPM", "WMT"]
+
+
+def prompt_stages() -> Dict[str, str]:
+    """Map each agent's system prompt to the stage name used in the report."""
+    return {
+        advisor.FINANCIAL_ADVISOR_PROMPT: "orchestrator",
+        simple_openai.FINANCIAL_ADVISOR_PROMPT: "simple_openai",
+        MARKET_ANALYST_PROMPT: "market_analyst",
+        PORTFOLIO_MANAGER_PROMPT: "portfolio_manager",
+        COMPLIANCE_OFFICER_PROMPT: "compliance_officer",
+        TAX_SPECIALIST_PROMPT: "tax_specialist",
+    }
+
+
+class StageRecorder:
+    """Thread-safe collection of client-side stage durations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[stage].append(seconds)
+
+    def error(self, stage: str) -> None:
+        with self._lock:
+            self.errors[stage] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                stage: {
+                    "requests": len(values),
+                    "errors": self.errors[stage],
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1),
+                }
+                for stage, values in self.durations.items()
+            }
+
+
+def simulate_user(user: int, user_advisor: Any, args: argparse.Namespace, recorder: StageRecorder) -> None:
+    """Ask one user's questions one after another."""
+    for i in range(args.queries_per_user):
+        # Vary the questions per user so the response cache and coalescing see distinct requests
+        question = QUESTIONS[(user + i) % len(QUESTIONS)].format(ticker=TICKERS[(user * 3 + i) % len(TICKERS)])
+        question = f"{question} (user {user}, question {i})"
+        stream = None if args.no_stream else TokenStream()
+        start = time.perf_counter()
+        try:
+            user_advisor.query(question, stream=stream)
+        except Exception:
+            recorder.error("query")
+            continue
+        recorder.add("query", time.perf_counter() - start)
+        if stream is not None and stream.ttft_ms is not None:
+            recorder.add("first_token", stream.ttft_ms / 1000)
+
+
+def print_stages(title: str, stages: Dict[str, Dict[str, Any]]) -> None:
+    """Print a per-stage latency table."""
+    print(f"\n{title}")
+    print(f"  {'stage':<22} {'count':>6} {'errors':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for stage, stats in stages.items():
+        print(f"  {stage:<22} {stats['requests']:>6} {stats['errors']:>6} {stats['p50_ms']:>7.0f}ms "
+              f"{stats['p95_ms']:>7.0f}ms {stats['p99_ms']:>7.0f}ms")
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description="Load test the advisor against a local mock OpenAI API")
+    parser.add_argument("--target", choices=["advisor", "simple"], default="advisor",
+                        help="advisor: orchestrator with specialist agents; simple: simple_openai advisor")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent simulated users")
+    parser.add_argument("--queries_per_user", type=int, default=3, help="Questions each user asks in sequence")
+    parser.add_argument("--latency", default="lognormal:0.3:0.4",
+                        help="Mock first-token latency, e.g. 0.3, uniform:0.1:0.5 or lognormal:0.3:0.4")
+    parser.add_argument("--token_interval", default="0.005", help="Mock latency between tokens")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of mock requests answered with 429")
+    parser.add_argument("--server_error_rate", type=float, default=0.0,
+                        help="Fraction of mock requests answered with 500")
+    parser.add_argument("--base_url", default=None, help="Use an already running OpenAI-compatible server instead")
+    parser.add_argument("--no_stream", action="store_true", help="Do not stream responses (no first-token stage)")
+    parser.add_argument("--no_cache", action="store_true", help="Disable the specialist response caches")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "load-test")
+    server = None
+    if args.base_url is None:
+        stages = prompt_stages()
+
+        def stage(request: Dict[str, Any]) -> str:
+            messages = request.get("messages") or [{}]
+            name = stages.get(messages[0].get("content"), "other") if messages[0].get("role") == "system" else "other"
+            return f"llm:{name}"
+
+        server = MockOpenAIServer(
+            latency=args.latency, token_interval=args.token_interval, error_rate=args.error_rate,
+            server_error_rate=args.server_error_rate, stage=stage,
+        ).start()
+        args.base_url = server.base_url
+    # Every OpenAI client created from here on, shared or not, talks to the mock API
+    os.environ["OPENAI_BASE_URL"] = args.base_url
+
+    if args.no_cache:
+        response_cache.enabled = False
+
+    recorder = StageRecorder()
+    # Strands' tool directory watcher is not safe to start from several threads, so build advisors first
+    module = advisor if args.target == "advisor" else simple_openai
+    advisors = []
+    for user in range(args.users):
+        start = time.perf_counter()
+        advisors.append(module.FinancialAdvisor(user_id=f"load_user_{user}"))
+        recorder.add("setup", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        list(pool.map(lambda user: simulate_user(user, advisors[user], args, recorder), range(args.users)))
+    elapsed = time.perf_counter() - start
+
+    client = recorder.summary()
+    queries = client.get("query", {}).get("requests", 0)
+    print(f"\n{args.users} users x {args.queries_per_user} queries against {args.base_url} "
+          f"({args.target}, latency {args.latency})")
+    print(f"  {queries} queries in {elapsed:.1f}s: {queries / elapsed:.1f} queries/s")
+    print_stages("Client stages", client)
+    if server is not None:
+        print(f"  model requests: {server.requests} ({server.requests / elapsed:.1f}/s), "
+              f"{server.throttled} throttled, {server.server_errors} server errors, "
+              f"{server.connections} connections")
+        print_stages("Model calls by agent (server-side service time)", server.stage_stats())
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
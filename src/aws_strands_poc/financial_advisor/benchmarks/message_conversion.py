@@ -0,0 +1,90 @@
+"""
+Benchmark: full versus memoized Strands-to-OpenAI message conversion.
+
+Builds agent histories of tool-calling turns and measures the cost of the
+conversion made before each model call: re-converting the whole history, as
+OpenAIDirectModel used to, against MessageConverter, which only converts the
+messages added since the previous call. Reports the per-call cost at a given
+history length and the total over an agent loop that grows to that length.
+Converting the same history again is how a retry looks to the converter, so the
+per-call figure includes re-fingerprinting every message holding tool blocks.
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from aws_strands_poc.financial_advisor.models.openai_model import MessageConverter, convert_messages_to_openai_format
+
+
+def make_turn(i: int) -> List[Dict[str, Any]]:
+    """Build one tool-calling turn: question, tool call, tool result and answer."""
+    tool_use_id = f"tool-{i}"
+    return [
+        {"role": "user", "content": [{"text": f"How is holding {i} doing compared to the index?"}]},
+        {"role": "assistant", "content": [
+            {"text": "Let me look that up."},
+            {"toolUse": {"toolUseId": tool_use_id, "name": "stock_data",
+                         "input": {"ticker": f"T{i}", "days": 30, "fields": ["open", "close", "volume"]}}},
+        ]},
+        {"role": "user", "content": [
+            {"toolResult": {"toolUseId": tool_use_id, "status": "success",
+                            "content": [{"text": "price: 101.5, change: +1.2%, " * 20}]}},
+        ]},
+        {"role": "assistant", "content": [{"text": f"Holding {i} is up 1.2% over the month. " * 5}]},
+    ]
+
+
+def make_history(length: int) -> List[Dict[str, Any]]:
+    """Build a history of the given number of messages."""
+    messages: List[Dict[str, Any]] = []
+    i = 0
+    while len(messages) < length:
+        messages.extend(make_turn(i))
+        i += 1
+    return messages[:length]
+
+
+def per_call_us(convert: Callable[[List[Dict[str, Any]]], Any], history: List[Dict[str, Any]], repeats: int) -> float:
+    """Average microseconds to convert the history once."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        convert(history)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def agent_loop_ms(convert: Callable[[List[Dict[str, Any]]], Any], history: List[Dict[str, Any]]) -> float:
+    """Milliseconds spent converting over a loop that appends one message per model call."""
+    growing: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    for message in history:
+        growing.append(message)
+        convert(growing)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Run the message conversion benchmark."""
+    parser = argparse.ArgumentParser(description="Full vs memoized message conversion")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000], help="History lengths")
+    parser.add_argument("--repeats", type=int, default=50, help="Conversions per per-call measurement")
+    args = parser.parse_args()
+
+    print(f"\n{'messages':>8}  {'full/call':>11}  {'memo/call':>11}  {'full loop':>11}  {'memo loop':>11}  speedup")
+    for length in args.lengths:
+        history = make_history(length)
+        # Check the two paths agree before timing them
+        assert MessageConverter().convert(history) == convert_messages_to_openai_format(history)
+
+        warm = MessageConverter()
+        warm.convert(history)
+        full_call = per_call_us(convert_messages_to_openai_format, history, args.repeats)
+        memo_call = per_call_us(warm.convert, history, args.repeats)
+        full_loop = agent_loop_ms(convert_messages_to_openai_format, history)
+        memo_loop = agent_loop_ms(MessageConverter().convert, history)
+        print(f"{length:>8}  {full_call:>9.0f}us  {memo_call:>9.0f}us  {full_loop:>9.1f}ms  "
+              f"{memo_loop:>9.1f}ms  {full_loop / memo_loop:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Scripted Strands model used by the offline benchmarks.
+
+The model answers each turn by calling a script function with the conversation
+so far, and sleeps for a configurable latency to stand in for a real model call.
+MockOpenAIClient does the same for code that talks to the OpenAI SDK directly.
+"""
+
+import json
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from strands.types.models import Model
+from strands.types.content import Messages
+from strands.types.tools import ToolSpec
+
+# A script returns either final text or a list of (tool name, tool input) calls
+ScriptResult = Union[str, List[Tuple[str, Dict[str, Any]]]]
+
+
+def last_user_text(messages: Messages) -> str:
+    """Return the text of the most recent user prompt in a Strands conversation."""
+    for message in reversed(messages):
+        if message.get("role") != "user":
+            continue
+        for content in message.get("content", []):
+            if "text" in content:
+                return content["text"]
+    return ""
+
+
+def has_tool_results(messages: Messages) -> bool:
+    """Return True if the last message carries tool results."""
+    if not messages:
+        return False
+    return any("toolResult" in content for content in messages[-1].get("content", []))
+
+
+class ScriptedModel(Model):
+    """Strands model that replays scripted answers and tool calls."""
+
+    def __init__(
+        self,
+        script: Callable[[Messages], ScriptResult],
+        latency: float = 0.0,
+        model_id: str = "scripted",
+    ):
+        """
+        Initialize the scripted model.
+
+        Args:
+            script: Function returning the next answer for a conversation
+            latency: Seconds to sleep per model call
+            model_id: Model identifier reported in the config
+        """
+        self.script = script
+        self.latency = latency
+        self.config = {"model_id": model_id}
+        self.calls = 0
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    def format_request(
+        self, messages: Messages, tool_specs: Optional[List[ToolSpec]] = None, system_prompt: Optional[str] = None
+    ) -> Messages:
+        return messages
+
+    def format_chunk(self, event: Any) -> Any:
+        return event
+
+    def stream(self, request: Messages) -> Iterable[Any]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        result = self.script(request)
+
+        yield {"messageStart": {"role": "assistant"}}
+        if isinstance(result, str):
+            yield {"contentBlockDelta": {"delta": {"text": result}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+            return
+
+        for name, tool_input in result:
+            yield {"contentBlockStart": {"start": {"toolUse": {"name": name, "toolUseId": f"tooluse_{uuid.uuid4().hex[:12]}"}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_input)}}}}
+            yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "tool_use"}}
+
+
+def openai_last_user_text(messages: List[Dict[str, Any]]) -> str:
+    """Return the most recent user message in an OpenAI-format conversation."""
+    for message in reversed(messages):
+        if isinstance(message, dict) and message.get("role") == "user":
+            return message.get("content") or ""
+    return ""
+
+
+def openai_has_tool_results(messages: List[Dict[str, Any]]) -> bool:
+    """Return True if an OpenAI-format conversation ends with a tool result."""
+    return bool(messages) and isinstance(messages[-1], dict) and messages[-1].get("role") == "tool"
+
+
+class MockOpenAIClient:
+    """
+    Stand-in for the sync OpenAI client with scripted, optionally streamed, completions.
+
+    The script receives the OpenAI-format messages. Text answers are split into
+    word tokens; streamed responses wait first_token_latency before the first
+    chunk and token_interval between chunks, like a real model decoding. Usage is
+    reported with roughly four characters per prompt token.
+    """
+
+    def __init__(
+        self,
+        script: Optional[Callable[[List[Dict[str, Any]]], ScriptResult]] = None,
+        first_token_latency: float = 0.0,
+        token_interval: float = 0.0,
+    ):
+        """
+        Initialize the mock client.
+
+        Args:
+            script: Function returning the next answer for a conversation
+                (defaults to echoing the last user message)
+            first_token_latency: Seconds before the first token
+            token_interval: Seconds between subsequent tokens
+        """
+        self.script = script or (lambda messages: f"Echo: {openai_last_user_text(messages)}")
+        self.first_token_latency = first_token_latency
+        self.token_interval = token_interval
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, Any]], stream: bool = False, **kwargs: Any) -> Any:
+        self.calls += 1
+        result = self.script(messages)
+        usage = self._usage(messages, result)
+        if stream:
+            include_usage = (kwargs.get("stream_options") or {}).get("include_usage", False)
+            return self._stream(model, result, usage if include_usage else None)
+
+        time.sleep(self.first_token_latency + self.token_interval * max(0, len(self._tokens(result)) - 1))
+        message: Dict[str, Any] = {"role": "assistant", "content": None}
+        if isinstance(result, str):
+            message["content"] = result
+        else:
+            message["tool_calls"] = [
+                {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                 "function": {"name": name, "arguments": json.dumps(tool_input)}}
+                for name, tool_input in result
+            ]
+        return ChatCompletion.model_validate({
+            "id": "mock", "object": "chat.completion", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "stop" if isinstance(result, str) else "tool_calls"}],
+            "usage": usage,
+        })
+
+    @staticmethod
+    def _tokens(result: ScriptResult) -> List[str]:
+        if isinstance(result, str):
+            words = result.split(" ")
+            return [word + " " for word in words[:-1]] + words[-1:]
+        return [json.dumps(tool_input) for _, tool_input in result]
+
+    @classmethod
+    def _usage(cls, messages: List[Dict[str, Any]], result: ScriptResult) -> Dict[str, int]:
+        prompt_chars = sum(len(str(message.get("content") or "")) for message in messages if isinstance(message, dict))
+        prompt_tokens = prompt_chars // 4 + 4 * len(messages)
+        completion_tokens = len(cls._tokens(result))
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def _stream(self, model: str, result: ScriptResult,
+                usage: Optional[Dict[str, int]] = None) -> Iterator[ChatCompletionChunk]:
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> ChatCompletionChunk:
+            return ChatCompletionChunk.model_validate({
+                "id": "mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            })
+
+        time.sleep(self.first_token_latency)
+        if isinstance(result, str):
+            for i, token in enumerate(self._tokens(result)):
+                if i and self.token_interval:
+                    time.sleep(self.token_interval)
+                yield chunk({"content": token})
+            yield chunk({}, "stop")
+            if usage is not None:
+                yield self._usage_chunk(model, usage)
+            return
+
+        for index, (name, tool_input) in enumerate(result):
+            yield chunk({"tool_calls": [{"index": index, "id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                                         "function": {"name": name, "arguments": ""}}]})
+            yield chunk({"tool_calls": [{"index": index, "function": {"arguments": json.dumps(tool_input)}}]})
+        yield chunk({}, "tool_calls")
+        if usage is not None:
+            yield self._usage_chunk(model, usage)
+
+    @staticmethod
+    def _usage_chunk(model: str, usage: Dict[str, int]) -> ChatCompletionChunk:
+        # Like the real API, usage arrives in a final chunk with no choices
+        return ChatCompletionChunk.model_validate({
+            "id": "mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [], "usage": usage,
+        })
@@ -0,0 +1,541 @@
+"""
+Local OpenAI-compatible HTTP stand-in used by the offline benchmarks and load tests.
+
+MockOpenAIServer answers ``POST /v1/chat/completions`` on a background thread,
+using HTTP/1.1 keep-alive like the real API, either as one JSON completion or,
+when the request asks for ``stream``, as server-sent events. Answers come from a
+script: by default, requests that offer tools get a tool call chosen from the
+prompt, conversations ending in a tool result get a final answer, and anything
+else gets an echo of the last user message. That is enough to drive the whole
+orchestrator -> specialist -> tool path of the advisor.
+
+The server can add latency drawn from a distribution before the first token and
+between streamed tokens, a per-connection handshake delay that stands in for
+the TCP/TLS round trips to a remote endpoint, and real TLS with a throwaway
+self-signed certificate. To exercise error handling it can answer with 429s,
+either at a random error rate or once a requests-per-minute quota is used up
+(with a Retry-After header), and with 500s at a random error rate. It counts the
+connections and requests it sees and records service times per stage.
+
+Run it standalone with ``python -m aws_strands_poc.financial_advisor.benchmarks.mock_server``.
+"""
+
+import argparse
+import collections
+import json
+import math
+import os
+import random
+import re
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from aws_strands_poc.financial_advisor.batch import percentile
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import (
+    ScriptResult,
+    openai_has_tool_results,
+    openai_last_user_text,
+)
+
+Script = Callable[[Dict[str, Any]], ScriptResult]
+
+ANSWER = (
+    "Based on the latest data, the position looks reasonably valued. Keep it sized to your risk "
+    "tolerance, diversify across sectors, and review it again after the next earnings report."
+)
+
+
+def make_self_signed_cert(directory: str) -> Optional[str]:
+    """
+    Create a self-signed certificate for localhost with the openssl CLI.
+
+    Args:
+        directory: Directory for the certificate and key files
+
+    Returns:
+        Path of the combined PEM file, or None if openssl is not available
+    """
+    if shutil.which("openssl") is None:
+        return None
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+         "-keyout", key_path, "-out", cert_path],
+        check=True, capture_output=True,
+    )
+    pem_path = os.path.join(directory, "combined.pem")
+    with open(pem_path, "w") as out, open(cert_path) as cert, open(key_path) as key:
+        out.write(cert.read() + key.read())
+    return pem_path
+
+
+class Latency:
+    """Random delay in seconds drawn from a named distribution."""
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0):
+        """
+        Initialize the distribution.
+
+        Args:
+            kind: fixed (a), uniform (a to b), normal (mean a, deviation b),
+                lognormal (median a, sigma b) or exponential (mean a)
+            a: First parameter
+            b: Second parameter
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{kind}', expected one of {self.KINDS}")
+        self.kind = kind
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def parse(cls, spec: Union[str, float, "Latency", None]) -> "Latency":
+        """
+        Build a distribution from a number or a ``kind:a[:b]`` string.
+
+        Args:
+            spec: e.g. 0.2, "0.2", "uniform:0.1:0.5" or "lognormal:0.3:0.6"
+
+        Returns:
+            The distribution
+        """
+        if isinstance(spec, Latency):
+            return spec
+        if spec is None:
+            return cls()
+        if isinstance(spec, (int, float)):
+            return cls("fixed", float(spec))
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", float(kind))
+        values = [float(value) for value in params.split(":")]
+        return cls(kind, *values)
+
+    def sample(self) -> float:
+        """Draw one delay (never negative)."""
+        if self.kind == "fixed":
+            value = self.a
+        elif self.kind == "uniform":
+            value = random.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = random.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = random.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        else:
+            value = random.expovariate(1 / self.a) if self.a > 0 else 0.0
+        return max(0.0, value)
+
+    def __bool__(self) -> bool:
+        return self.a > 0 or self.b > 0
+
+    def __repr__(self) -> str:
+        return f"Latency({self.kind}, {self.a}, {self.b})"
+
+
+def _tool_arguments(tool: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    """Fill a tool's required parameters with plausible values taken from the prompt."""
+    parameters = tool.get("function", {}).get("parameters", {})
+    properties = parameters.get("properties", {})
+    arguments: Dict[str, Any] = {}
+    for name in parameters.get("required", list(properties)):
+        schema = properties.get(name, {})
+        kind = schema.get("type", "string")
+        if "enum" in schema:
+            arguments[name] = schema["enum"][0]
+        elif kind in ("number", "integer"):
+            arguments[name] = 10000
+        elif kind == "array":
+            arguments[name] = []
+        elif kind == "object":
+            arguments[name] = {}
+        elif name in ("ticker", "symbol"):
+            tickers = re.findall(r"\b[A-Z]{2,5}\b", prompt)
+            arguments[name] = tickers[0] if tickers else "AAPL"
+        elif name == "expression":
+            arguments[name] = "10000 * 1.07 ** 5"
+        else:
+            arguments[name] = prompt
+    return arguments
+
+
+def scripted_tool_calls(request: Dict[str, Any]) -> ScriptResult:
+    """
+    Default script: call the best-matching tool once, then answer.
+
+    The tool is the one whose name shares the most words with the last user
+    message (the first tool on a tie), so an orchestrator asked about taxes
+    calls ``tax_specialist`` and a specialist calls its data tool.
+
+    Args:
+        request: Decoded chat completions request
+
+    Returns:
+        Final answer text, or a single tool call
+    """
+    messages = request.get("messages") or []
+    prompt = openai_last_user_text(messages)
+    tools = request.get("tools") or []
+    if not tools:
+        return f"Echo: {prompt}"
+    if openai_has_tool_results(messages):
+        return ANSWER
+
+    words = set(re.findall(r"[a-z]+", prompt.lower()))
+
+    def score(tool: Dict[str, Any]) -> int:
+        return len(words & set(tool.get("function", {}).get("name", "").split("_")))
+
+    tool = max(tools, key=score)
+    return [(tool["function"]["name"], _tool_arguments(tool, prompt))]
+
+
+def _tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + words[-1:]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.mock.record_connection()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_events(self, events: Iterator[Dict[str, Any]]) -> None:
+        # Server-sent events in chunked encoding, so the connection stays open afterwards
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+        done = b"data: [DONE]\n\n"
+        self.wfile.write(f"{len(done):x}\r\n".encode("ascii") + done + b"\r\n0\r\n\r\n")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        mock = self.server.mock
+        mock.record_request()
+        start = time.perf_counter()
+        status, body, headers = mock.respond(request)
+        if isinstance(body, dict):
+            self._send_json(status, body, headers)
+        else:
+            self._send_events(body)
+        mock.record_stage(request, status, time.perf_counter() - start)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    mock: "MockOpenAIServer"
+
+
+class MockOpenAIServer:
+    """Background HTTP(S) server speaking a minimal chat completions API."""
+
+    def __init__(
+        self,
+        latency: Union[float, str, Latency] = 0.0,
+        handshake_latency: float = 0.0,
+        tls: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        error_rate: float = 0.0,
+        requests_per_minute: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        token_interval: Union[float, str, Latency] = 0.0,
+        server_error_rate: float = 0.0,
+        script: Optional[Script] = None,
+        stage: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ):
+        """
+        Initialize the server (call start() or use it as a context manager).
+
+        Args:
+            latency: Delay before the first token of each response, in seconds or as a
+                distribution spec such as "lognormal:0.3:0.5" (see Latency.parse)
+            handshake_latency: Seconds to sleep once per new connection
+            tls: Serve HTTPS with a self-signed certificate (requires openssl)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            error_rate: Fraction of requests answered with a 429 at random
+            requests_per_minute: Quota over a sliding one-minute window; requests
+                beyond it are answered with a 429
+            retry_after: Seconds sent in the Retry-After header of 429s (by default
+                the time until the quota frees up, or no header for random errors)
+            token_interval: Delay between generated tokens, in seconds or as a distribution spec
+            server_error_rate: Fraction of requests answered with a 500 at random
+            script: Function mapping a request to answer text or tool calls
+                (defaults to scripted_tool_calls)
+            stage: Function naming the stage a request belongs to, for per-stage
+                service times (defaults to the request's model)
+        """
+        self.latency = Latency.parse(latency)
+        self.handshake_latency = handshake_latency
+        self.tls = tls
+        self.host = host
+        self.port = port
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self.token_interval = Latency.parse(token_interval)
+        self.server_error_rate = server_error_rate
+        self.script = script or scripted_tool_calls
+        self.stage = stage or (lambda request: str(request.get("model", "mock")))
+        self.cert_path: Optional[str] = None
+        self.connections = 0
+        self.requests = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self._stage_times: Dict[str, List[float]] = collections.defaultdict(list)
+        self._stage_errors: Dict[str, int] = collections.defaultdict(int)
+        self._accepted: "collections.deque[float]" = collections.deque()
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to an OpenAI client."""
+        scheme = "https" if self.tls else "http"
+        host = "localhost" if self.tls else self.host
+        return f"{scheme}://{host}:{self.port}/v1"
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+        if self.handshake_latency:
+            time.sleep(self.handshake_latency)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_stage(self, request: Dict[str, Any], status: int, elapsed: float) -> None:
+        """Record the service time of a completed request under its stage."""
+        name = self.stage(request)
+        with self._lock:
+            if status == 200:
+                self._stage_times[name].append(elapsed)
+            else:
+                self._stage_errors[name] += 1
+
+    def _throttle(self) -> Optional[float]:
+        """Decide whether to reject a request; returns the Retry-After seconds (or -1 for no header)."""
+        now = time.monotonic()
+        with self._lock:
+            while self._accepted and now - self._accepted[0] >= 60:
+                self._accepted.popleft()
+            if self.requests_per_minute is not None and len(self._accepted) >= self.requests_per_minute:
+                self.throttled += 1
+                return self.retry_after if self.retry_after is not None else 60 - (now - self._accepted[0])
+            if self.error_rate and random.random() < self.error_rate:
+                self.throttled += 1
+                return self.retry_after if self.retry_after is not None else -1
+            self._accepted.append(now)
+        return None
+
+    def respond(self, request: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Build the response for a chat completions request.
+
+        Args:
+            request: Decoded request body
+
+        Returns:
+            Tuple of HTTP status, body and extra headers. The body is a JSON
+            dictionary, or an iterator of completion chunks for streamed requests
+        """
+        if self.server_error_rate and random.random() < self.server_error_rate:
+            with self._lock:
+                self.server_errors += 1
+            return 500, {"error": {"message": "Internal server error", "type": "server_error"}}, {}
+        retry_after = self._throttle()
+        if retry_after is not None:
+            headers = {"retry-after-ms": str(int(retry_after * 1000))} if retry_after >= 0 else {}
+            return 429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                   "code": "rate_limit_exceeded"}}, headers
+
+        result = self.script(request)
+        if request.get("stream"):
+            return 200, self._stream(request, result), {}
+
+        message: Dict[str, Any] = {"role": "assistant", "content": None}
+        if isinstance(result, str):
+            message["content"] = result
+            tokens = len(_tokens(result))
+        else:
+            message["tool_calls"] = [
+                {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                 "function": {"name": name, "arguments": json.dumps(tool_input)}}
+                for name, tool_input in result
+            ]
+            tokens = len(result)
+        time.sleep(self.latency.sample() + sum(self.token_interval.sample() for _ in range(tokens - 1)))
+        return 200, {
+            "id": "mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "stop" if isinstance(result, str) else "tool_calls"}],
+            "usage": self._usage(request, tokens),
+        }, {}
+
+    @staticmethod
+    def _usage(request: Dict[str, Any], completion_tokens: int) -> Dict[str, int]:
+        prompt_tokens = math.ceil(len(json.dumps(request.get("messages", []))) / 4)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def _stream(self, request: Dict[str, Any], result: ScriptResult) -> Iterator[Dict[str, Any]]:
+        model = request.get("model", "mock")
+
+        def chunk(delta: Optional[Dict[str, Any]], finish_reason: Optional[str] = None,
+                  usage: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+            choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            return {"id": "mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": choices, "usage": usage}
+
+        time.sleep(self.latency.sample())
+        if isinstance(result, str):
+            tokens = _tokens(result)
+            for i, token in enumerate(tokens):
+                if i and self.token_interval:
+                    time.sleep(self.token_interval.sample())
+                yield chunk({"role": "assistant", "content": token} if i == 0 else {"content": token})
+            yield chunk({}, "stop")
+        else:
+            tokens = result
+            for index, (name, tool_input) in enumerate(result):
+                if index and self.token_interval:
+                    time.sleep(self.token_interval.sample())
+                yield chunk({"tool_calls": [{"index": index, "id": f"call_{uuid.uuid4().hex[:12]}",
+                                             "type": "function", "function": {"name": name, "arguments": ""}}]})
+                yield chunk({"tool_calls": [{"index": index, "function": {"arguments": json.dumps(tool_input)}}]})
+            yield chunk({}, "tool_calls")
+        if (request.get("stream_options") or {}).get("include_usage"):
+            yield chunk(None, usage=self._usage(request, len(tokens)))
+
+    def stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report server-side service times per stage.
+
+        Returns:
+            Dictionary mapping each stage to its request and error counts and
+            p50/p95/p99 service time in milliseconds
+        """
+        with self._lock:
+            stages = set(self._stage_times) | set(self._stage_errors)
+            return {
+                name: {
+                    "requests": len(self._stage_times[name]),
+                    "errors": self._stage_errors[name],
+                    "p50_ms": round(percentile(self._stage_times[name], 50) * 1000, 1),
+                    "p95_ms": round(percentile(self._stage_times[name], 95) * 1000, 1),
+                    "p99_ms": round(percentile(self._stage_times[name], 99) * 1000, 1),
+                }
+                for name in sorted(stages)
+            }
+
+    def start(self) -> "MockOpenAIServer":
+        """Start serving on a background thread."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        if self.tls:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            self.cert_path = make_self_signed_cert(self._tmpdir.name)
+            if self.cert_path is None:
+                raise RuntimeError("TLS requires the openssl command line tool")
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert_path)
+            # Handshake on the handler thread rather than in the accept loop
+            self._server.socket = context.wrap_socket(
+                self._server.socket, server_side=True, do_handshake_on_connect=False
+            )
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and remove the temporary certificate."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    def reset_counters(self) -> None:
+        """Reset the connection, request, error and stage counts and the quota window."""
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+            self.throttled = 0
+            self.server_errors = 0
+            self._stage_times.clear()
+            self._stage_errors.clear()
+            self._accepted.clear()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main():
+    """Serve the mock API in the foreground until interrupted."""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat completions server")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--latency", default="0.2", help="First-token latency, e.g. 0.2 or lognormal:0.3:0.5")
+    parser.add_argument("--token_interval", default="0.01", help="Latency between tokens")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--server_error_rate", type=float, default=0.0, help="Fraction answered with 500")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(latency=args.latency, token_interval=args.token_interval, port=args.port,
+                              error_rate=args.error_rate, server_error_rate=args.server_error_rate).start()
+    print(f"Mock OpenAI API at {server.base_url} (set OPENAI_BASE_URL to use it); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
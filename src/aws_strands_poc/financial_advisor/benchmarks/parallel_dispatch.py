@@ -0,0 +1,103 @@
+"""
+Benchmark: sequential versus parallel specialist dispatch.
+
+Runs an orchestrator turn that calls the tax specialist and the portfolio manager
+together, once with sequential dispatch and once with parallel dispatch, and
+reports the wall-clock time of each. Specialists are stand-ins that sleep for a
+fixed latency, so the numbers isolate the dispatch overhead.
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from strands import Agent, tool
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import ScriptedModel, has_tool_results
+from aws_strands_poc.financial_advisor.dispatch import compare_dispatch_modes, enable_parallel_dispatch
+
+
+def make_specialists(latency: float) -> List[Callable]:
+    """Create stand-in specialist tools that sleep for the given latency."""
+
+    @tool
+    def tax_specialist(query: str) -> str:
+        """
+        Answer tax questions.
+
+        Args:
+            query: The tax-related query to analyze
+        """
+        time.sleep(latency)
+        return f"Tax view on: {query}"
+
+    @tool
+    def portfolio_manager(query: str) -> str:
+        """
+        Answer portfolio questions.
+
+        Args:
+            query: The portfolio management query to analyze
+        """
+        time.sleep(latency)
+        return f"Portfolio view on: {query}"
+
+    return [tax_specialist, portfolio_manager]
+
+
+def orchestrator_script(messages):
+    """Call both specialists in the first turn, then summarize their answers."""
+    if not has_tool_results(messages):
+        return [
+            ("tax_specialist", {"query": "Tax impact of selling AAPL"}),
+            ("portfolio_manager", {"query": "Rebalance after selling AAPL"}),
+        ]
+    texts = [
+        content["text"]
+        for block in messages[-1]["content"]
+        if "toolResult" in block
+        for content in block["toolResult"]["content"]
+        if "text" in content
+    ]
+    return " | ".join(texts)
+
+
+def run_orchestrator(parallel: bool, specialist_latency: float, model_latency: float) -> float:
+    """Time one orchestrator query in the given dispatch mode."""
+    agent = Agent(
+        model=ScriptedModel(orchestrator_script, latency=model_latency),
+        tools=make_specialists(specialist_latency),
+        callback_handler=None,
+        max_parallel_tools=1,
+        load_tools_from_directory=False,
+    )
+    if parallel:
+        enable_parallel_dispatch(agent)
+
+    start = time.perf_counter()
+    agent("Should I sell AAPL and how do I rebalance?")
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the dispatch benchmark."""
+    parser = argparse.ArgumentParser(description="Sequential vs parallel specialist dispatch")
+    parser.add_argument("--specialist_latency", type=float, default=0.5, help="Seconds per specialist call")
+    parser.add_argument("--model_latency", type=float, default=0.05, help="Seconds per orchestrator model call")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs per mode")
+    args = parser.parse_args()
+
+    print("\nOrchestrator turn with two specialists")
+    for parallel in (False, True):
+        timings = [run_orchestrator(parallel, args.specialist_latency, args.model_latency) for _ in range(args.runs)]
+        label = "parallel" if parallel else "sequential"
+        print(f"  {label:<10} best={min(timings):.3f}s mean={sum(timings) / len(timings):.3f}s")
+
+    print("\nDirect fan-out of two specialists")
+    tax, portfolio = make_specialists(args.specialist_latency)
+    result = compare_dispatch_modes([(tax, "Tax impact of selling AAPL"), (portfolio, "Rebalance after selling AAPL")])
+    print(f"  sequential={result['sequential_s']:.3f}s parallel={result['parallel_s']:.3f}s speedup={result['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
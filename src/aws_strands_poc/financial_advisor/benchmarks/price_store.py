@@ -0,0 +1,105 @@
+"""
+Benchmark: memory-mapped price store read latency, cold and warm.
+
+Fills a temporary store with ten years of daily bars for many tickers and a
+year of minute bars for one, then times stock_data-style timeframe reads three
+ways: cold (a fresh store with the files evicted from the page cache where the
+OS allows it), warm (files already mapped) and, for comparison, loading the
+whole column files into memory and generating the series from scratch.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.batch import percentile
+from aws_strands_poc.financial_advisor.tools.price_series import generate_series
+from aws_strands_poc.financial_advisor.tools.price_store import DATE_FIELD, FIELDS, PriceStore
+
+END = "2025-05-16"
+# (timeframe, interval) reads to time
+READS = [("5d", "1d"), ("1y", "1d"), ("10y", "1d"), ("5d", "1m"), ("1mo", "1m")]
+
+
+def drop_page_cache(root: Path) -> bool:
+    """Ask the OS to evict the store's files from the page cache; False when unsupported."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in root.rglob("*.npy"):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def timed(fn: Callable[[], object], count: int) -> List[float]:
+    """Run fn count times and return the latencies in milliseconds."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summary(latencies: List[float]) -> str:
+    """Format the p50 and p95 of a list of latencies."""
+    return f"p50 {percentile(latencies, 50):>7.3f}ms p95 {percentile(latencies, 95):>7.3f}ms"
+
+
+def main():
+    """Run the price store benchmark."""
+    parser = argparse.ArgumentParser(description="Cold and warm read latency of the memory-mapped price store")
+    parser.add_argument("--tickers", type=int, default=200, help="Tickers with ten years of daily bars")
+    parser.add_argument("--reads", type=int, default=200, help="Reads per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        store = PriceStore(root)
+        tickers = [f"T{i:04d}" for i in range(args.tickers)]
+        start = time.perf_counter()
+        for ticker in tickers:
+            store.write_series(generate_series(ticker, "10y", "1d", end=END))
+        store.write_series(generate_series("T0000", "1y", "1m", end=END))
+        size = sum(p.stat().st_size for p in root.rglob("*.npy"))
+        print(f"\nStore: {args.tickers} tickers x 10y daily + 1y of minute bars, "
+              f"{size / 2 ** 20:.0f} MiB, written in {time.perf_counter() - start:.1f}s")
+
+        print(f"\nRead latency per stock_data timeframe ({args.reads} reads, rotating tickers)")
+        print(f"  {'read':<10} {'bars':>6}  {'cold':<30} {'warm':<30}")
+        for timeframe, interval in READS:
+            names = tickers if interval == "1d" else ["T0000"]
+            bars = len(store.read_timeframe(names[0], timeframe, interval, end=END))
+            evicted = drop_page_cache(root)
+            cold_store = PriceStore(root)
+            cold: List[float] = []
+            for i in range(min(args.reads, len(names))):
+                cold += timed(lambda: cold_store.read_timeframe(names[i], timeframe, interval, end=END).close[-1], 1)
+            counter = iter(range(10 ** 9))
+            warm = timed(lambda: cold_store.read_timeframe(
+                names[next(counter) % len(names)], timeframe, interval, end=END).close[-1], args.reads)
+            print(f"  {timeframe + '/' + interval:<10} {bars:>6}  {summary(cold):<30} {summary(warm):<30}")
+        if not evicted:
+            print("  (page cache eviction unsupported here: cold reads only include opening and mapping)")
+
+        print(f"\nFor comparison, one 1y/1d read per approach")
+        directory = store.path(tickers[-1], "1d")
+        loaded = timed(lambda: [np.load(directory / f"{name}.npy") for name in (DATE_FIELD,) + FIELDS], args.reads)
+        generated = timed(lambda: generate_series(tickers[-1], "1y", "1d", end=END), args.reads)
+        mapped = timed(lambda: store.read_timeframe(tickers[-1], "1y", "1d", end=END).close[-1], args.reads)
+        print(f"  {'warm mapped read':<26} {summary(mapped)}")
+        print(f"  {'np.load of all columns':<26} {summary(loaded)}")
+        print(f"  {'generate_series':<26} {summary(generated)}")
+        print(f"\nStore stats: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: rate-limit-aware scheduling against a mock server that returns 429s.
+
+First sends a burst of generate calls to a server that rejects a fraction of
+requests with 429s, with only the SDK's default retries and then through the
+request scheduler, and counts the answers that came back as errors. Then fills
+a paced scheduler with a batch backlog followed by interactive requests, and
+compares how long each lane waited for admission.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import MockOpenAIServer
+from aws_strands_poc.financial_advisor.models.client_registry import ClientRegistry
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+from aws_strands_poc.financial_advisor.models.scheduler import RequestScheduler
+
+
+def ask(model: OpenAIDirectModel, i: int) -> Dict[str, Any]:
+    """Send one question and time it."""
+    start = time.perf_counter()
+    _, metadata = model.generate([{"role": "user", "content": [{"text": f"Question {i}"}]}])
+    return {"ok": "error" not in metadata, "latency_s": time.perf_counter() - start}
+
+
+def burst(model: OpenAIDirectModel, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send requests concurrently and summarise the outcomes."""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda i: ask(model, i), range(requests)))
+    latencies = sorted(r["latency_s"] for r in results)
+    return {
+        "succeeded": sum(r["ok"] for r in results),
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def injected_errors(server: MockOpenAIServer, client: Any, requests: int, concurrency: int) -> None:
+    """Compare SDK retries alone with the scheduler when the server throttles at random."""
+    print(f"\n{requests} requests, {concurrency} in flight, {server.error_rate:.0%} answered with 429")
+    sdk_only = OpenAIDirectModel(client=client, coalesce=False, schedule=False)
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0, base_delay=0.05, max_retries=8)
+    scheduled = OpenAIDirectModel(client=client, coalesce=False, scheduler=scheduler)
+    for name, model in (("SDK retries only", sdk_only), ("scheduler", scheduled)):
+        server.reset_counters()
+        result = burst(model, requests, concurrency)
+        print(f"  {name:<17} {result['succeeded']}/{requests} answered, {server.throttled} 429s, "
+              f"mean {result['mean_ms']:.0f}ms, p95 {result['p95_ms']:.0f}ms")
+    lane = scheduler.stats()["lanes"]["interactive"]
+    print(f"  scheduler retries: {lane['retries']} ({lane['retry_after_honoured']} honoured Retry-After), "
+          f"{lane['failed']} gave up")
+
+
+def priority_lanes(client: Any, batch: int, interactive: int, rpm: int) -> None:
+    """Queue a batch backlog, then interactive requests, behind a paced scheduler."""
+    print(f"\n{batch} batch requests queued before {interactive} interactive ones, paced at {rpm} requests/minute")
+    scheduler = RequestScheduler(requests_per_minute=rpm, tokens_per_minute=0, burst_seconds=1)
+    models = {
+        lane: OpenAIDirectModel(client=client, coalesce=False, scheduler=scheduler, priority=lane)
+        for lane in ("batch", "interactive")
+    }
+    peak: List[int] = []
+    with ThreadPoolExecutor(max_workers=batch + interactive) as pool:
+        futures = [pool.submit(ask, models["batch"], i) for i in range(batch)]
+        time.sleep(0.2)
+        futures += [pool.submit(ask, models["interactive"], i) for i in range(interactive)]
+        time.sleep(0.05)
+        peak.append(scheduler.stats()["queue_depth"])
+        for future in futures:
+            future.result()
+    lanes = scheduler.stats()["lanes"]
+    for lane in ("interactive", "batch"):
+        stats = lanes[lane]
+        print(f"  {lane:<12} admitted {stats['admitted']}, wait avg {stats['avg_wait_ms']:.0f}ms, "
+              f"max {stats['max_wait_ms']:.0f}ms, peak queue depth {stats['peak_queue_depth']}")
+    print(f"  queue depth once both lanes were waiting: {peak[0]}")
+
+
+def main():
+    """Run the rate limit benchmark."""
+    parser = argparse.ArgumentParser(description="Request scheduler against a throttling mock server")
+    parser.add_argument("--requests", type=int, default=100, help="Requests in the injected-429 burst")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--error_rate", type=float, default=0.3, help="Fraction of requests answered with 429")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency per request in seconds")
+    parser.add_argument("--rpm", type=int, default=600, help="Scheduler pacing for the priority lane test")
+    args = parser.parse_args()
+
+    with MockOpenAIServer(latency=args.latency, error_rate=args.error_rate, retry_after=0.05) as server:
+        client = ClientRegistry().get_client("benchmark", base_url=server.base_url)
+        injected_errors(server, client, args.requests, args.concurrency)
+        server.error_rate = 0.0
+        priority_lanes(client, batch=40, interactive=5, rpm=args.rpm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: bytes and tokens of tool results under each result encoding.
+
+Calls stock_data, portfolio_analysis and tax_calculator with typical arguments
+and encodes every result with each encoder: the repr Strands sends by default,
+compact JSON, header+rows, columnar and CSV-in-JSON. The earlier one-dict-per-bar
+stock_data rows are included to show the table encoders on record lists. Checks
+that every encoding decodes back to the original result and reports the
+savings of each tool's configured encoding.
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+from aws_strands_poc.financial_advisor.benchmarks.downsampling import as_rows
+from aws_strands_poc.financial_advisor.history import count_tokens
+from aws_strands_poc.financial_advisor.tools import portfolio_analysis, stock_data, tax_calculator
+from aws_strands_poc.financial_advisor.tools.result_encoding import (
+    ENCODERS,
+    encode_result,
+    encoding_stats,
+)
+
+END = "2025-05-16"
+HOLDINGS = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "JPM", "V", "WMT", "TSLA"]
+
+
+def payloads() -> List[Tuple[str, Any]]:
+    """Return (label, tool result) pairs for typical calls of each tool."""
+    portfolio = [{"ticker": ticker, "allocation": 10} for ticker in HOLDINGS]
+    return [
+        ("stock_data 1mo", stock_data(ticker="AAPL", timeframe="1mo", end=END)),
+        ("stock_data 6mo", stock_data(ticker="AAPL", timeframe="6mo", end=END)),
+        ("stock_data 10 tickers", stock_data(tickers=HOLDINGS, timeframe="1mo", end=END)),
+        ("stock_data old rows", as_rows(stock_data(ticker="AAPL", timeframe="1mo", end=END))),
+        ("portfolio_analysis", portfolio_analysis(
+            portfolio=portfolio, metrics=["risk", "return", "sharpe", "alpha", "diversification"])),
+        ("tax_calculator single", tax_calculator(income=120000, deductions=5000)),
+        ("tax_calculator married", tax_calculator(income=450000, filing_status="married")),
+    ]
+
+
+def main():
+    """Run the result encoding benchmark."""
+    parser = argparse.ArgumentParser(description="Compare tool result encodings by size and tokens")
+    parser.add_argument("--repeat", type=int, default=200, help="Encodings per payload for the timing")
+    args = parser.parse_args()
+
+    results = payloads()
+    names = list(ENCODERS)
+    print(f"\nTokens per tool result (bytes in parentheses), by encoding")
+    print(f"  {'payload':<24}" + "".join(f"{name:>16}" for name in names) + f"{'round-trips':>13}")
+    for label, result in results:
+        plain = dict(result)
+        cells, lossless = [], True
+        for name in names:
+            text = encode_result(plain, name)
+            encoder = ENCODERS[name]
+            lossless &= encoder.decode(encoder.encode(plain)) == plain
+            cells.append(f"{count_tokens(text):>7} ({len(text.encode('utf-8')):>6})")
+        print(f"  {label:<24}" + "".join(f"{cell:>16}" for cell in cells) + f"{str(lossless):>13}")
+
+    print(f"\nEncoding time per result, including the round-trip check (mean of {args.repeat} runs)")
+    for label, result in results:
+        plain = dict(result)
+        timings: Dict[str, float] = {}
+        for name in names:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                encode_result(plain, name)
+            timings[name] = (time.perf_counter() - start) / args.repeat * 1e6
+        print(f"  {label:<24}" + " ".join(f"{name}={us:.0f}us" for name, us in timings.items()))
+
+    encoding_stats.clear()
+    for _, result in results:
+        str(result)
+    print(f"\nConfigured per-tool encodings, as the model receives them")
+    for tool_name, stats in encoding_stats.stats().items():
+        print(f"  {tool_name:<20} results={stats['results']} bytes {stats['repr_bytes']} -> {stats['encoded_bytes']} "
+              f"({stats['bytes_saved']:.0%} saved), tokens {stats['repr_tokens']} -> {stats['encoded_tokens']} "
+              f"({stats['tokens_saved']:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
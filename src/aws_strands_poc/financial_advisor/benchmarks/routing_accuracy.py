@@ -0,0 +1,54 @@
+"""
+Benchmark: pre-router accuracy, coverage and classification latency.
+
+Trains the hashed n-gram classifier on the built-in routing examples, evaluates it
+on the held-out labelled queries at several confidence thresholds, and measures
+how long one local routing decision takes compared to an orchestrator LLM hop.
+"""
+
+import argparse
+import time
+
+from aws_strands_poc.financial_advisor.router import PreRouter, ROUTING_EVAL_EXAMPLES
+
+
+def main():
+    """Run the routing-accuracy report."""
+    parser = argparse.ArgumentParser(description="Pre-router accuracy report")
+    parser.add_argument(
+        "--thresholds",
+        default="0.5,0.6,0.7,0.8,0.9",
+        help="Comma-separated confidence thresholds to evaluate",
+    )
+    args = parser.parse_args()
+
+    print(f"\nRouting accuracy on {len(ROUTING_EVAL_EXAMPLES)} held-out queries")
+    print(f"  {'threshold':>9} {'coverage':>9} {'routed_acc':>11} {'top1_acc':>9}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        report = PreRouter(min_confidence=threshold).accuracy_report()
+        routed_accuracy = report["routed_accuracy"]
+        print(
+            f"  {threshold:>9.2f} {report['coverage']:>9.1%} "
+            f"{'n/a' if routed_accuracy is None else format(routed_accuracy, '.1%'):>11} "
+            f"{report['top1_accuracy']:>9.1%}"
+        )
+
+    router = PreRouter()
+    report = router.accuracy_report()
+    print(f"\nPer-specialist precision/recall at {router.min_confidence}")
+    for specialist, scores in report["per_specialist"].items():
+        precision = "n/a" if scores["precision"] is None else f"{scores['precision']:.1%}"
+        recall = "n/a" if scores["recall"] is None else f"{scores['recall']:.1%}"
+        print(f"  {specialist:<20} precision={precision:>6} recall={recall:>6}")
+
+    queries = [query for query, _ in ROUTING_EVAL_EXAMPLES] * 100
+    start = time.perf_counter()
+    for query in queries:
+        router.route(query)
+    elapsed = time.perf_counter() - start
+    print(f"\nLocal routing latency: {elapsed / len(queries) * 1e6:.1f}us per query")
+    print(f"Counters: {router.stats()}")
+
+
+if __name__ == "__main__":
+    main()
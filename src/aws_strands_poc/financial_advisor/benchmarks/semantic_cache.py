@@ -0,0 +1,113 @@
+"""
+Benchmark: semantic cache precision, hit rate, lookup latency and persistence.
+
+Evaluates the semantic cache on the labelled paraphrase / near-miss pairs at
+several similarity thresholds, with and without the substitution check. It then
+runs a paraphrase-heavy workload through a cached specialist, comparing the
+specialist calls made with the exact-match cache alone and with the semantic
+cache behind it, measures lookup latency as the index grows to its size bound,
+and checks that a saved index answers the same lookups after reloading.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from aws_strands_poc.financial_advisor.cache import ResponseCache, cached_specialist
+from aws_strands_poc.financial_advisor.semantic_cache import (
+    SEMANTIC_EVAL_PAIRS,
+    SemanticCache,
+    evaluate_semantic_cache,
+)
+
+
+def print_sweep(thresholds, allow_substitutions: bool) -> None:
+    """Print precision and hit rate at each threshold."""
+    label = "similarity only" if allow_substitutions else "with substitution check"
+    print(f"\n{len(SEMANTIC_EVAL_PAIRS)} labelled pairs, {label}")
+    print(f"  {'threshold':>9} {'hit_rate':>9} {'recall':>7} {'precision':>10} {'wrong':>6}")
+    for threshold in thresholds:
+        report = evaluate_semantic_cache(threshold, allow_substitutions=allow_substitutions)
+        precision = "n/a" if report["precision"] is None else f"{report['precision']:.1%}"
+        print(f"  {threshold:>9.2f} {report['hit_rate']:>9.1%} {report['recall']:>7.1%} "
+              f"{precision:>10} {report['wrong_answers']:>6}")
+
+
+def workload_calls(semantic: bool, specialist_latency: float, threshold: float) -> int:
+    """Ask every seed and probe question through a cached fake specialist and count its runs."""
+    calls = []
+    semantic_cache = SemanticCache(threshold=threshold)
+    semantic_cache.enabled = semantic
+
+    @cached_specialist("tax_specialist", "benchmark prompt", cache=ResponseCache(), semantic=semantic_cache)
+    def specialist(query: str) -> str:
+        calls.append(query)
+        time.sleep(specialist_latency)
+        return f"answer to {query}"
+
+    for seed, probe, _ in SEMANTIC_EVAL_PAIRS:
+        specialist(seed)
+        specialist(probe)
+    return len(calls)
+
+
+def main():
+    """Run the semantic cache benchmark."""
+    parser = argparse.ArgumentParser(description="Semantic cache precision, hit rate and latency report")
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9",
+                        help="Comma-separated similarity thresholds to evaluate")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Threshold for the workload and latency runs")
+    parser.add_argument("--sizes", default="256,2048,8192", help="Comma-separated index sizes for the latency run")
+    parser.add_argument("--specialist_latency", type=float, default=0.0,
+                        help="Seconds each fake specialist run takes in the workload")
+    args = parser.parse_args()
+
+    thresholds = [float(t) for t in args.thresholds.split(",")]
+    print_sweep(thresholds, allow_substitutions=True)
+    print_sweep(thresholds, allow_substitutions=False)
+
+    queries = 2 * len(SEMANTIC_EVAL_PAIRS)
+    exact = workload_calls(False, args.specialist_latency, args.threshold)
+    semantic = workload_calls(True, args.specialist_latency, args.threshold)
+    print(f"\nWorkload of {queries} queries (seeds then probes) at threshold {args.threshold}")
+    print(f"  specialist runs, exact cache only:   {exact}")
+    print(f"  specialist runs, with semantic cache: {semantic} ({exact - semantic} saved)")
+
+    print(f"\nLookup latency (index filled to its bound, then 1000 lookups)")
+    probes = [probe for _, probe, _ in SEMANTIC_EVAL_PAIRS]
+    for size in (int(s) for s in args.sizes.split(",")):
+        cache = SemanticCache(threshold=args.threshold, max_entries=size)
+        start = time.perf_counter()
+        for i in range(size + size // 4):
+            seed = SEMANTIC_EVAL_PAIRS[i % len(SEMANTIC_EVAL_PAIRS)][0]
+            cache.put(f"{seed} case {i}", "bench", "bench", seed)
+        put_us = (time.perf_counter() - start) / (size + size // 4) * 1e6
+        start = time.perf_counter()
+        for i in range(1000):
+            cache.get(probes[i % len(probes)], "bench", "bench")
+        get_us = (time.perf_counter() - start) / 1000 * 1e6
+        stats = cache.stats()
+        print(f"  {size:>6} entries: put {put_us:>6.0f}us, get {get_us:>6.0f}us, "
+              f"{stats['entries']} kept, {stats['evictions']} evicted")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "semantic_cache.npz")
+        cache = SemanticCache(threshold=args.threshold)
+        for seed, _, _ in SEMANTIC_EVAL_PAIRS:
+            cache.put(seed, "bench", "bench", seed)
+        cache.save(path)
+        start = time.perf_counter()
+        reloaded = SemanticCache(threshold=args.threshold)
+        loaded = reloaded.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+        same = all(
+            (a.response if a else None) == (b.response if b else None)
+            for a, b in ((cache.get(p, "bench", "bench"), reloaded.get(p, "bench", "bench")) for p in probes)
+        )
+        print(f"\nPersistence: {loaded} entries, {os.path.getsize(path) / 1024:.0f} KiB on disk, "
+              f"loaded in {load_ms:.1f}ms, same answers after reload: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: vectorized price series generation against the per-row loop.
+
+Times the previous stock_data implementation, which built one dict per bar with
+random.uniform in a Python loop, against the NumPy generator at the same number
+of bars, from a month of daily bars up to a year of minute bars. Both are timed
+on generation alone and including conversion to the JSON-ready tool output.
+Also times a universe of tickers and checks that a seed reproduces the series.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.price_series import TICKER_PROFILES, bar_count, generate_series
+
+# (timeframe, interval) pairs from short to long
+SIZES = [("1mo", "1d"), ("6mo", "1d"), ("10y", "1d"), ("1mo", "1m"), ("1y", "1m")]
+
+
+def legacy_rows(ticker: str, points: int) -> List[Dict[str, Any]]:
+    """The previous stock_data loop: one random.uniform row at a time."""
+    current_price = 175.0
+    data = []
+    for i in range(points):
+        daily_change = current_price * random.uniform(-0.02, 0.02)
+        open_price = current_price
+        close_price = current_price + daily_change
+        high_price = max(open_price, close_price) * (1 + random.uniform(0, 0.01))
+        low_price = min(open_price, close_price) * (1 - random.uniform(0, 0.01))
+        data.append({
+            "date": f"2025-{(5 - i // 30) % 12 + 1:02d}-{(17 - i % 30) % 28 + 1:02d}",
+            "open": round(open_price, 2),
+            "high": round(high_price, 2),
+            "low": round(low_price, 2),
+            "close": round(close_price, 2),
+            "volume": int(random.uniform(1000000, 10000000)),
+        })
+        current_price = close_price
+    return data
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    """Return the fastest of several runs in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the price series generation benchmark."""
+    parser = argparse.ArgumentParser(description="Compare vectorized stock_data generation against the row loop")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the universe run")
+    args = parser.parse_args()
+
+    print(f"\nSingle ticker, best of {args.repeat} (gen = arrays only, json = tool output)")
+    print(f"  {'timeframe':<10} {'bars':>8} {'loop':>10} {'numpy gen':>10} {'numpy json':>11} {'speedup':>8}")
+    for timeframe, interval in SIZES:
+        bars = bar_count(timeframe, interval)
+        loop = best_of(args.repeat, lambda: legacy_rows("AAPL", bars))
+        gen = best_of(args.repeat, lambda: generate_series("AAPL", timeframe, interval))
+        json_ready = best_of(args.repeat, lambda: generate_series("AAPL", timeframe, interval).to_dict())
+        print(f"  {timeframe + '/' + interval:<10} {bars:>8} {loop * 1000:>8.2f}ms {gen * 1000:>8.2f}ms "
+              f"{json_ready * 1000:>9.2f}ms {loop / json_ready:>7.1f}x")
+
+    known = list(TICKER_PROFILES)
+    tickers = [known[i] if i < len(known) else f"T{i:04d}" for i in range(args.tickers)]
+    bars = bar_count("1y", "1d")
+    loop = best_of(1, lambda: [legacy_rows(t, bars) for t in tickers])
+    gen = best_of(1, lambda: [generate_series(t, "1y", "1d") for t in tickers])
+    print(f"\n{len(tickers)} tickers x {bars} daily bars: loop {loop * 1000:.0f}ms, "
+          f"numpy {gen * 1000:.0f}ms ({loop / gen:.1f}x)")
+
+    first = generate_series("NVDA", "1y", "1m", seed=7)
+    second = generate_series("NVDA", "1y", "1m", seed=7)
+    other = generate_series("NVDA", "1y", "1m", seed=8)
+    same = all(np.array_equal(getattr(first, c), getattr(second, c)) for c in ("open", "high", "low", "close", "volume"))
+    print(f"\nReproducible with the same seed: {same}; "
+          f"different seed changes the series: {not np.array_equal(first.close, other.close)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: time-to-first-token with and without streaming.
+
+Runs an orchestrator that calls one specialist and then writes its answer, on
+OpenAIDirectModel backed by a mock client that decodes tokens at a fixed rate.
+Without streaming the first visible token is the end of the final answer; with
+streaming it is the specialist's first token.
+"""
+
+import argparse
+import os
+import statistics
+from typing import Any, Dict, List
+
+from strands import tool
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import MockOpenAIClient, openai_has_tool_results
+from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+from aws_strands_poc.financial_advisor.streaming import StreamingCallbackHandler, TokenStream, streaming_to
+
+ANSWER = " ".join(["Diversified index funds keep costs low and spread risk across many holdings."] * 4)
+
+
+def orchestrator_script(messages: List[Dict[str, Any]]):
+    """Ask the specialist first, then summarize."""
+    if not openai_has_tool_results(messages):
+        return [("portfolio_manager", {"query": "How should I diversify?"})]
+    return ANSWER
+
+
+def build_orchestrator(first_token_latency: float, token_interval: float):
+    """Create an orchestrator and a specialist on mock streaming clients."""
+    specialist_agent = create_openai_agent(
+        system_prompt="You are a portfolio manager.",
+        tools=[],
+        model_provider=OpenAIDirectModel(client=MockOpenAIClient(
+            lambda messages: ANSWER, first_token_latency, token_interval
+        )),
+        callback_handler=StreamingCallbackHandler("portfolio_manager"),
+        load_tools_from_directory=False,
+    )
+
+    @tool
+    def portfolio_manager(query: str) -> str:
+        """
+        Answer portfolio questions.
+
+        Args:
+            query: The portfolio management query to analyze
+        """
+        specialist_agent.messages = []
+        return str(specialist_agent(query))
+
+    return create_openai_agent(
+        system_prompt="You are a financial advisor.",
+        tools=[portfolio_manager],
+        model_provider=OpenAIDirectModel(client=MockOpenAIClient(
+            orchestrator_script, first_token_latency, token_interval
+        )),
+        callback_handler=StreamingCallbackHandler("advisor"),
+        load_tools_from_directory=False,
+    )
+
+
+def main():
+    """Run the streaming benchmark."""
+    parser = argparse.ArgumentParser(description="Time-to-first-token with and without streaming")
+    parser.add_argument("--first_token_latency", type=float, default=0.3, help="Mock seconds before the first token")
+    parser.add_argument("--token_interval", type=float, default=0.01, help="Mock seconds between tokens")
+    parser.add_argument("--repeats", type=int, default=3, help="Queries per measurement")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    ttfts, totals = [], []
+    for _ in range(args.repeats):
+        agent = build_orchestrator(args.first_token_latency, args.token_interval)
+        stream = TokenStream()
+        with streaming_to(stream):
+            agent("How should I diversify?")
+        summary = stream.summary()
+        ttfts.append(summary["ttft_ms"])
+        totals.append(summary["total_ms"])
+
+    print("\nOrchestrator -> specialist -> orchestrator")
+    print(f"  without streaming: first token at {statistics.mean(totals):.0f}ms (the full answer)")
+    print(f"  with streaming:    first token at {statistics.mean(ttfts):.0f}ms, "
+          f"complete at {statistics.mean(totals):.0f}ms")
+    print(f"  first sources:     {summary['first_token_ms_by_source']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: vectorized technical indicators against naive per-bar Python loops.
+
+Each indicator is computed the way an analysis script typically does it, one bar
+at a time over Python lists, and with the NumPy implementations behind the
+technical_indicators tool; both must agree to within rounding. Also times a
+universe of tickers as one panel against per-ticker loops, and the tool itself
+cold against a repeat call served from the indicator cache.
+"""
+
+import argparse
+import math
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.benchmarks.stock_data_generation import best_of
+from aws_strands_poc.financial_advisor.tools import technical_indicators
+from aws_strands_poc.financial_advisor.tools.indicators import INDICATORS, compute
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    INTERVALS,
+    PriceSeries,
+    generate_panel,
+    generate_series,
+)
+from aws_strands_poc.financial_advisor.tools.technical_indicators import indicator_cache
+
+END = "2025-05-16"
+
+
+def loop_ema(values: List[float], period: int) -> List[float]:
+    alpha = 2 / (period + 1)
+    out = [values[0]]
+    for value in values[1:]:
+        out.append(alpha * value + (1 - alpha) * out[-1])
+    return out
+
+
+def loop_sma(values: List[float], period: int) -> List[float]:
+    return [math.nan] * (period - 1) + [sum(values[i - period + 1:i + 1]) / period
+                                        for i in range(period - 1, len(values))]
+
+
+def loop_wilder(values: List[float], period: int, first: int) -> List[float]:
+    average = sum(values[first:first + period]) / period
+    out = [math.nan] * (first + period - 1) + [average]
+    for value in values[first + period:]:
+        average = (average * (period - 1) + value) / period
+        out.append(average)
+    return out
+
+
+def loop_indicator(name: str, bars: Dict[str, List[float]]) -> Dict[str, List[float]]:
+    """Compute an indicator with default parameters one bar at a time over lists."""
+    close, high, low, volume = bars["close"], bars["high"], bars["low"], bars["volume"]
+    if name == "sma":
+        return {name: loop_sma(close, 20)}
+    if name == "ema":
+        return {name: loop_ema(close, 20)}
+    if name == "rsi":
+        changes = [0.0] + [close[i] - close[i - 1] for i in range(1, len(close))]
+        gains = loop_wilder([max(c, 0.0) for c in changes], 14, 1)
+        losses = loop_wilder([max(-c, 0.0) for c in changes], 14, 1)
+        return {name: [100.0 if loss == 0 else 100 - 100 / (1 + gain / loss) for gain, loss in zip(gains, losses)]}
+    if name == "macd":
+        line = [fast - slow for fast, slow in zip(loop_ema(close, 12), loop_ema(close, 26))]
+        signal = loop_ema(line, 9)
+        return {"macd": line, "signal": signal, "histogram": [m - s for m, s in zip(line, signal)]}
+    if name == "bollinger":
+        middle = loop_sma(close, 20)
+        spread = [math.nan] * 19
+        for i in range(19, len(close)):
+            window = close[i - 19:i + 1]
+            mean = sum(window) / 20
+            spread.append(2 * math.sqrt(sum((v - mean) ** 2 for v in window) / 20))
+        return {"middle": middle, "upper": [m + s for m, s in zip(middle, spread)],
+                "lower": [m - s for m, s in zip(middle, spread)]}
+    if name == "atr":
+        ranges = [high[0] - low[0]] + [
+            max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])) for i in range(1, len(close))
+        ]
+        return {name: loop_wilder(ranges, 14, 0)}
+    price_volume = total_volume = 0.0
+    out = []
+    session = None
+    for h, l, c, v, day in zip(high, low, close, volume, bars["session"]):
+        if day != session:
+            # Intraday VWAP starts over every session; daily bars share one session
+            price_volume = total_volume = 0.0
+            session = day
+        price_volume += (h + l + c) / 3 * v
+        total_volume += v
+        out.append(price_volume / total_volume)
+    return {name: out}
+
+
+def as_lists(series: PriceSeries) -> Dict[str, List[Any]]:
+    """Turn a series into plain lists, with each bar's session day (None for daily bars)."""
+    lists = {name: getattr(series, name).tolist() for name in ("high", "low", "close", "volume")}
+    intraday = INTERVALS[series.interval] > 0
+    lists["session"] = series.dates.astype("datetime64[D]").tolist() if intraday else [None] * len(series)
+    return lists
+
+
+def max_difference(fast: Dict[str, np.ndarray], slow: Dict[str, List[float]]) -> float:
+    """Largest absolute difference between the two implementations, ignoring warm-up NaNs."""
+    return max(float(np.nanmax(np.abs(fast[key] - np.array(slow[key])))) for key in fast)
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the technical indicator benchmark."""
+    parser = argparse.ArgumentParser(description="Compare vectorized technical indicators against per-bar loops")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the universe run")
+    args = parser.parse_args()
+
+    sizes = [("1y", "1d"), ("10y", "1d"), ("1y", "5m")]
+    for timeframe, interval in sizes:
+        series = generate_series("AAPL", timeframe, interval=interval, end=END)
+        lists = as_lists(series)
+        print(f"\n{timeframe}/{interval} ({len(series)} bars), best of {args.repeat}")
+        print(f"  {'indicator':<10} {'loop':>10} {'numpy':>10} {'speedup':>8} {'max diff':>10}")
+        for name in INDICATORS:
+            slow = loop_indicator(name, lists)
+            fast = compute(name, series)
+            loop = best_of(args.repeat, lambda: loop_indicator(name, lists))
+            vectorized = best_of(args.repeat, lambda: compute(name, series))
+            print(f"  {name:<10} {loop * 1000:>8.2f}ms {vectorized * 1000:>8.3f}ms "
+                  f"{loop / vectorized:>7.1f}x {max_difference(fast, slow):>10.1e}")
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    panel = generate_panel(tickers, "1y", "1d", end=END)
+    universe = [as_lists(panel.series(i)) for i in range(len(tickers))]
+    loop = timed(lambda: [loop_indicator(name, bars) for bars in universe for name in INDICATORS])
+    vectorized = best_of(args.repeat, lambda: [compute(name, panel) for name in INDICATORS])
+    print(f"\n{len(tickers)} tickers x {len(panel)} daily bars, all {len(INDICATORS)} indicators: "
+          f"loop {loop * 1000:.0f}ms, numpy panel {vectorized * 1000:.1f}ms ({loop / vectorized:.0f}x)")
+
+    request = {"tickers": tickers[:50], "timeframe": "1y", "end": END}
+    indicator_cache.clear()
+    cold = timed(lambda: str(technical_indicators(**request)))
+    warm = best_of(args.repeat, lambda: str(technical_indicators(**request)))
+    print(f"technical_indicators for 50 tickers: cold {cold * 1000:.1f}ms, cached {warm * 1000:.1f}ms "
+          f"(cache: {indicator_cache.stats()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: tick feed throughput at 1k and 10k tickers.
+
+Publishes simulated tick batches for every ticker in the universe through the
+TickBus into a RollingIndicators consumer and reports ticks per second for the
+whole pipeline, for the consumer alone and with extra subscribers that each
+watch a small watchlist. For reference, runs a per-tick pub/sub with Python
+callbacks, deque ring buffers and indicators recomputed from the ring on every
+tick. Finally compares reading the latest state of 50 tickers from the feed
+with recomputing their indicators from a fresh intraday series.
+"""
+
+import argparse
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.benchmarks.stock_data_generation import best_of
+from aws_strands_poc.financial_advisor.tools.technical_indicators import indicator_cache, technical_indicators
+from aws_strands_poc.financial_advisor.tools.tick_feed import RollingIndicators, TickBatch, TickBus, TickSimulator
+
+START = np.datetime64("2025-05-16T13:30")
+
+
+class NaiveConsumer:
+    """Per-tick consumer: a deque per ticker and the window statistics recomputed on every tick."""
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self.rings: Dict[str, deque] = {}
+        self.state: Dict[str, Dict[str, float]] = {}
+
+    def on_tick(self, ticker: str, price: float, size: int) -> None:
+        ring = self.rings.setdefault(ticker, deque(maxlen=self.window))
+        ring.append(price)
+        mean = sum(ring) / len(ring)
+        std = math.sqrt(sum((p - mean) ** 2 for p in ring) / len(ring))
+        state = self.state.setdefault(ticker, {"ema": price, "volume": 0.0, "price_volume": 0.0})
+        state["ema"] += 2 / 21 * (price - state["ema"])
+        state["volume"] += size
+        state["price_volume"] += price * size
+        state.update(price=price, sma=mean, upper=mean + 2 * std, lower=mean - 2 * std)
+
+
+def naive_rate(batches: List[TickBatch], tickers: List[str]) -> float:
+    """Ticks per second through per-tick callbacks into the naive consumer."""
+    consumer = NaiveConsumer()
+    subscribers: List[Callable[[str, float, int], None]] = [consumer.on_tick]
+    start = time.perf_counter()
+    ticks = 0
+    for batch in batches:
+        for row, price, size in zip(batch.rows.tolist(), batch.price.tolist(), batch.size.tolist()):
+            for callback in subscribers:
+                callback(tickers[row], price, size)
+        ticks += len(batch)
+    return ticks / (time.perf_counter() - start)
+
+
+def feed(tickers: List[str], watchlists: int = 0) -> Dict[str, Any]:
+    """Build a bus, simulator and consumer, plus optional watchlist subscribers."""
+    bus = TickBus()
+    simulator = TickSimulator(bus, tickers, seed=7, start=START)
+    indicators = RollingIndicators(bus)
+    bus.subscribe(indicators)
+    rng = np.random.default_rng(0)
+    for _ in range(watchlists):
+        bus.subscribe(lambda batch: None, [tickers[i] for i in rng.choice(len(tickers), 50, replace=False)])
+    return {"bus": bus, "simulator": simulator, "indicators": indicators}
+
+
+def rate(fn: Callable[[], int]) -> float:
+    """Ticks per second of a function returning the number of ticks it processed."""
+    start = time.perf_counter()
+    ticks = fn()
+    return ticks / (time.perf_counter() - start)
+
+
+def main():
+    """Run the tick feed benchmark."""
+    parser = argparse.ArgumentParser(description="Tick feed throughput at 1k and 10k tickers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Universe sizes")
+    parser.add_argument("--ticks", type=int, default=2_000_000, help="Ticks per measurement")
+    parser.add_argument("--naive_ticks", type=int, default=200_000, help="Ticks for the per-tick reference")
+    parser.add_argument("--watchlists", type=int, default=10, help="Extra 50-ticker subscribers")
+    args = parser.parse_args()
+
+    print(f"\nTicks per second ({args.ticks:,} ticks per run)")
+    print(f"  {'tickers':>8} {'pipeline':>12} {'consumer':>12} {f'+{args.watchlists} watchlists':>16} "
+          f"{'per-tick loop':>14} {'speedup':>8}")
+    for size in args.sizes:
+        tickers = [f"T{i:05d}" for i in range(size)]
+        steps = max(1, args.ticks // size)
+
+        parts = feed(tickers)
+        pipeline = rate(lambda: parts["simulator"].run(steps))
+
+        parts = feed(tickers)
+        bus, indicators = parts["bus"], parts["indicators"]
+        batches = [parts["simulator"].step() for _ in range(steps)]
+        consumer = RollingIndicators(bus)
+        consumer_rate = rate(lambda: sum(consumer(batch) or len(batch) for batch in batches))
+
+        parts = feed(tickers, watchlists=args.watchlists)
+        fanout = rate(lambda: parts["simulator"].run(steps))
+
+        naive = naive_rate(batches[:max(1, args.naive_ticks // size)], tickers)
+        print(f"  {size:>8,} {pipeline:>12,.0f} {consumer_rate:>12,.0f} {fanout:>16,.0f} "
+              f"{naive:>14,.0f} {consumer_rate / naive:>7.0f}x")
+
+    # Latest state of a watchlist: read from the feed against recomputing from bars
+    tickers = [f"T{i:05d}" for i in range(1000)]
+    parts = feed(tickers)
+    parts["simulator"].run(100)
+    watchlist = tickers[:50]
+    read = best_of(5, lambda: [parts["indicators"].snapshot(t) for t in watchlist])
+
+    def recompute() -> None:
+        indicator_cache.clear()
+        str(technical_indicators(tickers=watchlist, timeframe="1d", interval="1m",
+                                 indicators=["sma", "ema", "rsi", "bollinger", "vwap"]))
+
+    recomputed = best_of(5, recompute)
+    print(f"\nLatest state of 50 tickers: feed snapshot {read * 1000:.2f}ms, "
+          f"recomputed from a fresh 1d/1m series {recomputed * 1000:.1f}ms ({recomputed / read:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: parallel tool calls and multi-round tool loops in simple_openai.
+
+Drives simple_openai.FinancialAdvisor with a scripted client that asks for
+several slow lookups in one message, follows up with a second round, and then
+answers. Compares running the calls of each message one by one against running
+them on the worker pool, prints the per-round model and tool latency, and shows
+a hung tool being cut off by its timeout while the other results still arrive
+in call order.
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+from aws_strands_poc.financial_advisor import simple_openai
+from aws_strands_poc.financial_advisor.benchmarks.mock_model import MockOpenAIClient
+
+TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "JPM"]
+
+QUOTE_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": "stock_quote",
+        "description": "Look up the latest price of a stock",
+        "parameters": {
+            "type": "object",
+            "properties": {"ticker": {"type": "string", "description": "Stock ticker"}},
+            "required": ["ticker"],
+        },
+    },
+}
+
+
+def script(calls_per_round: int, rounds: int):
+    """Ask for calls_per_round quotes per round for the given number of rounds, then sum them up."""
+
+    def answer(messages: List[Dict[str, Any]]):
+        done = sum(1 for m in messages if isinstance(m, dict) and m.get("role") == "tool") // calls_per_round
+        if done < rounds:
+            return [("stock_quote", {"ticker": TICKERS[(done * calls_per_round + i) % len(TICKERS)]})
+                    for i in range(calls_per_round)]
+        results = [m["content"] for m in messages if isinstance(m, dict) and m.get("role") == "tool"]
+        return "Quotes: " + ", ".join(results[-calls_per_round * rounds:])
+
+    return answer
+
+
+def build(args: argparse.Namespace, parallel: int, quote) -> simple_openai.FinancialAdvisor:
+    """Create an advisor on the scripted client with the quote tool registered."""
+    advisor = simple_openai.FinancialAdvisor(
+        user_id="benchmark", max_parallel_tools=parallel, tool_timeout=args.tool_timeout
+    )
+    advisor.client = MockOpenAIClient(script(args.calls_per_round, args.rounds), args.model_latency)
+    advisor.register_tool(QUOTE_SCHEMA, quote)
+    return advisor
+
+
+def main():
+    """Run the tool rounds benchmark."""
+    parser = argparse.ArgumentParser(description="Sequential vs parallel tool calls in simple_openai")
+    parser.add_argument("--calls_per_round", type=int, default=4, help="Tool calls the model makes per message")
+    parser.add_argument("--rounds", type=int, default=2, help="Tool rounds before the model answers")
+    parser.add_argument("--tool_latency", type=float, default=0.2, help="Seconds each tool call takes")
+    parser.add_argument("--model_latency", type=float, default=0.1, help="Seconds each model call takes")
+    parser.add_argument("--tool_timeout", type=float, default=1.0, help="Per-tool timeout in seconds")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    def quote(ticker: str) -> str:
+        time.sleep(args.tool_latency)
+        return f"{ticker}=${100 + TICKERS.index(ticker) * 10}"
+
+    print(f"\n{args.rounds} rounds x {args.calls_per_round} tool calls of {args.tool_latency * 1000:.0f}ms, "
+          f"model calls of {args.model_latency * 1000:.0f}ms")
+    answers = {}
+    for label, parallel in (("sequential", 1), ("parallel", args.calls_per_round)):
+        advisor = build(args, parallel, quote)
+        start = time.perf_counter()
+        answers[label] = advisor.query("Quote my watchlist")
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<10} {elapsed * 1000:>6.0f}ms  {advisor.round_summary()}")
+        advisor.close()
+    print(f"  same answer in call order: {answers['sequential'] == answers['parallel']}")
+
+    def flaky_quote(ticker: str) -> str:
+        # One ticker hangs well past the timeout
+        time.sleep(args.tool_timeout * 3 if ticker == "MSFT" else args.tool_latency)
+        return f"{ticker}=${100 + TICKERS.index(ticker) * 10}"
+
+    advisor = build(args, args.calls_per_round, flaky_quote)
+    start = time.perf_counter()
+    answer = advisor.query("Quote my watchlist")
+    elapsed = time.perf_counter() - start
+    print(f"\nWith MSFT hanging and a {args.tool_timeout:.1f}s tool timeout: {elapsed * 1000:.0f}ms")
+    for round_stats in advisor.last_turn_rounds:
+        tools = ", ".join(f"{t['name']} {t['ms']:.0f}ms {t['status']}" for t in round_stats["tools"])
+        print(f"  round {round_stats['round']}: model {round_stats['model_ms']:.0f}ms; {tools or 'answer'}")
+    print(f"  answer: {answer}")
+    advisor.close()
+
+
+if __name__ == "__main__":
+    main()
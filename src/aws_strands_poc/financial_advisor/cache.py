@@ -0,0 +1,443 @@
+"""
+Specialist Response Cache - Reuses answers to repeated specialist questions.
+
+Users ask many near-identical questions, and each one re-runs a full specialist
+agent loop. The cache sits in front of the specialist tools and is keyed on the
+normalized query, the specialist, the model name and a hash of the system prompt,
+so changing the prompt or the model never serves a stale answer.
+
+Entries live in a bounded in-memory LRU with per-specialist TTLs, and can
+optionally be written through to an on-disk tier that survives restarts. The
+disk tier is bounded the same way: expired entries are deleted when they are
+read, and the least recently used files go first once it is full. When
+enabled, queries that miss the exact key fall back to the semantic cache, which
+serves answers to paraphrases of earlier questions under the same TTLs, for the
+specialists in SEMANTIC_CACHE_SPECIALISTS only.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from aws_strands_poc.financial_advisor.model_config import model_label
+from aws_strands_poc.financial_advisor.semantic_cache import SemanticCache
+from aws_strands_poc.financial_advisor.streaming import current_stream
+
+logger = logging.getLogger(__name__)
+
+# Seconds an answer stays valid per specialist (0 disables caching).
+# Market answers depend on live prices, so they only live for a minute.
+DEFAULT_TTLS: Dict[str, float] = {
+    "market_analyst": 60,
+    "portfolio_manager": 60 * 60,
+    "compliance_officer": 24 * 60 * 60,
+    "tax_specialist": 24 * 60 * 60,
+}
+
+# Signs stay: "-5% return" and "5% return" are different questions
+_PUNCTUATION_RE = re.compile(r"[^\w\s$%.+-]")
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_STRAY_DOT_RE = re.compile(r"(?<!\d)\.|\.(?!\d)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache entry.
+
+    Lowercases, drops thousands separators and punctuation (keeping $, %, signs
+    and decimal points) and collapses whitespace.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Normalized query text
+    """
+    text = _THOUSANDS_RE.sub("", query.lower())
+    text = _PUNCTUATION_RE.sub(" ", text)
+    text = _STRAY_DOT_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def prompt_hash(system_prompt: str) -> str:
+    """Return a short stable hash of a system prompt."""
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of specialist responses with TTLs and an optional disk tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60 * 60,
+        cache_dir: Optional[Union[str, Path]] = None,
+        normalizer: Callable[[str], str] = normalize_query,
+        max_disk_entries: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of in-memory entries
+            max_bytes: Maximum total size of in-memory responses (UTF-8 bytes)
+            ttls: Per-specialist TTLs in seconds; 0 opts a specialist out
+                (defaults to DEFAULT_TTLS)
+            default_ttl: TTL for specialists missing from ``ttls``
+            cache_dir: Optional directory for the on-disk tier
+            normalizer: Function used to normalize queries before keying
+            max_disk_entries: Maximum number of on-disk entries (defaults to max_entries)
+            max_disk_bytes: Maximum total size of on-disk entry files (defaults to max_bytes)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.normalizer = normalizer
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else max_entries
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else max_bytes
+        self.enabled = True
+
+        # key -> (specialist, expires_at, response)
+        self._entries: "OrderedDict[str, Tuple[str, float, str]]" = OrderedDict()
+        self._bytes = 0
+        # key -> file size of the on-disk entries, least recently used first
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_evictions = 0
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def ttl_for(self, specialist: str) -> float:
+        """Return the TTL in seconds for a specialist (0 means not cached)."""
+        return self.ttls.get(specialist, self.default_ttl)
+
+    def make_key(self, query: str, specialist: str, model: str, system_prompt: str) -> str:
+        """
+        Build the cache key for a specialist call.
+
+        Args:
+            query: Raw query text
+            specialist: Specialist name
+            model: Model name
+            system_prompt: Specialist system prompt
+
+        Returns:
+            Hex digest identifying the call
+        """
+        payload = json.dumps(
+            [self.normalizer(query), specialist, model, prompt_hash(system_prompt)],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, specialist: str) -> Optional[str]:
+        """
+        Look up a response, checking memory first and then the disk tier.
+
+        Args:
+            key: Cache key from make_key
+            specialist: Specialist name (for metrics)
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._counters[specialist]["hits"] += 1
+                    self._counters[specialist]["memory_hits"] += 1
+                    return entry[2]
+                self._remove(key)
+                self._counters[specialist]["expired"] += 1
+
+        disk_entry = self._read_disk(key)
+        if disk_entry is not None and disk_entry["expires_at"] > now:
+            with self._lock:
+                self._insert(key, specialist, disk_entry["expires_at"], disk_entry["response"])
+                self._counters[specialist]["hits"] += 1
+                self._counters[specialist]["disk_hits"] += 1
+            return disk_entry["response"]
+        if disk_entry is not None:
+            self._remove_disk([key])
+            if entry is None:
+                with self._lock:
+                    self._counters[specialist]["expired"] += 1
+
+        with self._lock:
+            self._counters[specialist]["misses"] += 1
+        return None
+
+    def put(self, key: str, specialist: str, response: str) -> None:
+        """
+        Store a response for its specialist's TTL.
+
+        Args:
+            key: Cache key from make_key
+            specialist: Specialist name
+            response: Response text to cache
+        """
+        ttl = self.ttl_for(specialist)
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._insert(key, specialist, expires_at, response)
+            self._counters[specialist]["stores"] += 1
+        self._write_disk(key, specialist, expires_at, response)
+
+    def _insert(self, key: str, specialist: str, expires_at: float, response: str) -> None:
+        # Caller holds the lock
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (specialist, expires_at, response)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            evicted_key, (evicted_specialist, _, _) = next(iter(self._entries.items()))
+            self._remove(evicted_key)
+            self._counters[evicted_specialist]["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock
+        _, _, response = self._entries.pop(key)
+        self._bytes -= len(response.encode("utf-8"))
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_disk_index(self) -> None:
+        """Index the entries already on disk, least recently used (oldest mtime) first."""
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        with self._lock:
+            for _, key, size in sorted(files):
+                self._disk_index[key] = size
+                self._disk_bytes += size
+            evicted = self._over_disk_limits()
+        self._remove_disk(evicted, evictions=True)
+
+    def _over_disk_limits(self) -> List[str]:
+        # Caller holds the lock; pops the least recently used entries beyond the limits
+        evicted = []
+        while self._disk_index and (
+            len(self._disk_index) > self.max_disk_entries or self._disk_bytes > self.max_disk_bytes
+        ):
+            key, size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_disk(self, keys: List[str], evictions: bool = False) -> None:
+        """Delete on-disk entries."""
+        with self._lock:
+            for key in keys:
+                self._disk_bytes -= self._disk_index.pop(key, 0)
+            if evictions:
+                self._disk_evictions += len(keys)
+        for key in keys:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {str(e)}")
+            return None
+        # The file's mtime records its last use, so the LRU order survives restarts
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._disk_index:
+                self._disk_index.move_to_end(key)
+        return entry
+
+    def _write_disk(self, key: str, specialist: str, expires_at: float, response: str) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"specialist": specialist, "expires_at": expires_at, "response": response}, f)
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {path.name}: {str(e)}")
+            return
+        with self._lock:
+            self._disk_bytes += size - self._disk_index.pop(key, 0)
+            self._disk_index[key] = size
+            evicted = self._over_disk_limits()
+        self._remove_disk(evicted, evictions=True)
+
+    def clear(self, include_disk: bool = False) -> None:
+        """
+        Drop all in-memory entries and reset the metrics.
+
+        Args:
+            include_disk: Also delete the on-disk tier
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._counters.clear()
+        if include_disk and self.cache_dir:
+            with self._lock:
+                self._disk_index.clear()
+                self._disk_bytes = 0
+                self._disk_evictions = 0
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with overall and per-specialist hit rates, sizes and eviction counts
+        """
+        with self._lock:
+            per_specialist = {}
+            totals: Counter = Counter()
+            for specialist, counts in self._counters.items():
+                lookups = counts["hits"] + counts["misses"]
+                per_specialist[specialist] = {
+                    **counts,
+                    "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+                }
+                totals.update(counts)
+            lookups = totals["hits"] + totals["misses"]
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": totals["hits"],
+                "misses": totals["misses"],
+                "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+                "evictions": totals["evictions"],
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+                "disk_evictions": self._disk_evictions,
+                "per_specialist": per_specialist,
+            }
+
+
+# Process-wide cache shared by all specialist tools.
+# Set SPECIALIST_CACHE_DIR to enable the on-disk tier.
+response_cache = ResponseCache(cache_dir=os.environ.get("SPECIALIST_CACHE_DIR") or None)
+
+# Specialists whose answers may be reused for a paraphrased question. Tax and
+# compliance answers hinge on exact figures and legal details, so a near match
+# must never stand in for them.
+SEMANTIC_CACHE_SPECIALISTS = ("market_analyst", "portfolio_manager")
+
+# Process-wide paraphrase cache behind the exact-match one; off unless opted into.
+# Set SEMANTIC_CACHE=1 to enable it, SEMANTIC_CACHE_SPECIALISTS (comma-separated)
+# to change which specialists use it, SEMANTIC_CACHE_PATH to persist it and
+# SEMANTIC_CACHE_THRESHOLD to tune it.
+semantic_cache = SemanticCache(
+    threshold=float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.7")),
+    ttls=DEFAULT_TTLS,
+    path=os.environ.get("SEMANTIC_CACHE_PATH") or None,
+    specialists=[
+        name.strip()
+        for name in os.environ.get("SEMANTIC_CACHE_SPECIALISTS", ",".join(SEMANTIC_CACHE_SPECIALISTS)).split(",")
+        if name.strip()
+    ],
+)
+semantic_cache.enabled = os.environ.get("SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def cached_specialist(
+    specialist: str,
+    system_prompt: str,
+    cache: Optional[ResponseCache] = None,
+    semantic: Optional[SemanticCache] = None,
+) -> Callable[[Callable[[str], str]], Callable[[str], str]]:
+    """
+    Decorate a specialist function so repeated queries are served from the cache.
+
+    Apply it below ``@tool`` so the tool keeps the specialist's name, signature
+    and docstring. The model configuration (MODEL, or the MODEL_CASCADE tiers) is
+    read at call time, matching the specialist itself. Exact misses are looked up in the
+    semantic cache before the specialist runs.
+
+    Args:
+        specialist: Specialist name used in the key, TTL lookup and metrics
+        system_prompt: Specialist system prompt, hashed into the key
+        cache: Cache to use (defaults to the shared response_cache)
+        semantic: Semantic cache to use (defaults to the shared semantic_cache)
+
+    Returns:
+        Decorator wrapping a ``(query) -> str`` specialist function
+    """
+
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        @functools.wraps(func)
+        def wrapper(query: str) -> str:
+            active_cache = cache or response_cache
+            active_semantic = semantic if semantic is not None else semantic_cache
+            if not active_cache.enabled or active_cache.ttl_for(specialist) <= 0:
+                return func(query)
+
+            model_name = model_label()
+            key = active_cache.make_key(query, specialist, model_name, system_prompt)
+            namespace = f"{specialist}:{model_name}:{prompt_hash(system_prompt)}"
+            cached = active_cache.get(key, specialist)
+            if cached is not None:
+                logger.info(f"Cache hit for {specialist}")
+            elif active_semantic.enabled:
+                match = active_semantic.get(query, namespace, specialist)
+                if match is not None:
+                    logger.info(f"Semantic cache hit for {specialist} (similarity {match.similarity:.2f})")
+                    cached = match.response
+            if cached is not None:
+                stream = current_stream()
+                if stream is not None:
+                    stream.emit(specialist, cached)
+                return cached
+
+            response = func(query)
+            active_cache.put(key, specialist, response)
+            if active_semantic.enabled:
+                active_semantic.put(query, namespace, specialist, response)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,174 @@
+"""
+Single-Flight Coalescing - Shares one upstream call among identical concurrent requests.
+
+When many users ask the same question at the same moment, every request would
+otherwise run its own specialist chain or model call. With single-flight, the
+first request for a key runs the call while later identical requests wait and
+receive the same result (or exception). Nothing is kept once the call returns;
+longer-lived reuse is the response cache's job.
+"""
+
+import functools
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from aws_strands_poc.financial_advisor.cache import normalize_query
+from aws_strands_poc.financial_advisor.model_config import model_label
+from aws_strands_poc.financial_advisor.streaming import current_stream
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call and the requests waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe group of in-flight calls keyed by request."""
+
+    def __init__(self, name: str = "default"):
+        """
+        Initialize the group.
+
+        Args:
+            name: Name used in logs and metrics
+        """
+        self.name = name
+        self.enabled = True
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset the metrics."""
+        self.requests = 0
+        self.executions = 0
+        self.collapsed = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        Run fn unless an identical call is already in flight, in which case wait for it.
+
+        Args:
+            key: Key identifying identical requests
+            fn: Function making the upstream call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Tuple of the result and whether it was shared from another request's call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"Single-flight {self.name}: shared one call with {call.waiters} waiting requests")
+        return call.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report coalescing activity.
+
+        Returns:
+            Dictionary with request, execution and collapsed-call counts, the
+            collapse rate and the calls currently in flight
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "collapse_rate": self.collapsed / self.requests if self.requests else 0.0,
+                "errors": self.errors,
+                "max_waiters": self.max_waiters,
+                "in_flight": len(self._calls),
+            }
+
+
+# Process-wide groups shared by all specialist tools and all OpenAIDirectModel instances
+specialist_flight = SingleFlight("specialists")
+model_flight = SingleFlight("openai_generate")
+
+
+def coalesced_specialist(
+    specialist: str,
+    normalizer: Callable[[str], str] = normalize_query,
+    flight: Optional[SingleFlight] = None,
+) -> Callable[[Callable[[str], str]], Callable[[str], str]]:
+    """
+    Decorate a specialist function so identical concurrent queries share one run.
+
+    Apply it between ``@tool`` and ``@cached_specialist`` so that concurrent
+    cache misses for the same question collapse into one specialist run, which
+    then fills the cache. The key combines the specialist, the model configuration
+    (MODEL, or the MODEL_CASCADE tiers) and the normalized query.
+
+    Args:
+        specialist: Specialist name used in the key
+        normalizer: Function used to normalize queries before keying
+        flight: Single-flight group to use (defaults to the shared specialist_flight)
+
+    Returns:
+        Decorator wrapping a ``(query) -> str`` specialist function
+    """
+
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        @functools.wraps(func)
+        def wrapper(query: str) -> str:
+            active_flight = flight or specialist_flight
+            if not active_flight.enabled:
+                return func(query)
+
+            key = (specialist, model_label(), normalizer(query))
+            response, shared = active_flight.do(key, func, query)
+            if shared:
+                logger.info(f"Coalesced {specialist} query with an identical in-flight request")
+                # The leader's tokens went to its own stream; forward the finished answer to ours
+                stream = current_stream()
+                if stream is not None:
+                    stream.emit(specialist, response)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,147 @@
+"""
+Specialist Dispatch - Runs independent specialist calls concurrently.
+
+When the orchestrator asks several specialists for help in one turn, their tool
+calls are independent and can run at the same time. The executor here runs them
+on a bounded thread pool and hands the results back in the order the calls were
+issued, so the merged tool results are identical to sequential dispatch.
+"""
+
+import concurrent.futures
+import contextvars
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from strands import Agent
+from strands.types.event_loop import ParallelToolExecutorInterface
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL_SPECIALISTS = 4
+
+
+class OrderedToolExecutor(ParallelToolExecutorInterface):
+    """
+    Bounded thread pool that yields tool futures in submission order.
+
+    Implements the Strands ParallelToolExecutorInterface. Strands appends tool
+    results in the order ``as_completed`` yields them; yielding in submission
+    order keeps the merged results deterministic while the calls still overlap.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_PARALLEL_SPECIALISTS, timeout: int = 900):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Maximum number of tool calls running at the same time
+            timeout: Default timeout in seconds for waiting on a tool call
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="specialist")
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Schedule a tool call on the pool, carrying over the caller's context (e.g. the active token stream)."""
+        context = contextvars.copy_context()
+        return self.thread_pool.submit(context.run, fn, *args, **kwargs)
+
+    def as_completed(self, futures: Iterable[Future], timeout: Optional[int] = None) -> Iterator[Future]:
+        """
+        Yield the given futures in submission order once each has finished.
+
+        Args:
+            futures: Futures returned by submit, in submission order
+            timeout: Maximum number of seconds to wait for all futures (None for no limit)
+
+        Raises:
+            concurrent.futures.TimeoutError: If the timeout is reached
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for future in list(futures):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            concurrent.futures.wait([future], timeout=remaining)
+            if not future.done():
+                raise concurrent.futures.TimeoutError()
+            yield future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying thread pool."""
+        self.thread_pool.shutdown(wait=wait)
+
+
+def enable_parallel_dispatch(agent: Agent, max_workers: int = DEFAULT_MAX_PARALLEL_SPECIALISTS) -> Agent:
+    """
+    Make an agent run the tool calls of one turn concurrently, merged in call order.
+
+    Args:
+        agent: Strands agent whose tool calls should be dispatched in parallel
+        max_workers: Maximum number of tool calls running at the same time
+
+    Returns:
+        The same agent, for chaining
+    """
+    previous = agent.thread_pool_wrapper
+    agent.thread_pool_wrapper = OrderedToolExecutor(max_workers=max_workers)
+    if previous is not None and hasattr(previous, "shutdown"):
+        previous.shutdown(wait=False)
+    logger.info(f"Parallel specialist dispatch enabled with {max_workers} workers")
+    return agent
+
+
+def dispatch_specialists(
+    calls: List[Tuple[Callable[[str], str], str]],
+    parallel: bool = True,
+    max_workers: int = DEFAULT_MAX_PARALLEL_SPECIALISTS,
+) -> List[str]:
+    """
+    Run several specialist tools directly and return their answers in call order.
+
+    Args:
+        calls: List of (specialist tool, query) pairs
+        parallel: Run the calls concurrently on a bounded thread pool
+        max_workers: Maximum number of specialists running at the same time
+
+    Returns:
+        List of specialist responses, in the same order as ``calls``
+    """
+    if not parallel or len(calls) <= 1:
+        return [specialist(query) for specialist, query in calls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls)), thread_name_prefix="specialist") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, specialist, query) for specialist, query in calls]
+        return [future.result() for future in futures]
+
+
+def compare_dispatch_modes(
+    calls: List[Tuple[Callable[[str], str], str]],
+    max_workers: int = DEFAULT_MAX_PARALLEL_SPECIALISTS,
+) -> Dict[str, float]:
+    """
+    Measure wall-clock time of sequential versus parallel dispatch for the same calls.
+
+    Args:
+        calls: List of (specialist tool, query) pairs
+        max_workers: Maximum number of specialists running at the same time
+
+    Returns:
+        Dictionary with sequential and parallel timings in seconds and the speedup
+    """
+    start = time.perf_counter()
+    sequential_results = dispatch_specialists(calls, parallel=False)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_results = dispatch_specialists(calls, parallel=True, max_workers=max_workers)
+    parallel = time.perf_counter() - start
+
+    if sequential_results != parallel_results:
+        logger.warning("Sequential and parallel dispatch returned different results")
+
+    return {
+        "sequential_s": round(sequential, 4),
+        "parallel_s": round(parallel, 4),
+        "speedup": round(sequential / parallel, 2) if parallel > 0 else 0.0,
+    }
@@ -0,0 +1,273 @@
+"""
+Conversation History - Token-bounded chat history for OpenAI chat completions.
+
+The whole history is re-sent on every request, so an unbounded list makes each
+turn slower and more expensive than the last until it overflows the context
+window. ConversationHistory keeps the system prompt, a summary of older turns
+and a rolling window of recent turns within a token budget.
+
+History is compacted a whole turn at a time (a user message and every message
+that answers it), so an assistant tool call is never separated from its tool
+results. Tokens are counted locally with tiktoken when it is installed, and
+estimated from the text length otherwise.
+"""
+
+import logging
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Tokens OpenAI adds around every message for the role and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+Summarizer = Callable[[List[Dict[str, Any]], str], str]
+
+
+def _encoding(model: str) -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use when tiktoken is available
+
+    Returns:
+        Exact token count with tiktoken, otherwise an estimate of one token per four characters
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def as_message_dict(message: Any) -> Dict[str, Any]:
+    """Convert an OpenAI SDK message object to a plain message dictionary."""
+    if isinstance(message, dict):
+        return message
+    return message.model_dump(exclude_none=True)
+
+
+def message_tokens(message: Dict[str, Any], model: str = "gpt-4o-mini") -> int:
+    """
+    Count the prompt tokens a message costs, including tool calls.
+
+    Args:
+        message: Message in OpenAI format
+        model: Model whose tokenizer to use when tiktoken is available
+
+    Returns:
+        Token count of the message
+    """
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "", model)
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function", {})
+        tokens += count_tokens(function.get("name", ""), model) + count_tokens(function.get("arguments", ""), model)
+    return tokens
+
+
+def extractive_summary(turns: List[Dict[str, Any]], previous_summary: str) -> str:
+    """
+    Summarize evicted messages locally by keeping the gist of each exchange.
+
+    Args:
+        turns: Messages being dropped from the window, oldest first
+        previous_summary: The existing summary text (may be empty)
+
+    Returns:
+        The updated summary text
+    """
+    lines = [previous_summary] if previous_summary else []
+    for message in turns:
+        role = message.get("role")
+        content = (message.get("content") or "").strip().replace("\n", " ")
+        if role == "user" and content:
+            lines.append(f"- User asked: {content[:200]}")
+        elif role == "assistant" and content:
+            lines.append(f"  Advisor answered: {content[:300]}")
+        elif role == "tool" and content:
+            lines.append(f"  Tool result: {content[:100]}")
+    return "\n".join(lines)
+
+
+class ConversationHistory:
+    """List-like chat history that stays within a prompt token budget."""
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_tokens: int = 4000,
+        summary_max_tokens: Optional[int] = None,
+        model: str = "gpt-4o-mini",
+        summarizer: Summarizer = extractive_summary,
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            system_prompt: System prompt, always sent first
+            max_tokens: Token budget for the whole prompt (system prompt, summary and window).
+                The latest turn is always kept, even if it alone exceeds the budget
+            summary_max_tokens: Token budget for the summary of older turns
+                (defaults to a quarter of max_tokens); the oldest summary lines go first
+            model: Model whose tokenizer to use when tiktoken is available
+            summarizer: Function folding evicted messages into the summary text
+        """
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens if summary_max_tokens is not None else max_tokens // 4
+        self.model = model
+        self.summarizer = summarizer
+
+        self.system_message = {"role": "system", "content": system_prompt}
+        self._system_tokens = message_tokens(self.system_message, model)
+        self.summary = ""
+        self._turns: List[List[Dict[str, Any]]] = []
+        self._summary_tokens = 0
+        self._window_tokens = 0
+
+        # Tokens the prompt would have without compaction, for savings reports
+        self._uncompacted_tokens = self._system_tokens
+        self.compactions = 0
+        self.evicted_messages = 0
+        self.last_prompt: Dict[str, int] = {}
+
+    def append(self, message: Any) -> None:
+        """
+        Add a message; a user message starts a new turn.
+
+        Args:
+            message: Message dictionary or OpenAI SDK message object
+        """
+        message = as_message_dict(message)
+        if message.get("role") == "user" or not self._turns:
+            self._turns.append([])
+        self._turns[-1].append(message)
+        tokens = message_tokens(message, self.model)
+        self._window_tokens += tokens
+        self._uncompacted_tokens += tokens
+
+    def extend(self, messages: List[Any]) -> None:
+        """Add several messages in order."""
+        for message in messages:
+            self.append(message)
+
+    def discard_turn(self) -> int:
+        """
+        Remove the latest turn, e.g. one that ended before the model answered.
+
+        Compaction always keeps the latest turn, so this is the turn started by
+        the last user message even if older turns were summarized meanwhile.
+
+        Returns:
+            Number of messages removed
+        """
+        if not self._turns:
+            return 0
+        turn = self._turns.pop()
+        tokens = sum(message_tokens(message, self.model) for message in turn)
+        self._window_tokens -= tokens
+        self._uncompacted_tokens -= tokens
+        return len(turn)
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """Return the messages currently held, without compacting."""
+        prefix = [self.system_message]
+        if self.summary:
+            prefix.append({"role": "system", "content": f"{SUMMARY_PREFIX}\n{self.summary}"})
+        return prefix + [message for turn in self._turns for message in turn]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.messages())
+
+    def __len__(self) -> int:
+        return len(self.messages())
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.messages()[index]
+
+    def prompt_tokens(self) -> int:
+        """Return the token count of the messages currently held."""
+        return self._system_tokens + self._summary_tokens + self._window_tokens
+
+    def prompt_messages(self) -> List[Dict[str, Any]]:
+        """
+        Compact the history to the token budget and return the messages to send.
+
+        Also records the sent and uncompacted token counts in ``last_prompt``.
+
+        Returns:
+            Messages in OpenAI format
+        """
+        self.compact()
+        sent = self.prompt_tokens()
+        self.last_prompt = {
+            "sent_tokens": sent,
+            "uncompacted_tokens": self._uncompacted_tokens,
+            "saved_tokens": max(0, self._uncompacted_tokens - sent),
+        }
+        return self.messages()
+
+    def compact(self) -> int:
+        """
+        Move the oldest turns into the summary until the prompt fits the budget.
+
+        Returns:
+            Number of messages evicted from the window
+        """
+        evicted: List[Dict[str, Any]] = []
+        while len(self._turns) > 1 and self.prompt_tokens() > self.max_tokens:
+            turn = self._turns.pop(0)
+            self._window_tokens -= sum(message_tokens(message, self.model) for message in turn)
+            evicted.extend(turn)
+            # Re-summarize as we go so the summary's own size counts against the budget
+            self._set_summary(self.summarizer(turn, self.summary))
+
+        if evicted:
+            self.compactions += 1
+            self.evicted_messages += len(evicted)
+            logger.info(f"Compacted {len(evicted)} messages into the conversation summary")
+        return len(evicted)
+
+    def _set_summary(self, summary: str) -> None:
+        """Store the summary, dropping its oldest lines beyond the summary budget."""
+        lines = summary.split("\n")
+        while len(lines) > 1 and count_tokens("\n".join(lines), self.model) > self.summary_max_tokens:
+            lines.pop(0)
+        self.summary = "\n".join(lines)
+        summary_message = {"role": "system", "content": f"{SUMMARY_PREFIX}\n{self.summary}"}
+        self._summary_tokens = message_tokens(summary_message, self.model) if self.summary else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report history size and compaction activity.
+
+        Returns:
+            Dictionary with message and turn counts, token counts and compaction totals
+        """
+        return {
+            "turns": len(self._turns),
+            "messages": len(self.messages()),
+            "prompt_tokens": self.prompt_tokens(),
+            "uncompacted_tokens": self._uncompacted_tokens,
+            "summary_tokens": self._summary_tokens,
+            "compactions": self.compactions,
+            "evicted_messages": self.evicted_messages,
+        }
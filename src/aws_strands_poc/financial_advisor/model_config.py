@@ -0,0 +1,39 @@
+"""
+Model Configuration - The specialist model settings read from the environment.
+
+Specialists build their agents from the MODEL environment variable, or from the
+MODEL_CASCADE tiers when a cascade is configured. Everything that keys on "the
+model a specialist runs with" (the agent pool, the response cache and
+single-flight coalescing) uses model_label so that a cascade and a single model
+never share agents or answers. This module only reads the environment, so it
+can be imported from anywhere without pulling in the model providers.
+"""
+
+import os
+from typing import List, Optional, Sequence
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def cascade_from_env() -> Optional[List[str]]:
+    """Return the tiers listed in MODEL_CASCADE (e.g. "gpt-4o-mini,gpt-4o"), or None."""
+    tiers = [tier.strip() for tier in os.environ.get("MODEL_CASCADE", "").split(",") if tier.strip()]
+    return tiers or None
+
+
+def model_label(model: Optional[str] = None, cascade: Optional[Sequence[str]] = None) -> str:
+    """
+    Describe the model configuration an agent built now would answer with.
+
+    Args:
+        model: Model name (defaults to the MODEL environment variable or gpt-4o-mini)
+        cascade: Cascade tiers (defaults to MODEL_CASCADE); when set, model is ignored,
+            as in create_openai_agent
+
+    Returns:
+        The model name, or "cascade:" followed by the comma-separated tiers
+    """
+    tiers = cascade or cascade_from_env()
+    if tiers:
+        return "cascade:" + ",".join(tiers)
+    return model or os.environ.get("MODEL", DEFAULT_MODEL)
@@ -0,0 +1,237 @@
+"""
+Async direct OpenAI model.
+
+Async counterpart of OpenAIDirectModel built on AsyncOpenAI, so many in-flight
+conversations can wait on the model from one event loop instead of one blocked
+thread each. Requests go through the running loop's shared client from
+client_registry, the rate-limit scheduler's async path and, when one is
+active, the cassette.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+from strands.types.content import Message, Messages
+from strands.types.tools import ToolSpec
+
+from aws_strands_poc.financial_advisor.models.cassette import AsyncCassetteClient
+from aws_strands_poc.financial_advisor.models.client_registry import client_registry
+from aws_strands_poc.financial_advisor.models.openai_model import _STOP_REASONS, OpenAIDirectModel
+from aws_strands_poc.financial_advisor.models.scheduler import current_lane
+from aws_strands_poc.financial_advisor.streaming import ToolCallAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOpenAIDirectModel(OpenAIDirectModel):
+    """
+    OpenAIDirectModel whose requests are coroutines on AsyncOpenAI.
+
+    Strands 0.1 has no async model interface, so this model is driven directly
+    (see FinancialAdvisor.aquery) rather than through an Agent: ``acomplete``
+    runs one assistant turn and ``generate`` is a coroutine. Request formatting,
+    message conversion and token estimates are shared with OpenAIDirectModel.
+    An httpx.AsyncClient belongs to the event loop it was created on, so the
+    client is looked up per loop at request time rather than at construction.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", client: Optional[AsyncOpenAI] = None, **kwargs: Any) -> None:
+        """
+        Initialize the AsyncOpenAIDirectModel.
+
+        Args:
+            model: OpenAI model name
+            client: Optional pre-built AsyncOpenAI-compatible client (defaults to the
+                running loop's shared client from client_registry)
+            **kwargs: Any other OpenAIDirectModel argument; coalescing does not apply
+        """
+        self._api_key: Optional[str] = None
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        super().__init__(model=model, client=client, **kwargs)
+
+    def _shared_client(self, api_key: str) -> None:
+        # Resolved per event loop in _loop_client
+        self._api_key = api_key
+        return None
+
+    def _init_api_client(self) -> None:
+        # The cassette and scheduler options are applied per event loop in _loop_client
+        self._api_client = self.client
+
+    def _loop_client(self) -> Any:
+        """Return the client for the running event loop, wrapped for the cassette and scheduler."""
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = self.client
+            if client is None and self._api_key is not None:
+                client = client_registry.get_async_client(self._api_key)
+            if self.cassette is not None:
+                client = AsyncCassetteClient(self.cassette, client)
+            if self.scheduler is not None and hasattr(client, "with_options"):
+                client = client.with_options(max_retries=0)
+            self._loop_clients[loop] = client
+        return client
+
+    async def _acreate(self, request: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Send a chat completions request, through the scheduler's async path when one is set.
+
+        Args:
+            request: Keyword arguments for ``client.chat.completions.create``
+
+        Returns:
+            Tuple of the API response and the tokens charged to the scheduler
+        """
+        client = self._loop_client()
+        if self.scheduler is None:
+            return await client.chat.completions.create(**request), 0
+
+        estimate = self.converter.count_tokens(request["messages"], self.model)
+        estimate += request.get("max_tokens") or 0
+        lane = self.priority or current_lane()
+        response = await self.scheduler.arun(
+            lambda: client.chat.completions.create(**request), tokens=estimate, lane=lane
+        )
+        return response, estimate
+
+    async def _astream(
+        self, request: Dict[str, Any], on_text: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, List[Dict[str, Any]], Optional[str], Any, Optional[float]]:
+        """
+        Send a streaming request and assemble the answer.
+
+        Args:
+            request: Streaming request from format_request
+            on_text: Optional function called with each text delta
+
+        Returns:
+            Tuple of the text, the tool calls in OpenAI format, the finish reason,
+            the usage and the time of the first token (perf_counter)
+        """
+        response, estimate = await self._acreate(request)
+        parts: List[str] = []
+        tool_calls = ToolCallAccumulator()
+        finish_reason = None
+        usage = None
+        first_token_at = None
+        async for chunk in response:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if (choice.delta.content or choice.delta.tool_calls) and first_token_at is None:
+                first_token_at = time.perf_counter()
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                if on_text is not None:
+                    on_text(choice.delta.content)
+            for tool_delta in choice.delta.tool_calls or []:
+                tool_calls.add(tool_delta)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        self._record_usage(estimate, usage)
+        return "".join(parts), tool_calls.tool_calls(), finish_reason, usage, first_token_at
+
+    async def acomplete(
+        self,
+        messages: Messages,
+        tool_specs: Optional[List[ToolSpec]] = None,
+        system_prompt: Optional[str] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Message, str, Dict[str, int]]:
+        """
+        Run one assistant turn, streaming its text as it arrives.
+
+        Args:
+            messages: Conversation in Strands format
+            tool_specs: Tools to make available to the model
+            system_prompt: System prompt for the model
+            on_text: Optional function called with each text delta
+
+        Returns:
+            Tuple of the assistant message in Strands format (text and toolUse
+            blocks), the Strands stop reason and the token usage
+
+        Raises:
+            openai.RateLimitError: If OpenAI still rejects the request once the
+                scheduler's (or, without a scheduler, the SDK's) retries are exhausted
+        """
+        request = self.format_request(messages, tool_specs, system_prompt)
+        text, tool_calls, finish_reason, usage, _ = await self._astream(request, on_text)
+
+        content: List[Dict[str, Any]] = []
+        if text:
+            content.append({"text": text})
+        for call in tool_calls:
+            try:
+                tool_input = json.loads(call["function"]["arguments"] or "{}")
+            except ValueError:
+                # Strands treats unparsable arguments the same way
+                tool_input = {}
+            content.append({
+                "toolUse": {"toolUseId": call["id"], "name": call["function"]["name"], "input": tool_input}
+            })
+        return {"role": "assistant", "content": content}, _STOP_REASONS.get(finish_reason, "end_turn"), {
+            "inputTokens": getattr(usage, "prompt_tokens", 0),
+            "outputTokens": getattr(usage, "completion_tokens", 0),
+            "totalTokens": getattr(usage, "total_tokens", 0),
+        }
+
+    async def generate(
+        self,
+        messages: Messages,
+        stop: Optional[List[str]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs: Any,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Generate text from the OpenAI model.
+
+        Args:
+            messages: List of message dictionaries
+            stop: Optional list of stop sequences
+            on_token: Optional function called with each text delta
+            **kwargs: Additional parameters for the OpenAI API
+
+        Returns:
+            Tuple containing the generated text and metadata (tool calls, finish
+            reason, usage, time-to-first-token and total latency)
+        """
+        merged_kwargs = {**self.kwargs, **kwargs}
+        if stop:
+            merged_kwargs["stop"] = stop
+        start = time.perf_counter()
+        try:
+            text, tool_calls, finish_reason, usage, first_token_at = await self._astream({
+                "model": self.model,
+                "messages": self.converter.convert(messages),
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+                **merged_kwargs,
+            }, on_token)
+        except Exception as e:
+            # Handle potential API errors like the sync generate
+            error_msg = f"OpenAI API error: {str(e)}"
+            print(f"Error generating text: {error_msg}")
+            return error_msg, {"error": str(e)}
+        return text, {
+            "model": self.model,
+            "tool_calls": tool_calls,
+            "finish_reason": finish_reason,
+            "usage": usage,
+            "ttft_ms": (first_token_at - start) * 1000 if first_token_at is not None else None,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+        }
+
+    def stream(self, request: Dict[str, Any]) -> Any:
+        """Not available: this model has no blocking interface; use acomplete."""
+        raise NotImplementedError("AsyncOpenAIDirectModel is async only; use acomplete or generate")
@@ -0,0 +1,411 @@
+"""
+Model Cascade - Try a cheap model first and escalate only when its answer fails checks.
+
+Most specialist turns are easy: pick a tool, or summarize a tool result. A small
+model handles them at a fraction of the cost and latency of a large one. The
+cascade sends each turn to the cheapest tier, buffers its response, and runs a
+list of checks over it: the tool calls must name offered tools with valid JSON
+arguments, the answer must not be a refusal or cut off, and the model's
+self-reported confidence must clear a minimum. The first tier whose answer passes
+is used; the last tier is streamed straight through without checks.
+
+Every tier's latency, token usage, cost and escalation reasons are recorded in a
+CascadeMetrics object, shared process-wide as ``cascade_metrics``.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
+
+logger = logging.getLogger(__name__)
+
+# USD per million (input, output) tokens
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+}
+
+DEFAULT_TIERS = ("gpt-4o-mini", "gpt-4o")
+
+CONFIDENCE_INSTRUCTION = (
+    "\n\nWhen you give your final answer (not when calling a tool), end it with a separate last line "
+    "of the form 'Confidence: <number from 0 to 1>' rating how sure you are that the answer is "
+    "correct and complete."
+)
+
+_CONFIDENCE_RE = re.compile(r"\n?[ \t*_]*confidence[ \t*_]*:[ \t*_]*([01](?:\.\d+)?|\.\d+)[ \t*_%]*\s*$", re.IGNORECASE)
+_REFUSAL_RE = re.compile(
+    r"\b(?:i(?:'m| am) (?:sorry|unable|not able)|i can(?:no|')t (?:help|assist|provide|answer)|"
+    r"i(?: do not|'m not| am not| don't) (?:have access|able)|as an ai\b|unable to (?:help|assist|provide))",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CascadeOutcome:
+    """A buffered tier response, as seen by the checks."""
+
+    model: str
+    text: str
+    tool_calls: List[Tuple[str, str]] = field(default_factory=list)
+    finish_reason: Optional[str] = None
+    confidence: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+
+
+# A check returns a short failure reason, or None when the outcome is acceptable
+CascadeCheck = Callable[[CascadeOutcome, Dict[str, Any]], Optional[str]]
+
+
+def check_tool_calls(outcome: CascadeOutcome, request: Dict[str, Any]) -> Optional[str]:
+    """Fail tool calls to unknown tools, with unparsable arguments or missing required arguments."""
+    tools = {tool["function"]["name"]: tool["function"].get("parameters") or {} for tool in request.get("tools") or []}
+    for name, arguments in outcome.tool_calls:
+        if name not in tools:
+            return "unknown_tool"
+        try:
+            parsed = json.loads(arguments or "{}")
+        except json.JSONDecodeError:
+            return "invalid_tool_arguments"
+        if not isinstance(parsed, dict):
+            return "invalid_tool_arguments"
+        if any(required not in parsed for required in tools[name].get("required", [])):
+            return "missing_tool_arguments"
+    return None
+
+
+def check_refusal(outcome: CascadeOutcome, request: Dict[str, Any]) -> Optional[str]:
+    """Fail empty answers and answers that open with a refusal."""
+    if not outcome.tool_calls and not outcome.text.strip():
+        return "empty"
+    if _REFUSAL_RE.search(outcome.text[:300]):
+        return "refusal"
+    return None
+
+
+def check_truncation(outcome: CascadeOutcome, request: Dict[str, Any]) -> Optional[str]:
+    """Fail answers cut off by the token limit or the content filter."""
+    if outcome.finish_reason in ("length", "content_filter"):
+        return "truncated"
+    return None
+
+
+def confidence_check(min_confidence: float = 0.7, require: bool = False) -> CascadeCheck:
+    """
+    Build a check on the model's self-reported confidence.
+
+    Args:
+        min_confidence: Lowest acceptable confidence
+        require: Fail final answers that report no confidence at all
+
+    Returns:
+        A check that only applies to final answers, not tool calls
+    """
+
+    def check(outcome: CascadeOutcome, request: Dict[str, Any]) -> Optional[str]:
+        if outcome.tool_calls:
+            return None
+        if outcome.confidence is None:
+            return "no_confidence" if require else None
+        return "low_confidence" if outcome.confidence < min_confidence else None
+
+    return check
+
+
+DEFAULT_CHECKS: List[CascadeCheck] = [check_truncation, check_tool_calls, check_refusal, confidence_check()]
+
+
+def split_confidence(text: str) -> Tuple[str, Optional[float]]:
+    """
+    Remove a trailing "Confidence: 0.8" line from an answer.
+
+    Args:
+        text: Answer text
+
+    Returns:
+        Tuple of the answer without the line and the confidence, or the text and None
+    """
+    match = _CONFIDENCE_RE.search(text)
+    if not match:
+        return text, None
+    return text[: match.start()].rstrip(), min(float(match.group(1)), 1.0)
+
+
+def model_cost(model: str, input_tokens: int, output_tokens: int,
+               prices: Optional[Dict[str, Tuple[float, float]]] = None) -> float:
+    """Return the USD cost of a request (0 for models without a known price)."""
+    input_price, output_price = (prices or MODEL_PRICES).get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1e6
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class CascadeMetrics:
+    """Thread-safe per-tier counters for cascaded requests."""
+
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the metrics.
+
+        Args:
+            prices: USD per million (input, output) tokens by model (defaults to MODEL_PRICES)
+        """
+        self.prices = prices or MODEL_PRICES
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._costs: Dict[str, float] = defaultdict(float)
+        self._reasons: Dict[str, Counter] = defaultdict(Counter)
+        self._turns = 0
+        self._top_tier_cost = 0.0
+
+    def record(self, tier: str, outcome: Optional[CascadeOutcome], result: str,
+               reason: Optional[str] = None) -> None:
+        """
+        Record one tier attempt.
+
+        Args:
+            tier: Model name of the tier
+            outcome: The tier's response (None when the request failed)
+            result: "accepted", "escalated" or "final"
+            reason: Why the tier escalated
+        """
+        with self._lock:
+            counts = self._counters[tier]
+            counts["requests"] += 1
+            counts[result] += 1
+            if reason:
+                self._reasons[tier][reason] += 1
+            if outcome is not None:
+                counts["input_tokens"] += outcome.input_tokens
+                counts["output_tokens"] += outcome.output_tokens
+                self._latencies[tier].append(outcome.latency_ms)
+                self._costs[tier] += model_cost(tier, outcome.input_tokens, outcome.output_tokens, self.prices)
+
+    def record_turn(self, top_tier: str, outcome: Optional[CascadeOutcome]) -> None:
+        """
+        Count a finished turn and what it would have cost on the top tier alone.
+
+        Args:
+            top_tier: Model name of the last tier
+            outcome: The response that was used
+        """
+        with self._lock:
+            self._turns += 1
+            if outcome is not None:
+                self._top_tier_cost += model_cost(top_tier, outcome.input_tokens, outcome.output_tokens, self.prices)
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+            self._costs.clear()
+            self._reasons.clear()
+            self._turns = 0
+            self._top_tier_cost = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cascade usage.
+
+        Returns:
+            Dictionary with per-tier requests, escalation rate and reasons, latency
+            percentiles, tokens and cost, plus the total cost and an estimate of
+            what the same turns would have cost on the top tier alone
+        """
+        with self._lock:
+            tiers = {}
+            for tier, counts in self._counters.items():
+                latencies = self._latencies[tier]
+                tiers[tier] = {
+                    **counts,
+                    "escalation_rate": counts["escalated"] / counts["requests"] if counts["requests"] else 0.0,
+                    "escalation_reasons": dict(self._reasons[tier]),
+                    "p50_ms": round(_percentile(latencies, 50), 1),
+                    "p95_ms": round(_percentile(latencies, 95), 1),
+                    "cost_usd": round(self._costs[tier], 6),
+                }
+            total_cost = sum(self._costs.values())
+            return {
+                "turns": self._turns,
+                "cost_usd": round(total_cost, 6),
+                "top_tier_cost_usd": round(self._top_tier_cost, 6),
+                "tiers": tiers,
+            }
+
+
+# Process-wide metrics shared by all cascade models
+cascade_metrics = CascadeMetrics()
+
+
+class CascadeModel(OpenAIDirectModel):
+    """
+    An OpenAIDirectModel that answers each turn with the cheapest tier that passes its checks.
+
+    Earlier tiers are buffered so a failing answer never reaches the agent; the last
+    tier streams as usual. ``generate`` is not cascaded and uses the last tier.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[str] = DEFAULT_TIERS,
+        checks: Optional[Sequence[CascadeCheck]] = None,
+        ask_confidence: bool = True,
+        metrics: Optional[CascadeMetrics] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the cascade.
+
+        Args:
+            tiers: Model names from cheapest to strongest
+            checks: Checks an earlier tier's response must pass (defaults to DEFAULT_CHECKS)
+            ask_confidence: Ask earlier tiers to end final answers with a confidence line,
+                which is read by confidence_check and removed from the answer
+            metrics: Metrics to record to (defaults to the shared cascade_metrics)
+            **kwargs: Additional OpenAIDirectModel parameters
+        """
+        if not tiers:
+            raise ValueError("A cascade needs at least one tier")
+        kwargs.pop("model", None)
+        super().__init__(model=tiers[-1], **kwargs)
+        self.tiers = list(tiers)
+        self.checks = list(DEFAULT_CHECKS if checks is None else checks)
+        self.ask_confidence = ask_confidence
+        self.metrics = metrics or cascade_metrics
+        self.config["cascade"] = self.tiers
+
+    def evaluate(self, outcome: CascadeOutcome, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Run the checks over a tier's response.
+
+        Args:
+            outcome: The buffered response
+            request: The request it answered
+
+        Returns:
+            The first failure reason, or None if every check passes
+        """
+        for check in self.checks:
+            reason = check(outcome, request)
+            if reason:
+                return reason
+        return None
+
+    def _tier_request(self, request: Dict[str, Any], tier: str, last: bool) -> Dict[str, Any]:
+        tier_request = {**request, "model": tier}
+        messages = request["messages"]
+        if not last and self.ask_confidence and messages and messages[0].get("role") == "system":
+            tier_request["messages"] = [
+                {**messages[0], "content": messages[0]["content"] + CONFIDENCE_INSTRUCTION},
+                *messages[1:],
+            ]
+        return tier_request
+
+    @staticmethod
+    def _outcome(tier: str, events: List[Dict[str, Any]], latency_ms: float) -> CascadeOutcome:
+        """Assemble a buffered event list into a CascadeOutcome."""
+        parts: List[str] = []
+        tool_calls: List[List[str]] = []
+        current = None
+        outcome = CascadeOutcome(model=tier, text="", latency_ms=latency_ms)
+        for event in events:
+            chunk_type = event["chunk_type"]
+            if chunk_type == "content_start":
+                current = event["data_type"]
+                if current == "tool":
+                    tool_calls.append([event["data"]["name"], ""])
+            elif chunk_type == "content_delta":
+                if current == "tool":
+                    tool_calls[-1][1] += event["data"]
+                else:
+                    parts.append(event["data"])
+            elif chunk_type == "message_stop":
+                outcome.finish_reason = event["data"]
+            elif chunk_type == "metadata":
+                outcome.input_tokens = event["data"]["inputTokens"] or 0
+                outcome.output_tokens = event["data"]["outputTokens"] or 0
+        outcome.text, outcome.confidence = split_confidence("".join(parts))
+        outcome.tool_calls = [(name, arguments) for name, arguments in tool_calls]
+        return outcome
+
+    @staticmethod
+    def _replay(events: List[Dict[str, Any]], text: str) -> Iterable[Dict[str, Any]]:
+        """Yield buffered events with the answer text replaced by a single cleaned delta."""
+        in_text = False
+        for event in events:
+            chunk_type = event["chunk_type"]
+            if chunk_type == "content_start":
+                in_text = event["data_type"] == "text"
+                if in_text:
+                    if text:
+                        yield event
+                        yield {"chunk_type": "content_delta", "data_type": "text", "data": text}
+                    continue
+            elif in_text and chunk_type == "content_delta":
+                continue
+            elif in_text and chunk_type == "content_stop":
+                in_text = False
+                if not text:
+                    continue
+            yield event
+
+    def stream(self, request: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """
+        Answer a streaming request with the first tier whose response passes the checks.
+
+        Args:
+            request: Request from format_request
+
+        Yields:
+            Provider events consumed by format_chunk
+        """
+        for index, tier in enumerate(self.tiers[:-1]):
+            start = time.perf_counter()
+            try:
+                events = list(super().stream(self._tier_request(request, tier, last=False)))
+            except Exception as e:
+                logger.warning(f"Cascade tier {tier} failed, escalating: {str(e)}")
+                self.metrics.record(tier, None, "escalated", "error")
+                continue
+            outcome = self._outcome(tier, events, (time.perf_counter() - start) * 1000)
+            reason = self.evaluate(outcome, request)
+            if reason is None:
+                self.metrics.record(tier, outcome, "accepted")
+                self.metrics.record_turn(self.tiers[-1], outcome)
+                yield from self._replay(events, outcome.text)
+                return
+            logger.info(f"Cascade escalating from {tier} to {self.tiers[index + 1]}: {reason}")
+            self.metrics.record(tier, outcome, "escalated", reason)
+
+        # The last tier is the answer of record, so it streams without buffering
+        tier = self.tiers[-1]
+        start = time.perf_counter()
+        outcome = CascadeOutcome(model=tier, text="")
+        for event in super().stream(self._tier_request(request, tier, last=True)):
+            if event["chunk_type"] == "metadata":
+                outcome.input_tokens = event["data"]["inputTokens"] or 0
+                outcome.output_tokens = event["data"]["outputTokens"] or 0
+                outcome.latency_ms = (time.perf_counter() - start) * 1000
+                self.metrics.record(tier, outcome, "final")
+                self.metrics.record_turn(tier, outcome)
+            yield event
@@ -0,0 +1,504 @@
+"""
+LLM Cassette - Record and replay OpenAI chat completions for offline runs.
+
+A cassette sits between OpenAIDirectModel and the OpenAI client. In record mode
+every chat completions request goes to the API and the assembled answer (text,
+tool calls, finish reason, usage and latency) is appended to a JSONL file under
+a hash of the canonical request. In replay mode requests are answered from the
+file, as a plain completion or as a stream, after an optional synthetic delay,
+so the whole orchestrator -> specialist -> tool path runs without the network.
+AsyncCassetteClient does the same for AsyncOpenAI.
+
+The canonical request leaves out the stream flags, so a streamed recording can
+answer a non-streamed request and vice versa. By default it also leaves out the
+text of tool results, whose mock market data differs from run to run; tool
+call ids are kept, so each tool result still matches the call it answers.
+
+A cassette can be activated for the whole process with set_active_cassette or
+with environment variables:
+    OPENAI_CASSETTE          path of the cassette file
+    OPENAI_CASSETTE_MODE     record, replay or auto (replay, recording misses; default: replay)
+    OPENAI_CASSETTE_LATENCY  replay delay before the first token in seconds, or "recorded"
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from aws_strands_poc.financial_advisor.streaming import ToolCallAccumulator
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay", "auto")
+
+# Request fields that change how the answer is delivered, not what it is
+_DELIVERY_FIELDS = ("stream", "stream_options", "timeout", "extra_headers")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recording."""
+
+
+def canonical_request(request: Dict[str, Any], ignore_tool_results: bool = True) -> Dict[str, Any]:
+    """
+    Reduce a chat completions request to the fields that determine its answer.
+
+    Args:
+        request: Keyword arguments for ``client.chat.completions.create``
+        ignore_tool_results: Leave the text of tool result messages out
+
+    Returns:
+        The canonical request
+    """
+    canonical = {key: value for key, value in request.items() if key not in _DELIVERY_FIELDS}
+    if ignore_tool_results:
+        canonical["messages"] = [
+            {**message, "content": ""} if message.get("role") == "tool" else message
+            for message in request.get("messages", [])
+        ]
+    return canonical
+
+
+def cassette_key(request: Dict[str, Any], ignore_tool_results: bool = True) -> str:
+    """
+    Hash a request for cassette lookup.
+
+    Args:
+        request: Keyword arguments for ``client.chat.completions.create``
+        ignore_tool_results: Leave the text of tool result messages out of the hash
+
+    Returns:
+        Hex digest of the canonical request serialized as canonical JSON
+    """
+    payload = json.dumps(
+        canonical_request(request, ignore_tool_results), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, int]]:
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+def _prompt_preview(request: Dict[str, Any]) -> str:
+    # The last user message, kept in the recording to make the file readable
+    for message in reversed(request.get("messages", [])):
+        if message.get("role") == "user" and isinstance(message.get("content"), str):
+            return message["content"][:120]
+    return ""
+
+
+class Cassette:
+    """Thread-safe store of recorded chat completions, backed by a JSONL file."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency: Optional[float] = 0.0,
+        token_interval: float = 0.0,
+        ignore_tool_results: bool = True,
+    ):
+        """
+        Initialize the cassette, loading any existing recordings.
+
+        Args:
+            path: Path of the JSONL cassette file
+            mode: "record" (always call the API and append), "replay" (answer from the
+                file, raising CassetteMissError for unknown requests) or "auto"
+                (replay, recording requests that have no recording yet)
+            latency: Replay delay in seconds before the first token, or None to
+                reproduce the recorded time to first token and total latency
+            token_interval: Replay delay in seconds between streamed tokens
+            ignore_tool_results: Leave the text of tool results out of request keys
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.token_interval = token_interval
+        self.ignore_tool_results = ignore_tool_results
+        self._recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # Identical requests are answered with their recordings in order, the last one repeating
+        self._replay_positions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Skipping invalid cassette entry on line {line_number}: {str(e)}")
+                    continue
+                self._recordings[entry["key"]].append(entry["response"])
+        logger.info(f"Loaded {sum(len(r) for r in self._recordings.values())} recordings from {self.path}")
+
+    @property
+    def replaying(self) -> bool:
+        """Whether requests can be answered without an API client."""
+        return self.mode == "replay"
+
+    def key(self, request: Dict[str, Any]) -> str:
+        """Return the cassette key for a request."""
+        return cassette_key(request, self.ignore_tool_results)
+
+    def lookup(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the recording for a request.
+
+        Args:
+            request: Keyword arguments for ``client.chat.completions.create``
+
+        Returns:
+            The recorded response, or None if there is none (or the cassette is recording)
+        """
+        if self.mode == "record":
+            return None
+        key = self.key(request)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                self.misses += 1
+                return None
+            position = self._replay_positions[key]
+            self._replay_positions[key] = position + 1
+            self.hits += 1
+            return recordings[min(position, len(recordings) - 1)]
+
+    def record(self, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Store a response and append it to the cassette file.
+
+        Args:
+            request: Keyword arguments the response answers
+            response: Assembled response (content, tool_calls, finish_reason, usage, latency)
+        """
+        key = self.key(request)
+        entry = {"key": key, "model": request.get("model"), "prompt": _prompt_preview(request), "response": response}
+        with self._lock:
+            self._recordings[key].append(response)
+            self.recorded += 1
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cassette activity.
+
+        Returns:
+            Dictionary with the mode, recordings on file, and replay hits, misses and new recordings
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "recordings": sum(len(r) for r in self._recordings.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "recorded": self.recorded,
+            }
+
+
+class CassetteClient:
+    """
+    OpenAI client stand-in that answers chat completions from a cassette.
+
+    Only ``chat.completions.create`` is intercepted; requests without a
+    recording go to the wrapped client (and are recorded) unless the cassette
+    is in replay mode.
+    """
+
+    def __init__(self, cassette: Cassette, client: Any = None):
+        """
+        Initialize the client.
+
+        Args:
+            cassette: Cassette to replay from and record to
+            client: Real OpenAI client used for recording (not needed in replay mode)
+        """
+        self.cassette = cassette
+        self.client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def with_options(self, **options: Any) -> "CassetteClient":
+        """Return a cassette client whose wrapped client uses the given options."""
+        if self.client is None or not hasattr(self.client, "with_options"):
+            return self
+        return CassetteClient(self.cassette, self.client.with_options(**options))
+
+    def _create(self, **request: Any) -> Any:
+        recording = self.cassette.lookup(request)
+        if recording is not None:
+            if request.get("stream"):
+                return self._replay_stream(request, recording)
+            return self._replay(request, recording)
+
+        if self.cassette.replaying or self.client is None:
+            raise CassetteMissError(
+                f"No recording for request to {request.get('model')} ({_prompt_preview(request)!r}) "
+                f"in {self.cassette.path}"
+            )
+        if request.get("stream"):
+            return self._record_stream(request)
+        return self._record(request)
+
+    def _record(self, request: Dict[str, Any]) -> ChatCompletion:
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**request)
+        self.cassette.record(request, _completion_recording(response, (time.perf_counter() - start) * 1000))
+        return response
+
+    def _record_stream(self, request: Dict[str, Any]) -> Iterator[ChatCompletionChunk]:
+        recorder = _StreamRecorder()
+        for chunk in self.client.chat.completions.create(**request):
+            recorder.add(chunk)
+            yield chunk
+        self.cassette.record(request, recorder.recording())
+
+    def _delays(self, recording: Dict[str, Any], tokens: int) -> "tuple[float, float]":
+        """Return the delay before the first token and between tokens."""
+        if self.cassette.latency is not None:
+            return self.cassette.latency, self.cassette.token_interval
+        first = recording.get("ttft_ms", 0) / 1000
+        rest = max(0.0, recording.get("latency_ms", 0) / 1000 - first)
+        return first, rest / max(1, tokens - 1)
+
+    @staticmethod
+    def _tokens(content: str) -> List[str]:
+        words = content.split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def _replay_delay(self, recording: Dict[str, Any]) -> float:
+        """Return the delay before a non-streamed replay is answered."""
+        tokens = self._tokens(recording["content"]) if recording["content"] else []
+        first, interval = self._delays(recording, len(tokens))
+        return first + interval * max(0, len(tokens) - 1)
+
+    @staticmethod
+    def _completion(request: Dict[str, Any], recording: Dict[str, Any]) -> ChatCompletion:
+        message: Dict[str, Any] = {"role": "assistant", "content": recording["content"] or None}
+        if recording["tool_calls"]:
+            message["tool_calls"] = [
+                {"id": call["id"], "type": "function",
+                 "function": {"name": call["name"], "arguments": call["arguments"]}}
+                for call in recording["tool_calls"]
+            ]
+        return ChatCompletion.model_validate({
+            "id": "cassette", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [{"index": 0, "message": message, "finish_reason": recording["finish_reason"] or "stop"}],
+            "usage": recording["usage"],
+        })
+
+    def _replay(self, request: Dict[str, Any], recording: Dict[str, Any]) -> ChatCompletion:
+        time.sleep(self._replay_delay(recording))
+        return self._completion(request, recording)
+
+    def _replay_chunks(
+        self, request: Dict[str, Any], recording: Dict[str, Any]
+    ) -> Iterator["tuple[float, ChatCompletionChunk]"]:
+        """Yield the chunks of a streamed replay, each with the delay to wait before it."""
+        model = request.get("model", "")
+
+        def chunk(delta: Optional[Dict[str, Any]], finish_reason: Optional[str] = None,
+                  usage: Optional[Dict[str, int]] = None) -> ChatCompletionChunk:
+            choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            return ChatCompletionChunk.model_validate({
+                "id": "cassette", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": choices, "usage": usage,
+            })
+
+        tokens = self._tokens(recording["content"]) if recording["content"] else []
+        first, interval = self._delays(recording, len(tokens) + len(recording["tool_calls"]))
+        delay = first
+        for i, token in enumerate(tokens):
+            yield (delay if i == 0 else interval), chunk({"content": token})
+            delay = 0.0
+        for index, call in enumerate(recording["tool_calls"]):
+            yield (delay if not (index or tokens) else interval), chunk(
+                {"tool_calls": [{"index": index, "id": call["id"], "type": "function",
+                                 "function": {"name": call["name"], "arguments": ""}}]}
+            )
+            delay = 0.0
+            yield 0.0, chunk({"tool_calls": [{"index": index, "function": {"arguments": call["arguments"]}}]})
+        yield delay, chunk({}, recording["finish_reason"] or "stop")
+        if (request.get("stream_options") or {}).get("include_usage") and recording["usage"]:
+            yield 0.0, chunk(None, usage=recording["usage"])
+
+    def _replay_stream(self, request: Dict[str, Any], recording: Dict[str, Any]) -> Iterator[ChatCompletionChunk]:
+        for delay, chunk in self._replay_chunks(request, recording):
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+
+class AsyncCassetteClient(CassetteClient):
+    """
+    CassetteClient for AsyncOpenAI.
+
+    ``chat.completions.create`` is a coroutine, streams are async iterators, and
+    replay delays wait on the event loop instead of blocking it.
+    """
+
+    def with_options(self, **options: Any) -> "AsyncCassetteClient":
+        """Return a cassette client whose wrapped client uses the given options."""
+        if self.client is None or not hasattr(self.client, "with_options"):
+            return self
+        return AsyncCassetteClient(self.cassette, self.client.with_options(**options))
+
+    async def _create(self, **request: Any) -> Any:
+        recording = self.cassette.lookup(request)
+        if recording is not None:
+            if request.get("stream"):
+                return self._areplay_stream(request, recording)
+            await asyncio.sleep(self._replay_delay(recording))
+            return self._completion(request, recording)
+
+        if self.cassette.replaying or self.client is None:
+            raise CassetteMissError(
+                f"No recording for request to {request.get('model')} ({_prompt_preview(request)!r}) "
+                f"in {self.cassette.path}"
+            )
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(**request)
+        if request.get("stream"):
+            return self._arecord_stream(request, response, start)
+        self.cassette.record(request, _completion_recording(response, (time.perf_counter() - start) * 1000))
+        return response
+
+    async def _arecord_stream(
+        self, request: Dict[str, Any], response: AsyncIterator[ChatCompletionChunk], start: float
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        recorder = _StreamRecorder(start)
+        async for chunk in response:
+            recorder.add(chunk)
+            yield chunk
+        self.cassette.record(request, recorder.recording())
+
+    async def _areplay_stream(
+        self, request: Dict[str, Any], recording: Dict[str, Any]
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        for delay, chunk in self._replay_chunks(request, recording):
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+def _completion_recording(response: ChatCompletion, latency_ms: float) -> Dict[str, Any]:
+    """Assemble the recording of a non-streamed completion."""
+    message = response.choices[0].message
+    return {
+        "content": message.content or "",
+        "tool_calls": [
+            {"id": call.id, "name": call.function.name, "arguments": call.function.arguments}
+            for call in message.tool_calls or []
+        ],
+        "finish_reason": response.choices[0].finish_reason,
+        "usage": _usage_dict(response.usage),
+        "ttft_ms": round(latency_ms, 1),
+        "latency_ms": round(latency_ms, 1),
+    }
+
+
+class _StreamRecorder:
+    """Assembles the recording of a streamed completion from its chunks."""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.first_token_at: Optional[float] = None
+        self.parts: List[str] = []
+        self.tool_calls = ToolCallAccumulator()
+        self.finish_reason = None
+        self.usage = None
+
+    def add(self, chunk: ChatCompletionChunk) -> None:
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return
+        choice = chunk.choices[0]
+        if (choice.delta.content or choice.delta.tool_calls) and self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        if choice.delta.content:
+            self.parts.append(choice.delta.content)
+        for tool_delta in choice.delta.tool_calls or []:
+            self.tool_calls.add(tool_delta)
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+    def recording(self) -> Dict[str, Any]:
+        end = time.perf_counter()
+        return {
+            "content": "".join(self.parts),
+            "tool_calls": [
+                {"id": call["id"], "name": call["function"]["name"], "arguments": call["function"]["arguments"]}
+                for call in self.tool_calls.tool_calls()
+            ],
+            "finish_reason": self.finish_reason,
+            "usage": _usage_dict(self.usage),
+            "ttft_ms": round(((self.first_token_at or end) - self.start) * 1000, 1),
+            "latency_ms": round((end - self.start) * 1000, 1),
+        }
+
+
+_active_cassette: Optional[Cassette] = None
+_active_lock = threading.Lock()
+_env_checked = False
+
+
+def set_active_cassette(cassette: Optional[Cassette]) -> None:
+    """
+    Make every OpenAIDirectModel created from now on record to or replay from a cassette.
+
+    Args:
+        cassette: The cassette, or None to go back to the live API
+    """
+    global _active_cassette, _env_checked
+    with _active_lock:
+        _active_cassette = cassette
+        _env_checked = True
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """Return the process-wide cassette, creating it from OPENAI_CASSETTE on first use."""
+    global _active_cassette, _env_checked
+    with _active_lock:
+        if not _env_checked:
+            _env_checked = True
+            path = os.environ.get("OPENAI_CASSETTE")
+            if path:
+                latency = os.environ.get("OPENAI_CASSETTE_LATENCY", "0")
+                _active_cassette = Cassette(
+                    path,
+                    mode=os.environ.get("OPENAI_CASSETTE_MODE", "replay"),
+                    latency=None if latency == "recorded" else float(latency),
+                )
+        return _active_cassette
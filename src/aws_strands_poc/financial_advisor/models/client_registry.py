@@ -0,0 +1,418 @@
+"""
+OpenAI Client Registry - One tuned HTTP connection pool for the whole process.
+
+Every OpenAIDirectModel used to build its own OpenAI client, so each short-lived
+specialist agent opened fresh TCP and TLS connections to the API. The registry
+hands out OpenAI clients that all share one httpx connection pool with
+keep-alive, a bounded number of connections and HTTP/2 when the ``h2`` package
+is installed, and it counts new connections against requests to report reuse.
+A request counts as in flight until its response is closed or it fails. The
+open and idle connections are read from the httpcore pools when httpx still
+keeps them where expected, and reported as unavailable otherwise.
+Async clients get one pool per event loop, since an httpx.AsyncClient must
+not be shared between loops.
+
+Pool limits are read from the environment:
+    OPENAI_MAX_CONNECTIONS     maximum open connections (default: 100)
+    OPENAI_MAX_KEEPALIVE       maximum idle keep-alive connections (default: 20)
+    OPENAI_KEEPALIVE_EXPIRY    seconds an idle connection is kept (default: 30)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpcore
+import httpx
+from openai import DEFAULT_CONNECTION_LIMITS as DEFAULT_LIMITS
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# The metered clients wrap every transport httpx builds through these (private)
+# hooks; if an httpx upgrade drops them, only the default transport is metered
+_TRANSPORT_HOOKS = ("_init_transport", "_init_proxy_transport")
+TRANSPORT_HOOKS_AVAILABLE = all(
+    hasattr(client_class, name) for client_class in (httpx.Client, httpx.AsyncClient) for name in _TRANSPORT_HOOKS
+)
+
+
+class _PoolMetrics:
+    """Request and connection counters fed by the metered transports and httpcore trace events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.connections_opened = 0
+            self.tls_handshakes = 0
+
+    def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace callback, called for every connection-level step of a request."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace callback for async requests."""
+        self.trace(event_name, info)
+
+    def start(self, request: httpx.Request, asynchronous: bool = False) -> Callable[[], None]:
+        """Count a request as in flight and return the callback that ends it (safe to call twice)."""
+        request.extensions["trace"] = self.atrace if asynchronous else self.trace
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            with self._lock:
+                if not finished:
+                    finished = True
+                    self.in_flight -= 1
+
+        return finish
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """Response body that ends its request's in-flight count when it is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, finish: Callable[[], None]):
+        self._stream = stream
+        self._finish = finish
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+
+class _AsyncMeteredStream(httpx.AsyncByteStream):
+    """Async response body that ends its request's in-flight count when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, finish: Callable[[], None]):
+        self._stream = stream
+        self._finish = finish
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """Transport wrapper counting a request in flight from send until its response closes or it fails."""
+
+    def __init__(self, transport: httpx.BaseTransport, metrics: _PoolMetrics):
+        self.transport = transport
+        self.metrics = metrics
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        finish = self.metrics.start(request)
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            finish()
+            raise
+        if response.is_closed:
+            # Bodies given up front (e.g. by mock transports) are never closed again
+            finish()
+        else:
+            response.stream = _MeteredStream(response.stream, finish)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class _AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    """Async transport wrapper counting a request in flight until its response closes or it fails."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: _PoolMetrics):
+        self.transport = transport
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        finish = self.metrics.start(request, asynchronous=True)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            finish()
+            raise
+        if response.is_closed:
+            # Bodies given up front (e.g. by mock transports) are never closed again
+            finish()
+        else:
+            response.stream = _AsyncMeteredStream(response.stream, finish)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class _MeteredHttpxClient(DefaultHttpxClient):
+    """The SDK's default httpx client with every transport (including proxy mounts) metered."""
+
+    def __init__(self, metrics: _PoolMetrics, **kwargs: Any):
+        self._metrics = metrics
+        # The metered transports this client routes requests through
+        self.metered_transports: List[_MeteredTransport] = []
+        if not TRANSPORT_HOOKS_AVAILABLE and "transport" not in kwargs:
+            kwargs["transport"] = self._meter(
+                httpx.HTTPTransport(limits=kwargs.get("limits", DEFAULT_LIMITS), http2=kwargs.get("http2", False))
+            )
+        super().__init__(**kwargs)
+
+    def _meter(self, transport: httpx.BaseTransport) -> httpx.BaseTransport:
+        metered = _MeteredTransport(transport, self._metrics)
+        self.metered_transports.append(metered)
+        return metered
+
+    def _init_transport(self, *args: Any, **kwargs: Any) -> httpx.BaseTransport:
+        transport = super()._init_transport(*args, **kwargs)
+        return transport if transport in self.metered_transports else self._meter(transport)
+
+    def _init_proxy_transport(self, *args: Any, **kwargs: Any) -> httpx.BaseTransport:
+        return self._meter(super()._init_proxy_transport(*args, **kwargs))
+
+
+class _AsyncMeteredHttpxClient(DefaultAsyncHttpxClient):
+    """The SDK's default async httpx client with every transport (including proxy mounts) metered."""
+
+    def __init__(self, metrics: _PoolMetrics, **kwargs: Any):
+        self._metrics = metrics
+        self.metered_transports: List[_AsyncMeteredTransport] = []
+        if not TRANSPORT_HOOKS_AVAILABLE and "transport" not in kwargs:
+            kwargs["transport"] = self._meter(
+                httpx.AsyncHTTPTransport(limits=kwargs.get("limits", DEFAULT_LIMITS), http2=kwargs.get("http2", False))
+            )
+        super().__init__(**kwargs)
+
+    def _meter(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        metered = _AsyncMeteredTransport(transport, self._metrics)
+        self.metered_transports.append(metered)
+        return metered
+
+    def _init_transport(self, *args: Any, **kwargs: Any) -> httpx.AsyncBaseTransport:
+        transport = super()._init_transport(*args, **kwargs)
+        return transport if transport in self.metered_transports else self._meter(transport)
+
+    def _init_proxy_transport(self, *args: Any, **kwargs: Any) -> httpx.AsyncBaseTransport:
+        return self._meter(super()._init_proxy_transport(*args, **kwargs))
+
+
+def _pool_connections(transports: List[Any]) -> Optional[Dict[str, int]]:
+    """
+    Count open and idle connections in the connection pools behind metered transports.
+
+    httpx does not expose its transport's pool, so this reads HTTPTransport._pool
+    and only trusts it if it is an httpcore connection pool; from there on it uses
+    httpcore's public ``connections`` and ``is_idle()``.
+
+    Args:
+        transports: Metered transports of the shared clients
+
+    Returns:
+        Dictionary with open, idle and active connections, or None if an httpx
+        upgrade moved the pool (the request and connection counters still work)
+    """
+    pools = []
+    for metered in transports:
+        pool = getattr(metered.transport, "_pool", None)
+        if isinstance(pool, (httpcore.ConnectionPool, httpcore.AsyncConnectionPool)):
+            pools.append(pool)
+        elif isinstance(metered.transport, (httpx.HTTPTransport, httpx.AsyncHTTPTransport)):
+            return None
+    connections = [connection for pool in pools for connection in pool.connections]
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+class ClientRegistry:
+    """Process-wide cache of OpenAI clients sharing one sync connection pool and one async pool per event loop."""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        **http_options: Any,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Maximum open connections (defaults to OPENAI_MAX_CONNECTIONS or 100)
+            max_keepalive_connections: Maximum idle keep-alive connections
+                (defaults to OPENAI_MAX_KEEPALIVE or 20)
+            keepalive_expiry: Seconds an idle connection is kept open
+                (defaults to OPENAI_KEEPALIVE_EXPIRY or 30)
+            http2: Use HTTP/2 (defaults to True when the h2 package is installed)
+            **http_options: Additional httpx client options (e.g. verify, proxy)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.environ.get("OPENAI_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=max_keepalive_connections or int(os.environ.get("OPENAI_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=keepalive_expiry or float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "30")),
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.http_options = http_options
+        self.metrics = _PoolMetrics()
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+        # Per event loop: its async pool and the AsyncOpenAI clients using it
+        self._async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str]], AsyncOpenAI]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _shared_http_client(self) -> httpx.Client:
+        # Caller holds the lock
+        if self._http_client is None:
+            self._http_client = _MeteredHttpxClient(
+                self.metrics,
+                limits=self.limits,
+                http2=self.http2,
+                **self.http_options,
+            )
+            logger.info(
+                f"Created shared OpenAI connection pool (max_connections={self.limits.max_connections}, "
+                f"http2={self.http2})"
+            )
+        return self._http_client
+
+    def _shared_async_http_client(self, loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+        # Caller holds the lock; connections belong to the loop they were opened on
+        client = self._async_http_clients.get(loop)
+        if client is None:
+            client = self._async_http_clients[loop] = _AsyncMeteredHttpxClient(
+                self.metrics,
+                limits=self.limits,
+                http2=self.http2,
+                **self.http_options,
+            )
+        return client
+
+    def get_client(self, api_key: str, base_url: Optional[str] = None) -> OpenAI:
+        """
+        Return the shared OpenAI client for an API key and endpoint.
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Optional API base URL (defaults to the SDK's, i.e. OPENAI_BASE_URL or api.openai.com)
+
+        Returns:
+            An OpenAI client using the shared connection pool
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = OpenAI(api_key=api_key, base_url=base_url, http_client=self._shared_http_client())
+                self._clients[key] = client
+            return client
+
+    def get_async_client(self, api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+        """
+        Return the shared AsyncOpenAI client for an API key and endpoint on the running event loop.
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Optional API base URL
+
+        Returns:
+            An AsyncOpenAI client using the running loop's shared async connection pool
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        loop = asyncio.get_running_loop()
+        key = (api_key, base_url)
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=api_key, base_url=base_url, http_client=self._shared_async_http_client(loop)
+                )
+                clients[key] = client
+            return client
+
+    def _metered_transports(self) -> List[Any]:
+        # Caller holds the lock
+        transports = list(self._http_client.metered_transports) if self._http_client is not None else []
+        for client in self._async_http_clients.values():
+            transports.extend(client.metered_transports)
+        return transports
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool utilization and connection reuse.
+
+        Returns:
+            Dictionary with request and connection counts, the connection reuse
+            rate, in-flight and peak concurrency relative to max_connections, and
+            the open/idle connections currently in the pools (None if unavailable)
+        """
+        metrics = self.metrics
+        with metrics._lock:
+            requests = metrics.requests
+            opened = metrics.connections_opened
+            result = {
+                "requests": requests,
+                "connections_opened": opened,
+                "tls_handshakes": metrics.tls_handshakes,
+                "connection_reuse_rate": (requests - opened) / requests if requests else 0.0,
+                "in_flight": metrics.in_flight,
+                "peak_in_flight": metrics.peak_in_flight,
+                "max_connections": self.limits.max_connections,
+                "peak_utilization": metrics.peak_in_flight / self.limits.max_connections,
+                "http2": self.http2,
+            }
+        with self._lock:
+            result["clients"] = len(self._clients) + sum(len(clients) for clients in self._async_clients.values())
+            result["pool"] = _pool_connections(self._metered_transports())
+        return result
+
+    def close(self) -> None:
+        """Close the shared sync pool and forget all clients (async pools are left to their event loops)."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._clients.clear()
+            self._async_http_clients.clear()
+            self._async_clients.clear()
+
+
+# Process-wide registry used by OpenAIDirectModel and other OpenAI callers
+client_registry = ClientRegistry()
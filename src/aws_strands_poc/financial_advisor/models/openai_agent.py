@@ -1,14 +1,22 @@
 """
 OpenAI-compatible agent creator for Strands.
 
-This approach uses a simpler method that doesn't try to override the agent's internals.
+Agents are backed by OpenAIDirectModel, which streams responses from the OpenAI
+API through the standard Strands model interface, or by a CascadeModel that tries
+cheaper models first when a cascade is configured.
 """
 
 import os
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from strands import Agent
+from strands.types.models import Model
+
+from aws_strands_poc.financial_advisor.model_config import cascade_from_env
+from aws_strands_poc.financial_advisor.models.cascade import CascadeModel
+from aws_strands_poc.financial_advisor.models.cassette import get_active_cassette
+from aws_strands_poc.financial_advisor.models.openai_model import OpenAIDirectModel
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +25,8 @@ def create_openai_agent(
     tools: list, 
     model: str = "gpt-4o-mini",
     temperature: float = 0.3,
+    model_provider: Optional[Model] = None,
+    cascade: Optional[Sequence[str]] = None,
     **kwargs
 ) -> Agent:
     """
@@ -27,6 +37,11 @@ def create_openai_agent(
         tools: List of tools to provide to the agent
         model: OpenAI model name (default: gpt-4o-mini)
         temperature: Model temperature (default: 0.3)
+        model_provider: Optional pre-built Strands model to use instead of an
+            OpenAIDirectModel (the model and temperature arguments are then ignored)
+        cascade: Optional model names from cheapest to strongest; each turn is
+            answered by the first one whose response passes the cascade checks
+            (defaults to the MODEL_CASCADE environment variable; model is then ignored)
         **kwargs: Additional parameters for the Agent constructor
         
     Returns:
@@ -34,17 +49,23 @@ def create_openai_agent(
     """
     # Log the API key availability
     api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    cassette = get_active_cassette()
+    # Replaying a cassette needs no API access
+    if not api_key and model_provider is None and not (cassette is not None and cassette.replaying):
         raise ValueError("OPENAI_API_KEY environment variable must be set")
     
-    # For the POC, we'll use the default model since trying to create a custom
-    # OpenAI integration is causing issues with the Strands agent. In a real
-    # implementation, we would create a proper OpenAI integration.
+    cascade = cascade or cascade_from_env()
+    if model_provider is None and cascade:
+        model_provider = CascadeModel(tiers=cascade, api_key=api_key, temperature=temperature)
+    elif model_provider is None:
+        model_provider = OpenAIDirectModel(model=model, api_key=api_key, temperature=temperature)
+    
     logger.info(f"Creating agent with system prompt of length: {len(system_prompt)}")
     logger.info(f"Tools provided: {[t.__name__ if hasattr(t, '__name__') else str(t) for t in tools]}")
     
     # Create the agent with the tools
     agent = Agent(
+        model=model_provider,
         system_prompt=system_prompt,
         tools=tools,
         **kwargs
@@ -4,21 +4,62 @@ Direct OpenAI model implementation for Strands.
 This custom model provider uses the OpenAI SDK directly without LiteLLM.
 """
 
+import hashlib
 import json
+import logging
+import operator
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
 
 import openai
 from openai import OpenAI
+from strands.types.content import Message, Messages
 from strands.types.models import Model
-from strands.types.messages import Message, Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolSpec
+
+from aws_strands_poc.financial_advisor.coalesce import SingleFlight, model_flight
+from aws_strands_poc.financial_advisor.history import message_tokens
+from aws_strands_poc.financial_advisor.models.cassette import Cassette, CassetteClient, get_active_cassette
+from aws_strands_poc.financial_advisor.models.client_registry import client_registry
+from aws_strands_poc.financial_advisor.models.scheduler import RequestScheduler, current_lane, default_scheduler
+from aws_strands_poc.financial_advisor.streaming import ToolCallAccumulator
+
+logger = logging.getLogger(__name__)
+
+# OpenAI finish reasons mapped to Strands stop reasons
+_STOP_REASONS = {
+    "tool_calls": "tool_use",
+    "length": "max_tokens",
+    "content_filter": "content_filtered",
+}
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """
+    Build the default single-flight key for a generate request.
+    
+    Args:
+        request: Model name, OpenAI-format messages and API parameters
+    
+    Returns:
+        Hex digest of the request serialized as canonical JSON
+    """
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class OpenAIDirectModel(Model):
     """
     A model provider for OpenAI using the direct OpenAI API.
     
     This implementation directly uses the OpenAI Python SDK without any intermediary
-    like LiteLLM. It implements the Strands Model interface.
+    like LiteLLM. It implements the Strands Model interface, streaming text and
+    tool-call deltas to the agent as they arrive, and also offers a simpler
+    ``generate`` call for use outside of an agent.
     """
     
     def __init__(
@@ -27,6 +68,14 @@ class OpenAIDirectModel(Model):
         api_key: Optional[str] = None,
         temperature: float = 0.3,
         max_tokens: int = 1000,
+        client: Optional[OpenAI] = None,
+        coalesce: bool = True,
+        coalesce_key: Optional[Callable[[Dict[str, Any]], Hashable]] = None,
+        flight: Optional[SingleFlight] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        schedule: bool = True,
+        priority: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -37,30 +86,294 @@ class OpenAIDirectModel(Model):
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             temperature: Model temperature (0.0 to 1.0)
             max_tokens: Maximum number of tokens to generate
+            client: Optional pre-built OpenAI-compatible client (defaults to the
+                shared client from client_registry)
+            coalesce: Let identical concurrent generate calls share one API request
+            coalesce_key: Function mapping a request (model, messages and parameters)
+                to its single-flight key (defaults to request_key)
+            flight: Single-flight group to use (defaults to the shared model_flight)
+            scheduler: Rate-limit scheduler to send requests through (defaults to
+                the shared default_scheduler)
+            schedule: Send requests through the scheduler, which then owns retries;
+                when False, the SDK's own retries apply
+            priority: Scheduler lane for this model's requests (defaults to the
+                lane set with scheduling_lane, normally "interactive")
+            cassette: Cassette to record requests to or replay them from (defaults
+                to the active cassette, if any; see models.cassette)
             **kwargs: Additional parameters for OpenAI API
         """
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.kwargs = kwargs
+        self.coalesce = coalesce
+        self.coalesce_key = coalesce_key or request_key
+        self.flight = flight or model_flight
+        self.scheduler = (scheduler or default_scheduler) if schedule else None
+        self.priority = priority
+        # Remembers converted history so each call only converts the new messages
+        self.converter = MessageConverter()
+        # Reused while the system prompt is unchanged, so its token count is memoized too
+        self._system_message: Optional[Dict[str, Any]] = None
+        # Read by Strands for tracing
+        self.config: Dict[str, Any] = {"model_id": model}
+        
+        self.cassette = cassette or get_active_cassette()
+        
+        if client is not None:
+            self.client = client
+            self._init_api_client()
+            return
         
         # Set API key from argument or environment variable
+        replay_only = self.cassette is not None and self.cassette.replaying
         if api_key is not None:
             openai.api_key = api_key
         elif os.environ.get("OPENAI_API_KEY") is not None:
             # Use environment variable if available
             pass
+        elif replay_only:
+            # Answers come from the cassette, so no API client is needed
+            self.client = None
+            self._init_api_client()
+            return
         else:
             raise ValueError(
                 "OpenAI API key must be provided either through the api_key parameter "
                 "or the OPENAI_API_KEY environment variable."
             )
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"))
+        self.client = self._shared_client(api_key or os.environ.get("OPENAI_API_KEY"))
+        self._init_api_client()
+    
+    def _shared_client(self, api_key: str) -> Any:
+        """Return the process-wide client for an API key, so all models share one connection pool."""
+        return client_registry.get_client(api_key)
+    
+    def _init_api_client(self) -> None:
+        """
+        Pick the client used for requests.
+        
+        Requests go through the cassette when one is active, and SDK retries are
+        disabled when the scheduler retries instead.
+        """
+        if self.cassette is not None:
+            self.client = CassetteClient(self.cassette, self.client)
+        self._api_client = self.client
+        if self.scheduler is not None and hasattr(self.client, "with_options"):
+            self._api_client = self.client.with_options(max_retries=0)
+    
+    def _create(self, request: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Send a chat completions request, through the scheduler when one is set.
+        
+        Args:
+            request: Keyword arguments for ``client.chat.completions.create``
+        
+        Returns:
+            Tuple of the API response and the tokens charged to the scheduler
+        """
+        if self.scheduler is None:
+            return self.client.chat.completions.create(**request), 0
+        
+        # Charge the prompt plus the most the completion can use, corrected once usage is known
+        estimate = self.converter.count_tokens(request["messages"], self.model)
+        estimate += request.get("max_tokens") or 0
+        lane = self.priority or current_lane()
+        response = self.scheduler.run(
+            lambda: self._api_client.chat.completions.create(**request), tokens=estimate, lane=lane
+        )
+        return response, estimate
+    
+    def _record_usage(self, estimate: int, usage: Any) -> None:
+        """Tell the scheduler how many tokens a request actually used."""
+        total = getattr(usage, "total_tokens", None)
+        if self.scheduler is not None and estimate and total is not None:
+            self.scheduler.record_usage(estimate, total)
+    
+    def update_config(self, **model_config: Any) -> None:
+        """
+        Update the model configuration.
+        
+        Args:
+            **model_config: Any of model_id, temperature, max_tokens, or extra OpenAI API parameters
+        """
+        if "model_id" in model_config:
+            self.model = model_config.pop("model_id")
+            self.config["model_id"] = self.model
+        if "temperature" in model_config:
+            self.temperature = model_config.pop("temperature")
+        if "max_tokens" in model_config:
+            self.max_tokens = model_config.pop("max_tokens")
+        self.kwargs.update(model_config)
+    
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the model configuration.
+        
+        Returns:
+            Dictionary with the model id, temperature, max_tokens and extra API parameters
+        """
+        return {
+            "model_id": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            **self.kwargs,
+        }
+    
+    def format_request(
+        self, messages: Messages, tool_specs: Optional[List[ToolSpec]] = None, system_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Format a streaming chat completions request.
+        
+        Args:
+            messages: Conversation in Strands format
+            tool_specs: Tools to make available to the model
+            system_prompt: System prompt for the model
+        
+        Returns:
+            Keyword arguments for ``client.chat.completions.create``
+        """
+        openai_messages = self.converter.convert(messages)
+        if system_prompt:
+            if self._system_message is None or self._system_message["content"] != system_prompt:
+                self._system_message = {"role": "system", "content": system_prompt}
+            openai_messages.insert(0, self._system_message)
+        
+        request = {
+            "model": self.model,
+            "messages": openai_messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **self.kwargs,
+        }
+        if tool_specs:
+            request["tools"] = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool_spec["name"],
+                        "description": tool_spec["description"],
+                        "parameters": tool_spec["inputSchema"]["json"],
+                    },
+                }
+                for tool_spec in tool_specs
+            ]
+        return request
+    
+    def stream(self, request: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """
+        Send a streaming request and translate the deltas into content-block events.
+        
+        Text and tool-call deltas are forwarded as soon as they arrive rather than
+        buffered until the end of the response. OpenAI streams each tool call's
+        deltas contiguously, so a change of tool-call index closes the previous block.
+        
+        Args:
+            request: Request from format_request
+        
+        Yields:
+            Provider events consumed by format_chunk
+        
+        Raises:
+            openai.RateLimitError: If OpenAI still rejects the request once the scheduler's
+                (or, without a scheduler, the SDK's) retries are exhausted. It is not
+                raised as a ModelThrottledException, so Strands does not retry it again
+        """
+        start = time.perf_counter()
+        response, estimate = self._create(request)
+        
+        yield {"chunk_type": "message_start"}
+        
+        open_block: Optional[Tuple[str, int]] = None
+        finish_reason = None
+        usage = None
+        for chunk in response:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            
+            if delta.content:
+                if open_block != ("text", 0):
+                    if open_block is not None:
+                        yield {"chunk_type": "content_stop"}
+                    yield {"chunk_type": "content_start", "data_type": "text"}
+                    open_block = ("text", 0)
+                yield {"chunk_type": "content_delta", "data_type": "text", "data": delta.content}
+            
+            for tool_delta in delta.tool_calls or []:
+                block = ("tool", tool_delta.index or 0)
+                if open_block != block:
+                    if open_block is not None:
+                        yield {"chunk_type": "content_stop"}
+                    yield {
+                        "chunk_type": "content_start",
+                        "data_type": "tool",
+                        "data": {"toolUseId": tool_delta.id, "name": tool_delta.function.name},
+                    }
+                    open_block = block
+                if tool_delta.function is not None and tool_delta.function.arguments:
+                    yield {"chunk_type": "content_delta", "data_type": "tool", "data": tool_delta.function.arguments}
+            
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        if open_block is not None:
+            yield {"chunk_type": "content_stop"}
+        self._record_usage(estimate, usage)
+        yield {"chunk_type": "message_stop", "data": finish_reason}
+        yield {
+            "chunk_type": "metadata",
+            "data": {
+                "inputTokens": getattr(usage, "prompt_tokens", 0),
+                "outputTokens": getattr(usage, "completion_tokens", 0),
+                "totalTokens": getattr(usage, "total_tokens", 0),
+            },
+            "latency_ms": int((time.perf_counter() - start) * 1000),
+        }
+    
+    def format_chunk(self, event: Dict[str, Any]) -> StreamEvent:
+        """
+        Convert a provider event from stream into a Strands stream event.
+        
+        Args:
+            event: Event yielded by stream
+        
+        Returns:
+            The Strands stream event
+        """
+        chunk_type = event["chunk_type"]
+        if chunk_type == "message_start":
+            return {"messageStart": {"role": "assistant"}}
+        if chunk_type == "content_start":
+            if event["data_type"] == "tool":
+                return {"contentBlockStart": {"start": {"toolUse": event["data"]}}}
+            return {"contentBlockStart": {"start": {}}}
+        if chunk_type == "content_delta":
+            if event["data_type"] == "tool":
+                return {"contentBlockDelta": {"delta": {"toolUse": {"input": event["data"]}}}}
+            return {"contentBlockDelta": {"delta": {"text": event["data"]}}}
+        if chunk_type == "content_stop":
+            return {"contentBlockStop": {}}
+        if chunk_type == "message_stop":
+            return {"messageStop": {"stopReason": _STOP_REASONS.get(event["data"], "end_turn")}}
+        if chunk_type == "metadata":
+            return {"metadata": {"usage": event["data"], "metrics": {"latencyMs": event["latency_ms"]}}}
+        raise RuntimeError(f"Unknown chunk type: {chunk_type}")
     
     def generate(
-        self, messages: Messages, stop: Optional[List[str]] = None, **kwargs: Any
+        self,
+        messages: Messages,
+        stop: Optional[List[str]] = None,
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs: Any,
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Generate text from the OpenAI model.
@@ -68,10 +381,15 @@ class OpenAIDirectModel(Model):
         Args:
             messages: List of message dictionaries
             stop: Optional list of stop sequences
+            stream: Stream the response, calling on_token for each text delta
+            on_token: Optional function called with each text delta when streaming
             **kwargs: Additional parameters for the OpenAI API
         
         Returns:
-            Tuple containing the generated text and metadata
+            Tuple containing the generated text and metadata. Streamed responses
+            also report the assembled tool calls, finish reason, usage,
+            time-to-first-token and total latency. Results shared from an
+            identical in-flight call are marked with ``"coalesced": True``.
         """
         # Convert Strands message format to OpenAI format
         openai_messages = self._convert_messages_to_openai_format(messages)
@@ -82,20 +400,26 @@ class OpenAIDirectModel(Model):
             merged_kwargs["stop"] = stop
         
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=openai_messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                **merged_kwargs
-            )
-            
-            # Extract text content from response
-            content = response.choices[0].message.content or ""
+            if not self.coalesce:
+                return self._generate(openai_messages, stream, on_token, merged_kwargs)
             
-            # Return text and metadata
-            return content, {"model": self.model, "response": response}
+            key = self.coalesce_key({
+                "model": self.model,
+                "messages": openai_messages,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens,
+                "stream": stream,
+                **merged_kwargs,
+            })
+            (content, metadata), shared = self.flight.do(
+                key, self._generate, openai_messages, stream, on_token, merged_kwargs
+            )
+            if not shared:
+                return content, metadata
+            # The leader streamed to its own callback; hand this caller the finished text
+            if stream and on_token is not None and content:
+                on_token(content)
+            return content, {**metadata, "coalesced": True}
         
         except Exception as e:
             # Handle potential API errors
@@ -103,6 +427,107 @@ class OpenAIDirectModel(Model):
             print(f"Error generating text: {error_msg}")
             return error_msg, {"error": str(e)}
     
+    def _generate(
+        self,
+        openai_messages: List[Dict[str, Any]],
+        stream: bool,
+        on_token: Optional[Callable[[str], None]],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Make one chat completions request.
+        
+        Args:
+            openai_messages: Messages in OpenAI format
+            stream: Stream the response
+            on_token: Optional function called with each text delta when streaming
+            kwargs: Additional parameters for the OpenAI API
+        
+        Returns:
+            Tuple containing the generated text and metadata
+        """
+        if stream:
+            return self._generate_stream(openai_messages, on_token, **kwargs)
+        
+        # Call OpenAI API
+        response, estimate = self._create({
+            "model": self.model,
+            "messages": openai_messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            **kwargs,
+        })
+        self._record_usage(estimate, getattr(response, "usage", None))
+        
+        # Extract text content from response
+        content = response.choices[0].message.content or ""
+        
+        # Return text and metadata
+        return content, {"model": self.model, "response": response}
+    
+    def _generate_stream(
+        self,
+        openai_messages: List[Dict[str, Any]],
+        on_token: Optional[Callable[[str], None]],
+        **kwargs: Any,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Stream a response, forwarding text deltas and assembling tool calls as they arrive.
+        
+        Args:
+            openai_messages: Messages in OpenAI format
+            on_token: Optional function called with each text delta
+            **kwargs: Additional parameters for the OpenAI API
+        
+        Returns:
+            Tuple containing the generated text and metadata
+        """
+        start = time.perf_counter()
+        first_token_at = None
+        parts: List[str] = []
+        tool_calls = ToolCallAccumulator()
+        finish_reason = None
+        usage = None
+        
+        response, estimate = self._create({
+            "model": self.model,
+            "messages": openai_messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **kwargs,
+        })
+        for chunk in response:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(choice.delta.content)
+                if on_token is not None:
+                    on_token(choice.delta.content)
+            for tool_delta in choice.delta.tool_calls or []:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                tool_calls.add(tool_delta)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        end = time.perf_counter()
+        self._record_usage(estimate, usage)
+        return "".join(parts), {
+            "model": self.model,
+            "tool_calls": tool_calls.tool_calls(),
+            "finish_reason": finish_reason,
+            "usage": usage,
+            "ttft_ms": (first_token_at - start) * 1000 if first_token_at is not None else None,
+            "latency_ms": (end - start) * 1000,
+        }
+    
     def _convert_messages_to_openai_format(self, messages: Messages) -> List[Dict[str, Any]]:
         """
         Convert Strands message format to OpenAI format.
@@ -113,80 +538,287 @@ class OpenAIDirectModel(Model):
         Returns:
             List of messages in OpenAI format
         """
-        openai_messages = []
+        return self.converter.convert(messages)
+
+
+def convert_message_to_openai_format(message: Message) -> List[Dict[str, Any]]:
+    """
+    Convert one Strands message to OpenAI format.
+    
+    A message can become several OpenAI messages (one per tool result) or none
+    (when it has no content).
+    
+    Args:
+        message: Message in Strands format
+    
+    Returns:
+        List of messages in OpenAI format
+    """
+    openai_messages = []
+
+    # Handle system message
+    if message.get("role") == "system":
+        return [{
+            "role": "system", 
+            "content": message.get("content", "")
+        }]
+
+    # Handle user and assistant messages
+    role = message.get("role", "user")
+
+    # Handle string content or list content
+    if isinstance(message.get("content"), str):
+        content_value = message.get("content", "")
+        if content_value:
+            openai_messages.append({"role": role, "content": content_value})
+        return openai_messages
+
+    # Handle complex content with text and tool calls
+    message_content = []
+    has_tool_calls = False
+
+    for item in message.get("content", []):
+        if "text" in item:
+            message_content.append({"type": "text", "text": item["text"]})
+        elif "toolUse" in item:
+            has_tool_calls = True
+            tool_call = item["toolUse"]
+            tool_calls = {
+                "id": tool_call.get("toolUseId", ""),
+                "type": "function",
+                "function": {
+                    "name": tool_call.get("name", ""),
+                    "arguments": json.dumps(tool_call.get("input", {}))
+                }
+            }
+            message_content.append({"type": "tool_call", "tool_call": tool_calls})
+        elif "toolResult" in item:
+            # For tool results in user messages
+            tool_result = item["toolResult"]
+            result_text = ""
+            for content_item in tool_result.get("content", []):
+                if "text" in content_item:
+                    result_text = content_item["text"]
+
+            openai_messages.append({
+                "role": "tool",
+                "tool_call_id": tool_result.get("toolUseId", ""),
+                "content": result_text
+            })
+            continue
+
+    # Add message with content if there's any content
+    if message_content:
+        if has_tool_calls:
+            # For messages with tool calls
+            msg = {"role": role, "content": "", "tool_calls": []}
+            for item in message_content:
+                if item.get("type") == "text":
+                    msg["content"] = item.get("text", "")
+                elif item.get("type") == "tool_call":
+                    msg["tool_calls"].append(item.get("tool_call", {}))
+            openai_messages.append(msg)
+        else:
+            # For regular text messages with complex content
+            text_content = ""
+            for item in message_content:
+                if item.get("type") == "text":
+                    text_content += item.get("text", "")
+            if text_content:
+                openai_messages.append({"role": role, "content": text_content})
+
+    return openai_messages
+
+
+def convert_messages_to_openai_format(messages: Messages) -> List[Dict[str, Any]]:
+    """
+    Convert Strands message format to OpenAI format.
+    
+    Args:
+        messages: List of messages in Strands format
+    
+    Returns:
+        List of messages in OpenAI format
+    """
+    openai_messages = []
+    for message in messages:
+        openai_messages.extend(convert_message_to_openai_format(message))
+    return openai_messages
+
+
+class MessageConverter:
+    """
+    Memoizing Strands-to-OpenAI message converter.
+    
+    An agent re-sends its whole history on every model call, but only the tail
+    is new. The converter keeps the previous call's history and output: when the
+    new history starts with the same message objects, that prefix of the output
+    is reused as is and only the messages after it are converted. Messages
+    outside the prefix (e.g. after the history was trimmed or rolled back) are
+    looked up by identity in a bounded memo before being converted.
+    
+    A message is recognized by identity plus a cheap shape check: its content
+    object, block count and a fingerprint of its toolUse and toolResult blocks
+    (the objects they hold, the result status and text lengths). This catches
+    messages that are replaced, have content blocks added, or have tool blocks
+    edited in place, as Strands does when it swaps an oversized tool result for
+    an error after a context overflow. Strands only truncates the newest
+    message holding tool results and then retries with the same history, so a
+    call fingerprints that message again, plus every earlier message holding
+    tool blocks when it adds no messages. The converted dictionaries are shared
+    between calls and must not be mutated.
+    """
+    
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the converter.
         
-        for message in messages:
-            # Handle system message
-            if message.get("role") == "system":
-                openai_messages.append({
-                    "role": "system", 
-                    "content": message.get("content", "")
-                })
-                continue
-            
-            # Handle user and assistant messages
-            role = message.get("role", "user")
-            content = []
-            
-            # Handle string content or list content
-            if isinstance(message.get("content"), str):
-                content_value = message.get("content", "")
-                if content_value:
-                    openai_messages.append({"role": role, "content": content_value})
-                continue
-            
-            # Handle complex content with text and tool calls
-            message_content = []
-            has_tool_calls = False
+        Args:
+            max_entries: Maximum number of messages to memoize; the least recently used go first
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Message, Tuple[Any, ...], List[Dict[str, Any]]]]" = OrderedDict()
+        # Previous call: (message, shape, output length after it) per message, and the output
+        self._prefix: List[Tuple[Message, Tuple[Any, ...], int]] = []
+        self._prefix_messages: List[Message] = []
+        self._prefix_output: List[Dict[str, Any]] = []
+        # Positions in the previous call's history of messages holding tool blocks
+        self._prefix_tools: List[int] = []
+        # id of a converted message -> (message, model, prompt tokens)
+        self._token_counts: "OrderedDict[int, Tuple[Dict[str, Any], str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _shape(message: Message) -> Tuple[Any, ...]:
+        content = message.get("content")
+        if not isinstance(content, list):
+            return id(content), -1, ()
+        tools = []
+        for block in content:
+            if "toolResult" in block:
+                result = block["toolResult"]
+                items = result.get("content") or ()
+                texts = tuple(len(item["text"]) if "text" in item else id(item) for item in items)
+                tools.append((id(result), result.get("status"), id(items), texts))
+            elif "toolUse" in block:
+                use = block["toolUse"]
+                tools.append((id(use), id(use.get("input")), len(use.get("input") or ())))
+        return id(content), len(content), tuple(tools)
+    
+    def _convert_one(self, message: Message, shape: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        # Caller holds the lock; holding a reference to the message keeps its id from being reused
+        entry = self._entries.get(id(message))
+        if entry is not None and entry[0] is message and entry[1] == shape:
+            self._entries.move_to_end(id(message))
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        converted = convert_message_to_openai_format(message)
+        self._entries[id(message)] = (message, shape, converted)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return converted
+    
+    def convert(self, messages: Messages) -> List[Dict[str, Any]]:
+        """
+        Convert a message history, reusing earlier conversions.
+        
+        Args:
+            messages: List of messages in Strands format
+        
+        Returns:
+            List of messages in OpenAI format (a new list of shared message dictionaries)
+        """
+        with self._lock:
+            # Length of the unchanged prefix shared with the previous call. The usual case, the
+            # same list with messages appended, is checked by identity at C speed
+            previous = self._prefix_messages
+            if len(messages) >= len(previous) and all(map(operator.is_, messages, previous)):
+                matched = len(previous)
+                # Content blocks are only appended to the newest message while it is built;
+                # tool blocks are edited in place before a retry of the same history
+                recheck = self._prefix_tools if len(messages) == matched else self._prefix_tools[-1:]
+                for i in sorted(set(recheck + [matched - 1])) if matched else ():
+                    if self._shape(messages[i]) != self._prefix[i][1]:
+                        matched = i
+                        break
+            else:
+                matched = 0
+                for message, (previous_message, shape, _) in zip(messages, self._prefix):
+                    if message is not previous_message or self._shape(message) != shape:
+                        break
+                    matched += 1
+            self.hits += matched
             
-            for item in message.get("content", []):
-                if "text" in item:
-                    message_content.append({"type": "text", "text": item["text"]})
-                elif "toolUse" in item:
-                    has_tool_calls = True
-                    tool_call = item["toolUse"]
-                    tool_calls = {
-                        "id": tool_call.get("toolUseId", ""),
-                        "type": "function",
-                        "function": {
-                            "name": tool_call.get("name", ""),
-                            "arguments": json.dumps(tool_call.get("input", {}))
-                        }
-                    }
-                    message_content.append({"type": "tool_call", "tool_call": tool_calls})
-                elif "toolResult" in item:
-                    # For tool results in user messages
-                    tool_result = item["toolResult"]
-                    result_text = ""
-                    for content_item in tool_result.get("content", []):
-                        if "text" in content_item:
-                            result_text = content_item["text"]
-                    
-                    openai_messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_result.get("toolUseId", ""),
-                        "content": result_text
-                    })
-                    continue
+            prefix = self._prefix[:matched]
+            output_end = prefix[-1][2] if prefix else 0
+            openai_messages = self._prefix_output[:output_end]
+            tools = [i for i in self._prefix_tools if i < matched]
+            for message in messages[matched:]:
+                shape = self._shape(message)
+                if shape[2]:
+                    tools.append(len(prefix))
+                openai_messages.extend(self._convert_one(message, shape))
+                prefix.append((message, shape, len(openai_messages)))
             
-            # Add message with content if there's any content
-            if message_content:
-                if has_tool_calls:
-                    # For messages with tool calls
-                    msg = {"role": role, "content": "", "tool_calls": []}
-                    for item in message_content:
-                        if item.get("type") == "text":
-                            msg["content"] = item.get("text", "")
-                        elif item.get("type") == "tool_call":
-                            msg["tool_calls"].append(item.get("tool_call", {}))
-                    openai_messages.append(msg)
+            self._prefix = prefix
+            self._prefix_tools = tools
+            self._prefix_messages = previous[:matched] + list(messages[matched:])
+            self._prefix_output = openai_messages
+            return list(openai_messages)
+    
+    def count_tokens(self, openai_messages: List[Dict[str, Any]], model: str) -> int:
+        """
+        Count the prompt tokens of converted messages, tokenizing each message only once.
+        
+        Converted messages are shared between calls, so their counts are memoized
+        by identity and a growing history only tokenizes its new messages.
+        
+        Args:
+            openai_messages: Messages in OpenAI format, usually from convert
+            model: Model whose tokenizer to use
+        
+        Returns:
+            Token count of the messages
+        """
+        total = 0
+        with self._lock:
+            for message in openai_messages:
+                entry = self._token_counts.get(id(message))
+                if entry is not None and entry[0] is message and entry[1] == model:
+                    self._token_counts.move_to_end(id(message))
                 else:
-                    # For regular text messages with complex content
-                    text_content = ""
-                    for item in message_content:
-                        if item.get("type") == "text":
-                            text_content += item.get("text", "")
-                    if text_content:
-                        openai_messages.append({"role": role, "content": text_content})
+                    entry = (message, model, message_tokens(message, model))
+                    self._token_counts[id(message)] = entry
+                    if len(self._token_counts) > self.max_entries:
+                        self._token_counts.popitem(last=False)
+                total += entry[2]
+        return total
+    
+    def clear(self) -> None:
+        """Forget all remembered conversions."""
+        with self._lock:
+            self._entries.clear()
+            self._token_counts.clear()
+            self._prefix = []
+            self._prefix_messages = []
+            self._prefix_output = []
+            self._prefix_tools = []
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report conversion reuse.
         
-        return openai_messages
+        Returns:
+            Dictionary with hit and miss counts, the hit rate and the messages memoized
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,472 @@
+"""
+Request Scheduler - Client-side rate limiting and retries for OpenAI calls.
+
+Under load the API answers with 429s, and OpenAIDirectModel used to hand every
+one of them back as an error string. The scheduler sits in front of each API
+request and:
+
+- admits requests through requests-per-minute and tokens-per-minute token
+  buckets, so the process stays under its quota instead of discovering it
+- serves priority lanes in order ("interactive" before "batch"), so a batch
+  backlog never delays a user waiting at the CLI
+- retries 429s, timeouts and 5xx responses with jittered exponential backoff,
+  honouring the server's Retry-After header and pausing all lanes while it applies
+- reports queue depth, admission waits, throttles and retries
+
+Threads wait in acquire/run; coroutines wait in aacquire/arun without blocking
+their event loop, in the same queue.
+
+Limits can be set with OPENAI_RPM_LIMIT and OPENAI_TPM_LIMIT (unset or 0 means
+no client-side limit; retries still apply).
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import email.utils
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Sequence, TypeVar
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_LANES = ("interactive", "batch")
+
+# Seconds between queue checks for async waiters that are not at the head of the queue
+ASYNC_POLL_INTERVAL = 0.01
+
+_current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("scheduling_lane", default="interactive")
+
+# Errors worth retrying: throttling, timeouts, dropped connections and server errors
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def current_lane() -> str:
+    """Return the priority lane for requests made in the current context."""
+    return _current_lane.get()
+
+
+@contextlib.contextmanager
+def scheduling_lane(lane: str) -> Iterator[None]:
+    """
+    Send model requests made within the block (and threads started from its context) in a lane.
+
+    Args:
+        lane: Priority lane name, e.g. "batch"
+    """
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            per_minute: Refill rate in tokens per minute
+            capacity: Maximum burst size (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Return the seconds until amount tokens are available (0 if they are now)."""
+        self._refill()
+        # A request larger than the bucket waits for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens out of the bucket; the balance may go negative for corrections."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens, e.g. when a request used fewer than estimated."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested delay from an API error's response headers.
+
+    Args:
+        error: Exception raised by the OpenAI SDK
+
+    Returns:
+        Seconds to wait, or None if the response carries no usable Retry-After
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        parsed = email.utils.parsedate_tz(retry_after)
+        if parsed is None:
+            return None
+        return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RequestScheduler:
+    """Thread-safe admission control, priority lanes and retries for API requests."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        lanes: Sequence[str] = DEFAULT_LANES,
+        burst_seconds: float = 60.0,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Client-side request limit (defaults to OPENAI_RPM_LIMIT; None/0 for no limit)
+            tokens_per_minute: Client-side token limit (defaults to OPENAI_TPM_LIMIT; None/0 for no limit)
+            lanes: Priority lanes, highest priority first
+            burst_seconds: Size of each bucket in seconds of its rate; the default lets a
+                full minute's quota go out at once, smaller values pace requests evenly
+            max_retries: Retries per request after the first attempt
+            base_delay: Backoff delay in seconds before the first retry; doubles per retry
+            max_delay: Cap on a single backoff delay
+            jitter: Fraction of each backoff delay that is randomized, so retries spread out
+        """
+        if requests_per_minute is None:
+            requests_per_minute = float(os.environ.get("OPENAI_RPM_LIMIT", "0"))
+        if tokens_per_minute is None:
+            tokens_per_minute = float(os.environ.get("OPENAI_TPM_LIMIT", "0"))
+        self.request_bucket = (
+            TokenBucket(requests_per_minute, max(1.0, requests_per_minute * burst_seconds / 60)) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute, max(1.0, tokens_per_minute * burst_seconds / 60)) if tokens_per_minute else None
+        )
+        self.lanes = list(lanes)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+        self._cond = threading.Condition()
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._queue_depth: Counter = Counter()
+        self._peak_queue_depth: Counter = Counter()
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+        self._wait_totals: Dict[str, float] = defaultdict(float)
+        self._wait_max: Dict[str, float] = defaultdict(float)
+
+    def _lane_rank(self, lane: str) -> int:
+        if lane not in self.lanes:
+            raise ValueError(f"Unknown priority lane '{lane}', expected one of {self.lanes}")
+        return self.lanes.index(lane)
+
+    def _admission_wait(self, tokens: float) -> float:
+        # Caller holds the condition lock
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.wait_time(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.wait_time(tokens))
+        return wait
+
+    def _enqueue(self, lane: str) -> tuple:
+        # Caller holds the condition lock
+        entry = (self._lane_rank(lane), next(self._sequence))
+        heapq.heappush(self._queue, entry)
+        self._queue_depth[lane] += 1
+        self._peak_queue_depth[lane] = max(self._peak_queue_depth[lane], self._queue_depth[lane])
+        return entry
+
+    def _admit(self, tokens: float) -> None:
+        # Caller holds the condition lock and its entry is at the head of the queue
+        heapq.heappop(self._queue)
+        if self.request_bucket is not None:
+            self.request_bucket.consume(1)
+        if self.token_bucket is not None:
+            self.token_bucket.consume(tokens)
+
+    def _dequeue(self, entry: tuple, lane: str, admitted: bool, start: float) -> float:
+        # Caller holds the condition lock
+        if not admitted and entry in self._queue:
+            # Leave the queue cleanly if the waiter is interrupted
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+        self._queue_depth[lane] -= 1
+        self._cond.notify_all()
+        waited = time.monotonic() - start
+        if admitted:
+            self._counters[lane]["admitted"] += 1
+            self._wait_totals[lane] += waited
+            self._wait_max[lane] = max(self._wait_max[lane], waited)
+        return waited
+
+    def acquire(self, tokens: float = 0, lane: str = "interactive") -> float:
+        """
+        Block until a request may be sent.
+
+        Requests are admitted strictly by lane priority, and in arrival order
+        within a lane, once both buckets have room.
+
+        Args:
+            tokens: Estimated tokens the request will use (prompt plus completion)
+            lane: Priority lane
+
+        Returns:
+            Seconds spent waiting for admission
+        """
+        start = time.monotonic()
+        admitted = False
+        with self._cond:
+            entry = self._enqueue(lane)
+            try:
+                while True:
+                    if self._queue[0] == entry:
+                        wait = self._admission_wait(tokens)
+                        if wait <= 0:
+                            break
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+                self._admit(tokens)
+                admitted = True
+            finally:
+                waited = self._dequeue(entry, lane, admitted, start)
+        return waited
+
+    async def aacquire(self, tokens: float = 0, lane: str = "interactive") -> float:
+        """
+        Wait on the event loop until a request may be sent.
+
+        Async waiters share the queue, lanes and buckets with threads calling
+        acquire. They cannot wait on the condition, so a waiter that is not at
+        the head of the queue checks again every ASYNC_POLL_INTERVAL seconds.
+
+        Args:
+            tokens: Estimated tokens the request will use (prompt plus completion)
+            lane: Priority lane
+
+        Returns:
+            Seconds spent waiting for admission
+        """
+        start = time.monotonic()
+        admitted = False
+        with self._cond:
+            entry = self._enqueue(lane)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._admission_wait(tokens) if self._queue[0] == entry else ASYNC_POLL_INTERVAL
+                    if wait <= 0:
+                        self._admit(tokens)
+                        admitted = True
+                        break
+                await asyncio.sleep(min(wait, ASYNC_POLL_INTERVAL))
+        finally:
+            with self._cond:
+                waited = self._dequeue(entry, lane, admitted, start)
+        return waited
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: float) -> None:
+        """
+        Correct the token bucket once a request's real usage is known.
+
+        Args:
+            estimated_tokens: Tokens charged at admission
+            actual_tokens: Tokens the API reported
+        """
+        if self.token_bucket is None:
+            return
+        with self._cond:
+            difference = estimated_tokens - actual_tokens
+            if difference > 0:
+                self.token_bucket.refund(difference)
+            elif difference < 0:
+                self.token_bucket.consume(-difference)
+            self._cond.notify_all()
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Compute the delay before a retry.
+
+        Args:
+            attempt: Retry number, starting at 1
+            error: The error being retried; its Retry-After header wins when present
+
+        Returns:
+            Seconds to wait
+        """
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def run(self, fn: Callable[[], T], tokens: float = 0, lane: str = "interactive") -> T:
+        """
+        Run an API call through admission control, retrying retryable errors.
+
+        The request's tokens are charged once, at its first admission; retries
+        only wait for a request slot. The scheduler is the only layer that
+        retries: callers should disable the SDK's own retries and not retry the
+        error raised once these are exhausted.
+
+        Args:
+            fn: Function making one API request
+            tokens: Estimated tokens the request will use
+            lane: Priority lane
+
+        Returns:
+            The result of fn
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any non-retryable error
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens if attempt == 0 else 0, lane)
+            try:
+                return fn()
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                delay = self._retry_delay(e, attempt, lane)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def arun(self, fn: Callable[[], Awaitable[T]], tokens: float = 0, lane: str = "interactive") -> T:
+        """
+        Async counterpart of run: admission waits and backoff sleeps happen on the event loop.
+
+        Args:
+            fn: Function returning an awaitable that makes one API request
+            tokens: Estimated tokens the request will use
+            lane: Priority lane
+
+        Returns:
+            The result of awaiting fn()
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any non-retryable error
+        """
+        attempt = 0
+        while True:
+            await self.aacquire(tokens if attempt == 0 else 0, lane)
+            try:
+                return await fn()
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                delay = self._retry_delay(e, attempt, lane)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, error: Exception, attempt: int, lane: str) -> Optional[float]:
+        """
+        Count a retryable error and decide how long to back off.
+
+        Args:
+            error: The retryable error
+            attempt: Retry number, starting at 1
+            lane: Priority lane of the failed request
+
+        Returns:
+            Seconds to wait before retrying, or None once retries are exhausted
+        """
+        with self._cond:
+            if isinstance(error, openai.RateLimitError):
+                self._counters[lane]["throttled"] += 1
+            if attempt > self.max_retries:
+                self._counters[lane]["failed"] += 1
+                return None
+            self._counters[lane]["retries"] += 1
+        delay = self.backoff_delay(attempt, error)
+        if isinstance(error, openai.RateLimitError):
+            # The whole quota is exhausted, not just this request's: hold every lane
+            with self._cond:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                if retry_after_seconds(error) is not None:
+                    self._counters[lane]["retry_after_honoured"] += 1
+        logger.warning(f"{type(error).__name__} on {lane} request, retry {attempt} in {delay:.2f}s")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report scheduler activity.
+
+        Returns:
+            Dictionary with current and peak queue depth, admissions, admission
+            wait times, throttles, retries and failures per lane
+        """
+        with self._cond:
+            lanes = {}
+            for lane in self.lanes:
+                counts = self._counters[lane]
+                admitted = counts["admitted"]
+                lanes[lane] = {
+                    "queue_depth": self._queue_depth[lane],
+                    "peak_queue_depth": self._peak_queue_depth[lane],
+                    "admitted": admitted,
+                    "avg_wait_ms": round(self._wait_totals[lane] / admitted * 1000, 2) if admitted else 0.0,
+                    "max_wait_ms": round(self._wait_max[lane] * 1000, 2),
+                    "throttled": counts["throttled"],
+                    "retries": counts["retries"],
+                    "retry_after_honoured": counts["retry_after_honoured"],
+                    "failed": counts["failed"],
+                }
+            return {
+                "queue_depth": len(self._queue),
+                "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 3),
+                "lanes": lanes,
+            }
+
+
+# Process-wide scheduler shared by all OpenAIDirectModel instances
+default_scheduler = RequestScheduler()
@@ -0,0 +1,348 @@
+"""
+Pre-Router - Local classifier that routes clear-cut queries straight to a specialist.
+
+The orchestrator spends a full LLM round-trip just to pick one of four
+specialists. For queries that obviously belong to one domain, a small hashed
+n-gram Naive Bayes model trained on labelled examples makes the same choice
+locally. Queries below the confidence threshold fall back to the orchestrator.
+"""
+
+import logging
+import math
+import re
+import threading
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Labelled routing examples, one domain per query
+ROUTING_EXAMPLES: List[Tuple[str, str]] = [
+    # Market Analyst
+    ("What are the current trends in tech stocks?", "market_analyst"),
+    ("Can you analyze the performance of AAPL over the last month?", "market_analyst"),
+    ("What's the outlook for the banking sector?", "market_analyst"),
+    ("How did the S&P 500 perform this week?", "market_analyst"),
+    ("Is NVDA stock overvalued after the earnings report?", "market_analyst"),
+    ("What do rising interest rates mean for the stock market?", "market_analyst"),
+    ("Show me the price history of MSFT for the last 6 months", "market_analyst"),
+    ("What economic indicators should I watch this quarter?", "market_analyst"),
+    ("How is inflation data affecting market sentiment?", "market_analyst"),
+    ("Why did TSLA shares drop today?", "market_analyst"),
+    ("Summarize the latest financial news about the energy sector", "market_analyst"),
+    ("What is the stock price trend for GOOGL?", "market_analyst"),
+    ("Which industries are outperforming in the current market?", "market_analyst"),
+    ("What is the forecast for GDP growth and its impact on equities?", "market_analyst"),
+    # Portfolio Manager
+    ("Can you analyze a portfolio with 30% AAPL, 25% MSFT, 25% GOOGL, and 20% AMZN?", "portfolio_manager"),
+    ("What's an appropriate asset allocation for a conservative investor nearing retirement?", "portfolio_manager"),
+    ("How can I optimize my portfolio for higher returns while maintaining moderate risk?", "portfolio_manager"),
+    ("How should I diversify my investments across asset classes?", "portfolio_manager"),
+    ("What is the Sharpe ratio of my portfolio?", "portfolio_manager"),
+    ("Should I rebalance my portfolio toward more bonds?", "portfolio_manager"),
+    ("What allocation between stocks and bonds suits an aggressive investor?", "portfolio_manager"),
+    ("How do I build a retirement portfolio with index funds?", "portfolio_manager"),
+    ("Is my portfolio too concentrated in technology holdings?", "portfolio_manager"),
+    ("What is a good investment strategy for a 30 year old?", "portfolio_manager"),
+    ("How do I benchmark my portfolio performance?", "portfolio_manager"),
+    ("What is the risk and volatility of a 60/40 portfolio?", "portfolio_manager"),
+    ("Compare ETFs and mutual funds as investment vehicles for my savings", "portfolio_manager"),
+    ("How much should I allocate to international equities for diversification?", "portfolio_manager"),
+    # Compliance Officer
+    ("What are the key SEC regulations for individual investors?", "compliance_officer"),
+    ("Can you explain the rules around insider trading?", "compliance_officer"),
+    ("What compliance considerations are there for retirement account withdrawals?", "compliance_officer"),
+    ("What are FINRA rules on pattern day trading?", "compliance_officer"),
+    ("Is it legal to trade on information from a company insider?", "compliance_officer"),
+    ("What disclosure requirements apply to investment advisers?", "compliance_officer"),
+    ("Explain the Basel III capital requirements for banks", "compliance_officer"),
+    ("What anti-money laundering regulations apply to brokers?", "compliance_officer"),
+    ("What is the fiduciary duty of a financial advisor under the law?", "compliance_officer"),
+    ("What are the know your customer KYC requirements for opening an account?", "compliance_officer"),
+    ("Which regulatory body oversees broker-dealers?", "compliance_officer"),
+    ("What are the legal penalties for market manipulation?", "compliance_officer"),
+    ("What does Regulation Best Interest require from brokers?", "compliance_officer"),
+    ("What are the wash sale rule compliance risks for a trading firm?", "compliance_officer"),
+    # Tax Specialist
+    ("What would be my estimated taxes on an income of $150,000 with $20,000 in deductions?", "tax_specialist"),
+    ("How are capital gains taxed compared to regular income?", "tax_specialist"),
+    ("What tax strategies can help minimize my investment taxes?", "tax_specialist"),
+    ("What is the 2024 standard deduction for married filers?", "tax_specialist"),
+    ("How much tax will I pay on $120k filing single?", "tax_specialist"),
+    ("Can I deduct my home office expenses?", "tax_specialist"),
+    ("What is tax-loss harvesting and how does it reduce taxes?", "tax_specialist"),
+    ("What are the tax brackets for head of household filers?", "tax_specialist"),
+    ("Are dividends taxed differently from interest income?", "tax_specialist"),
+    ("What tax credits are available for education expenses?", "tax_specialist"),
+    ("When is the deadline for filing my federal tax return?", "tax_specialist"),
+    ("How are Roth IRA conversions taxed?", "tax_specialist"),
+    ("What is my effective tax rate on $90,000 of income?", "tax_specialist"),
+    ("Do I owe estimated quarterly taxes on freelance income?", "tax_specialist"),
+]
+
+# Held-out labelled queries for the routing-accuracy report
+ROUTING_EVAL_EXAMPLES: List[Tuple[str, str]] = [
+    ("How has AMZN stock moved over the past year?", "market_analyst"),
+    ("What is the market outlook for semiconductor stocks?", "market_analyst"),
+    ("Are bank stocks a good bet given the latest economic data?", "market_analyst"),
+    ("What caused the sell-off in the market yesterday?", "market_analyst"),
+    ("How should I allocate my 401k between stocks and bonds?", "portfolio_manager"),
+    ("Is a portfolio of 50% VTI and 50% BND diversified enough?", "portfolio_manager"),
+    ("What is the expected return and risk of my portfolio?", "portfolio_manager"),
+    ("How often should I rebalance my investments?", "portfolio_manager"),
+    ("What are the SEC rules on insider trading disclosures?", "compliance_officer"),
+    ("What regulations govern robo-advisors?", "compliance_officer"),
+    ("What are the FINRA suitability requirements?", "compliance_officer"),
+    ("Is front running illegal for brokers?", "compliance_officer"),
+    ("How much federal tax do I owe on $75,000 income?", "tax_specialist"),
+    ("What deductions can a married couple claim?", "tax_specialist"),
+    ("How are short-term capital gains taxed?", "tax_specialist"),
+    ("Is my IRA contribution tax deductible?", "tax_specialist"),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.][a-z0-9]+)*")
+_NUMBER_RE = re.compile(r"[0-9.]+k?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase a query and split it into word tokens, collapsing amounts to <num>."""
+    return ["<num>" if _NUMBER_RE.fullmatch(token) else token for token in _TOKEN_RE.findall(text.lower())]
+
+
+class HashedNgramClassifier:
+    """Multinomial Naive Bayes over hashed word unigrams and bigrams."""
+
+    def __init__(self, n_features: int = 2 ** 18, alpha: float = 0.5, sharpness: float = 4.0):
+        """
+        Initialize the classifier.
+
+        Args:
+            n_features: Number of hash buckets for n-gram features
+            alpha: Laplace smoothing constant
+            sharpness: Scale applied to the per-token log-likelihood before the
+                softmax; higher values give more confident probabilities
+        """
+        self.n_features = n_features
+        self.alpha = alpha
+        self.sharpness = sharpness
+        self.labels: List[str] = []
+        self._feature_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._total_counts: Dict[str, int] = Counter()
+        self._class_counts: Dict[str, int] = Counter()
+        self._vocabulary: set = set()
+
+    def _features(self, text: str) -> List[int]:
+        tokens = tokenize(text)
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in grams]
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "HashedNgramClassifier":
+        """
+        Train the classifier on labelled examples.
+
+        Args:
+            examples: Iterable of (query, label) pairs
+
+        Returns:
+            The trained classifier
+        """
+        for text, label in examples:
+            features = self._features(text)
+            self._feature_counts[label].update(features)
+            self._total_counts[label] += len(features)
+            self._class_counts[label] += 1
+            self._vocabulary.update(features)
+        self.labels = sorted(self._class_counts)
+        return self
+
+    def evidence(self, text: str) -> int:
+        """Return how many of a query's n-grams were seen in training."""
+        return sum(1 for f in self._features(text) if f in self._vocabulary)
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """
+        Score a query against every label.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Dictionary mapping each label to its probability
+        """
+        if not self.labels:
+            raise ValueError("Classifier has not been trained")
+
+        # Only features seen in training carry evidence
+        features = [f for f in self._features(text) if f in self._vocabulary]
+        if not features:
+            return {label: 1.0 / len(self.labels) for label in self.labels}
+
+        total_examples = sum(self._class_counts.values())
+        vocabulary_size = len(self._vocabulary)
+        scores = {}
+        for label in self.labels:
+            counts = self._feature_counts[label]
+            denominator = self._total_counts[label] + self.alpha * vocabulary_size
+            log_likelihood = sum(math.log((counts[f] + self.alpha) / denominator) for f in features)
+            # Average per feature so long queries are not automatically over-confident
+            scores[label] = (
+                math.log(self._class_counts[label] / total_examples) / len(features)
+                + log_likelihood / len(features)
+            ) * self.sharpness
+
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        norm = sum(exp_scores.values())
+        return {label: value / norm for label, value in exp_scores.items()}
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of pre-routing a single query."""
+
+    specialist: Optional[str]
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def routed(self) -> bool:
+        """True if the query goes straight to a specialist."""
+        return self.specialist is not None
+
+
+class PreRouter:
+    """Routes high-confidence queries to a specialist and counts saved LLM hops."""
+
+    def __init__(
+        self,
+        min_confidence: float = 0.8,
+        thresholds: Optional[Dict[str, float]] = None,
+        examples: Optional[Sequence[Tuple[str, str]]] = None,
+        classifier: Optional[HashedNgramClassifier] = None,
+        min_evidence: int = 2,
+    ):
+        """
+        Initialize the pre-router.
+
+        Args:
+            min_confidence: Default probability required to skip the orchestrator
+            thresholds: Optional per-specialist overrides of min_confidence
+            examples: Labelled (query, specialist) examples (defaults to ROUTING_EXAMPLES)
+            classifier: Pre-trained classifier to use instead of training one
+            min_evidence: Known n-grams a query needs before it can skip the orchestrator;
+                scores are averaged per n-gram, so one shared word (e.g. "there" in
+                "Hello there") would otherwise look as certain as a whole sentence
+        """
+        self.min_confidence = min_confidence
+        self.min_evidence = min_evidence
+        self.thresholds = dict(thresholds or {})
+        self.classifier = classifier or HashedNgramClassifier().fit(examples or ROUTING_EXAMPLES)
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.fallbacks = 0
+        self.routed_by_specialist: Dict[str, int] = Counter()
+
+    def threshold_for(self, specialist: str) -> float:
+        """Return the confidence threshold for a specialist."""
+        return self.thresholds.get(specialist, self.min_confidence)
+
+    def classify(self, query: str) -> RouteDecision:
+        """
+        Decide where a query should go without updating the counters.
+
+        Args:
+            query: The user's query
+
+        Returns:
+            RouteDecision with the specialist, or None to fall back to the orchestrator
+        """
+        scores = self.classifier.predict_proba(query)
+        best = max(scores, key=scores.get)
+        confidence = scores[best]
+        confident = confidence >= self.threshold_for(best)
+        specialist = best if confident and self.classifier.evidence(query) >= self.min_evidence else None
+        return RouteDecision(specialist=specialist, confidence=confidence, scores=scores)
+
+    def route(self, query: str) -> RouteDecision:
+        """
+        Decide where a query should go and record the outcome.
+
+        Args:
+            query: The user's query
+
+        Returns:
+            RouteDecision with the specialist, or None to fall back to the orchestrator
+        """
+        decision = self.classify(query)
+        with self._lock:
+            if decision.routed:
+                self.routed += 1
+                self.routed_by_specialist[decision.specialist] += 1
+            else:
+                self.fallbacks += 1
+        logger.info(
+            f"Pre-router: {decision.specialist or 'orchestrator'} (confidence {decision.confidence:.2f})"
+        )
+        return decision
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Report routing counters.
+
+        Returns:
+            Dictionary with routed and fallback counts and the number of LLM hops saved
+        """
+        with self._lock:
+            total = self.routed + self.fallbacks
+            return {
+                "routed": self.routed,
+                "fallbacks": self.fallbacks,
+                "llm_hops_saved": self.routed,
+                "routed_rate": self.routed / total if total else 0.0,
+                "routed_by_specialist": dict(self.routed_by_specialist),
+            }
+
+    def accuracy_report(self, examples: Optional[Sequence[Tuple[str, str]]] = None) -> Dict[str, object]:
+        """
+        Evaluate routing on labelled queries at the current thresholds.
+
+        Args:
+            examples: Labelled (query, specialist) pairs (defaults to ROUTING_EVAL_EXAMPLES)
+
+        Returns:
+            Dictionary with coverage, accuracy of routed queries, top-1 accuracy,
+            per-specialist precision/recall and the confusion counts
+        """
+        examples = list(examples or ROUTING_EVAL_EXAMPLES)
+        confusion: Dict[str, Counter] = defaultdict(Counter)
+        routed = correct_routed = correct_top1 = 0
+        for query, label in examples:
+            decision = self.classify(query)
+            top1 = max(decision.scores, key=decision.scores.get)
+            correct_top1 += top1 == label
+            predicted = decision.specialist or "orchestrator"
+            confusion[label][predicted] += 1
+            if decision.routed:
+                routed += 1
+                correct_routed += decision.specialist == label
+
+        per_specialist = {}
+        for specialist in self.classifier.labels:
+            predicted = sum(confusion[label][specialist] for label in confusion)
+            actual = sum(confusion[specialist].values())
+            hits = confusion[specialist][specialist]
+            per_specialist[specialist] = {
+                "precision": hits / predicted if predicted else None,
+                "recall": hits / actual if actual else None,
+            }
+
+        return {
+            "examples": len(examples),
+            "coverage": routed / len(examples) if examples else 0.0,
+            "routed_accuracy": correct_routed / routed if routed else None,
+            "top1_accuracy": correct_top1 / len(examples) if examples else 0.0,
+            "per_specialist": per_specialist,
+            "confusion": {label: dict(counts) for label, counts in confusion.items()},
+        }
@@ -0,0 +1,622 @@
+"""
+Semantic Cache - Serves paraphrased specialist questions from earlier answers.
+
+The exact-match response cache only helps when a query normalizes to the same
+text. "tax on $120k single" and "how much tax for 120000 income filing single"
+ask the same thing but share no key. This cache embeds each query locally with a
+hashed n-gram vectorizer (no network, no model download), keeps the vectors in a
+NumPy matrix, and answers a lookup with the most similar earlier query in the
+same namespace when its cosine similarity clears a threshold.
+
+Similar wording is not enough on its own: "tax on $120k" and "tax on $90k", or
+"rebalance toward bonds" and "rebalance toward stocks", are near neighbours but
+need different answers. A hit therefore also requires the numbers and tickers in
+both queries to agree exactly, and rejects pairs where each query has a content
+word the other lacks (a substitution rather than a rewording).
+
+The index is bounded (expired entries go first, then the least recently used),
+and can be saved to and reloaded from a single ``.npz`` file.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_AMOUNT_RE = re.compile(r"\$?(\d+(?:\.\d+)?)\s*(k|m|mm|bn)?\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_TICKER_RE = re.compile(r"\b[A-Z]{2,5}\b")
+_MULTIPLIERS = {"k": 1e3, "m": 1e6, "mm": 1e6, "bn": 1e9}
+
+# Words that carry no meaning for matching a financial question
+STOPWORDS = frozenset(
+    "a about am an and any are around as at be can compared could describe do does doing explain "
+    "for from get give has have how i if in is it its know me much my need of on or our please "
+    "should show some tell that the there this to versus vs was we what whats when which will "
+    "with would you your".split()
+)
+
+# Content words are compared on this many leading characters, which absorbs stemming misses
+_TERM_KEY_LENGTH = 5
+
+# Labelled (seed query, probe query, same answer?) pairs for the precision/hit-rate report.
+# The negatives are deliberately close: same wording with a different amount, ticker,
+# year or action.
+SEMANTIC_EVAL_PAIRS: List[Tuple[str, str, bool]] = [
+    # Paraphrases
+    ("tax on $120k single", "how much tax for 120000 income filing single", True),
+    ("What is the standard deduction for married filers in 2024?",
+     "2024 standard deduction married filing jointly", True),
+    ("How are capital gains taxed compared to regular income?",
+     "capital gains tax vs ordinary income tax", True),
+    ("What is my effective tax rate on $90,000 of income?", "effective tax rate for 90k income", True),
+    ("How is AAPL doing in the market this month?", "how has AAPL stock performed this month", True),
+    ("Show me the price history of MSFT for the last 6 months", "MSFT price history last 6 months", True),
+    ("What is the outlook for NVDA stock?", "NVDA stock outlook", True),
+    ("Can you explain the rules around insider trading?", "explain insider trading rules", True),
+    ("What are FINRA rules on pattern day trading?", "FINRA pattern day trading rules", True),
+    ("What is the wash sale rule?", "explain the wash sale rule", True),
+    ("How should I rebalance my portfolio toward more bonds?", "rebalancing my portfolio toward more bonds", True),
+    ("What is a good asset allocation for a conservative investor nearing retirement?",
+     "asset allocation for conservative investor near retirement", True),
+    ("How do I diversify my investments across asset classes?",
+     "how to diversify investments across different asset classes", True),
+    ("What is tax-loss harvesting?", "explain tax loss harvesting", True),
+    ("Are dividends taxed differently from interest income?",
+     "are dividends and interest income taxed differently", True),
+    ("How are Roth IRA conversions taxed?", "taxes on a Roth IRA conversion", True),
+    ("What tax credits are available for education expenses?", "education expense tax credits available", True),
+    ("Do I owe estimated quarterly taxes on freelance income?",
+     "do I need to pay quarterly estimated tax on freelance income", True),
+    # Near misses that need a different answer
+    ("tax on $120k single", "tax on $90k single", False),
+    ("What is the standard deduction for married filers in 2024?",
+     "What is the standard deduction for married filers in 2023?", False),
+    ("How is AAPL doing in the market this month?", "How is MSFT doing in the market this month?", False),
+    ("Show me the price history of MSFT for the last 6 months",
+     "Show me the price history of MSFT for the last 12 months", False),
+    ("What is my effective tax rate on $90,000 of income?", "What is my marginal tax rate on $90,000 of income?",
+     False),
+    ("How should I rebalance my portfolio toward more bonds?", "How should I rebalance my portfolio toward more stocks?",
+     False),
+    ("What are FINRA rules on pattern day trading?", "What are SEC rules on pattern day trading?", False),
+    ("How are capital gains taxed compared to regular income?", "How are dividends taxed compared to regular income?",
+     False),
+    ("Can you explain the rules around insider trading?", "Can you explain the rules around front running?", False),
+    ("What is a good asset allocation for a conservative investor nearing retirement?",
+     "What is a good asset allocation for an aggressive investor starting out?", False),
+    ("What is the wash sale rule?", "What is the pattern day trader rule?", False),
+    ("How are Roth IRA conversions taxed?", "How are traditional IRA withdrawals taxed?", False),
+    ("Do I owe estimated quarterly taxes on freelance income?", "Do I owe estimated quarterly taxes on rental income?",
+     False),
+    ("What tax credits are available for education expenses?", "What tax credits are available for child care?",
+     False),
+]
+
+
+def _canonical_amount(match: "re.Match") -> str:
+    value = float(match.group(1)) * _MULTIPLIERS.get((match.group(2) or "").lower(), 1)
+    return f"{value:g}" if value < 1e15 else match.group(1)
+
+
+def _stem(token: str) -> str:
+    # Crude suffix stripping so "taxes", "taxed" and "tax" share features
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) >= len(suffix) + 3 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Reduce a query to its content words, with amounts written out in full.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Lowercased, stemmed content words; "$120k" and "120,000" both become "120000"
+    """
+    text = _AMOUNT_RE.sub(lambda m: f" {_canonical_amount(m)} ", _THOUSANDS_RE.sub("", query.lower()))
+    return [_stem(token) for token in _TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def query_entities(query: str) -> FrozenSet[str]:
+    """
+    Extract the amounts and tickers that must match for two queries to share an answer.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Frozen set of canonical amounts and upper-case tickers
+    """
+    text = _THOUSANDS_RE.sub("", query)
+    amounts = {_canonical_amount(m) for m in _AMOUNT_RE.finditer(text)}
+    return frozenset(amounts | set(_TICKER_RE.findall(text)))
+
+
+def term_keys(query: str) -> FrozenSet[str]:
+    """
+    Reduce a query to the set of its content words for the substitution check.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Frozen set of content-word prefixes
+    """
+    return frozenset(term[:_TERM_KEY_LENGTH] for term in query_terms(query))
+
+
+def is_substitution(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    """
+    Check whether two queries swap content words rather than add or drop some.
+
+    "tax on 120000 single" vs "tax for 120000 income filing single" only adds words,
+    but "rebalance toward more bonds" vs "rebalance toward more stocks" replaces one,
+    which usually changes the question.
+
+    Args:
+        a: term_keys of the first query
+        b: term_keys of the second query
+
+    Returns:
+        True if each query has a content word the other lacks
+    """
+    return bool(a - b) and bool(b - a)
+
+
+class HashedNgramEmbedder:
+    """Embeds text as an L2-normalized vector of signed, hashed word and character n-grams."""
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 10,
+        bigram_weight: float = 0.5,
+        char_weight: float = 0.3,
+        char_ngram: int = 3,
+    ):
+        """
+        Initialize the embedder.
+
+        Args:
+            n_features: Dimension of the embedding
+            bigram_weight: Weight of word bigrams relative to single words
+            char_weight: Weight of character n-grams, which match word variants
+                and typos the stemmer misses
+            char_ngram: Character n-gram length
+        """
+        self.n_features = n_features
+        self.bigram_weight = bigram_weight
+        self.char_weight = char_weight
+        self.char_ngram = char_ngram
+
+    def _add(self, vector: np.ndarray, feature: str, weight: float) -> None:
+        h = zlib.crc32(feature.encode("utf-8"))
+        # The top bit picks the sign so collisions cancel out on average instead of piling up
+        vector[h % self.n_features] += weight if h & 0x80000000 else -weight
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed one query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            float32 vector of length n_features with unit norm (all zeros for an empty query)
+        """
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        terms = query_terms(text)
+        for term in terms:
+            self._add(vector, term, 1.0)
+            padded = f"<{term}>"
+            grams = [padded[i:i + self.char_ngram] for i in range(len(padded) - self.char_ngram + 1)]
+            for gram in grams:
+                # Spread each word's character weight over its n-grams so long words do not dominate
+                self._add(vector, f"#{gram}", self.char_weight / len(grams))
+        for a, b in zip(terms, terms[1:]):
+            self._add(vector, f"{a} {b}", self.bigram_weight)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed several queries into a (len(texts), n_features) matrix."""
+        return np.stack([self.embed(text) for text in texts]) if texts else np.zeros((0, self.n_features), np.float32)
+
+
+@dataclass
+class SemanticEntry:
+    """A cached answer and the query it was given for."""
+
+    query: str
+    specialist: str
+    entities: FrozenSet[str]
+    terms: FrozenSet[str]
+    response: str
+
+
+@dataclass
+class SemanticMatch:
+    """Result of a successful semantic lookup."""
+
+    response: str
+    query: str
+    similarity: float
+
+
+class SemanticCache:
+    """Thread-safe, bounded NumPy vector index of specialist answers with similarity lookup."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_entries: int = 2048,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60 * 60,
+        embedder: Optional[HashedNgramEmbedder] = None,
+        path: Optional[Union[str, Path]] = None,
+        save_every: int = 16,
+        candidates: int = 4,
+        allow_substitutions: bool = False,
+        specialists: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of entries in the index
+            ttls: Per-specialist TTLs in seconds; 0 opts a specialist out
+            default_ttl: TTL for specialists missing from ``ttls``
+            embedder: Query embedder (defaults to a HashedNgramEmbedder)
+            path: Optional ``.npz`` file the index is loaded from and saved to
+            save_every: Save to ``path`` after this many new entries (and at exit)
+            candidates: Number of nearest neighbours checked for matching entities
+            allow_substitutions: Accept hits where each query has a content word the
+                other lacks, relying on the similarity threshold alone
+            specialists: Only cache answers of these specialists (all when None)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.path = Path(path) if path else None
+        self.save_every = save_every
+        self.candidates = candidates
+        self.allow_substitutions = allow_substitutions
+        self.specialists: Optional[FrozenSet[str]] = None if specialists is None else frozenset(specialists)
+        self.enabled = True
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max_entries, self.embedder.n_features), dtype=np.float32)
+        # Per-row namespace id (-1 for a free row), expiry and last use, all wall-clock seconds
+        self._namespaces = np.full(max_entries, -1, dtype=np.int32)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._entries: List[Optional[SemanticEntry]] = [None] * max_entries
+        self._namespace_ids: Dict[str, int] = {}
+        self._free = list(range(max_entries - 1, -1, -1))
+        # Rows are handed out lowest first, so only rows below this mark ever hold entries
+        self._high_water = 0
+        self._unsaved = 0
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+        self._similarity_sum = 0.0
+
+        if self.path:
+            if self.path.exists():
+                self.load(self.path)
+            atexit.register(self.save)
+
+    def ttl_for(self, specialist: str) -> float:
+        """Return the TTL in seconds for a specialist (0 means not cached)."""
+        if self.specialists is not None and specialist not in self.specialists:
+            return 0
+        return self.ttls.get(specialist, self.default_ttl)
+
+    def get(self, query: str, namespace: str, specialist: str) -> Optional[SemanticMatch]:
+        """
+        Find the answer to the most similar earlier query in a namespace.
+
+        Args:
+            query: Raw query text
+            namespace: Partition key; only entries stored under the same one can match
+                (callers include the specialist, model and prompt hash)
+            specialist: Specialist name (for metrics)
+
+        Returns:
+            The best match above the threshold whose amounts and tickers agree and that
+            is not a word substitution, or None (always for specialists that are not cached)
+        """
+        if self.ttl_for(specialist) <= 0:
+            return None
+        vector = self.embedder.embed(query)
+        entities = query_entities(query)
+        terms = term_keys(query)
+        now = time.time()
+        with self._lock:
+            counts = self._counters[specialist]
+            namespace_id = self._namespace_ids.get(namespace)
+            if namespace_id is None or not vector.any():
+                counts["misses"] += 1
+                return None
+
+            n = self._high_water
+            scores = self._vectors[:n] @ vector
+            scores[(self._namespaces[:n] != namespace_id) | (self._expires[:n] <= now)] = -1.0
+            k = min(self.candidates, len(scores))
+            top = np.argpartition(scores, -k)[-k:]
+            for row in top[np.argsort(scores[top])[::-1]]:
+                similarity = float(scores[row])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[row]
+                if entry.entities != entities:
+                    counts["entity_rejects"] += 1
+                    continue
+                if not self.allow_substitutions and is_substitution(entry.terms, terms):
+                    counts["substitution_rejects"] += 1
+                    continue
+                self._last_used[row] = now
+                counts["hits"] += 1
+                self._similarity_sum += similarity
+                return SemanticMatch(response=entry.response, query=entry.query, similarity=similarity)
+
+            counts["misses"] += 1
+            return None
+
+    def put(self, query: str, namespace: str, specialist: str, response: str) -> None:
+        """
+        Store an answer for its specialist's TTL.
+
+        Args:
+            query: Raw query text
+            namespace: Partition key, as passed to get
+            specialist: Specialist name
+            response: Response text to cache
+        """
+        ttl = self.ttl_for(specialist)
+        if ttl <= 0:
+            return
+        vector = self.embedder.embed(query)
+        if not vector.any():
+            return
+        now = time.time()
+        entry = SemanticEntry(
+            query=query,
+            specialist=specialist,
+            entities=query_entities(query),
+            terms=term_keys(query),
+            response=response,
+        )
+        with self._lock:
+            self._insert(vector, namespace, entry, now + ttl, now)
+            self._counters[specialist]["stores"] += 1
+            self._unsaved += 1
+            save = self.path is not None and self._unsaved >= self.save_every
+        if save:
+            self.save()
+
+    def _insert(self, vector: np.ndarray, namespace: str, entry: SemanticEntry, expires_at: float,
+                last_used: float) -> None:
+        # Caller holds the lock
+        if not self._free:
+            self._evict(time.time())
+        row = self._free.pop()
+        self._high_water = max(self._high_water, row + 1)
+        if namespace not in self._namespace_ids:
+            self._namespace_ids[namespace] = len(self._namespace_ids)
+        self._vectors[row] = vector
+        self._namespaces[row] = self._namespace_ids[namespace]
+        self._expires[row] = expires_at
+        self._last_used[row] = last_used
+        self._entries[row] = entry
+
+    def _evict(self, now: float) -> None:
+        # Caller holds the lock. Reclaim every expired row, or the least recently used one.
+        used = self._namespaces >= 0
+        expired = np.flatnonzero(used & (self._expires <= now))
+        if len(expired):
+            rows, counter = expired, "expired"
+        else:
+            rows, counter = [int(np.argmin(np.where(used, self._last_used, np.inf)))], "evictions"
+        for row in rows:
+            self._counters[self._entries[row].specialist][counter] += 1
+            self._namespaces[row] = -1
+            self._entries[row] = None
+            self._free.append(int(row))
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Write the index to an ``.npz`` file atomically.
+
+        Args:
+            path: Destination (defaults to the cache's path)
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            return
+        with self._lock:
+            rows = np.flatnonzero(self._namespaces >= 0)
+            names = {namespace_id: name for name, namespace_id in self._namespace_ids.items()}
+            meta = [
+                {
+                    "namespace": names[int(self._namespaces[row])],
+                    "query": self._entries[row].query,
+                    "specialist": self._entries[row].specialist,
+                    "response": self._entries[row].response,
+                }
+                for row in rows
+            ]
+            arrays = {
+                "vectors": self._vectors[rows],
+                "expires": self._expires[rows],
+                "last_used": self._last_used[rows],
+                "meta": np.array(json.dumps(meta)),
+            }
+            self._unsaved = 0
+
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to save semantic cache to {path}: {str(e)}")
+
+    def load(self, path: Union[str, Path]) -> int:
+        """
+        Add the unexpired entries of a saved index, most recently used last.
+
+        Args:
+            path: ``.npz`` file written by save
+
+        Returns:
+            Number of entries loaded
+        """
+        try:
+            with np.load(path) as data:
+                vectors, expires, last_used = data["vectors"], data["expires"], data["last_used"]
+                meta = json.loads(str(data["meta"]))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable semantic cache {path}: {str(e)}")
+            return 0
+        if vectors.shape[1:] != (self.embedder.n_features,):
+            logger.warning(f"Ignoring semantic cache {path}: built with a different embedding size")
+            return 0
+
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for row in np.argsort(last_used):
+                if expires[row] <= now:
+                    continue
+                item = meta[row]
+                entry = SemanticEntry(
+                    query=item["query"],
+                    specialist=item["specialist"],
+                    entities=query_entities(item["query"]),
+                    terms=term_keys(item["query"]),
+                    response=item["response"],
+                )
+                self._insert(vectors[row], item["namespace"], entry, float(expires[row]), float(last_used[row]))
+                loaded += 1
+        logger.info(f"Loaded {loaded} semantic cache entries from {path}")
+        return loaded
+
+    def clear(self) -> None:
+        """Drop all entries and reset the metrics."""
+        with self._lock:
+            self._namespaces[:] = -1
+            self._entries = [None] * self.max_entries
+            self._namespace_ids.clear()
+            self._free = list(range(self.max_entries - 1, -1, -1))
+            self._high_water = 0
+            self._counters.clear()
+            self._similarity_sum = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with overall and per-specialist hit rates, entity and
+            substitution rejections, eviction counts and the mean similarity of hits
+        """
+        with self._lock:
+            per_specialist = {}
+            totals: Counter = Counter()
+            for specialist, counts in self._counters.items():
+                lookups = counts["hits"] + counts["misses"]
+                per_specialist[specialist] = {
+                    **counts,
+                    "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+                }
+                totals.update(counts)
+            lookups = totals["hits"] + totals["misses"]
+            return {
+                "entries": self.max_entries - len(self._free),
+                "hits": totals["hits"],
+                "misses": totals["misses"],
+                "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+                "entity_rejects": totals["entity_rejects"],
+                "substitution_rejects": totals["substitution_rejects"],
+                "evictions": totals["evictions"],
+                "expired": totals["expired"],
+                "mean_hit_similarity": self._similarity_sum / totals["hits"] if totals["hits"] else None,
+                "per_specialist": per_specialist,
+            }
+
+
+def evaluate_semantic_cache(
+    threshold: float,
+    pairs: Optional[Sequence[Tuple[str, str, bool]]] = None,
+    embedder: Optional[HashedNgramEmbedder] = None,
+    allow_substitutions: bool = False,
+) -> Dict[str, Any]:
+    """
+    Measure precision and hit rate on labelled query pairs.
+
+    Every seed query is stored with itself as the answer, then every probe query is
+    looked up. A hit is correct when the pair is labelled as the same question and the
+    answer returned is that pair's seed.
+
+    Args:
+        threshold: Similarity threshold to evaluate
+        pairs: Labelled (seed, probe, same answer?) pairs (defaults to SEMANTIC_EVAL_PAIRS)
+        embedder: Embedder to evaluate (defaults to a HashedNgramEmbedder)
+        allow_substitutions: Evaluate without the substitution check
+
+    Returns:
+        Dictionary with hit rate over all probes, recall over paraphrases, precision
+        of hits, the number of wrong answers served and the wrong hits themselves
+    """
+    pairs = list(pairs or SEMANTIC_EVAL_PAIRS)
+    cache = SemanticCache(
+        threshold=threshold,
+        max_entries=max(len(pairs), 1),
+        embedder=embedder,
+        allow_substitutions=allow_substitutions,
+    )
+    for seed in dict.fromkeys(seed for seed, _, _ in pairs):
+        cache.put(seed, "eval", "eval", seed)
+
+    hits = correct = 0
+    wrong = []
+    for seed, probe, same in pairs:
+        match = cache.get(probe, "eval", "eval")
+        if match is None:
+            continue
+        hits += 1
+        if same and match.response == seed:
+            correct += 1
+        else:
+            wrong.append((probe, match.query, round(match.similarity, 3)))
+
+    paraphrases = sum(1 for _, _, same in pairs if same)
+    return {
+        "threshold": threshold,
+        "pairs": len(pairs),
+        "hits": hits,
+        "hit_rate": hits / len(pairs) if pairs else 0.0,
+        "recall": correct / paraphrases if paraphrases else None,
+        "precision": correct / hits if hits else None,
+        "wrong_answers": len(wrong),
+        "wrong_hits": wrong,
+    }
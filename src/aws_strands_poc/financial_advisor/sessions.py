@@ -0,0 +1,382 @@
+"""
+Session Manager - Per-user advisor state for serving many users from one process.
+
+FinancialAdvisor ties one user to one orchestrator agent. The session manager
+creates advisors lazily, keeps the most recently active ones in memory, and
+evicts the rest to compact gzip-compressed JSON snapshots of their conversation.
+An evicted session is restored transparently on the user's next request, and
+its snapshot is then deleted. A snapshot that cannot be read is moved aside to
+a ``.corrupt`` file rather than overwritten by the user's next eviction.
+"""
+
+import base64
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+# Bytes in a conversation (e.g. image or document blocks) are stored as {_BYTES_KEY: base64}
+_BYTES_KEY = "__bytes__"
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON fallback for snapshots: encode bytes and refuse anything else that JSON cannot hold."""
+    if isinstance(value, (bytes, bytearray)):
+        return {_BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot snapshot a value of type {type(value).__name__}")
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    """JSON object hook for snapshots: turn encoded bytes back into bytes."""
+    if len(obj) == 1 and _BYTES_KEY in obj:
+        return base64.b64decode(obj[_BYTES_KEY])
+    return obj
+
+
+class _Timing:
+    """Running count, total and maximum of a latency."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+@dataclass
+class _Session:
+    """An in-memory advisor and its bookkeeping."""
+
+    advisor: FinancialAdvisor
+    last_used: float
+    in_flight: int = 0
+
+
+class SessionManager:
+    """Keeps the N most recently active user sessions in memory and snapshots the rest."""
+
+    def __init__(
+        self,
+        max_sessions: int = 100,
+        idle_timeout: Optional[float] = 30 * 60,
+        snapshot_dir: Union[str, Path] = "./sessions",
+        advisor_factory: Optional[Callable[[str], FinancialAdvisor]] = None,
+    ):
+        """
+        Initialize the session manager.
+
+        Args:
+            max_sessions: Maximum number of sessions kept in memory
+            idle_timeout: Seconds of inactivity after which a session is evicted
+                (None to evict only when over capacity)
+            snapshot_dir: Directory for evicted session snapshots
+            advisor_factory: Function creating an advisor for a user_id
+                (defaults to FinancialAdvisor(user_id=user_id))
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.snapshot_dir = Path(snapshot_dir)
+        self.advisor_factory = advisor_factory or (lambda user_id: FinancialAdvisor(user_id=user_id))
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        # Sessions whose snapshot is being written, with a token per eviction;
+        # a request in the meantime takes them back
+        self._evicting: Dict[str, Tuple[_Session, object]] = {}
+        # Users whose advisor is being created or restored, so only one request loads it
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.RLock()
+        self.created = 0
+        self.evictions = 0
+        self.restores = 0
+        self.restore_failures = 0
+        self._eviction_timing = _Timing()
+        self._restore_timing = _Timing()
+
+    def _snapshot_path(self, user_id: str) -> Path:
+        return self.snapshot_dir / f"{_UNSAFE_FILENAME_RE.sub('_', user_id)}.json.gz"
+
+    def get(self, user_id: str) -> FinancialAdvisor:
+        """
+        Return the advisor for a user, creating or restoring it if needed.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            The user's FinancialAdvisor
+        """
+        while True:
+            with self._lock:
+                session = self._sessions.get(user_id) or self._evicting.pop(user_id, (None, None))[0]
+                if session is not None:
+                    self._sessions[user_id] = session
+                    self._sessions.move_to_end(user_id)
+                    session.last_used = time.time()
+                    return session.advisor
+                loading = self._loading.get(user_id)
+                if loading is None:
+                    loading = self._loading[user_id] = threading.Event()
+                    break
+            # Another request is creating or restoring this session; use theirs
+            loading.wait()
+
+        try:
+            # Build outside the lock so one slow advisor does not stall other users
+            advisor = self.advisor_factory(user_id)
+            restored = self._restore(user_id, advisor)
+            with self._lock:
+                if restored:
+                    self.restores += 1
+                    # The session lives in memory again; a later eviction writes a new snapshot
+                    self._snapshot_path(user_id).unlink(missing_ok=True)
+                else:
+                    self.created += 1
+                self._sessions[user_id] = _Session(advisor=advisor, last_used=time.time())
+                over_capacity = self._over_capacity()
+        finally:
+            with self._lock:
+                del self._loading[user_id]
+            loading.set()
+        for evicted_id in over_capacity:
+            self._try_evict(evicted_id)
+        return advisor
+
+    def query(self, user_id: str, message: str) -> str:
+        """
+        Process a query in the user's session.
+
+        Args:
+            user_id: User identifier
+            message: The user's message or query
+
+        Returns:
+            The advisor's response
+        """
+        session = self._begin(user_id)
+        try:
+            return session.advisor.query(message)
+        finally:
+            self._end(session)
+
+    async def aquery(self, user_id: str, message: str, timeout: Optional[float] = None) -> str:
+        """
+        Process a query in the user's session without blocking the event loop.
+
+        Args:
+            user_id: User identifier
+            message: The user's message or query
+            timeout: Optional number of seconds before the query is abandoned
+
+        Returns:
+            The advisor's response
+        """
+        session = self._begin(user_id)
+        try:
+            return await session.advisor.aquery(message, timeout=timeout)
+        finally:
+            self._end(session)
+
+    def _begin(self, user_id: str) -> _Session:
+        while True:
+            self.get(user_id)
+            with self._lock:
+                session = self._sessions.get(user_id)
+                if session is None:
+                    # Evicted by a concurrent request between get() and now; load it again
+                    continue
+                session.in_flight += 1
+            self.evict_idle()
+            return session
+
+    def _end(self, session: _Session) -> None:
+        with self._lock:
+            session.in_flight -= 1
+            session.last_used = time.time()
+
+    def evict_idle(self) -> int:
+        """
+        Evict sessions that have been inactive for longer than idle_timeout.
+
+        Returns:
+            Number of sessions evicted
+        """
+        if self.idle_timeout is None:
+            return 0
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = [
+                user_id for user_id, session in self._sessions.items()
+                if session.last_used < cutoff and session.in_flight == 0
+            ]
+        return sum(self._try_evict(user_id) for user_id in idle)
+
+    def _over_capacity(self) -> List[str]:
+        # Caller holds the lock; sessions are ordered least recently used first
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return []
+        return [user_id for user_id, session in self._sessions.items() if session.in_flight == 0][:excess]
+
+    def evict(self, user_id: str) -> bool:
+        """
+        Snapshot a session to disk and drop it from memory.
+
+        The conversation is serialized and written outside the manager's lock.
+        A request for the user in the meantime takes the session back, and the
+        snapshot is discarded.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            True if the session was in memory and has been evicted
+
+        Raises:
+            TypeError: If the conversation holds a value that cannot be stored in JSON
+                (the session stays in memory)
+        """
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None or session.in_flight:
+                return False
+            del self._sessions[user_id]
+            eviction = self._evicting[user_id] = (session, object())
+            snapshot = {
+                "user_id": user_id,
+                "saved_at": time.time(),
+                "messages": list(session.advisor.agent.messages),
+            }
+
+        start = time.perf_counter()
+        path = self._snapshot_path(user_id)
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=_encode_value)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                if self._evicting.get(user_id) is eviction:
+                    del self._evicting[user_id]
+                    self._sessions[user_id] = session
+            raise
+
+        with self._lock:
+            if self._evicting.get(user_id) is not eviction:
+                # Taken back by a request while the snapshot was written
+                tmp_path.unlink(missing_ok=True)
+                return False
+            os.replace(tmp_path, path)
+            del self._evicting[user_id]
+            self.evictions += 1
+            self._eviction_timing.add(time.perf_counter() - start)
+        logger.info(f"Evicted session for user_id: {user_id}")
+        return True
+
+    def _try_evict(self, user_id: str) -> bool:
+        """Evict a session on behalf of another request, keeping it in memory if it cannot be snapshotted."""
+        try:
+            return self.evict(user_id)
+        except TypeError as e:
+            logger.error(f"Failed to evict session for user_id {user_id}: {str(e)}")
+            return False
+
+    def _restore(self, user_id: str, advisor: FinancialAdvisor) -> bool:
+        """
+        Load a snapshot into a freshly created advisor, if one exists.
+
+        An unreadable snapshot is renamed to ``<name>.<timestamp>.corrupt`` so it can
+        be inspected, and the user starts a new session.
+        """
+        path = self._snapshot_path(user_id)
+        if not path.exists():
+            return False
+
+        start = time.perf_counter()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f, object_hook=_decode_object)
+            messages = snapshot["messages"]
+            if not isinstance(messages, list):
+                raise ValueError(f"expected a list of messages, got {type(messages).__name__}")
+        except Exception as e:
+            self._quarantine(user_id, path, e)
+            return False
+        advisor.agent.messages = messages
+        with self._lock:
+            self._restore_timing.add(time.perf_counter() - start)
+        logger.info(f"Restored session for user_id: {user_id}")
+        return True
+
+    def _quarantine(self, user_id: str, path: Path, error: Exception) -> None:
+        """Move an unreadable snapshot aside so the next eviction does not overwrite it."""
+        corrupt_path = path.with_name(f"{path.name}.{time.time_ns()}.corrupt")
+        with self._lock:
+            self.restore_failures += 1
+        try:
+            os.replace(path, corrupt_path)
+        except OSError as e:
+            logger.error(f"Failed to restore session for user_id {user_id}: {str(error)}; "
+                         f"could not move the snapshot aside: {str(e)}")
+            return
+        logger.error(f"Failed to restore session for user_id {user_id}: {str(error)}; "
+                     f"snapshot moved to {corrupt_path}")
+
+    def flush(self) -> None:
+        """Snapshot every idle in-memory session, e.g. before shutdown."""
+        with self._lock:
+            user_ids = list(self._sessions)
+        for user_id in user_ids:
+            self._try_evict(user_id)
+
+    @staticmethod
+    def session_bytes(advisor: FinancialAdvisor) -> int:
+        """Estimate the memory held by a session as the size of its serialized conversation."""
+        return len(json.dumps(advisor.agent.messages, separators=(",", ":"), default=_encode_value).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report session usage.
+
+        Returns:
+            Dictionary with session counts (including snapshots that could not be
+            restored), per-session memory estimates and eviction/restore latencies
+        """
+
+        with self._lock:
+            session_bytes = {user_id: self.session_bytes(s.advisor) for user_id, s in self._sessions.items()}
+            return {
+                "active_sessions": len(self._sessions),
+                "created": self.created,
+                "evictions": self.evictions,
+                "restores": self.restores,
+                "restore_failures": self.restore_failures,
+                "session_bytes": session_bytes,
+                "total_session_bytes": sum(session_bytes.values()),
+                "eviction_latency": self._eviction_timing.summary(),
+                "restore_latency": self._restore_timing.summary(),
+            }
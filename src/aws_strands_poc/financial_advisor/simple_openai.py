@@ -5,9 +5,17 @@ Financial Advisor - Simple POC using OpenAI SDK directly.
 import os
 import logging
 import json
-from typing import Dict, List, Optional, Any
+import time
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Any
 from dotenv import load_dotenv
 
+from aws_strands_poc.financial_advisor.history import ConversationHistory
+from aws_strands_poc.financial_advisor.models.cassette import CassetteClient, get_active_cassette
+from aws_strands_poc.financial_advisor.streaming import TokenStream, ToolCallAccumulator
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -20,6 +28,7 @@ logger = logging.getLogger("financial_advisor")
 
 # Import OpenAI SDK
 from openai import OpenAI
+from openai.types.chat import ChatCompletionMessage
 
 # Define tool schemas for the calculator
 CALCULATOR_SCHEMA = {
@@ -70,116 +79,304 @@ class SimpleCalculator:
 class FinancialAdvisor:
     """A simple financial advisor agent using OpenAI directly."""
     
-    def __init__(self, user_id: str = "financial_user", model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        user_id: str = "financial_user",
+        model: str = "gpt-4o-mini",
+        max_history_tokens: int = 4000,
+        max_tool_rounds: int = 5,
+        max_parallel_tools: int = 4,
+        tool_timeout: float = 30.0,
+    ):
         """
         Initialize the Financial Advisor.
         
         Args:
             user_id: Identifier for the user
             model: OpenAI model name
+            max_history_tokens: Prompt token budget; older turns are summarized to stay within it
+            max_tool_rounds: Maximum rounds of tool calls per query; after the last
+                round the model must answer without tools
+            max_parallel_tools: Maximum number of tool calls from one message running at once
+            tool_timeout: Seconds a tool call may take, counted from the start of its
+                round, before its result becomes a timeout error
         """
         self.user_id = user_id
         self.model = model
+        self.max_tool_rounds = max_tool_rounds
+        self.max_parallel_tools = max_parallel_tools
+        self.tool_timeout = tool_timeout
+        
+        # Tools the model may call: name -> (schema, function taking the tool arguments)
+        self.tools: Dict[str, Any] = {}
+        self.tool_timeouts: Dict[str, float] = {}
+        self.register_tool(CALCULATOR_SCHEMA, lambda expression="": SimpleCalculator.calculate(expression))
+        self._tool_pool: Optional[ThreadPoolExecutor] = None
+        self.last_turn_rounds: List[Dict[str, Any]] = []
+        self.last_tool_timings: List[Dict[str, Any]] = []
         
-        # Check for OpenAI API key
+        # Check for OpenAI API key (replaying a cassette needs none)
         api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
+        cassette = get_active_cassette()
+        if not api_key and not (cassette is not None and cassette.replaying):
             raise ValueError("OPENAI_API_KEY environment variable must be set")
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=api_key)
+        # Initialize OpenAI client, recording to or replaying from the active cassette
+        self.client = OpenAI(api_key=api_key) if api_key else None
+        if cassette is not None:
+            self.client = CassetteClient(cassette, self.client)
         
-        # Initialize conversation history
-        self.conversation_history = [
-            {"role": "system", "content": FINANCIAL_ADVISOR_PROMPT}
-        ]
+        # Initialize conversation history, bounded to the prompt token budget
+        self.conversation_history = ConversationHistory(
+            FINANCIAL_ADVISOR_PROMPT, max_tokens=max_history_tokens, model=model
+        )
+        self.last_turn_tokens: Dict[str, int] = {}
         
         logger.info(f"Financial Advisor initialized with user_id: {user_id} and model: {model}")
     
+    def register_tool(
+        self, schema: Dict[str, Any], function: Callable[..., Any], timeout: Optional[float] = None
+    ) -> None:
+        """
+        Make a tool available to the model.
+        
+        Args:
+            schema: OpenAI function tool schema
+            function: Called with the tool arguments as keyword arguments; its
+                result is sent back as a string
+            timeout: Seconds this tool may take (defaults to tool_timeout)
+        """
+        name = schema["function"]["name"]
+        self.tools[name] = (schema, function)
+        if timeout is not None:
+            self.tool_timeouts[name] = timeout
+    
+    def _call_tool(self, tool_call: Any) -> str:
+        """
+        Run one tool call and return its result as text.
+        
+        Args:
+            tool_call: Tool call from OpenAI
+            
+        Returns:
+            The tool result, or an error message for unknown tools and bad arguments
+        """
+        function_name = tool_call.function.name
+        if function_name not in self.tools:
+            return f"Tool {function_name} not found"
+        try:
+            function_args = json.loads(tool_call.function.arguments or "{}")
+            return str(self.tools[function_name][1](**function_args))
+        except Exception as e:
+            logger.error(f"Tool {function_name} failed: {str(e)}")
+            return f"Error: {str(e)}"
+    
     def _run_tool(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Execute tool calls made by the model.
         
+        The calls of one message run concurrently on a worker pool of
+        max_parallel_tools workers (1 runs them one by one). Results are returned
+        in the order of the calls, and a call that exceeds its timeout is answered
+        with a timeout error instead of holding up the others.
+        
         Args:
             tool_calls: List of tool calls from OpenAI
             
         Returns:
             List of tool results to send back to OpenAI
         """
-        tool_results = []
+        timings = []
+        contents = []
+        if self._tool_pool is None:
+            self._tool_pool = ThreadPoolExecutor(max_workers=self.max_parallel_tools, thread_name_prefix="tool")
+        spans: Dict[int, List[float]] = {}
+        
+        def run(index: int, tool_call: Any) -> str:
+            spans[index] = [time.perf_counter()]
+            try:
+                return self._call_tool(tool_call)
+            finally:
+                spans[index].append(time.perf_counter())
+        
+        # Carry the caller's context (e.g. the active token stream) into the workers
+        futures: List[Future] = [
+            self._tool_pool.submit(contextvars.copy_context().run, run, index, tool_call)
+            for index, tool_call in enumerate(tool_calls)
+        ]
+        submitted = time.perf_counter()
+        timed_out = False
+        for index, (tool_call, future) in enumerate(zip(tool_calls, futures)):
+            name = tool_call.function.name
+            timeout = self.tool_timeouts.get(name, self.tool_timeout)
+            # Each call's timeout runs from when the round was submitted
+            remaining = max(0.0, submitted + timeout - time.perf_counter())
+            try:
+                contents.append(future.result(timeout=remaining))
+                status = "ok"
+            except FutureTimeoutError:
+                future.cancel()
+                timed_out = True
+                logger.warning(f"Tool {name} timed out after {timeout}s")
+                contents.append(f"Error: tool {name} timed out after {timeout}s")
+                status = "timeout"
+            span = spans.get(index, [submitted])
+            end = span[1] if len(span) > 1 else time.perf_counter()
+            timings.append({"name": name, "ms": (end - span[0]) * 1000, "status": status})
+        
+        if timed_out:
+            # A hung tool keeps its worker busy, so later rounds get a fresh pool
+            self._tool_pool.shutdown(wait=False)
+            self._tool_pool = None
+    
+        self.last_tool_timings = timings
+        return [
+            {"tool_call_id": tool_call.id, "role": "tool", "content": content}
+            for tool_call, content in zip(tool_calls, contents)
+        ]
+        
+    def _complete(self, stream: Optional[TokenStream] = None, allow_tools: bool = True) -> ChatCompletionMessage:
+        """
+        Send the conversation to OpenAI and return the assistant message.
         
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
+        Args:
+            stream: Optional token stream; when given the response is streamed and
+                each text delta is forwarded to it as it arrives
+            allow_tools: Let the model call tools; when False it must answer in text
             
-            if function_name == "calculator":
-                expression = function_args.get("expression", "")
-                result = SimpleCalculator.calculate(expression)
-                tool_results.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "content": str(result)
-                })
-            else:
-                tool_results.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "content": f"Tool {function_name} not found"
-                })
+        Returns:
+            The assistant message, including any tool calls
+        """
+        messages = self.conversation_history.prompt_messages()
+        self._record_prompt_tokens()
+        tools = [schema for schema, _ in self.tools.values()]
+        tool_choice = "auto" if allow_tools else "none"
         
-        return tool_results
+        if stream is None:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice
+            )
+            return response.choices[0].message
+        
+        chunks = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            stream=True
+        )
+        parts = []
+        tool_calls = ToolCallAccumulator()
+        for chunk in chunks:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                parts.append(delta.content)
+                stream.emit("advisor", delta.content)
+            for tool_delta in delta.tool_calls or []:
+                tool_calls.add(tool_delta)
+        
+        # Rebuild a regular message so history and tool handling are the same as without streaming
+        return ChatCompletionMessage(
+            role="assistant",
+            content="".join(parts) or None,
+            tool_calls=tool_calls.tool_calls() or None,
+        )
+    
+    def _record_prompt_tokens(self):
+        """Add the prompt just built to this turn's token totals."""
+        prompt = self.conversation_history.last_prompt
+        self.last_turn_tokens["requests"] = self.last_turn_tokens.get("requests", 0) + 1
+        for key in ("sent_tokens", "uncompacted_tokens", "saved_tokens"):
+            self.last_turn_tokens[key] = self.last_turn_tokens.get(key, 0) + prompt[key]
         
-    def query(self, message: str) -> str:
+    def query(self, message: str, stream: Optional[TokenStream] = None) -> str:
         """
         Process a user query through the financial advisor.
         
         Args:
             message: The user's message or query
+            stream: Optional token stream that receives the response as it is generated
             
         Returns:
-            The agent's response
+            The agent's response. A turn that ends without an answer (an error or
+            the tool round limit) is removed from the conversation history, so the
+            next request does not carry an unanswered message or tool calls.
         """
         logger.info(f"Processing query: {message[:50]}...")
+        self.last_turn_tokens = {}
+        self.last_turn_rounds = []
         
         # Add user message to conversation history
         self.conversation_history.append({"role": "user", "content": message})
+        answered = False
         
-        # Process with OpenAI
+        # Process with OpenAI, running tools until the model answers or the rounds run out
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=self.conversation_history,
-                tools=[CALCULATOR_SCHEMA],
-                tool_choice="auto"
-            )
-            
-            assistant_message = response.choices[0].message
-            self.conversation_history.append(assistant_message)
-            
-            # Check if the model wants to use a tool
-            if assistant_message.tool_calls:
+            for round_number in range(self.max_tool_rounds + 1):
+                allow_tools = round_number < self.max_tool_rounds
+                start = time.perf_counter()
+                assistant_message = self._complete(stream, allow_tools=allow_tools)
+                model_ms = (time.perf_counter() - start) * 1000
+                
+                # Check if the model wants to use a tool
+                if not assistant_message.tool_calls:
+                    self.conversation_history.append(assistant_message)
+                    self.last_turn_rounds.append({"round": round_number, "model_ms": model_ms, "tools_ms": 0.0,
+                                                  "tools": []})
+                    answered = True
+                    return assistant_message.content
+                if not allow_tools:
+                    logger.warning(f"Model kept calling tools after {self.max_tool_rounds} rounds")
+                    break
+                
                 logger.info(f"Model requested to use tools: {assistant_message.tool_calls}")
+                self.conversation_history.append(assistant_message)
                 
-                # Execute the tool calls
+                # Execute the tool calls and add their results to the conversation history
+                start = time.perf_counter()
                 tool_results = self._run_tool(assistant_message.tool_calls)
-                
-                # Add tool results to conversation history
+                self.last_turn_rounds.append({
+                    "round": round_number,
+                    "model_ms": model_ms,
+                    "tools_ms": (time.perf_counter() - start) * 1000,
+                    "tools": self.last_tool_timings,
+                })
                 self.conversation_history.extend(tool_results)
-                
-                # Call the model again with the tool results
-                second_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=self.conversation_history,
-                    tools=[CALCULATOR_SCHEMA],
-                    tool_choice="auto"
-                )
-                
-                final_message = second_response.choices[0].message
-                self.conversation_history.append(final_message)
-                return final_message.content
             
-            return assistant_message.content
+            return "Sorry, I could not finish answering within the tool call limit."
             
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}")
             return f"Sorry, I encountered an error: {str(e)}"
+        finally:
+            if not answered:
+                # Drop the user message and any tool rounds so the history stays well formed
+                self.conversation_history.discard_turn()
+            if stream is not None:
+                stream.finish()
+            if self.last_turn_tokens:
+                logger.info(
+                    f"Prompt tokens this turn: {self.last_turn_tokens['sent_tokens']} sent, "
+                    f"{self.last_turn_tokens['saved_tokens']} saved by history compaction"
+                )
+            if self.last_turn_rounds:
+                logger.info(f"Rounds this turn: {self.round_summary()}")
+    
+    def round_summary(self) -> str:
+        """Describe the model and tool time of each round in the last turn."""
+        return ", ".join(
+            f"#{r['round']} model {r['model_ms']:.0f}ms"
+            + (f" + {len(r['tools'])} tools {r['tools_ms']:.0f}ms" if r["tools"] else "")
+            for r in self.last_turn_rounds
+        )
+    
+    def close(self) -> None:
+        """Shut down the tool worker pool."""
+        if self._tool_pool is not None:
+            self._tool_pool.shutdown(wait=False)
+            self._tool_pool = None
@@ -6,10 +6,13 @@ from aws_strands_poc.financial_advisor.specialists.market_analyst import market_
 from aws_strands_poc.financial_advisor.specialists.portfolio_manager import portfolio_manager
 from aws_strands_poc.financial_advisor.specialists.compliance_officer import compliance_officer
 from aws_strands_poc.financial_advisor.specialists.tax_specialist import tax_specialist
+from aws_strands_poc.financial_advisor.specialists.pool import SpecialistAgentPool, specialist_pool
 
 __all__ = [
     "market_analyst",
     "portfolio_manager",
     "compliance_officer",
     "tax_specialist",
+    "SpecialistAgentPool",
+    "specialist_pool",
 ]
@@ -7,7 +7,9 @@ from dotenv import load_dotenv
 
 from strands import Agent, tool
 from strands_tools import calculator, http_request
-from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.cache import cached_specialist
+from aws_strands_poc.financial_advisor.coalesce import coalesced_specialist
+from aws_strands_poc.financial_advisor.specialists.pool import specialist_pool
 
 # Load environment variables from .env file
 load_dotenv()
@@ -42,6 +44,8 @@ requirements rather than making subjective judgments about them.
 """
 
 @tool
+@coalesced_specialist("compliance_officer")
+@cached_specialist("compliance_officer", COMPLIANCE_OFFICER_PROMPT)
 def compliance_officer(query: str) -> str:
     """
     Process and respond to compliance and regulatory queries using a specialized compliance officer agent.
@@ -53,17 +57,17 @@ def compliance_officer(query: str) -> str:
     # Get model from environment variable or default to gpt-4o-mini
     model_name = os.environ.get("MODEL", "gpt-4o-mini")
     
-    # Create the compliance officer agent with specialized tools and the specified model
-    compliance_agent = create_openai_agent(
+    # Borrow a warm agent from the pool instead of building one per query
+    with specialist_pool.checkout(
+        "compliance_officer",
         system_prompt=COMPLIANCE_OFFICER_PROMPT,
         model=model_name,
         tools=[calculator, http_request],
-    )
-    
-    print("\nRouted to Compliance Officer")
-    
-    # Process the query using the agent
-    response = compliance_agent(query)
+    ) as compliance_agent:
+        print("\nRouted to Compliance Officer")
+        
+        # Process the query using the agent
+        response = compliance_agent(query)
     
     # Extract the response text
     if hasattr(response, 'message') and response.message:
@@ -18,7 +18,11 @@ else:
     HAS_PYTHON_REPL = True
 
 from aws_strands_poc.financial_advisor.tools.stock_data import stock_data
-from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.tools.technical_indicators import technical_indicators
+from aws_strands_poc.financial_advisor.tools.live_quotes import live_quotes
+from aws_strands_poc.financial_advisor.cache import cached_specialist
+from aws_strands_poc.financial_advisor.coalesce import coalesced_specialist
+from aws_strands_poc.financial_advisor.specialists.pool import specialist_pool
 
 # Load environment variables from .env file
 load_dotenv()
@@ -35,9 +39,11 @@ Your responsibilities include:
 5. Providing insights on sectors, industries, and specific companies
 
 When analyzing stocks or markets:
-- Use the stock_data tool to fetch price data
+- Use the stock_data tool to fetch price data; pass tickers=[...] to compare several stocks in one call
+- Use the live_quotes tool for where stocks are trading right now; it reads the live feed without fetching history
+- Use the technical_indicators tool for SMA, EMA, RSI, MACD, Bollinger bands, ATR and VWAP instead of computing them yourself
 - Use the calculator tool for financial calculations
-- Use the python_repl tool for more complex analysis when needed
+- Use the python_repl tool only for analysis the other tools do not cover
 - Use the http_request tool for accessing external financial data
 
 Always provide balanced analysis, mentioning both positive and negative factors.
@@ -47,6 +53,8 @@ Always remind users that past performance does not guarantee future results.
 """
 
 @tool
+@coalesced_specialist("market_analyst")
+@cached_specialist("market_analyst", MARKET_ANALYST_PROMPT)
 def market_analyst(query: str) -> str:
     """
     Process and respond to market analysis queries using a specialized market analyst agent.
@@ -59,21 +67,22 @@ def market_analyst(query: str) -> str:
     # Get model from environment variable or default to gpt-4o-mini
     model_name = os.environ.get("MODEL", "gpt-4o-mini")
     
-    # Create the market analyst agent with specialized tools and the specified model
-    tools = [calculator, http_request, stock_data]
+    # Collect the market analyst tools for the specified model
+    tools = [calculator, http_request, stock_data, technical_indicators, live_quotes]
     if HAS_PYTHON_REPL:
         tools.append(python_repl)
     
-    market_agent = create_openai_agent(
+    # Borrow a warm agent from the pool instead of building one per query
+    with specialist_pool.checkout(
+        "market_analyst",
         system_prompt=MARKET_ANALYST_PROMPT,
         model=model_name,
         tools=tools,
-    )
-    
-    print("\nRouted to Market Analyst")
-    
-    # Process the query using the agent
-    response = market_agent(query)
+    ) as market_agent:
+        print("\nRouted to Market Analyst")
+        
+        # Process the query using the agent
+        response = market_agent(query)
     
     # Extract the response text
     if hasattr(response, 'message') and response.message:
@@ -0,0 +1,177 @@
+"""
+Specialist Agent Pool - Hands out warm, reusable specialist agents.
+
+Building a Strands Agent parses every tool spec and creates a fresh model
+client, so doing it on every routed query is wasted work. The pool keeps idle
+agents keyed by specialist, model configuration (the model, or the cascade tiers
+when MODEL_CASCADE is set) and tool set, and resets their conversation
+state before they are handed out again.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from strands import Agent
+from strands.telemetry.metrics import EventLoopMetrics
+
+from aws_strands_poc.financial_advisor.model_config import model_label
+from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.streaming import StreamingCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, Tuple[str, ...]]
+
+
+def _tool_name(tool: Any) -> str:
+    """Return a stable name for a tool object, module or string."""
+    if isinstance(tool, str):
+        return tool
+    return getattr(tool, "__name__", None) or getattr(tool, "tool_name", None) or repr(tool)
+
+
+class SpecialistAgentPool:
+    """Thread-safe pool of reusable specialist agents."""
+
+    def __init__(self, max_idle_per_key: int = 4):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_key: Maximum number of idle agents kept for each
+                (specialist, model, tools) key. Extra agents are discarded on release.
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[PoolKey, List[Agent]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.build_time = 0.0
+
+    @staticmethod
+    def make_key(specialist: str, model: str, tools: list) -> PoolKey:
+        """
+        Build the pool key for a specialist configuration.
+
+        Args:
+            specialist: Specialist name (e.g., "tax_specialist")
+            model: Model configuration the agent answers with (see model_label)
+            tools: Tools provided to the agent
+
+        Returns:
+            Hashable key identifying interchangeable agents
+        """
+        return (specialist, model, tuple(sorted(_tool_name(t) for t in tools)))
+
+    @contextmanager
+    def checkout(
+        self,
+        specialist: str,
+        system_prompt: str,
+        tools: list,
+        model: str = "gpt-4o-mini",
+        **kwargs: Any,
+    ) -> Iterator[Agent]:
+        """
+        Borrow an agent for the duration of a ``with`` block.
+
+        A pooled agent is reused when one is idle, otherwise a new one is built
+        with create_openai_agent. The agent is returned to the pool with a clean
+        conversation when the block exits normally, and dropped if it raised.
+
+        Args:
+            specialist: Specialist name used in the pool key
+            system_prompt: System prompt for newly built agents
+            tools: Tools for newly built agents
+            model: Model name for newly built agents; the pool key uses the cascade
+                tiers instead when a cascade is passed or MODEL_CASCADE is set
+            **kwargs: Additional parameters for create_openai_agent
+
+        Yields:
+            A Strands Agent with an empty conversation history
+        """
+        key = self.make_key(specialist, model_label(model, kwargs.get("cascade")), tools)
+        agent = self._acquire(key)
+        if agent is None:
+            agent = self._build(key, system_prompt, tools, model, **kwargs)
+
+        try:
+            yield agent
+        except BaseException:
+            with self._lock:
+                self.discarded += 1
+            raise
+        else:
+            self._release(key, agent)
+
+    def _acquire(self, key: PoolKey) -> Optional[Agent]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.hits += 1
+                return idle.pop()
+            self.misses += 1
+            return None
+
+    def _build(self, key: PoolKey, system_prompt: str, tools: list, model: str, **kwargs: Any) -> Agent:
+        start = time.perf_counter()
+        agent = create_openai_agent(system_prompt=system_prompt, tools=tools, model=model, **kwargs)
+        # Forward the specialist's tokens to the caller's stream while one is active
+        agent.callback_handler = StreamingCallbackHandler(key[0], fallback=agent.callback_handler)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.build_time += elapsed
+        logger.info(f"Built pooled agent for {key[0]} ({key[1]}) in {elapsed * 1000:.1f}ms")
+        return agent
+
+    def _release(self, key: PoolKey, agent: Agent) -> None:
+        self._reset(agent)
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle_per_key:
+                idle.append(agent)
+            else:
+                self.discarded += 1
+
+    @staticmethod
+    def _reset(agent: Agent) -> None:
+        """Clear per-conversation state so the next borrower starts fresh."""
+        agent.messages = []
+        agent.event_loop_metrics = EventLoopMetrics()
+
+    def clear(self) -> None:
+        """Drop all idle agents and reset the counters."""
+        with self._lock:
+            self._idle.clear()
+            self.hits = 0
+            self.misses = 0
+            self.discarded = 0
+            self.build_time = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool usage.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, build timings and idle agent counts
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "discarded": self.discarded,
+                "build_time_total_ms": round(self.build_time * 1000, 2),
+                "build_time_avg_ms": round(self.build_time * 1000 / self.misses, 2) if self.misses else 0.0,
+                "idle": {f"{key[0]}:{key[1]}": len(agents) for key, agents in self._idle.items()},
+            }
+
+
+# Process-wide pool shared by all specialist tools
+specialist_pool = SpecialistAgentPool()
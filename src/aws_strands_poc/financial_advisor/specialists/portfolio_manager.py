@@ -17,7 +17,9 @@ else:
     from strands_tools import calculator, python_repl
     HAS_PYTHON_REPL = True
 
-from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.cache import cached_specialist
+from aws_strands_poc.financial_advisor.coalesce import coalesced_specialist
+from aws_strands_poc.financial_advisor.specialists.pool import specialist_pool
 from aws_strands_poc.financial_advisor.tools.portfolio_analysis import portfolio_analysis
 from aws_strands_poc.financial_advisor.tools.stock_data import stock_data
 
@@ -38,7 +40,7 @@ Your responsibilities include:
 
 When analyzing portfolios:
 - Use the portfolio_analysis tool to calculate key portfolio metrics
-- Use the stock_data tool to retrieve information about individual securities
+- Use the stock_data tool to retrieve information about individual securities; pass every holding in one call with tickers=[...] instead of one call per holding
 - Use the calculator tool for financial calculations
 - Use the python_repl tool for more complex analysis when needed
 
@@ -54,6 +56,8 @@ advisor before making investment decisions.
 """
 
 @tool
+@coalesced_specialist("portfolio_manager")
+@cached_specialist("portfolio_manager", PORTFOLIO_MANAGER_PROMPT)
 def portfolio_manager(query: str) -> str:
     """
     Process and respond to portfolio management queries using a specialized portfolio manager agent.
@@ -66,21 +70,22 @@ def portfolio_manager(query: str) -> str:
     # Get model from environment variable or default to gpt-4o-mini
     model_name = os.environ.get("MODEL", "gpt-4o-mini")
     
-    # Create the portfolio manager agent with specialized tools and the specified model
+    # Collect the portfolio manager tools for the specified model
     tools = [calculator, portfolio_analysis, stock_data]
     if HAS_PYTHON_REPL:
         tools.append(python_repl)
     
-    portfolio_agent = create_openai_agent(
+    # Borrow a warm agent from the pool instead of building one per query
+    with specialist_pool.checkout(
+        "portfolio_manager",
         system_prompt=PORTFOLIO_MANAGER_PROMPT,
         model=model_name,
         tools=tools,
-    )
-    
-    print("\nRouted to Portfolio Manager")
-    
-    # Process the query using the agent
-    response = portfolio_agent(query)
+    ) as portfolio_agent:
+        print("\nRouted to Portfolio Manager")
+        
+        # Process the query using the agent
+        response = portfolio_agent(query)
     
     # Extract the response text
     if hasattr(response, 'message') and response.message:
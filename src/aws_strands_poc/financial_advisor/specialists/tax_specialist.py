@@ -17,7 +17,9 @@ else:
     from strands_tools import calculator, python_repl
     HAS_PYTHON_REPL = True
 
-from aws_strands_poc.financial_advisor.models import create_openai_agent
+from aws_strands_poc.financial_advisor.cache import cached_specialist
+from aws_strands_poc.financial_advisor.coalesce import coalesced_specialist
+from aws_strands_poc.financial_advisor.specialists.pool import specialist_pool
 from aws_strands_poc.financial_advisor.tools.tax_calculator import tax_calculator
 
 # Load environment variables from .env file
@@ -52,6 +54,8 @@ understand tax concepts and implications rather than making subjective judgments
 """
 
 @tool
+@coalesced_specialist("tax_specialist")
+@cached_specialist("tax_specialist", TAX_SPECIALIST_PROMPT)
 def tax_specialist(query: str) -> str:
     """
     Process and respond to tax-related queries using a specialized tax specialist agent.
@@ -63,21 +67,22 @@ def tax_specialist(query: str) -> str:
     # Get model from environment variable or default to gpt-4o-mini
     model_name = os.environ.get("MODEL", "gpt-4o-mini")
     
-    # Create the tax specialist agent with specialized tools and the specified model
+    # Collect the tax specialist tools for the specified model
     tools = [calculator, tax_calculator]
     if HAS_PYTHON_REPL:
         tools.append(python_repl)
     
-    tax_agent = create_openai_agent(
+    # Borrow a warm agent from the pool instead of building one per query
+    with specialist_pool.checkout(
+        "tax_specialist",
         system_prompt=TAX_SPECIALIST_PROMPT,
         model=model_name,
         tools=tools,
-    )
-    
-    print("\nRouted to Tax Specialist")
-    
-    # Process the query using the agent
-    response = tax_agent(query)
+    ) as tax_agent:
+        print("\nRouted to Tax Specialist")
+        
+        # Process the query using the agent
+        response = tax_agent(query)
     
     # Extract the response text
     if hasattr(response, 'message') and response.message:
@@ -0,0 +1,250 @@
+"""
+Token Streaming - Forwards model output to the caller as it is generated.
+
+A query passes through the orchestrator, one or more specialists and the
+orchestrator again, so waiting for the final answer makes time-to-first-token
+equal to the total latency. A TokenStream is activated for the duration of a
+query; every agent callback handler and streaming model call made while it is
+active forwards its text deltas to it, tagged with where they came from.
+
+The active stream is held in a context variable, so concurrent queries on
+different threads or tasks each see their own stream. Worker pools that run
+specialists must copy the caller's context (see dispatch.OrderedToolExecutor).
+"""
+
+import contextvars
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenCallback = Callable[[str, str], None]
+
+_current_stream: "contextvars.ContextVar[Optional[TokenStream]]" = contextvars.ContextVar(
+    "current_token_stream", default=None
+)
+
+
+class TokenStream:
+    """Collects streamed text deltas for one query and measures time-to-first-token."""
+
+    def __init__(self, on_token: Optional[TokenCallback] = None):
+        """
+        Initialize the stream.
+
+        Args:
+            on_token: Optional function called with (source, text) for every delta,
+                e.g. to print tokens as they arrive
+        """
+        self.on_token = on_token
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the collected text and timings and restart the clock."""
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks = 0
+        self.first_token_by_source: Dict[str, float] = {}
+        self._text: Dict[str, List[str]] = {}
+
+    def emit(self, source: str, text: str) -> None:
+        """
+        Forward a text delta.
+
+        Args:
+            source: Name of the agent or model that produced the text
+            text: The text delta
+        """
+        if not text:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if self.first_token_at is None:
+                self.first_token_at = now
+            self.first_token_by_source.setdefault(source, now)
+            self.chunks += 1
+            self._text.setdefault(source, []).append(text)
+        if self.on_token is not None:
+            self.on_token(source, text)
+
+    def finish(self) -> None:
+        """Mark the end of the query."""
+        self.finished_at = time.perf_counter()
+
+    def text(self, source: Optional[str] = None) -> str:
+        """
+        Return the streamed text.
+
+        Args:
+            source: Only return the text from this source (default: all sources)
+
+        Returns:
+            The concatenated text deltas
+        """
+        with self._lock:
+            if source is not None:
+                return "".join(self._text.get(source, []))
+            return "".join("".join(parts) for parts in self._text.values())
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """Milliseconds from the start of the query to the first streamed token."""
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Report the stream timings.
+
+        Returns:
+            Dictionary with time-to-first-token, total time, chunk count and the
+            first-token time of each source
+        """
+        end = self.finished_at or time.perf_counter()
+        ttft = self.ttft_ms
+        return {
+            "ttft_ms": round(ttft, 1) if ttft is not None else None,
+            "total_ms": round((end - self.started_at) * 1000, 1),
+            "chunks": self.chunks,
+            "first_token_ms_by_source": {
+                source: round((at - self.started_at) * 1000, 1) for source, at in self.first_token_by_source.items()
+            },
+        }
+
+
+class ConsolePrinter:
+    """
+    Token callback that prints deltas to the console as they arrive.
+
+    A label is printed whenever the source changes, so output from
+    specialists running in parallel stays attributable.
+    """
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None, file: Any = None):
+        """
+        Initialize the printer.
+
+        Args:
+            labels: Display labels per source (sources without one are shown by name)
+            file: Stream to write to (defaults to sys.stdout)
+        """
+        self.labels = labels or {}
+        self.file = file
+        self._last_source: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, source: str, text: str) -> None:
+        out = self.file or sys.stdout
+        with self._lock:
+            if source != self._last_source:
+                label = self.labels.get(source, source)
+                out.write(f"\n[{label}] " if self._last_source is not None else f"[{label}] ")
+                self._last_source = source
+            out.write(text)
+            out.flush()
+
+
+def current_stream() -> Optional[TokenStream]:
+    """Return the stream active in the current context, if any."""
+    return _current_stream.get()
+
+
+@contextmanager
+def streaming_to(stream: Optional[TokenStream]) -> Iterator[Optional[TokenStream]]:
+    """
+    Make a stream the active stream for the duration of a ``with`` block.
+
+    Args:
+        stream: The stream to activate (None leaves streaming off)
+
+    Yields:
+        The activated stream
+    """
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+        if stream is not None:
+            stream.finish()
+
+
+class StreamingCallbackHandler:
+    """
+    Agent callback handler that forwards text deltas to the active stream.
+
+    When no stream is active, events go to the fallback handler instead, so an
+    agent keeps its normal console output outside of streaming queries.
+    """
+
+    def __init__(self, source: str, fallback: Optional[Callable[..., Any]] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            source: Name attached to the forwarded text (e.g., "market_analyst")
+            fallback: Handler used when no stream is active
+        """
+        self.source = source
+        self.fallback = fallback
+
+    def __call__(self, **kwargs: Any) -> None:
+        stream = current_stream()
+        if stream is None:
+            if self.fallback is not None:
+                self.fallback(**kwargs)
+            return
+        if "data" in kwargs:
+            stream.emit(self.source, kwargs["data"])
+
+
+class ToolCallAccumulator:
+    """
+    Assembles OpenAI streamed tool-call deltas into complete tool calls.
+
+    The first delta for a tool call carries its index, id and function name;
+    later deltas with the same index carry fragments of the JSON arguments.
+    """
+
+    def __init__(self):
+        self._calls: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, delta: Any) -> bool:
+        """
+        Fold one tool-call delta into the accumulated calls.
+
+        Args:
+            delta: A ``choices[0].delta.tool_calls`` item from a stream chunk
+
+        Returns:
+            True if the delta started a new tool call
+        """
+        index = getattr(delta, "index", None) or 0
+        call = self._calls.get(index)
+        is_new = call is None
+        if is_new:
+            call = {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+            self._calls[index] = call
+        if getattr(delta, "id", None):
+            call["id"] = delta.id
+        function = getattr(delta, "function", None)
+        if function is not None:
+            if getattr(function, "name", None):
+                call["function"]["name"] += function.name
+            if getattr(function, "arguments", None):
+                call["function"]["arguments"] += function.arguments
+        return is_new
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        """Return the assembled tool calls in index order, in OpenAI message format."""
+        return [self._calls[index] for index in sorted(self._calls)]
@@ -5,11 +5,15 @@ Tools for financial calculations and data retrieval.
 from aws_strands_poc.financial_advisor.tools.stock_data import stock_data
 from aws_strands_poc.financial_advisor.tools.portfolio_analysis import portfolio_analysis
 from aws_strands_poc.financial_advisor.tools.tax_calculator import tax_calculator
+from aws_strands_poc.financial_advisor.tools.technical_indicators import technical_indicators
+from aws_strands_poc.financial_advisor.tools.live_quotes import live_quotes
 from aws_strands_poc.financial_advisor.tools.memory.simple_memory import memory_tool
 
 __all__ = [
     "stock_data",
     "portfolio_analysis",
     "tax_calculator",
+    "technical_indicators",
+    "live_quotes",
     "memory_tool",
 ]
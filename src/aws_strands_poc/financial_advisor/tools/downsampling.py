@@ -0,0 +1,276 @@
+"""
+Downsampling - Shrink price series before they are sent to the model.
+
+Most questions about a price history only need its shape, yet every bar costs
+prompt tokens. Two reductions are provided, both vectorized with NumPy and
+working on a single PriceSeries or on a PricePanel of several tickers:
+
+- OHLCV buckets: consecutive bars are merged into coarser bars (first open,
+  highest high, lowest low, last close, summed volume), either into a coarser
+  calendar ``resolution`` (e.g. 1wk bars from 1d bars) or into at most
+  ``max_points`` buckets of equal bar count.
+- LTTB (largest triangle three buckets): keeps the ``max_points`` bars whose
+  closes best preserve the visual shape of the series, including its peaks and
+  troughs. Single series only.
+
+``summary_stats`` computes return, volatility, maximum drawdown and price range
+on the full-resolution bars, so the figures stay exact after downsampling.
+"""
+
+import warnings
+from dataclasses import replace
+from typing import Any, Dict, Optional, TypeVar, Union
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    INTERVALS,
+    MINUTES_PER_SESSION,
+    SESSION_OPEN,
+    TRADING_DAYS_PER_YEAR,
+    PricePanel,
+    PriceSeries,
+)
+
+Bars = TypeVar("Bars", PriceSeries, PricePanel)
+SESSION_OPEN_MINUTE = int(SESSION_OPEN / np.timedelta64(1, "m"))
+METHODS = ("ohlc", "lttb")
+
+
+def bars_per_year(interval: str) -> float:
+    """Return how many bars of an interval make up a trading year."""
+    step = INTERVALS[interval]
+    if step > 0:
+        return TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / step
+    return TRADING_DAYS_PER_YEAR / -step
+
+
+def bar_minutes(interval: str) -> int:
+    """Return the length of a bar in trading minutes."""
+    step = INTERVALS[interval]
+    return step if step > 0 else -step * MINUTES_PER_SESSION
+
+
+def _bucket_keys(dates: np.ndarray, resolution: str) -> np.ndarray:
+    """Map each bar date to the integer key of its bucket at a resolution."""
+    step = INTERVALS[resolution]
+    if step > 0:
+        minutes = dates.astype("datetime64[m]").astype(np.int64)
+        days = dates.astype("datetime64[D]").astype("datetime64[m]").astype(np.int64)
+        # Buckets are counted from each session open, like the generated intraday bars
+        return days * MINUTES_PER_SESSION + (minutes - days - SESSION_OPEN_MINUTE) // step
+    if resolution == "1d":
+        return dates.astype("datetime64[D]").astype(np.int64)
+    if resolution == "1wk":
+        # datetime64[W] weeks start on Thursday; shift so they start on Monday
+        return (dates.astype("datetime64[D]") + np.timedelta64(3, "D")).astype("datetime64[W]").astype(np.int64)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    return months if resolution == "1mo" else months // 3
+
+
+def bucket_starts(dates: np.ndarray, resolution: Optional[str] = None,
+                  max_points: Optional[int] = None) -> np.ndarray:
+    """
+    Return the index of the first bar of every bucket.
+
+    Args:
+        dates: Sorted bar dates
+        resolution: Calendar bucket size, one of INTERVALS
+        max_points: Maximum number of buckets; applied after ``resolution``
+
+    Returns:
+        Sorted bucket start indices, starting with 0
+    """
+    n = len(dates)
+    starts = np.arange(n)
+    if resolution is not None and n:
+        keys = _bucket_keys(dates, resolution)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    if max_points is not None and len(starts) > max_points:
+        # Equal numbers of current buckets per output bucket
+        starts = starts[(np.arange(max_points) * len(starts)) // max_points]
+    return starts
+
+
+def resample_ohlc(bars: Bars, starts: np.ndarray, interval: Optional[str] = None) -> Bars:
+    """
+    Merge the bars between consecutive start indices into one OHLCV bar each.
+
+    Missing bars (NaN in a panel) are ignored within a bucket.
+
+    Args:
+        bars: Series or panel to merge
+        starts: Bucket start indices from bucket_starts
+        interval: Interval label of the merged bars (defaults to the original)
+
+    Returns:
+        Series or panel of the same type with one bar per bucket, dated by its first bar
+    """
+    n = len(bars)
+    if len(starts) == n:
+        return bars if interval is None else replace(bars, interval=interval)
+    present = ~np.isnan(bars.close)
+    if present.all():
+        first, last = starts, np.r_[starts[1:], n] - 1
+        open_, close = bars.open[..., first], bars.close[..., last]
+    else:
+        # First and last bar actually present in each bucket, per row
+        positions = np.arange(n)
+        first = np.minimum.reduceat(np.where(present, positions, n - 1), starts, axis=-1)
+        last = np.maximum.reduceat(np.where(present, positions, 0), starts, axis=-1)
+        open_ = np.take_along_axis(bars.open, first, axis=-1)
+        close = np.take_along_axis(bars.close, last, axis=-1)
+        empty = ~np.logical_or.reduceat(present, starts, axis=-1)
+        open_[empty] = close[empty] = np.nan
+    volume = bars.volume if bars.volume.dtype.kind == "i" else np.nan_to_num(bars.volume)
+    return replace(
+        bars,
+        interval=interval or bars.interval,
+        dates=bars.dates[starts],
+        open=open_,
+        high=np.fmax.reduceat(bars.high, starts, axis=-1),
+        low=np.fmin.reduceat(bars.low, starts, axis=-1),
+        close=close,
+        volume=np.add.reduceat(volume, starts, axis=-1).astype(bars.volume.dtype),
+    )
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Pick the points of a line that best preserve its shape (largest triangle three buckets).
+
+    Args:
+        x: Increasing x values
+        y: y values
+        max_points: Number of points to keep (at least 2; with 2 only the endpoints remain)
+
+    Returns:
+        Sorted indices of the kept points, always including the first and last
+
+    Raises:
+        ValueError: If max_points is below 2
+    """
+    if max_points < 2:
+        raise ValueError("max_points must be at least 2")
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points == 2:
+        return np.array([0, n - 1], dtype=np.int64)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # Inner points split into max_points - 2 buckets between the fixed endpoints
+    edges = 1 + ((np.arange(max_points - 1) * (n - 2)) // (max_points - 2))
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(max_points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        # The third triangle corner is the average of the next bucket (or the last point)
+        next_lo, next_hi = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        areas = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    return selected
+
+
+def downsample(
+    bars: Bars,
+    max_points: Optional[int] = None,
+    resolution: Optional[str] = None,
+    method: str = "ohlc",
+) -> Bars:
+    """
+    Reduce a series or panel to a coarser resolution and/or at most max_points bars.
+
+    Args:
+        bars: Series or panel to reduce
+        max_points: Maximum number of bars to keep
+        resolution: Coarser bar interval to merge into (e.g. 1wk); must not be
+            finer than the bars' own interval
+        method: "ohlc" to merge bars into buckets, or "lttb" to keep the bars that
+            best preserve the shape of the closes (series only; applied after
+            any resolution merge)
+
+    Returns:
+        The reduced series or panel (the input itself when nothing needs reducing)
+
+    Raises:
+        ValueError: For an unknown method or resolution, a resolution finer than
+            the bars, max_points below 2, or "lttb" on a panel
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {', '.join(METHODS)}")
+    if method == "lttb" and not isinstance(bars, PriceSeries):
+        # Each ticker would keep different bars, which breaks the shared date axis
+        raise ValueError('Method "lttb" only applies to a single ticker; use "ohlc" for several tickers')
+    if max_points is not None and max_points < 2:
+        raise ValueError("max_points must be at least 2")
+    if resolution is not None:
+        if resolution not in INTERVALS:
+            raise ValueError(f"Unknown resolution {resolution!r}; expected one of {', '.join(INTERVALS)}")
+        if bar_minutes(resolution) < bar_minutes(bars.interval):
+            raise ValueError(f"Resolution {resolution} is finer than the {bars.interval} bars")
+        if resolution != bars.interval:
+            bars = resample_ohlc(bars, bucket_starts(bars.dates, resolution=resolution), interval=resolution)
+    if max_points is None or len(bars) <= max_points:
+        return bars
+    if method == "lttb":
+        keep = lttb_indices(np.arange(len(bars)), bars.close, max_points)
+        return replace(bars, dates=bars.dates[keep], open=bars.open[keep], high=bars.high[keep],
+                       low=bars.low[keep], close=bars.close[keep], volume=bars.volume[keep])
+    return resample_ohlc(bars, bucket_starts(bars.dates, max_points=max_points))
+
+
+def summary_stats(bars: Union[PriceSeries, PricePanel]) -> Dict[str, Any]:
+    """
+    Compute headline statistics over all bars.
+
+    Args:
+        bars: Series or panel at full resolution
+
+    Returns:
+        For a series: bars, first and last close, return_pct, annualized
+        volatility_pct, max_drawdown_pct, high, low and range_pct. For a panel:
+        the same figures per ticker
+    """
+    close = np.atleast_2d(bars.close).astype(np.float64)
+    high = np.atleast_2d(bars.high)
+    low = np.atleast_2d(bars.low)
+    if not close.shape[-1]:
+        return {"bars": 0} if isinstance(bars, PriceSeries) else {ticker: {"bars": 0} for ticker in bars.tickers}
+    present = ~np.isnan(close)
+    counts = present.sum(axis=-1)
+
+    rows = np.arange(len(close))
+    first = close[rows, np.argmax(present, axis=-1)]
+    last = close[rows, close.shape[-1] - 1 - np.argmax(present[:, ::-1], axis=-1)]
+    # Tickers with no bars at all produce NaNs here and are reported as empty below
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        log_returns = np.diff(np.log(close), axis=-1)
+        volatility = np.nanstd(log_returns, axis=-1) * np.sqrt(bars_per_year(bars.interval))
+        peaks = np.fmax.accumulate(np.where(present, close, -np.inf), axis=-1)
+        drawdown = np.nanmin(np.where(present, close / peaks - 1, np.nan), axis=-1)
+        highest = np.nanmax(high, axis=-1)
+        lowest = np.nanmin(low, axis=-1)
+
+    def row_stats(i: int) -> Dict[str, Any]:
+        if not counts[i]:
+            return {"bars": 0}
+        return {
+            "bars": int(counts[i]),
+            "first_close": round(float(first[i]), 2),
+            "last_close": round(float(last[i]), 2),
+            "return_pct": round(float(last[i] / first[i] - 1) * 100, 2),
+            "volatility_pct": round(float(np.nan_to_num(volatility[i])) * 100, 2),
+            "max_drawdown_pct": round(float(drawdown[i]) * 100, 2),
+            "high": round(float(highest[i]), 2),
+            "low": round(float(lowest[i]), 2),
+            "range_pct": round(float(highest[i] / lowest[i] - 1) * 100, 2),
+        }
+
+    if isinstance(bars, PriceSeries):
+        return row_stats(0)
+    return {ticker: row_stats(i) for i, ticker in enumerate(bars.tickers)}
@@ -0,0 +1,198 @@
+"""
+Indicators - Vectorized technical indicators over OHLCV bars.
+
+Every indicator works along the last axis, so the same call computes one
+series (1-D arrays) or many tickers at once (a tickers x bars matrix from a
+PricePanel). Moving averages use cumulative sums, and the exponential averages
+behind EMA, MACD, RSI and ATR use a blocked closed form of the recursion
+instead of a per-bar Python loop. Values before an indicator has enough bars
+are NaN.
+
+Conventions: EMA is seeded with the first close (pandas ``adjust=False``); RSI
+and ATR use Wilder's smoothing seeded with a simple average; Bollinger bands use
+the population standard deviation; VWAP restarts every session for intraday
+bars and is anchored at the first bar otherwise.
+"""
+
+from typing import Any, Dict, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from aws_strands_poc.financial_advisor.tools.price_series import INTERVALS, PricePanel, PriceSeries
+
+Bars = Union[PriceSeries, PricePanel]
+
+# Indicator -> default parameters, in label order
+INDICATORS: Dict[str, Dict[str, Any]] = {
+    "sma": {"period": 20},
+    "ema": {"period": 20},
+    "rsi": {"period": 14},
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+    "bollinger": {"period": 20, "num_std": 2.0},
+    "atr": {"period": 14},
+    "vwap": {},
+}
+
+
+def _nan_like(values: np.ndarray) -> np.ndarray:
+    return np.full(values.shape, np.nan)
+
+
+def ewm(values: np.ndarray, alpha: float, initial: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Exponentially weighted recursion ``y[i] = alpha * x[i] + (1 - alpha) * y[i - 1]`` along the last axis.
+
+    Within a block the recursion has the closed form
+    ``y[i] = d**(i+1) * y0 + alpha * d**i * cumsum(x[j] * d**-j)`` with ``d = 1 - alpha``;
+    blocks are sized so that ``d**-j`` stays below 1e100.
+
+    Args:
+        values: Input array
+        alpha: Smoothing factor in (0, 1]
+        initial: Value of y before the first input (scalar or one per row)
+
+    Returns:
+        Array of the same shape as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    n = values.shape[-1]
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[...] = values
+        return out
+    block = max(1, int(100 * np.log(10) / -np.log(decay)))
+    previous = np.broadcast_to(np.asarray(initial, dtype=np.float64), values.shape[:-1])
+    for start in range(0, n, block):
+        chunk = values[..., start:start + block]
+        steps = np.arange(chunk.shape[-1])
+        powers = decay ** steps
+        weighted = np.cumsum(chunk * decay ** -steps, axis=-1) * (alpha * powers)
+        out[..., start:start + chunk.shape[-1]] = weighted + previous[..., None] * (decay * powers)
+        previous = out[..., start + chunk.shape[-1] - 1]
+    return out
+
+
+def sma(close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Simple moving average of the last ``period`` closes."""
+    out = _nan_like(close)
+    if period <= close.shape[-1]:
+        sums = np.cumsum(close, axis=-1)
+        out[..., period - 1] = sums[..., period - 1]
+        out[..., period:] = sums[..., period:] - sums[..., :-period]
+        out[..., period - 1:] /= period
+    return out
+
+
+def ema(close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Exponential moving average with smoothing 2 / (period + 1), seeded with the first close."""
+    if not close.shape[-1]:
+        return _nan_like(close)
+    return ewm(close, 2.0 / (period + 1), close[..., 0])
+
+
+def _wilder(values: np.ndarray, period: int, first: int) -> np.ndarray:
+    """Wilder's smoothing of values[first:], seeded with the mean of the first ``period`` of them."""
+    out = _nan_like(values)
+    if values.shape[-1] - first < period:
+        return out
+    seed = values[..., first:first + period].mean(axis=-1)
+    out[..., first + period - 1] = seed
+    out[..., first + period:] = ewm(values[..., first + period:], 1.0 / period, seed)
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative strength index (0-100) with Wilder's smoothing."""
+    change = np.diff(close, axis=-1, prepend=close[..., :1])
+    gains = _wilder(np.clip(change, 0, None), period, 1)
+    losses = _wilder(np.clip(-change, 0, None), period, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gains / losses)
+    return np.where((losses == 0) & ~np.isnan(gains), 100.0, out)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram between them."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+
+def bollinger(close: np.ndarray, period: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands: the SMA and num_std standard deviations above and below it."""
+    middle = sma(close, period)
+    spread = _nan_like(close)
+    if period <= close.shape[-1]:
+        spread[..., period - 1:] = sliding_window_view(close, period, axis=-1).std(axis=-1) * num_std
+    return {"middle": middle, "upper": middle + spread, "lower": middle - spread}
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average true range with Wilder's smoothing."""
+    previous = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    true_range[..., :1] = (high - low)[..., :1]
+    return _wilder(true_range, period, 0)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         dates: np.ndarray, intraday: bool) -> np.ndarray:
+    """Volume-weighted average of the typical price, restarting each session for intraday bars."""
+    volume = volume.astype(np.float64)
+    price_volume = np.cumsum((high + low + close) / 3.0 * volume, axis=-1)
+    total_volume = np.cumsum(volume, axis=-1)
+    if intraday and len(dates):
+        days = dates.astype("datetime64[D]")
+        starts = np.r_[True, days[1:] != days[:-1]]
+        # Index of each bar's session start, carried forward
+        session_start = np.maximum.accumulate(np.where(starts, np.arange(len(days)), 0))
+        price_volume -= np.where(session_start > 0, price_volume[..., session_start - 1], 0.0)
+        total_volume -= np.where(session_start > 0, total_volume[..., session_start - 1], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return price_volume / total_volume
+
+
+def compute(name: str, bars: Bars, **params: Any) -> Dict[str, np.ndarray]:
+    """
+    Compute one indicator over a series or every row of a panel.
+
+    Args:
+        name: Indicator name from INDICATORS
+        bars: PriceSeries or PricePanel
+        **params: Parameters overriding the indicator's defaults
+
+    Returns:
+        Output arrays by component name (the indicator name for single-line indicators)
+
+    Raises:
+        ValueError: For an unknown indicator or parameter
+    """
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator {name!r}; expected one of {', '.join(INDICATORS)}")
+    unknown = set(params) - set(INDICATORS[name])
+    if unknown:
+        raise ValueError(f"Unknown {name} parameters: {', '.join(sorted(unknown))}")
+    params = {**INDICATORS[name], **params}
+    close = np.asarray(bars.close, dtype=np.float64)
+    if name == "sma":
+        return {name: sma(close, int(params["period"]))}
+    if name == "ema":
+        return {name: ema(close, int(params["period"]))}
+    if name == "rsi":
+        return {name: rsi(close, int(params["period"]))}
+    if name == "macd":
+        return macd(close, int(params["fast"]), int(params["slow"]), int(params["signal"]))
+    if name == "bollinger":
+        return bollinger(close, int(params["period"]), float(params["num_std"]))
+    high, low = np.asarray(bars.high, dtype=np.float64), np.asarray(bars.low, dtype=np.float64)
+    if name == "atr":
+        return {name: atr(high, low, close, int(params["period"]))}
+    return {name: vwap(high, low, close, np.asarray(bars.volume), bars.dates, INTERVALS[bars.interval] > 0)}
+
+
+def label(name: str, params: Dict[str, Any]) -> str:
+    """Return a result key such as sma_50 or macd_12_26_9 for an indicator and its parameters."""
+    values = {**INDICATORS[name], **params}.values()
+    return "_".join([name] + [f"{value:g}" if isinstance(value, float) else str(value) for value in values])
@@ -0,0 +1,45 @@
+"""
+Live Quotes Tool - Reads the latest intraday state of tickers from the streaming tick feed.
+"""
+
+from typing import List, Optional
+
+from strands import tool
+
+from aws_strands_poc.financial_advisor.tools.result_encoding import encoded_result
+from aws_strands_poc.financial_advisor.tools.stock_data import MAX_BATCH_TICKERS
+from aws_strands_poc.financial_advisor.tools.tick_feed import live_feed
+
+
+@tool
+@encoded_result("json")
+def live_quotes(ticker: str = "", tickers: Optional[List[str]] = None) -> dict:
+    """
+    Get the latest intraday price and rolling indicators for one ticker, or several at once.
+
+    Values come from a continuously updated tick feed, so this is the cheapest way
+    to check where a stock is trading right now. Indicators are computed over
+    recent ticks, not daily bars; use technical_indicators for daily indicators.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., AAPL, MSFT)
+        tickers: Several ticker symbols to quote in one call
+
+    Returns:
+        Dictionary with the time, last price, session open, change, high, low,
+        volume, VWAP and tick count of each ticker, plus the SMA, EMA, RSI and
+        Bollinger bands over its recent ticks. With tickers, one entry per
+        ticker under "quotes"
+    """
+    # Note: In a real implementation, this would subscribe to a market data stream
+    # For the POC, ticks come from the local simulator in tools/tick_feed.py
+    symbols = list(dict.fromkeys(t.upper() for t in ([ticker] if ticker else []) + list(tickers or [])))
+    if not symbols:
+        return {"error": "Provide a ticker or a list of tickers"}
+    if len(symbols) > MAX_BATCH_TICKERS:
+        return {"error": f"At most {MAX_BATCH_TICKERS} tickers per call; got {len(symbols)}"}
+
+    quotes = live_feed.quotes(symbols)
+    if len(symbols) == 1 and not tickers:
+        return {"ticker": symbols[0], **(quotes[symbols[0]] or {"error": "No ticks yet"})}
+    return {"quotes": {symbol: quote or {"error": "No ticks yet"} for symbol, quote in quotes.items()}}
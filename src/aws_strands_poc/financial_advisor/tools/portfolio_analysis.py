@@ -6,7 +6,40 @@ from strands import tool
 import math
 import random  # For mock data in POC
 
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.price_store import price_store
+from aws_strands_poc.financial_advisor.tools.result_encoding import encoded_result
+
+
+def _stored_metrics(ticker: str, base: dict) -> dict:
+    """
+    Replace the annual return and volatility with ones measured on the last year of stored daily bars.
+
+    Args:
+        ticker: Stock ticker symbol
+        base: Metrics to start from (beta and alpha are kept)
+
+    Returns:
+        The metrics, measured from the local price store when it holds the ticker
+    """
+    try:
+        series = price_store.read_timeframe(ticker, "1y", interval="1d")
+    except ValueError:
+        return base
+    if series is None or len(series) < 2:
+        return base
+    # Log returns straight from the mapped close column
+    log_returns = np.diff(np.log(series.close))
+    return {
+        **base,
+        "annual_return": float(math.expm1(log_returns.mean() * 252)),
+        "volatility": float(log_returns.std() * math.sqrt(252)),
+        "source": "store",
+    }
+
 @tool
+@encoded_result("json")
 def portfolio_analysis(portfolio: list, metrics: list = ["risk", "return", "sharpe"]) -> dict:
     """
     Analyze an investment portfolio for various financial metrics.
@@ -20,7 +53,8 @@ def portfolio_analysis(portfolio: list, metrics: list = ["risk", "return", "shar
         Dictionary with calculated metrics for the portfolio
     """
     # Mock stock data - in a real implementation, this would fetch actual historical data
-    # and calculate real metrics
+    # and calculate real metrics. Tickers in the local price store get their return and
+    # volatility from stored daily bars instead.
     stock_metrics = {
         "AAPL": {"annual_return": 0.15, "volatility": 0.20, "beta": 1.2, "alpha": 0.03},
         "MSFT": {"annual_return": 0.12, "volatility": 0.18, "beta": 1.1, "alpha": 0.02},
@@ -56,11 +90,14 @@ def portfolio_analysis(portfolio: list, metrics: list = ["risk", "return", "shar
     weighted_volatility = 0
     weighted_beta = 0
     weighted_alpha = 0
+    stored_tickers = []
     
     for item in portfolio:
         ticker = item["ticker"].upper()
         allocation = item["allocation"] / 100  # Convert percentage to decimal
-        stock_metric = stock_metrics.get(ticker, default_metrics)
+        stock_metric = _stored_metrics(ticker, stock_metrics.get(ticker, default_metrics))
+        if stock_metric.get("source") == "store":
+            stored_tickers.append(ticker)
         
         weighted_return += stock_metric["annual_return"] * allocation
         weighted_volatility += stock_metric["volatility"] * allocation
@@ -77,6 +114,8 @@ def portfolio_analysis(portfolio: list, metrics: list = ["risk", "return", "shar
             "total_allocation": total_allocation
         }
     }
+    if stored_tickers:
+        result["portfolio_summary"]["measured_from_store"] = stored_tickers
     
     if "return" in metrics:
         result["annual_return"] = round(weighted_return * 100, 2)  # Convert to percentage
@@ -0,0 +1,438 @@
+"""
+Price Series - Vectorized, seedable generator of mock OHLCV bars.
+
+Closes follow a geometric random walk whose drift and volatility come from a
+per-ticker profile, scaled to the bar interval. Each bar opens at the previous
+close; highs and lows extend past the open/close range by a random intrabar
+excursion, and volume is lognormal and rises with the size of the move. All
+columns are generated with NumPy in one pass, so a year of minute bars takes
+milliseconds, and a panel of many tickers on one date axis is generated as
+(tickers x bars) matrices.
+
+The random stream is derived from the seed, ticker, timeframe and interval, so
+the same request always returns the same series. Without a seed, DEFAULT_SEED is
+used: unseeded data is deterministic per ticker, timeframe and interval, and
+differs from every explicit seed other than DEFAULT_SEED itself.
+"""
+
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Per-ticker (base price, annual drift, annual volatility, average daily volume)
+TICKER_PROFILES: Dict[str, Tuple[float, float, float, float]] = {
+    "AAPL": (175.0, 0.15, 0.20, 55e6),
+    "MSFT": (350.0, 0.12, 0.18, 22e6),
+    "GOOGL": (140.0, 0.14, 0.22, 25e6),
+    "AMZN": (180.0, 0.16, 0.25, 40e6),
+    "META": (450.0, 0.18, 0.28, 15e6),
+    "TSLA": (180.0, 0.25, 0.40, 95e6),
+    "NVDA": (920.0, 0.30, 0.35, 45e6),
+    "JPM": (185.0, 0.10, 0.15, 9e6),
+    "V": (270.0, 0.11, 0.14, 6e6),
+    "WMT": (60.0, 0.08, 0.12, 18e6),
+}
+DEFAULT_PROFILE = (100.0, 0.10, 0.20, 5e6)
+# Seed of unseeded requests; any explicit seed, including 0, gives a different scenario
+DEFAULT_SEED = 0x5EED
+
+TRADING_DAYS_PER_YEAR = 252
+MINUTES_PER_SESSION = 390  # 09:30 to 16:00
+SESSION_OPEN = np.timedelta64(9 * 60 + 30, "m")
+
+# Timeframe -> length in trading days
+TIMEFRAME_DAYS: Dict[str, int] = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+}
+
+# Interval -> minutes per bar (intraday) or trading days per bar (negative)
+INTERVALS: Dict[str, int] = {
+    "1m": 1,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "1d": -1,
+    "1wk": -5,
+    "1mo": -21,
+    "3mo": -63,
+}
+
+# Interval used when none is requested, keeping the default payloads small
+DEFAULT_INTERVALS: Dict[str, str] = {
+    "1d": "1h",
+    "5d": "1d",
+    "1mo": "1d",
+    "3mo": "1d",
+    "6mo": "1d",
+    "1y": "1mo",
+    "2y": "1mo",
+    "5y": "3mo",
+    "10y": "3mo",
+}
+
+COLUMNS = ("date", "open", "high", "low", "close", "volume")
+OHLCV = COLUMNS[1:]
+
+
+@dataclass
+class PriceSeries:
+    """OHLCV bars for one ticker as columnar NumPy arrays."""
+
+    ticker: str
+    timeframe: str
+    interval: str
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def to_dict(self, decimals: int = 2) -> Dict[str, Any]:
+        """
+        Convert to a JSON-serializable columnar dictionary.
+
+        Args:
+            decimals: Decimal places for prices
+
+        Returns:
+            Dictionary with the ticker, timeframe, interval and one list per column
+        """
+        unit = "D" if INTERVALS[self.interval] < 0 else "m"
+        return {
+            "ticker": self.ticker,
+            "timeframe": self.timeframe,
+            "interval": self.interval,
+            "currency": "USD",
+            "columns": list(COLUMNS),
+            "date": np.datetime_as_string(self.dates, unit=unit).tolist(),
+            "open": self.open.round(decimals).tolist(),
+            "high": self.high.round(decimals).tolist(),
+            "low": self.low.round(decimals).tolist(),
+            "close": self.close.round(decimals).tolist(),
+            "volume": self.volume.tolist(),
+        }
+
+
+@dataclass
+class PricePanel:
+    """
+    OHLCV bars for several tickers on a shared date axis, one matrix row per ticker.
+
+    Volumes are stored as floats so that missing bars can be NaN.
+    """
+
+    tickers: List[str]
+    timeframe: str
+    interval: str
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return self.close.shape[1]
+
+    def series(self, row: Union[int, str]) -> PriceSeries:
+        """
+        Return one ticker's bars, dropping dates it has no bar on.
+
+        Args:
+            row: Row index or ticker symbol
+
+        Returns:
+            PriceSeries for the ticker
+        """
+        if isinstance(row, str):
+            row = self.tickers.index(row.upper())
+        present = ~np.isnan(self.close[row])
+        every = bool(present.all())
+        pick = (lambda values: values[row]) if every else (lambda values: values[row][present])
+        return PriceSeries(
+            ticker=self.tickers[row],
+            timeframe=self.timeframe,
+            interval=self.interval,
+            dates=self.dates if every else self.dates[present],
+            open=pick(self.open),
+            high=pick(self.high),
+            low=pick(self.low),
+            close=pick(self.close),
+            volume=pick(self.volume).astype(np.int64),
+        )
+
+    def to_dict(self, decimals: int = 2) -> Dict[str, Any]:
+        """
+        Convert to a JSON-serializable columnar dictionary with one date list for all tickers.
+
+        Args:
+            decimals: Decimal places for prices
+
+        Returns:
+            Dictionary with the shared date list and, per ticker, one list per
+            column; missing bars are None
+        """
+        unit = "D" if INTERVALS[self.interval] < 0 else "m"
+        missing = np.isnan(self.close)
+
+        def column(values: np.ndarray, row: int, places: Optional[int]) -> list:
+            values = values[row].round(places) if places is not None else values[row].astype(np.int64)
+            if not missing[row].any():
+                return values.tolist()
+            return [None if gap else value for value, gap in zip(values.tolist(), missing[row].tolist())]
+
+        return {
+            "tickers": list(self.tickers),
+            "timeframe": self.timeframe,
+            "interval": self.interval,
+            "currency": "USD",
+            "columns": list(COLUMNS),
+            "date": np.datetime_as_string(self.dates, unit=unit).tolist(),
+            "series": {
+                ticker: {
+                    **{name: column(getattr(self, name), row, decimals) for name in OHLCV[:-1]},
+                    "volume": column(np.nan_to_num(self.volume), row, None),
+                }
+                for row, ticker in enumerate(self.tickers)
+            },
+        }
+
+
+def resolve_interval(timeframe: str, interval: Optional[str] = None) -> str:
+    """
+    Validate a timeframe and pick its bar interval.
+
+    Args:
+        timeframe: One of TIMEFRAME_DAYS
+        interval: One of INTERVALS (defaults to DEFAULT_INTERVALS[timeframe])
+
+    Returns:
+        The interval to use
+
+    Raises:
+        ValueError: For an unknown timeframe or interval
+    """
+    if timeframe not in TIMEFRAME_DAYS:
+        raise ValueError(f"Unknown timeframe {timeframe!r}; expected one of {', '.join(TIMEFRAME_DAYS)}")
+    interval = interval or DEFAULT_INTERVALS[timeframe]
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval {interval!r}; expected one of {', '.join(INTERVALS)}")
+    return interval
+
+
+def bar_count(timeframe: str, interval: str) -> int:
+    """Return the number of bars a timeframe spans at an interval."""
+    days = TIMEFRAME_DAYS[timeframe]
+    step = INTERVALS[interval]
+    if step > 0:
+        return days * -(-MINUTES_PER_SESSION // step)
+    return max(1, -(-days // -step))
+
+
+def bar_dates(timeframe: str, interval: str, end: Optional[Union[str, date]] = None) -> np.ndarray:
+    """
+    Build the timestamp axis of a series, ending on the last trading day on or before ``end``.
+
+    Args:
+        timeframe: One of TIMEFRAME_DAYS
+        interval: One of INTERVALS
+        end: Last date of the series (defaults to today)
+
+    Returns:
+        datetime64[D] array for daily and longer bars, datetime64[m] bar open times for intraday bars
+    """
+    end_day = last_trading_day(end)
+    days = TIMEFRAME_DAYS[timeframe]
+    step = INTERVALS[interval]
+    if step < 0:
+        n = bar_count(timeframe, interval)
+        return np.busday_offset(end_day, np.arange(-(n - 1), 1) * -step)
+    sessions = np.busday_offset(end_day, np.arange(-(days - 1), 1)).astype("datetime64[m]")
+    offsets = SESSION_OPEN + np.arange(0, MINUTES_PER_SESSION, step).astype("timedelta64[m]")
+    return (sessions[:, None] + offsets[None, :]).ravel()
+
+
+def last_trading_day(end: Optional[Union[str, date, np.datetime64]] = None) -> np.datetime64:
+    """Return the last trading day on or before ``end`` (defaults to today)."""
+    return np.busday_offset(np.datetime64(end or date.today(), "D"), 0, roll="backward")
+
+
+def series_bounds(
+    timeframe: str, interval: str, end: Optional[Union[str, date, np.datetime64]] = None
+) -> Tuple[np.datetime64, np.datetime64]:
+    """
+    Return the half-open time range a timeframe covers, ending with the trading day of ``end``.
+
+    Args:
+        timeframe: One of TIMEFRAME_DAYS
+        interval: One of INTERVALS
+        end: Last date of the range (defaults to today)
+
+    Returns:
+        (start, stop) datetime64 bounds; bars with start <= date < stop fall in the range
+    """
+    end_day = last_trading_day(end)
+    step = INTERVALS[interval]
+    days = (bar_count(timeframe, interval) - 1) * -step + 1 if step < 0 else TIMEFRAME_DAYS[timeframe]
+    start = np.busday_offset(end_day, -(days - 1))
+    unit = "D" if step < 0 else "m"
+    return start.astype(f"datetime64[{unit}]"), (end_day + 1).astype(f"datetime64[{unit}]")
+
+
+def series_seed(ticker: str, timeframe: str, interval: str, seed: Optional[int] = None) -> np.random.SeedSequence:
+    """Derive the random stream for one ticker, timeframe and interval from a seed (DEFAULT_SEED when None)."""
+    key = f"{ticker}|{timeframe}|{interval}".encode("utf-8")
+    return np.random.SeedSequence([seed if seed is not None else DEFAULT_SEED, zlib.crc32(key)])
+
+
+def generate_panel(
+    tickers: Sequence[str],
+    timeframe: str = "1mo",
+    interval: Optional[str] = None,
+    seed: Optional[int] = None,
+    end: Optional[Union[str, date]] = None,
+) -> "PricePanel":
+    """
+    Generate reproducible OHLCV bars for several tickers on one date axis in a single pass.
+
+    Each ticker keeps its own random stream, so its bars are identical to
+    generate_series for the same arguments; the random walk, wicks and volume
+    are computed for all tickers at once as (tickers x bars) matrices.
+
+    Args:
+        tickers: Stock ticker symbols
+        timeframe: One of TIMEFRAME_DAYS (e.g. 1mo, 1y, 10y)
+        interval: Bar size, one of INTERVALS (defaults per timeframe, e.g. 1d for 1mo)
+        seed: Scenario seed; the same seed, ticker, timeframe and interval always
+            give the same prices (DEFAULT_SEED when None, so unseeded data is
+            deterministic per ticker)
+        end: Last date of the series (defaults to today)
+
+    Returns:
+        PricePanel with one row per ticker
+
+    Raises:
+        ValueError: For an unknown timeframe or interval
+    """
+    tickers = [ticker.upper() for ticker in tickers]
+    interval = resolve_interval(timeframe, interval)
+    dates = bar_dates(timeframe, interval, end)
+    n = len(dates)
+    profiles = np.array([TICKER_PROFILES.get(ticker, DEFAULT_PROFILE) for ticker in tickers]).reshape(-1, 4)
+    base_price, drift, volatility, daily_volume = (profiles[:, [i]] for i in range(4))
+
+    step = INTERVALS[interval]
+    # Bar length in years and as a fraction of a trading day
+    day_fraction = step / MINUTES_PER_SESSION if step > 0 else -step
+    dt = day_fraction / TRADING_DAYS_PER_YEAR
+    bar_sigma = volatility * np.sqrt(dt)
+
+    # Draw each ticker's stream in the same order as a single-ticker run
+    shocks = np.empty((len(tickers), n))
+    excursions = np.empty((len(tickers), 2, n))
+    volume_noise = np.empty((len(tickers), n))
+    for row, ticker in enumerate(tickers):
+        rng = np.random.default_rng(series_seed(ticker, timeframe, interval, seed))
+        rng.standard_normal(out=shocks[row])
+        rng.standard_normal(out=excursions[row])
+        rng.standard_normal(out=volume_noise[row])
+
+    log_returns = (drift - 0.5 * volatility ** 2) * dt + bar_sigma * shocks
+    close = base_price * np.exp(np.cumsum(log_returns, axis=1))
+    open_ = np.empty_like(close)
+    open_[:, :1] = base_price
+    open_[:, 1:] = close[:, :-1]
+
+    # Intrabar excursions beyond the open/close range, about half a bar's volatility
+    excursions = np.abs(excursions) * (0.5 * bar_sigma)[:, :, None]
+    high = np.maximum(open_, close) * np.exp(excursions[:, 0])
+    low = np.minimum(open_, close) * np.exp(-excursions[:, 1])
+
+    # Busier bars on bigger moves
+    volume = daily_volume * day_fraction * np.exp(0.3 * volume_noise - 0.045) * (0.7 + 0.3 * np.abs(shocks))
+    return PricePanel(
+        tickers=tickers,
+        timeframe=timeframe,
+        interval=interval,
+        dates=dates,
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume.astype(np.int64).astype(np.float64),
+    )
+
+
+def generate_series(
+    ticker: str,
+    timeframe: str = "1mo",
+    interval: Optional[str] = None,
+    seed: Optional[int] = None,
+    end: Optional[Union[str, date]] = None,
+) -> PriceSeries:
+    """
+    Generate reproducible OHLCV bars for a ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        timeframe: One of TIMEFRAME_DAYS (e.g. 1mo, 1y, 10y)
+        interval: Bar size, one of INTERVALS (defaults per timeframe, e.g. 1d for 1mo)
+        seed: Scenario seed; the same seed, ticker, timeframe and interval always
+            give the same prices (DEFAULT_SEED when None, so unseeded data is
+            deterministic per ticker)
+        end: Last date of the series (defaults to today)
+
+    Returns:
+        PriceSeries with the bars in chronological order
+
+    Raises:
+        ValueError: For an unknown timeframe or interval
+    """
+    return generate_panel([ticker], timeframe, interval=interval, seed=seed, end=end).series(0)
+
+
+def align_series(series: Sequence[PriceSeries], timeframe: str = "") -> "PricePanel":
+    """
+    Put several series on their shared date axis.
+
+    The axis is the union of all dates; a ticker without a bar on a date has
+    NaN in every column there.
+
+    Args:
+        series: Series with the same interval
+        timeframe: Timeframe label for the panel
+
+    Returns:
+        PricePanel with one row per series, in the given order
+    """
+    if len({s.interval for s in series}) > 1:
+        raise ValueError("Series to align must share an interval")
+    dates = series[0].dates if len(series) == 1 else np.unique(np.concatenate([s.dates for s in series]))
+    columns = {name: np.full((len(series), len(dates)), np.nan) for name in OHLCV}
+    for row, s in enumerate(series):
+        positions = np.searchsorted(dates, s.dates)
+        for name in OHLCV:
+            columns[name][row, positions] = getattr(s, name)
+    return PricePanel(
+        tickers=[s.ticker for s in series],
+        timeframe=timeframe or series[0].timeframe,
+        interval=series[0].interval,
+        dates=dates,
+        **columns,
+    )
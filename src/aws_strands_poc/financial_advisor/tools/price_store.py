@@ -0,0 +1,433 @@
+"""
+Price Store - Local memory-mapped columnar store of OHLCV bars.
+
+Each ticker and bar interval holds one ``.npy`` file per column: ``dates.npy``
+is the sorted date index and ``open``, ``high``, ``low``, ``close`` and
+``volume`` are aligned to it. Files are opened with
+``np.load(mmap_mode="r")``, so a read maps the file instead of copying it, and a
+date range is found by binary search on the index and returned as views of the
+mapped columns. Only the pages a query touches are read from disk.
+
+Layout::
+
+    <root>/<TICKER>/<interval>/CURRENT             name of the live version
+    <root>/<TICKER>/<interval>/<version>/dates.npy
+    <root>/<TICKER>/<interval>/<version>/open.npy
+    ...
+
+Bars are written with ``write``, ``write_series`` or in bulk from CSV with
+``ingest_csv``. Every write creates a new version directory and then switches
+``CURRENT`` to it with an atomic rename, so a stored ticker never goes missing
+mid-write. A read resolves ``CURRENT`` once and maps every column from that
+one version, so readers never see columns from two different writes; if a
+later write removes the version before it is mapped, the read resolves
+``CURRENT`` again.
+
+Usage::
+
+    python -m aws_strands_poc.financial_advisor.tools.price_store ingest bars.csv --root data/prices
+    python -m aws_strands_poc.financial_advisor.tools.price_store generate AAPL MSFT --timeframe 10y --root data/prices
+"""
+
+import argparse
+import csv
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.downsampling import bar_minutes, bucket_starts, resample_ohlc
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    INTERVALS,
+    PriceSeries,
+    generate_series,
+    resolve_interval,
+    series_bounds,
+)
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("open", "high", "low", "close", "volume")
+DATE_FIELD = "dates"
+CURRENT = "CURRENT"
+# Times a read resolves CURRENT again when its version disappears under it
+READ_RETRIES = 5
+_SAFE_TICKER_RE = re.compile(r"^[A-Z0-9.^=-]{1,16}$")
+
+
+def _date_dtype(interval: str) -> str:
+    """Daily and longer bars are indexed by day, intraday bars by minute."""
+    return "datetime64[D]" if INTERVALS[interval] < 0 else "datetime64[m]"
+
+
+class PriceStore:
+    """
+    Memory-mapped columnar store of OHLCV bars, one directory per ticker and interval.
+
+    A store without a root directory is disabled: reads return None and callers
+    fall back to generated data.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the store (None disables it)
+        """
+        self.root = Path(root) if root else None
+        self.enabled = self.root is not None
+        # (ticker, interval) -> (version directory, {column: memmap})
+        self._maps: Dict[Tuple[str, str], Tuple[Path, Dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+        # Serializes writes so that concurrent merges never drop each other's bars
+        self._write_lock = threading.Lock()
+        self.reads = 0
+        self.opens = 0
+        self.misses = 0
+
+    def _dir(self, ticker: str, interval: str) -> Path:
+        ticker = ticker.upper()
+        if not _SAFE_TICKER_RE.match(ticker):
+            raise ValueError(f"Invalid ticker {ticker!r}")
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval {interval!r}; expected one of {', '.join(INTERVALS)}")
+        return self.root / ticker / interval
+
+    def path(self, ticker: str, interval: str = "1d") -> Optional[Path]:
+        """
+        Return the directory of the live version of a ticker's bars.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+
+        Returns:
+            The version directory, or None when the ticker is not stored
+        """
+        if not self.enabled or not _SAFE_TICKER_RE.match(ticker.upper()):
+            return None
+        directory = self._dir(ticker, interval)
+        try:
+            return directory / (directory / CURRENT).read_text().strip()
+        except FileNotFoundError:
+            # Stores written before versioning keep the columns in the interval directory
+            return directory if (directory / f"{DATE_FIELD}.npy").exists() else None
+
+    def _columns(self, ticker: str, interval: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Return the mapped columns of a ticker's live version, remapping them after a write.
+
+        Raises:
+            FileNotFoundError: When the live version keeps disappearing before it can be mapped
+        """
+        key = (ticker.upper(), interval)
+        for _ in range(READ_RETRIES):
+            version = self.path(ticker, interval)
+            if version is None:
+                return None
+            with self._lock:
+                cached = self._maps.get(key)
+                if cached is not None and cached[0] == version:
+                    return cached[1]
+            try:
+                columns = {name: np.load(version / f"{name}.npy", mmap_mode="r") for name in (DATE_FIELD,) + FIELDS}
+            except FileNotFoundError:
+                # A newer write replaced this version between resolving and mapping it
+                continue
+            with self._lock:
+                self._maps[key] = (version, columns)
+                self.opens += 1
+            return columns
+        raise FileNotFoundError(f"Price store version of {ticker} {interval} kept changing during the read")
+
+    def has(self, ticker: str, interval: str = "1d") -> bool:
+        """Return True when the store holds bars for a ticker at an interval."""
+        return self.path(ticker, interval) is not None
+
+    def tickers(self) -> List[str]:
+        """Return the tickers in the store."""
+        if not self.enabled or not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def date_range(self, ticker: str, interval: str = "1d") -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        """Return the first and last stored bar dates, or None if the ticker is not stored."""
+        columns = self._columns(ticker, interval)
+        if columns is None or not len(columns[DATE_FIELD]):
+            return None
+        dates = columns[DATE_FIELD]
+        return dates[0], dates[-1]
+
+    def read(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start: Optional[Union[str, date, np.datetime64]] = None,
+        stop: Optional[Union[str, date, np.datetime64]] = None,
+        timeframe: str = "",
+    ) -> Optional[PriceSeries]:
+        """
+        Read the bars in a date range without copying them.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            start: First date to include (defaults to the first stored bar)
+            stop: First date to exclude (defaults to after the last stored bar)
+            timeframe: Timeframe label for the returned series
+
+        Returns:
+            PriceSeries whose columns are read-only views of the mapped files,
+            or None if the ticker is not stored
+        """
+        columns = self._columns(ticker, interval)
+        if columns is None:
+            self.misses += 1
+            return None
+        self.reads += 1
+        dates = columns[DATE_FIELD]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start).astype(dates.dtype), "left"))
+        hi = len(dates) if stop is None else int(np.searchsorted(dates, np.datetime64(stop).astype(dates.dtype), "left"))
+        return PriceSeries(
+            ticker=ticker.upper(),
+            timeframe=timeframe,
+            interval=interval,
+            dates=dates[lo:hi],
+            **{name: columns[name][lo:hi] for name in FIELDS},
+        )
+
+    def read_timeframe(
+        self,
+        ticker: str,
+        timeframe: str,
+        interval: Optional[str] = None,
+        end: Optional[Union[str, date]] = None,
+    ) -> Optional[PriceSeries]:
+        """
+        Read the bars of a timeframe ending at ``end``, like generate_series would return them.
+
+        Args:
+            ticker: Stock ticker symbol
+            timeframe: Timeframe such as 1mo or 5y
+            interval: Bar interval (defaults per timeframe)
+            end: Last date of the range (defaults to the last stored bar)
+
+        Returns:
+            PriceSeries, or None if the ticker is stored neither at that interval
+            nor at a finer one (whose bars are then merged into the interval)
+
+        Raises:
+            ValueError: For an unknown timeframe or interval
+        """
+        interval = resolve_interval(timeframe, interval)
+        source = self.stored_interval(ticker, interval)
+        if source is None:
+            self.misses += 1
+            return None
+        if end is None:
+            end = self.date_range(ticker, source)[1].astype("datetime64[D]")
+        start, stop = series_bounds(timeframe, interval, end)
+        series = self.read(ticker, source, start, stop, timeframe=timeframe)
+        if source != interval:
+            series = resample_ohlc(series, bucket_starts(series.dates, resolution=interval), interval=interval)
+        return series
+
+    def stored_interval(self, ticker: str, interval: str) -> Optional[str]:
+        """
+        Return the stored interval to serve bars of an interval from.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Requested bar interval
+
+        Returns:
+            The interval itself when stored, else the coarsest stored finer
+            interval, else None
+        """
+        if not self.enabled:
+            return None
+        finer = sorted((i for i in INTERVALS if bar_minutes(i) <= bar_minutes(interval)), key=bar_minutes, reverse=True)
+        return next((i for i in finer if self.has(ticker, i)), None)
+
+    def write(
+        self,
+        ticker: str,
+        interval: str,
+        dates: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        merge: bool = True,
+    ) -> int:
+        """
+        Store bars for a ticker as a new version and make it the live one in one step.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            dates: Bar dates (any order)
+            columns: Arrays for open, high, low, close and volume aligned to ``dates``
+            merge: Keep stored bars on dates not in ``dates`` (otherwise replace them all)
+
+        Returns:
+            Number of bars stored for the ticker after the write
+        """
+        if not self.enabled:
+            raise RuntimeError("Price store has no root directory")
+        directory = self._dir(ticker, interval)
+        dates = np.asarray(dates, dtype=_date_dtype(interval))
+        new = {name: np.asarray(columns[name], dtype=np.int64 if name == "volume" else np.float64) for name in FIELDS}
+        if any(len(values) != len(dates) for values in new.values()):
+            raise ValueError("All columns must have the same length as dates")
+
+        with self._write_lock:
+            existing = self._columns(ticker, interval) if merge else None
+            if existing is not None and len(existing[DATE_FIELD]):
+                keep = ~np.isin(existing[DATE_FIELD], dates)
+                dates = np.concatenate([existing[DATE_FIELD][keep], dates])
+                new = {name: np.concatenate([existing[name][keep], new[name]]) for name in FIELDS}
+            # The last bar for a date wins
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+            last = np.ones(len(dates), dtype=bool)
+            last[:-1] = dates[1:] != dates[:-1]
+
+            version = f"v{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+            (directory / version).mkdir(parents=True)
+            np.save(directory / version / f"{DATE_FIELD}.npy", dates[last])
+            for name in FIELDS:
+                np.save(directory / version / f"{name}.npy", new[name][order][last])
+            pointer = directory / f".{CURRENT}.{version}.tmp"
+            pointer.write_text(version)
+            os.replace(pointer, directory / CURRENT)
+            with self._lock:
+                self._maps.pop((ticker.upper(), interval), None)
+            self._remove_stale(directory, version)
+        return int(last.sum())
+
+    @staticmethod
+    def _remove_stale(directory: Path, version: str) -> None:
+        """Delete versions older than the live one, and columns left from the unversioned layout."""
+        for entry in directory.iterdir():
+            if entry.is_dir() and entry.name.startswith("v"):
+                # Versions start with a timestamp; newer ones may still be written by another process
+                if entry.name < version:
+                    # Readers that still map old files keep them until they are done
+                    shutil.rmtree(entry, ignore_errors=True)
+            elif entry.suffix == ".npy":
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def write_series(self, series: PriceSeries, merge: bool = True) -> int:
+        """Store a PriceSeries under its ticker and interval."""
+        return self.write(series.ticker, series.interval, series.dates,
+                          {name: getattr(series, name) for name in FIELDS}, merge=merge)
+
+    def ingest_csv(
+        self,
+        path: Union[str, Path],
+        ticker: Optional[str] = None,
+        interval: str = "1d",
+    ) -> Dict[str, int]:
+        """
+        Bulk-load bars from a CSV file.
+
+        The file needs a header with date, open, high, low, close and volume
+        columns (case-insensitive). A ticker or symbol column lets one file hold
+        many tickers; otherwise ``ticker`` names the single ticker in the file.
+
+        Args:
+            path: CSV file path
+            ticker: Ticker of every row when the file has no ticker column
+            interval: Bar interval of the rows
+
+        Returns:
+            Number of rows ingested per ticker
+        """
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip().lower() for name in next(reader)]
+            ticker_col = next((header.index(name) for name in ("ticker", "symbol") if name in header), None)
+            if ticker_col is None and not ticker:
+                raise ValueError(f"{path} has no ticker column; pass the ticker explicitly")
+            try:
+                positions = [header.index(name) for name in ("date",) + FIELDS]
+            except ValueError:
+                raise ValueError(f"{path} needs date, open, high, low, close and volume columns") from None
+            rows: Dict[str, List[List[str]]] = defaultdict(list)
+            for row in reader:
+                if row:
+                    rows[row[ticker_col].upper() if ticker_col is not None else ticker.upper()].append(row)
+
+        ingested = {}
+        for symbol, symbol_rows in rows.items():
+            columns = list(zip(*symbol_rows))
+            dates = np.array(columns[positions[0]], dtype=_date_dtype(interval))
+            values = {name: np.array(columns[pos], dtype=np.float64) for name, pos in zip(FIELDS, positions[1:])}
+            self.write(symbol, interval, dates, values)
+            ingested[symbol] = len(symbol_rows)
+        logger.info(f"Ingested {sum(ingested.values())} rows for {len(ingested)} tickers from {path}")
+        return ingested
+
+    def close(self) -> None:
+        """Drop all mapped files."""
+        with self._lock:
+            self._maps.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return read counters and the number of mapped tickers."""
+        with self._lock:
+            mapped = len(self._maps)
+        return {
+            "enabled": self.enabled,
+            "reads": self.reads,
+            "misses": self.misses,
+            "file_opens": self.opens,
+            "mapped": mapped,
+        }
+
+
+# Process-wide store; set PRICE_STORE_PATH to serve stock_data from local files
+price_store = PriceStore(os.environ.get("PRICE_STORE_PATH") or None)
+
+
+def main():
+    """Ingest CSV files into a store or fill it with generated bars."""
+    parser = argparse.ArgumentParser(description="Manage the local memory-mapped price store")
+    parser.add_argument("--root", default=os.environ.get("PRICE_STORE_PATH"), required=not price_store.enabled,
+                        help="Store directory (default: PRICE_STORE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Bulk-load CSV files")
+    ingest.add_argument("paths", nargs="+", help="CSV files with date, open, high, low, close, volume columns")
+    ingest.add_argument("--ticker", help="Ticker for files without a ticker column")
+    ingest.add_argument("--interval", default="1d", choices=list(INTERVALS), help="Bar interval of the rows")
+    generate = commands.add_parser("generate", help="Store generated mock bars")
+    generate.add_argument("tickers", nargs="+", help="Tickers to generate")
+    generate.add_argument("--timeframe", default="10y", help="Timeframe to generate")
+    generate.add_argument("--interval", default="1d", choices=list(INTERVALS), help="Bar interval")
+    generate.add_argument("--seed", type=int, help="Scenario seed")
+    args = parser.parse_args()
+
+    store = PriceStore(args.root)
+    start = time.perf_counter()
+    if args.command == "ingest":
+        counts: Dict[str, int] = {}
+        for path in args.paths:
+            counts.update(store.ingest_csv(path, ticker=args.ticker, interval=args.interval))
+    else:
+        counts = {t.upper(): store.write_series(generate_series(t, args.timeframe, args.interval, seed=args.seed))
+                  for t in args.tickers}
+    print(f"Stored {sum(counts.values())} bars for {len(counts)} tickers in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
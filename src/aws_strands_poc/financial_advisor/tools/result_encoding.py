@@ -0,0 +1,306 @@
+"""
+Result Encoding - Compact, lossless text encodings for tool results.
+
+Strands turns a tool's return value into the tool-result text the model reads
+with ``str(result)``, i.e. the Python repr of a dict: quoted keys repeated for
+every record, spaces after every separator and Python literals. Tool results
+dominate the prompt in the specialist loops, so tools can opt into a compact
+encoding with the ``encoded_result`` decorator, placed under ``@tool``::
+
+    @tool
+    @encoded_result("rows")
+    def tax_calculator(...) -> dict:
+
+The decorated function still returns a plain dict to Python callers; only its
+text form changes. Every encoder is lossless: ``decode(encode(value)) ==
+value``. Each result is checked when it is encoded, and one that would not
+round-trip (e.g. it holds tuples or NaN) is sent in the default repr form.
+
+Encoders:
+
+- ``repr``: Strands' default ``str(result)``, kept as the baseline
+- ``json``: compact JSON without whitespace
+- ``rows``: compact JSON where every list of records with the same keys becomes
+  ``{"$header": [keys], "$rows": [[values], ...]}``
+- ``columnar``: like rows, but as ``{"$columns": {key: [values], ...}}``
+- ``csv``: like rows, but as one ``{"$csv": "..."}`` string whose first line
+  is the header and whose cells are JSON literals
+
+``encoding_stats`` records, per tool, the bytes and tokens of each encoded
+result against the repr baseline.
+"""
+
+import ast
+import functools
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_strands_poc.financial_advisor.history import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_HEADER, _ROWS, _COLUMNS, _CSV = "$header", "$rows", "$columns", "$csv"
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _records_keys(value: Any) -> Optional[List[str]]:
+    """Return the shared keys of a list of two or more flat records with the same keys, else None."""
+    if not isinstance(value, list) or len(value) < 2 or not all(isinstance(item, dict) for item in value):
+        return None
+    keys = list(value[0])
+    if not keys or any(list(item) != keys for item in value):
+        return None
+    if any(isinstance(v, (dict, list)) for item in value for v in item.values()):
+        return None
+    return keys
+
+
+class ResultEncoder:
+    """Base class: turns a tool result into text and back."""
+
+    name = ""
+
+    def encode(self, value: Any) -> str:
+        raise NotImplementedError
+
+    def decode(self, text: str) -> Any:
+        raise NotImplementedError
+
+
+class ReprEncoder(ResultEncoder):
+    """Python repr, as Strands produces it for undecorated tools."""
+
+    name = "repr"
+
+    def encode(self, value: Any) -> str:
+        return str(value)
+
+    def decode(self, text: str) -> Any:
+        return ast.literal_eval(text)
+
+
+class JsonEncoder(ResultEncoder):
+    """Compact JSON."""
+
+    name = "json"
+
+    def encode(self, value: Any) -> str:
+        return _compact(value)
+
+    def decode(self, text: str) -> Any:
+        return json.loads(text)
+
+
+class _TableEncoder(JsonEncoder):
+    """Compact JSON with every list of same-key records rewritten as a table."""
+
+    marker = ""
+
+    def encode(self, value: Any) -> str:
+        return _compact(self._pack(value))
+
+    def decode(self, text: str) -> Any:
+        return self._unpack(json.loads(text))
+
+    def _pack(self, value: Any) -> Any:
+        keys = _records_keys(value)
+        if keys is not None:
+            return self.pack_table(keys, [[item[key] for key in keys] for item in value])
+        if isinstance(value, dict):
+            return {key: self._pack(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._pack(item) for item in value]
+        return value
+
+    def _unpack(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if self.marker in value:
+                keys, rows = self.unpack_table(value)
+                return [dict(zip(keys, row)) for row in rows]
+            return {key: self._unpack(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unpack(item) for item in value]
+        return value
+
+    def pack_table(self, keys: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def unpack_table(self, table: Dict[str, Any]) -> Any:
+        raise NotImplementedError
+
+
+class RowsEncoder(_TableEncoder):
+    """Records as a header plus one value list per record."""
+
+    name = "rows"
+    marker = _ROWS
+
+    def pack_table(self, keys: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+        return {_HEADER: keys, _ROWS: rows}
+
+    def unpack_table(self, table: Dict[str, Any]) -> Any:
+        return table[_HEADER], table[_ROWS]
+
+
+class ColumnarEncoder(_TableEncoder):
+    """Records as one value list per key."""
+
+    name = "columnar"
+    marker = _COLUMNS
+
+    def pack_table(self, keys: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+        return {_COLUMNS: {key: list(column) for key, column in zip(keys, zip(*rows))}}
+
+    def unpack_table(self, table: Dict[str, Any]) -> Any:
+        columns = table[_COLUMNS]
+        return list(columns), zip(*columns.values())
+
+
+class CsvEncoder(_TableEncoder):
+    """Records as CSV text whose cells are JSON literals, so types survive."""
+
+    name = "csv"
+    marker = _CSV
+
+    def pack_table(self, keys: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+        lines = [_compact(keys)[1:-1]] + [_compact(row)[1:-1] for row in rows]
+        return {_CSV: "\n".join(lines)}
+
+    def unpack_table(self, table: Dict[str, Any]) -> Any:
+        lines = [json.loads(f"[{line}]") for line in table[_CSV].split("\n")]
+        return lines[0], lines[1:]
+
+
+ENCODERS: Dict[str, ResultEncoder] = {
+    encoder.name: encoder
+    for encoder in (ReprEncoder(), JsonEncoder(), RowsEncoder(), ColumnarEncoder(), CsvEncoder())
+}
+
+
+def encode_result(value: Any, encoding: str = "json") -> str:
+    """
+    Encode a tool result, falling back to repr when the encoding would not round-trip.
+
+    Args:
+        value: Tool result
+        encoding: Name of an encoder in ENCODERS
+
+    Returns:
+        The encoded text
+
+    Raises:
+        ValueError: For an unknown encoding
+    """
+    encoder = ENCODERS.get(encoding)
+    if encoder is None:
+        raise ValueError(f"Unknown result encoding {encoding!r}; expected one of {', '.join(ENCODERS)}")
+    try:
+        text = encoder.encode(value)
+        if encoder.decode(text) == value:
+            return text
+    except (TypeError, ValueError) as e:
+        logger.debug(f"{encoding} encoding failed, using repr: {e}")
+    return str(value)
+
+
+def decode_result(text: str, encoding: str = "json") -> Any:
+    """Decode text produced by encode_result with the same encoding."""
+    return ENCODERS[encoding].decode(text)
+
+
+class EncodingStats:
+    """Per-tool bytes and tokens of encoded results against the repr baseline."""
+
+    def __init__(self):
+        self._tools: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name: str, baseline: str, encoded: str) -> None:
+        """Record one result's repr and encoded text."""
+        baseline_tokens, encoded_tokens = count_tokens(baseline), count_tokens(encoded)
+        with self._lock:
+            stats = self._tools.setdefault(tool_name, {
+                "results": 0, "repr_bytes": 0, "encoded_bytes": 0, "repr_tokens": 0, "encoded_tokens": 0,
+            })
+            stats["results"] += 1
+            stats["repr_bytes"] += len(baseline.encode("utf-8"))
+            stats["encoded_bytes"] += len(encoded.encode("utf-8"))
+            stats["repr_tokens"] += baseline_tokens
+            stats["encoded_tokens"] += encoded_tokens
+
+    def clear(self) -> None:
+        """Forget all recorded results."""
+        with self._lock:
+            self._tools.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return totals and byte/token savings per tool."""
+        with self._lock:
+            tools = {name: dict(stats) for name, stats in self._tools.items()}
+        for stats in tools.values():
+            for unit in ("bytes", "tokens"):
+                baseline = stats[f"repr_{unit}"]
+                stats[f"{unit}_saved"] = 1 - stats[f"encoded_{unit}"] / baseline if baseline else 0.0
+        return tools
+
+
+# Process-wide statistics for all encoded tool results
+encoding_stats = EncodingStats()
+
+
+class EncodedResult(dict):
+    """
+    A tool result dict whose ``str()`` is its compact encoding.
+
+    Strands stringifies tool return values with ``str()``, so this is what the
+    model reads, while Python callers keep a normal dict. The encoding is not
+    cached: every ``str()`` reflects the dict as it is then, including changes
+    to nested values. Only the first one is counted in encoding_stats.
+    """
+
+    def __init__(self, value: Dict[str, Any], encoding: str, tool_name: str = ""):
+        super().__init__(value)
+        self.encoding = encoding
+        self.tool_name = tool_name
+        self._recorded = False
+
+    def __str__(self) -> str:
+        plain = dict(self)
+        text = encode_result(plain, self.encoding)
+        if not self._recorded:
+            self._recorded = True
+            encoding_stats.record(self.tool_name, repr(plain), text)
+        return text
+
+
+def encoded_result(encoding: str = "json") -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that makes a tool's dict results reach the model in a compact encoding.
+
+    Apply it below ``@tool`` so the tool keeps the function's signature and docstring.
+
+    Args:
+        encoding: Name of an encoder in ENCODERS
+
+    Returns:
+        Decorator wrapping the tool function
+    """
+    if encoding not in ENCODERS:
+        raise ValueError(f"Unknown result encoding {encoding!r}; expected one of {', '.join(ENCODERS)}")
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = func(*args, **kwargs)
+            if isinstance(result, dict) and not isinstance(result, EncodedResult):
+                return EncodedResult(result, encoding, func.__name__)
+            return result
+
+        return wrapper
+
+    return decorator
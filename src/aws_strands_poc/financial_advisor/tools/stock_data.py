@@ -2,80 +2,156 @@
 Stock Data Tool - Fetches stock price data for a given ticker symbol.
 """
 
+from typing import Dict, List, Optional, Tuple
+
 from strands import tool
-import json
-import random  # For mock data in POC
+
+from aws_strands_poc.financial_advisor.tools.downsampling import bucket_starts, downsample, resample_ohlc, summary_stats
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    INTERVALS,
+    PricePanel,
+    PriceSeries,
+    align_series,
+    generate_panel,
+    generate_series,
+    resolve_interval,
+)
+from aws_strands_poc.financial_advisor.tools.price_store import price_store
+from aws_strands_poc.financial_advisor.tools.result_encoding import encoded_result
+
+# Upper bound on tickers per call, keeping one response within a sensible prompt size
+MAX_BATCH_TICKERS = 50
+
+# Bars per ticker returned when the caller sets no max_points; longer series are
+# merged into OHLCV buckets (a year of 1m bars alone is ~98,000 bars and 5 MB)
+DEFAULT_MAX_POINTS = 500
+
+# Upper bound on bars x tickers in one response, even with an explicit max_points
+MAX_RESPONSE_BARS = 10_000
+
+
+def load_panel(
+    tickers: List[str], timeframe: str, interval: Optional[str], seed: Optional[int], end: Optional[str]
+) -> Tuple[PricePanel, Dict[str, str]]:
+    """
+    Load several tickers onto one date axis: stored tickers from the price store, the rest generated in one pass.
+
+    Without an explicit end date, every ticker ends on the latest stored bar (or
+    today when none is stored), so the series line up.
+
+    Returns:
+        The panel and the source ("store" or "generated") of each ticker
+    """
+    interval = resolve_interval(timeframe, interval)
+    stored = {ticker: price_store.stored_interval(ticker, interval) for ticker in tickers}
+    if end is None and any(stored.values()):
+        end = str(max(price_store.date_range(t, i)[1] for t, i in stored.items() if i).astype("datetime64[D]"))
+    missing = [ticker for ticker in tickers if stored[ticker] is None]
+    generated = generate_panel(missing, timeframe, interval=interval, seed=seed, end=end) if missing else None
+    sources = {ticker: "generated" if stored[ticker] is None else "store" for ticker in tickers}
+    if len(missing) == len(tickers):
+        return generated, sources
+
+    series = [
+        price_store.read_timeframe(ticker, timeframe, interval=interval, end=end)
+        if stored[ticker] is not None else generated.series(missing.index(ticker))
+        for ticker in tickers
+    ]
+    panel = align_series(series, timeframe)
+    if len(panel) > max(len(s) for s in series) and INTERVALS[interval] < -1:
+        # Stored weekly/monthly bars follow the calendar while generated ones are
+        # spaced in trading days; merge both into the same calendar buckets
+        panel = resample_ohlc(panel, bucket_starts(panel.dates, resolution=interval), interval=interval)
+    return panel, sources
+
+
+def load_series(
+    ticker: str, timeframe: str, interval: Optional[str], seed: Optional[int], end: Optional[str]
+) -> Tuple[PriceSeries, str]:
+    """
+    Load one ticker from the price store, or generate it when the store does not hold it.
+
+    Returns:
+        The series and its source ("store" or "generated")
+    """
+    series = price_store.read_timeframe(ticker, timeframe, interval=interval, end=end)
+    if series is not None:
+        return series, "store"
+    return generate_series(ticker, timeframe, interval=interval, seed=seed, end=end), "generated"
+
 
 @tool
-def stock_data(ticker: str, timeframe: str = "1d") -> dict:
+@encoded_result("json")
+def stock_data(ticker: str = "", timeframe: str = "1d", interval: Optional[str] = None,
+               seed: Optional[int] = None, end: Optional[str] = None,
+               tickers: Optional[List[str]] = None, max_points: Optional[int] = None,
+               resolution: Optional[str] = None, method: str = "ohlc") -> dict:
     """
-    Fetch stock price data for a given ticker symbol.
-    
+    Fetch stock price data for one ticker, or for several tickers at once.
+
+    Every response includes a summary (return, annualized volatility, maximum
+    drawdown, high, low and range) computed on the full-resolution bars. When only
+    the trend matters, set max_points or resolution to receive fewer bars. Without
+    max_points, series longer than 500 bars are merged down to 500 and the response
+    reports the original bar count in "downsampled_from".
+
     Args:
         ticker: Stock ticker symbol (e.g., AAPL, MSFT)
-        timeframe: Time period for data (1d, 5d, 1mo, 3mo, 6mo, 1y, 5y)
-    
+        timeframe: Time period for data (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y)
+        interval: Bar size (1m, 5m, 15m, 30m, 1h, 1d, 1wk, 1mo, 3mo); defaults to hourly
+                  for 1d, daily up to 6mo, monthly for 1y-2y and quarterly beyond
+        seed: Scenario seed; the same seed always returns the same prices (generated data only).
+            Without a seed, generated prices are still fixed per ticker and timeframe
+        end: Last date of the series as YYYY-MM-DD (defaults to today, or to the
+             last stored bar when the ticker is in the local price store)
+        tickers: Several ticker symbols to fetch in one call (e.g., every holding in a
+                 portfolio), returned on one shared date axis
+        max_points: Return at most this many bars per ticker (default 500; bars times
+                    tickers may not exceed 10,000)
+        resolution: Merge bars into coarser ones of this size (e.g., 1wk for a 6mo request)
+        method: How max_points reduces bars: "ohlc" merges neighbouring bars, "lttb" keeps
+                the bars that best preserve the shape of the closing prices (single ticker only;
+                an error with tickers)
+
     Returns:
-        Dictionary containing stock price data including open, high, low, close prices
+        Dictionary containing columnar stock price data: one list each for date, open,
+        high, low, close and volume, plus a summary. With tickers, one shared date list,
+        the columns of each ticker under "series" and a summary per ticker; a ticker
+        without a bar on a date has null there
     """
     # Note: In a real implementation, this would use an API like yfinance
-    # For the POC, we'll generate mock data
-    
-    # Mock base prices for common tickers
-    base_prices = {
-        "AAPL": 175.0,
-        "MSFT": 350.0,
-        "GOOGL": 140.0,
-        "AMZN": 180.0,
-        "META": 450.0,
-        "TSLA": 180.0,
-        "NVDA": 920.0,
-        "JPM": 185.0,
-        "V": 270.0,
-        "WMT": 60.0
-    }
-    
-    # Default price for unknown tickers
-    base_price = base_prices.get(ticker.upper(), 100.0)
-    
-    # Generate mock data with realistic fluctuations
-    data = []
-    current_price = base_price
-    
-    # Number of data points based on timeframe
-    points = {
-        "1d": 24,      # Hourly for 1 day
-        "5d": 5,       # Daily for 5 days
-        "1mo": 30,     # Daily for 1 month
-        "3mo": 90,     # Daily for 3 months
-        "6mo": 180,    # Daily for 6 months
-        "1y": 12,      # Monthly for 1 year
-        "5y": 20       # Quarterly for 5 years
-    }.get(timeframe, 10)
-    
-    for i in range(points):
-        # Generate realistic daily fluctuations (within ±2%)
-        daily_change = current_price * random.uniform(-0.02, 0.02)
-        open_price = current_price
-        close_price = current_price + daily_change
-        high_price = max(open_price, close_price) * (1 + random.uniform(0, 0.01))
-        low_price = min(open_price, close_price) * (1 - random.uniform(0, 0.01))
-        
-        data.append({
-            "date": f"2025-{(5 - i//30):02d}-{(17 - i%30):02d}" if i < 180 else f"2024-{(12 - i//30):02d}-{(30 - i%30):02d}",
-            "open": round(open_price, 2),
-            "high": round(high_price, 2),
-            "low": round(low_price, 2),
-            "close": round(close_price, 2),
-            "volume": int(random.uniform(1000000, 10000000))
-        })
-        current_price = close_price
-    
-    result = {
-        "ticker": ticker.upper(),
-        "timeframe": timeframe,
-        "currency": "USD",
-        "data": data
-    }
-    
+    # For the POC, bars come from the local price store when it holds the ticker,
+    # otherwise we generate a reproducible mock series
+    if tickers:
+        symbols = list(dict.fromkeys(t.upper() for t in ([ticker] if ticker else []) + list(tickers)))
+        if len(symbols) > MAX_BATCH_TICKERS:
+            return {"error": f"At most {MAX_BATCH_TICKERS} tickers per call; got {len(symbols)}"}
+        try:
+            bars, source = load_panel(symbols, timeframe, interval, seed, end)
+        except ValueError as e:
+            return {"error": str(e)}
+    elif ticker:
+        try:
+            bars, source = load_series(ticker, timeframe, interval, seed, end)
+        except ValueError as e:
+            return {"error": str(e)}
+    else:
+        return {"error": "Provide a ticker or a list of tickers"}
+
+    width = len(bars.tickers) if isinstance(bars, PricePanel) else 1
+    limit = MAX_RESPONSE_BARS // width
+    if max_points is None:
+        max_points = min(DEFAULT_MAX_POINTS, limit)
+    elif max_points > limit:
+        return {"error": f"At most {MAX_RESPONSE_BARS} bars per response; {max_points} points x {width} "
+                         f"tickers is too many, ask for at most {limit} points"}
+    try:
+        reduced = downsample(bars, max_points=max_points, resolution=resolution, method=method)
+    except ValueError as e:
+        return {"error": str(e)}
+    result = reduced.to_dict()
+    result["source"] = source
+    result["summary"] = summary_stats(bars)
+    if len(reduced) != len(bars):
+        result["downsampled_from"] = len(bars)
     return result
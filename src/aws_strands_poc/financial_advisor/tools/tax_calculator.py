@@ -4,7 +4,10 @@ Tax Calculator Tool - Calculates estimated taxes based on income and deductions.
 
 from strands import tool
 
+from aws_strands_poc.financial_advisor.tools.result_encoding import encoded_result
+
 @tool
+@encoded_result("columnar")
 def tax_calculator(income: float, deductions: float = 0, filing_status: str = "single") -> dict:
     """
     Calculate estimated taxes based on income and deductions.
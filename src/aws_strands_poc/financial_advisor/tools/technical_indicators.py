@@ -0,0 +1,330 @@
+"""
+Technical Indicators Tool - Computes SMA, EMA, RSI, MACD, Bollinger bands, ATR and VWAP.
+
+The market analyst used to reach these through python_repl, re-parsing the
+stock_data output in generated code for every question. This tool computes them
+natively over the same bars stock_data returns (the local price store first,
+generated data otherwise), for one ticker or many in a single vectorized pass.
+
+Computed indicator series are kept in a bounded LRU cache keyed by ticker,
+timeframe, interval, indicator and parameters, plus a fingerprint of the bars
+(source, length, last date and close), so a repeat question is a dictionary
+lookup and a store update is never served stale values.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from strands import tool
+
+from aws_strands_poc.financial_advisor.tools.indicators import INDICATORS, compute, label
+from aws_strands_poc.financial_advisor.tools.price_series import INTERVALS, PricePanel, PriceSeries
+from aws_strands_poc.financial_advisor.tools.result_encoding import encoded_result
+from aws_strands_poc.financial_advisor.tools.stock_data import MAX_BATCH_TICKERS, load_panel, load_series
+
+DEFAULT_INDICATORS = ["sma", "ema", "rsi", "macd", "bollinger", "atr", "vwap"]
+# Bar size when none is given: indicators need more bars than a chart, so short
+# timeframes use intraday bars and everything else daily bars
+DEFAULT_INTERVALS = {"1d": "5m", "5d": "30m"}
+# Upper bound on the tail of values returned per indicator
+MAX_POINTS = 100
+
+Spec = Tuple[str, Tuple[Tuple[str, Any], ...]]
+Fingerprint = Tuple[Any, ...]
+
+
+class IndicatorCache:
+    """Thread-safe LRU cache of computed indicator series."""
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached (ticker, indicator, parameters) series
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, np.ndarray]]:
+        """Return the cached outputs for a key, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Tuple[Any, ...], value: Dict[str, np.ndarray]) -> None:
+        """Store the outputs for a key, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with entries, hits, misses, hit rate and evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+
+# Process-wide indicator cache shared by all agents.
+# Set INDICATOR_CACHE_SIZE to resize it (0 disables caching).
+indicator_cache = IndicatorCache(max_entries=int(os.environ.get("INDICATOR_CACHE_SIZE", "512")))
+
+
+def parse_indicator(entry: str, params: Optional[Dict[str, Dict[str, Any]]] = None) -> Spec:
+    """
+    Resolve an indicator request into its name and full parameters.
+
+    Args:
+        entry: Indicator name, optionally followed by its parameters in order
+            (e.g. sma_50, macd_5_35_5, bollinger_20_2.5)
+        params: Parameter overrides per indicator name, applied to bare names
+
+    Returns:
+        (name, ((parameter, value), ...)) with every parameter filled in
+
+    Raises:
+        ValueError: For an unknown indicator or malformed parameters
+    """
+    name, *values = entry.strip().lower().split("_")
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator {entry!r}; expected one of {', '.join(INDICATORS)}")
+    defaults = INDICATORS[name]
+    if len(values) > len(defaults):
+        raise ValueError(f"{name} takes at most {len(defaults)} parameters ({', '.join(defaults) or 'none'})")
+    overrides = dict((params or {}).get(name, {})) if not values else {}
+    unknown = set(overrides) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown {name} parameters: {', '.join(sorted(unknown))}")
+    resolved = {**defaults, **overrides}
+    for key, value in zip(defaults, values):
+        resolved[key] = value
+    try:
+        resolved = {key: type(defaults[key])(float(value)) for key, value in resolved.items()}
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name} parameters: {resolved}")
+    if any(value <= 0 for value in resolved.values()):
+        raise ValueError(f"{name} parameters must be positive: {resolved}")
+    return name, tuple(resolved.items())
+
+
+def fingerprint(series: PriceSeries, source: str) -> Fingerprint:
+    """Identify a ticker's bars for caching: ticker, timeframe, interval, source, length, last date and close."""
+    if not len(series):
+        return series.ticker, series.timeframe, series.interval, source, 0
+    return (series.ticker, series.timeframe, series.interval, source, len(series),
+            series.dates[-1].item(), float(series.close[-1]))
+
+
+def indicator_series(
+    series: List[PriceSeries], sources: List[str], spec: Spec, panel: Optional[PricePanel] = None
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Return one indicator's output arrays for each series, from the cache where possible.
+
+    Uncached series are computed together as one matrix when a gap-free panel
+    of them is given, otherwise one at a time.
+
+    Args:
+        series: Bars per ticker
+        sources: Source of each ticker's bars ("store" or "generated")
+        spec: Indicator from parse_indicator
+        panel: The same tickers on a shared date axis, in the same order
+
+    Returns:
+        Output arrays by component name, one dict per series
+    """
+    name, params = spec
+    keys = [(fingerprint(s, source), name, params) for s, source in zip(series, sources)]
+    results = [indicator_cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if panel is not None and len(missing) > 1 and not np.isnan(panel.close).any():
+        rows = np.array(missing)
+        subset = replace(panel, tickers=[panel.tickers[i] for i in missing], open=panel.open[rows],
+                         high=panel.high[rows], low=panel.low[rows], close=panel.close[rows],
+                         volume=panel.volume[rows])
+        outputs = compute(name, subset, **dict(params))
+        computed = [{part: values[row] for part, values in outputs.items()} for row in range(len(missing))]
+    else:
+        computed = [compute(name, series[i], **dict(params)) for i in missing]
+    for i, result in zip(missing, computed):
+        indicator_cache.put(keys[i], result)
+        results[i] = result
+    return results
+
+
+def _value(values: np.ndarray, decimals: int = 2) -> Optional[float]:
+    value = float(values[-1]) if len(values) else float("nan")
+    return None if np.isnan(value) else round(value, decimals)
+
+
+def _tail(values: np.ndarray, points: int, decimals: int = 2) -> List[Optional[float]]:
+    return [None if np.isnan(v) else v for v in values[-points:].round(decimals).tolist()]
+
+
+def signals(close: float, latest: Dict[str, Any], outputs: Dict[str, Dict[str, np.ndarray]]) -> List[str]:
+    """Describe notable readings: RSI extremes, MACD crossovers and closes outside the bands or averages."""
+    notes = []
+    for key, value in latest.items():
+        if value is None:
+            continue
+        name = key.split("_")[0]
+        if name == "rsi":
+            if value >= 70:
+                notes.append(f"{key} {value} is overbought (>= 70)")
+            elif value <= 30:
+                notes.append(f"{key} {value} is oversold (<= 30)")
+        elif name in ("sma", "ema", "vwap"):
+            notes.append(f"close is {'above' if close > value else 'below'} {key} ({value})")
+        elif name == "macd":
+            histogram = outputs[key]["histogram"]
+            side = "above" if histogram[-1] > 0 else "below"
+            crossed = len(histogram) > 1 and np.sign(histogram[-1]) != np.sign(histogram[-2])
+            notes.append(f"{key} {'just crossed' if crossed else 'is'} {side} its signal line")
+        elif name == "bollinger":
+            if close > value["upper"]:
+                notes.append(f"close is above the upper {key} band ({value['upper']})")
+            elif close < value["lower"]:
+                notes.append(f"close is below the lower {key} band ({value['lower']})")
+    return notes
+
+
+def ticker_result(series: PriceSeries, source: str, outputs: Dict[str, Dict[str, np.ndarray]],
+                  points: int) -> Dict[str, Any]:
+    """Build the response for one ticker from its indicator outputs, keyed by label."""
+    if not len(series):
+        return {"bars": 0, "source": source, "error": f"No bars for {series.ticker}"}
+    unit = "D" if INTERVALS[series.interval] < 0 else "m"
+    close = round(float(series.close[-1]), 2)
+    latest: Dict[str, Any] = {}
+    for key, values in outputs.items():
+        if len(values) == 1:
+            latest[key] = _value(next(iter(values.values())))
+        else:
+            parts = {part: _value(line) for part, line in values.items()}
+            latest[key] = None if all(v is None for v in parts.values()) else parts
+
+    result: Dict[str, Any] = {
+        "as_of": str(np.datetime_as_string(series.dates[-1], unit=unit)),
+        "close": close,
+        "bars": len(series),
+        "source": source,
+        "values": latest,
+        "signals": signals(close, latest, outputs),
+    }
+    short = [key for key, value in latest.items() if value is None]
+    if short:
+        result["insufficient_bars"] = short
+    if points:
+        result["series"] = {"date": np.datetime_as_string(series.dates[-points:], unit=unit).tolist()}
+        for key, values in outputs.items():
+            if len(values) == 1:
+                result["series"][key] = _tail(next(iter(values.values())), points)
+            else:
+                result["series"][key] = {part: _tail(line, points) for part, line in values.items()}
+    return result
+
+
+@tool
+@encoded_result("json")
+def technical_indicators(ticker: str = "", tickers: Optional[List[str]] = None,
+                         indicators: Optional[List[str]] = None, timeframe: str = "6mo",
+                         interval: Optional[str] = None, params: Optional[Dict[str, Dict[str, Any]]] = None,
+                         points: int = 0, seed: Optional[int] = None, end: Optional[str] = None) -> dict:
+    """
+    Compute technical indicators for one ticker, or for several tickers at once.
+
+    Supported indicators (defaults in brackets): sma [period 20], ema [period 20],
+    rsi [period 14], macd [fast 12, slow 26, signal 9], bollinger [period 20,
+    num_std 2], atr [period 14] and vwap (per session for intraday bars). Give
+    parameters inline in order, e.g. sma_50, sma_200 or macd_5_35_5, or per
+    indicator with params. Uses the same bars as stock_data.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., AAPL, MSFT)
+        tickers: Several ticker symbols to analyze in one call
+        indicators: Indicators to compute (defaults to all of them with default parameters)
+        timeframe: Time period of bars (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y); longer
+                   periods such as sma_200 need a timeframe with enough bars (e.g., 1y)
+        interval: Bar size (1m, 5m, 15m, 30m, 1h, 1d, 1wk, 1mo, 3mo); defaults to 5m for 1d,
+                  30m for 5d and daily otherwise
+        params: Parameters per indicator name, e.g. {"rsi": {"period": 7}}
+        points: Also return the last this-many values of every indicator (0 for latest only)
+        seed: Scenario seed, as in stock_data (generated data only)
+        end: Last date of the bars as YYYY-MM-DD, as in stock_data
+
+    Returns:
+        Dictionary with the latest close and value of each indicator (keyed like
+        sma_20 or macd_12_26_9), short notes on notable signals, and with points
+        the recent values. With tickers, one such entry per ticker under "tickers"
+    """
+    try:
+        specs = list(dict.fromkeys(parse_indicator(entry, params) for entry in indicators or DEFAULT_INDICATORS))
+    except ValueError as e:
+        return {"error": str(e)}
+    if not 0 <= points <= MAX_POINTS:
+        return {"error": f"points must be between 0 and {MAX_POINTS}"}
+    interval = interval or DEFAULT_INTERVALS.get(timeframe, "1d")
+
+    symbols = list(dict.fromkeys(t.upper() for t in ([ticker] if ticker else []) + list(tickers or [])))
+    if not symbols:
+        return {"error": "Provide a ticker or a list of tickers"}
+    if len(symbols) > MAX_BATCH_TICKERS:
+        return {"error": f"At most {MAX_BATCH_TICKERS} tickers per call; got {len(symbols)}"}
+    try:
+        if len(symbols) == 1:
+            bars, source = load_series(symbols[0], timeframe, interval, seed, end)
+            panel, series, sources = None, [bars], [source]
+        else:
+            panel, source_map = load_panel(symbols, timeframe, interval, seed, end)
+            series = [panel.series(i) for i in range(len(symbols))]
+            sources = [source_map[symbol] for symbol in symbols]
+    except ValueError as e:
+        return {"error": str(e)}
+
+    outputs: List[Dict[str, Dict[str, np.ndarray]]] = [{} for _ in series]
+    for spec in specs:
+        key = label(spec[0], dict(spec[1]))
+        for row, values in enumerate(indicator_series(series, sources, spec, panel)):
+            outputs[row][key] = values
+    entries = [ticker_result(s, src, out, points) for s, src, out in zip(series, sources, outputs)]
+
+    result: Dict[str, Any] = {"timeframe": timeframe, "interval": series[0].interval}
+    if len(symbols) == 1 and not tickers:
+        return {"ticker": symbols[0], **result, **entries[0]}
+    result["tickers"] = dict(zip(symbols, entries))
+    return result
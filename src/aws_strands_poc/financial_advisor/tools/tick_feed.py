@@ -0,0 +1,513 @@
+"""
+Tick Feed - Simulated streaming ticks with incrementally updated rolling indicators.
+
+Intraday monitoring should not regenerate a whole stock_data series per
+question. Instead a TickSimulator publishes ticks for many tickers on an
+in-process TickBus, and consumers such as RollingIndicators keep their state
+up to date as ticks arrive:
+
+- Ticks travel in TickBatch objects: one tick for each of a set of tickers at
+  the same moment, as NumPy arrays. Publishing and consuming a batch costs a
+  handful of array operations, whatever the number of tickers.
+- RollingIndicators keeps a fixed-size ring buffer of recent prices per ticker
+  and updates running sums, EMA, Wilder-smoothed RSI, session high/low and VWAP
+  in O(1) per tick. Reading the latest state copies a few numbers; nothing is
+  recomputed.
+
+``live_feed`` is the process-wide feed behind the live_quotes tool. It is
+created empty, adds tickers as they are asked for and starts its simulator
+thread on first use. Simulated time advances by TICK_FEED_INTERVAL seconds per
+batch, which is also the wall-clock pace of the thread.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.indicators import label
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    DEFAULT_PROFILE,
+    MINUTES_PER_SESSION,
+    TICKER_PROFILES,
+    TRADING_DAYS_PER_YEAR,
+    generate_panel,
+)
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_SESSION = MINUTES_PER_SESSION * 60
+SECONDS_PER_YEAR = TRADING_DAYS_PER_YEAR * SECONDS_PER_SESSION
+
+TickCallback = Callable[["TickBatch"], None]
+
+
+@dataclass
+class TickBatch:
+    """
+    Ticks for a set of tickers at the same moment, at most one per ticker.
+
+    Tickers are identified by their row in the publishing bus (see TickBus.register).
+    """
+
+    time: np.datetime64
+    rows: np.ndarray
+    price: np.ndarray
+    size: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def subset(self, keep: np.ndarray) -> "TickBatch":
+        """Return the ticks selected by a boolean mask."""
+        return TickBatch(self.time, self.rows[keep], self.price[keep], self.size[keep])
+
+
+class TickBus:
+    """
+    In-process publish/subscribe channel for tick batches.
+
+    The bus owns the ticker universe: every ticker gets a stable row number
+    that publishers and consumers use to index their arrays. Subscribers are
+    called synchronously on the publishing thread, each with only the ticks of
+    the tickers it subscribed to.
+    """
+
+    def __init__(self):
+        self.tickers: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # (token, callback, boolean mask of subscribed rows or None for all); replaced, never mutated
+        self._subscribers: Tuple[Tuple[object, TickCallback, Optional[np.ndarray]], ...] = ()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._ticks = 0
+        self._delivered = 0
+
+    def register(self, tickers: Iterable[str]) -> np.ndarray:
+        """
+        Add tickers to the universe.
+
+        Args:
+            tickers: Ticker symbols; known ones keep their row
+
+        Returns:
+            The row of each ticker
+        """
+        with self._lock:
+            rows = []
+            for ticker in tickers:
+                ticker = ticker.upper()
+                if ticker not in self._rows:
+                    self._rows[ticker] = len(self.tickers)
+                    self.tickers.append(ticker)
+                rows.append(self._rows[ticker])
+            if any(mask is not None and len(mask) < len(self.tickers) for _, _, mask in self._subscribers):
+                # New tickers are outside every watchlist
+                self._subscribers = tuple(
+                    (token, callback, mask if mask is None else np.pad(mask, (0, len(self.tickers) - len(mask))))
+                    for token, callback, mask in self._subscribers
+                )
+            return np.array(rows, dtype=np.int64)
+
+    def row(self, ticker: str) -> Optional[int]:
+        """Return a ticker's row, or None when it is not registered."""
+        return self._rows.get(ticker.upper())
+
+    def subscribe(self, callback: TickCallback, tickers: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Deliver published batches to a callback.
+
+        Args:
+            callback: Called with each batch on the publishing thread
+            tickers: Only deliver ticks of these tickers (registering them); all when None
+
+        Returns:
+            Function that cancels the subscription
+        """
+        rows = None if tickers is None else self.register(tickers)
+        with self._lock:
+            mask = None
+            if rows is not None:
+                mask = np.zeros(len(self.tickers), dtype=bool)
+                mask[rows] = True
+            token = object()
+            self._subscribers = self._subscribers + ((token, callback, mask),)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers = tuple(s for s in self._subscribers if s[0] is not token)
+
+        return unsubscribe
+
+    def publish(self, batch: TickBatch) -> None:
+        """Deliver a batch to every subscriber, filtered to its tickers."""
+        subscribers = self._subscribers
+        delivered = 0
+        for _, callback, mask in subscribers:
+            ticks = batch if mask is None else batch.subset(mask[batch.rows])
+            if len(ticks):
+                try:
+                    callback(ticks)
+                except Exception as e:
+                    logger.warning(f"Tick subscriber {callback!r} failed: {e}")
+                delivered += len(ticks)
+        with self._lock:
+            self._batches += 1
+            self._ticks += len(batch)
+            self._delivered += delivered
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report bus usage.
+
+        Returns:
+            Dictionary with tickers, subscribers, batches, ticks published and ticks delivered
+        """
+        with self._lock:
+            return {
+                "tickers": len(self.tickers),
+                "subscribers": len(self._subscribers),
+                "batches": self._batches,
+                "ticks": self._ticks,
+                "delivered": self._delivered,
+            }
+
+
+class TickSimulator:
+    """
+    Publishes simulated ticks for a universe of tickers.
+
+    Prices follow a geometric random walk with each ticker's profile drift and
+    volatility, scaled to the tick interval, starting from the last daily close
+    stock_data reports for the ticker. Tick sizes are lognormal around the
+    profile's daily volume spread over a session.
+    """
+
+    def __init__(self, bus: TickBus, tickers: Iterable[str] = (), interval: float = 1.0,
+                 activity: float = 1.0, seed: Optional[int] = None, start: Optional[np.datetime64] = None):
+        """
+        Initialize the simulator.
+
+        Args:
+            bus: Bus to publish on
+            tickers: Initial ticker universe
+            interval: Simulated seconds between batches (also the pace of start())
+            activity: Probability that a ticker trades in a given batch
+            seed: Seed for reproducible ticks and opening prices
+            start: Simulated time of the first batch (defaults to now)
+        """
+        self.bus = bus
+        self.interval = interval
+        self.activity = activity
+        self.seed = seed
+        self.time = np.datetime64(start if start is not None else np.datetime64("now"), "ms")
+        self._step = np.timedelta64(int(round(interval * 1000)), "ms")
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.empty(0, dtype=np.int64)
+        self._log_price = np.empty(0)
+        self._drift = np.empty(0)
+        self._volatility = np.empty(0)
+        self._size = np.empty(0)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.add_tickers(tickers)
+
+    def add_tickers(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Add tickers to the simulated universe.
+
+        Returns:
+            The tickers that were not simulated yet
+        """
+        with self._lock:
+            known = set(self._rows.tolist())
+            symbols = list(dict.fromkeys(t.upper() for t in tickers))
+            new = [t for t, row in zip(symbols, self.bus.register(symbols)) if row not in known]
+            if not new:
+                return []
+            profiles = np.array([TICKER_PROFILES.get(t, DEFAULT_PROFILE) for t in new])
+            dt = self.interval / SECONDS_PER_YEAR
+            opening = generate_panel(new, "5d", "1d", seed=self.seed).close[:, -1]
+            self._rows = np.concatenate([self._rows, self.bus.register(new)])
+            self._log_price = np.concatenate([self._log_price, np.log(opening)])
+            self._drift = np.concatenate([self._drift, (profiles[:, 1] - profiles[:, 2] ** 2 / 2) * dt])
+            self._volatility = np.concatenate([self._volatility, profiles[:, 2] * np.sqrt(dt)])
+            self._size = np.concatenate([self._size, profiles[:, 3] * self.interval / SECONDS_PER_SESSION])
+            return new
+
+    def step(self, tickers: Optional[Iterable[str]] = None) -> TickBatch:
+        """
+        Advance simulated time by one interval and publish a batch.
+
+        Args:
+            tickers: Only tick these (already added) tickers, all of them trading;
+                by default each ticker trades with probability ``activity``
+
+        Returns:
+            The published batch
+        """
+        with self._lock:
+            n = len(self._rows)
+            if tickers is not None:
+                wanted = self.bus.register(tickers)
+                pick = np.flatnonzero(np.isin(self._rows, wanted))
+            elif self.activity >= 1.0:
+                pick = slice(None)
+            else:
+                pick = np.flatnonzero(self._rng.random(n) < self.activity)
+            count = n if isinstance(pick, slice) else len(pick)
+            shocks = self._rng.standard_normal(count)
+            self._log_price[pick] += self._drift[pick] + self._volatility[pick] * shocks
+            sizes = np.maximum(1, (self._size[pick] * self._rng.lognormal(-0.125, 0.5, count)).astype(np.int64))
+            batch = TickBatch(self.time, self._rows[pick], np.exp(self._log_price[pick]), sizes)
+            self.time += self._step
+            # Publish under the lock so batches reach subscribers in time order
+            self.bus.publish(batch)
+        return batch
+
+    def run(self, steps: int) -> int:
+        """
+        Publish batches back to back, without pacing.
+
+        Returns:
+            Number of ticks published
+        """
+        return sum(len(self.step()) for _ in range(steps))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Publish one batch per interval on a background thread until stop() is called."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="tick-simulator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.step()
+            deadline += self.interval
+            self._stop.wait(max(0.0, deadline - time.monotonic()))
+
+
+class RollingIndicators:
+    """
+    Tick consumer keeping rolling indicators per ticker, updated in O(1) per tick.
+
+    Per ticker it holds a ring buffer of the last ``window`` prices with running
+    sums of their deviations from the ticker's first price (for the SMA and
+    Bollinger bands; re-summed from the ring once per window to bound rounding
+    drift), an EMA, Wilder-smoothed average gains and losses of tick-to-tick
+    changes (RSI), and the open, high, low, volume and VWAP since the first tick.
+    """
+
+    def __init__(self, bus: TickBus, window: int = 20, ema_period: int = 20,
+                 rsi_period: int = 14, num_std: float = 2.0):
+        """
+        Initialize the consumer; subscribe it with ``bus.subscribe(indicators)``.
+
+        Args:
+            bus: Bus whose ticker rows the consumer indexes by
+            window: Ring buffer size, the period of the SMA and Bollinger bands
+            ema_period: EMA period in ticks
+            rsi_period: RSI period in ticks
+            num_std: Width of the Bollinger bands in standard deviations
+        """
+        self.bus = bus
+        self.window = window
+        self.ema_period = ema_period
+        self.rsi_period = rsi_period
+        self.num_std = num_std
+        self._ema_alpha = 2.0 / (ema_period + 1)
+        self._labels = {
+            "sma": label("sma", {"period": window}),
+            "ema": label("ema", {"period": ema_period}),
+            "rsi": label("rsi", {"period": rsi_period}),
+            "bollinger": label("bollinger", {"period": window, "num_std": float(num_std)}),
+        }
+        self._lock = threading.Lock()
+        self._capacity = 0
+        self._allocate(0)
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow every per-ticker array to hold ``capacity`` tickers."""
+        def grow(name: str, fill: float, dtype: Any = np.float64, width: int = 0) -> None:
+            shape = (capacity, width) if width else (capacity,)
+            array = np.full(shape, fill, dtype=dtype)
+            if self._capacity:
+                array[:self._capacity] = getattr(self, name)
+            setattr(self, name, array)
+
+        grow("ring", np.nan, width=self.window)
+        grow("count", 0, np.int64)
+        grow("time", 0, np.int64)
+        for name in ("last", "open", "reference", "high", "low", "ema"):
+            grow(name, np.nan)
+        for name in ("sum", "sumsq", "gain", "loss", "volume", "price_volume"):
+            grow(name, 0.0)
+        self._capacity = capacity
+
+    def __call__(self, batch: TickBatch) -> None:
+        """Fold a batch of ticks into the per-ticker state."""
+        if not len(batch):
+            return
+        rows, price = batch.rows, batch.price
+        with self._lock:
+            if rows.max() >= self._capacity:
+                self._allocate(max(int(rows.max()) + 1, 2 * self._capacity))
+            count = self.count[rows]
+            first = count == 0
+            self.reference[rows] = reference = np.where(first, price, self.reference[rows])
+            self.open[rows] = np.where(first, price, self.open[rows])
+            previous = np.where(first, price, self.last[rows])
+
+            # Ring buffer and running sums of the window
+            slot = count % self.window
+            evicted = np.where(count >= self.window, self.ring[rows, slot] - reference, 0.0)
+            deviation = price - reference
+            self.sum[rows] += deviation - evicted
+            self.sumsq[rows] += deviation * deviation - evicted * evicted
+            self.ring[rows, slot] = price
+
+            # EMA seeded with the first price; RSI averages are the mean of the
+            # first rsi_period changes, then Wilder-smoothed
+            self.ema[rows] = np.where(first, price, self.ema[rows] + self._ema_alpha * (price - self.ema[rows]))
+            change = price - previous
+            weight = np.where(first, 0.0, 1.0 / np.maximum(np.minimum(count, self.rsi_period), 1))
+            self.gain[rows] += weight * (np.maximum(change, 0.0) - self.gain[rows])
+            self.loss[rows] += weight * (np.maximum(-change, 0.0) - self.loss[rows])
+
+            self.high[rows] = np.fmax(self.high[rows], price)
+            self.low[rows] = np.fmin(self.low[rows], price)
+            self.volume[rows] += batch.size
+            self.price_volume[rows] += price * batch.size
+            self.last[rows] = price
+            self.time[rows] = batch.time.astype("datetime64[ms]").astype(np.int64)
+            self.count[rows] = count + 1
+
+            resync = rows[(count + 1) % self.window == 0]
+            if len(resync):
+                deviations = self.ring[resync] - self.reference[resync, None]
+                self.sum[resync] = deviations.sum(axis=1)
+                self.sumsq[resync] = (deviations * deviations).sum(axis=1)
+
+    def snapshot(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a ticker's latest price and indicators without recomputing them.
+
+        Indicators that have not seen enough ticks yet are None.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            Dictionary of the latest state, or None when the ticker has no ticks
+        """
+        row = self.bus.row(ticker)
+        with self._lock:
+            if row is None or row >= self._capacity or not self.count[row]:
+                return None
+            count = int(self.count[row])
+            values = {name: float(getattr(self, name)[row]) for name in (
+                "last", "open", "reference", "high", "low", "ema", "sum", "sumsq", "gain", "loss",
+                "volume", "price_volume")}
+            stamp = int(self.time[row])
+
+        price = values["last"]
+        result: Dict[str, Any] = {
+            "time": str(np.datetime64(stamp, "ms").astype("datetime64[s]")),
+            "price": round(price, 2),
+            "open": round(values["open"], 2),
+            "change_pct": round((price / values["open"] - 1) * 100, 2),
+            "high": round(values["high"], 2),
+            "low": round(values["low"], 2),
+            "volume": int(values["volume"]),
+            "vwap": round(values["price_volume"] / values["volume"], 2),
+            "ticks": count,
+        }
+        full = count >= self.window
+        mean = values["sum"] / self.window
+        middle = values["reference"] + mean
+        spread = self.num_std * float(np.sqrt(max(values["sumsq"] / self.window - mean * mean, 0.0)))
+        result[self._labels["sma"]] = round(middle, 2) if full else None
+        result[self._labels["ema"]] = round(values["ema"], 2) if count >= self.ema_period else None
+        if count > self.rsi_period:
+            rsi = 100.0 if values["loss"] == 0 else 100.0 - 100.0 / (1.0 + values["gain"] / values["loss"])
+            result[self._labels["rsi"]] = round(rsi, 2)
+        else:
+            result[self._labels["rsi"]] = None
+        result[self._labels["bollinger"]] = {
+            "middle": round(middle, 2), "upper": round(middle + spread, 2), "lower": round(middle - spread, 2),
+        } if full else None
+        return result
+
+
+class LiveFeed:
+    """A tick simulator, its bus and a RollingIndicators consumer, started on first use."""
+
+    def __init__(self, interval: float = 1.0, window: int = 20, seed: Optional[int] = None):
+        """
+        Initialize the feed without starting it.
+
+        Args:
+            interval: Seconds between tick batches
+            window: Ring buffer size per ticker
+            seed: Seed for reproducible ticks
+        """
+        self.bus = TickBus()
+        self.simulator = TickSimulator(self.bus, interval=interval, seed=seed)
+        self.indicators = RollingIndicators(self.bus, window=window)
+        self.bus.subscribe(self.indicators)
+        self._lock = threading.Lock()
+
+    def quotes(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Return the latest state of tickers, adding them to the feed first if needed.
+
+        New tickers are warmed up with enough ticks to fill their indicators, and
+        the simulator thread is started if it is not running.
+
+        Args:
+            tickers: Ticker symbols
+
+        Returns:
+            Latest state per ticker (see RollingIndicators.snapshot)
+        """
+        with self._lock:
+            new = self.simulator.add_tickers(tickers)
+            if new:
+                logger.info(f"Tick feed warming up {len(new)} tickers")
+                for _ in range(self.indicators.window):
+                    self.simulator.step(new)
+            if not self.simulator.running:
+                self.simulator.start()
+        return {ticker.upper(): self.indicators.snapshot(ticker) for ticker in tickers}
+
+    def stop(self) -> None:
+        """Stop the simulator thread."""
+        self.simulator.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report bus usage and whether the simulator is running."""
+        return {**self.bus.stats(), "running": self.simulator.running}
+
+
+# Process-wide feed behind the live_quotes tool; idle until first used.
+# Set TICK_FEED_INTERVAL to change the seconds between tick batches.
+live_feed = LiveFeed(interval=float(os.environ.get("TICK_FEED_INTERVAL", "1.0")))
@@ -8,13 +8,21 @@ which uses a multi-agent architecture to provide specialized financial guidance.
 import os
 import logging
 import argparse
+import asyncio
+import json
 import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file first thing
 load_dotenv()
 
-from aws_strands_poc.financial_advisor import FinancialAdvisor
+from aws_strands_poc.financial_advisor import FinancialAdvisor, SessionManager
+from aws_strands_poc.financial_advisor.batch import run_batch
+from aws_strands_poc.financial_advisor.cache import response_cache, semantic_cache
+from aws_strands_poc.financial_advisor.models.cascade import cascade_metrics
+from aws_strands_poc.financial_advisor.models.cassette import Cassette, set_active_cassette
+from aws_strands_poc.financial_advisor.router import PreRouter
+from aws_strands_poc.financial_advisor.streaming import ConsolePrinter, TokenStream
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +32,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger("financial_advisor_app")
 
+# Labels printed in front of streamed output from each agent
+STREAM_LABELS = {
+    "advisor": "Advisor",
+    "market_analyst": "Market Analyst",
+    "portfolio_manager": "Portfolio Manager",
+    "compliance_officer": "Compliance Officer",
+    "tax_specialist": "Tax Specialist",
+}
+
+def run_batch_mode(args, pre_router=None):
+    """Run the batch queries from args.batch_input and print a summary."""
+    sessions = SessionManager(
+        max_sessions=max(100, args.concurrency * 2),
+        advisor_factory=lambda user_id: FinancialAdvisor(
+            user_id=user_id,
+            model=args.model,
+            parallel_dispatch=not args.sequential_dispatch,
+            pre_router=pre_router,
+        ),
+    )
+    
+    print(f"\nRunning batch from {args.batch_input} with concurrency {args.concurrency}...")
+    summary = asyncio.run(run_batch(
+        args.batch_input,
+        args.batch_output,
+        sessions,
+        concurrency=args.concurrency,
+        timeout=args.query_timeout,
+    ))
+    
+    print(f"\nBatch complete. Results written to {args.batch_output}")
+    print(f"  Processed: {summary['processed']} (skipped {summary['skipped']} already done, {summary['failed']} failed)")
+    print(f"  Throughput: {summary['throughput_qps']} queries/s over {summary['elapsed_s']}s")
+    latency = summary["latency_ms"]
+    print(f"  Latency: p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms")
+    cascade = cascade_metrics.stats()
+    if cascade["turns"]:
+        print(f"  Cascade: ${cascade['cost_usd']:.4f} (top tier alone: ~${cascade['top_tier_cost_usd']:.4f})")
+        for tier, tier_stats in cascade["tiers"].items():
+            print(f"    {tier}: {tier_stats['requests']} requests, "
+                  f"{tier_stats['escalation_rate']:.0%} escalated, p50={tier_stats['p50_ms']}ms")
+    logger.info(f"Batch summary: {json.dumps(summary)}")
+
 def main():
     """Run the Financial Advisor application."""
     # Enable debugging for Strands
@@ -44,16 +95,102 @@ def main():
         default=None,
         help="OpenAI model name (defaults to MODEL environment variable or gpt-4o-mini)"
     )
+    parser.add_argument(
+        "--cascade", 
+        default=None,
+        help="Comma-separated models from cheapest to strongest, e.g. gpt-4o-mini,gpt-4o; "
+             "each turn escalates only when the cheaper answer fails its checks "
+             "(defaults to MODEL_CASCADE environment variable)"
+    )
     parser.add_argument(
         "--init_memory", 
         action="store_true",
         help="Initialize user memory with default preferences"
     )
+    parser.add_argument(
+        "--sequential_dispatch", 
+        action="store_true",
+        help="Call specialists one after another instead of concurrently"
+    )
+    parser.add_argument(
+        "--pre_route", 
+        action="store_true",
+        help="Send clear-cut queries straight to a specialist using a local classifier"
+    )
+    parser.add_argument(
+        "--route_threshold", 
+        type=float,
+        default=0.8,
+        help="Minimum classifier confidence for pre-routing (default: 0.8)"
+    )
+    parser.add_argument(
+        "--no_cache", 
+        action="store_true",
+        help="Disable the specialist response cache"
+    )
+    parser.add_argument(
+        "--semantic_cache", 
+        action="store_true",
+        help="Also reuse market and portfolio answers for paraphrased questions (defaults to SEMANTIC_CACHE)"
+    )
+    parser.add_argument(
+        "--no_stream", 
+        action="store_true",
+        help="Print each response only once it is complete instead of streaming tokens"
+    )
+    parser.add_argument(
+        "--batch_input", 
+        default=None,
+        help="Run non-interactively over a JSONL file of {\"user_id\", \"message\"} queries"
+    )
+    parser.add_argument(
+        "--batch_output", 
+        default="batch_results.jsonl",
+        help="JSONL file for batch results, also used to resume after a crash"
+    )
+    parser.add_argument(
+        "--concurrency", 
+        type=int,
+        default=8,
+        help="Maximum number of batch queries in flight (default: 8)"
+    )
+    parser.add_argument(
+        "--query_timeout", 
+        type=float,
+        default=None,
+        help="Per-query timeout in seconds for batch mode"
+    )
+    parser.add_argument(
+        "--cassette", 
+        default=None,
+        help="JSONL cassette file to record model responses to or replay them from"
+    )
+    parser.add_argument(
+        "--cassette_mode", 
+        choices=["record", "replay", "auto"],
+        default="replay",
+        help="record: call the API and save; replay: answer offline from the cassette; "
+             "auto: replay, recording anything missing (default: replay)"
+    )
+    parser.add_argument(
+        "--replay_latency", 
+        default="0",
+        help="Seconds before the first replayed token, or 'recorded' to reproduce recorded timings (default: 0)"
+    )
     
     args = parser.parse_args()
     
-    # Check for OpenAI API key
-    if not args.api_key and not os.environ.get("OPENAI_API_KEY"):
+    if args.cassette:
+        set_active_cassette(Cassette(
+            args.cassette,
+            mode=args.cassette_mode,
+            latency=None if args.replay_latency == "recorded" else float(args.replay_latency),
+        ))
+        logger.info(f"Using cassette {args.cassette} in {args.cassette_mode} mode")
+    
+    # Check for OpenAI API key (replaying a cassette needs none)
+    replaying = args.cassette and args.cassette_mode == "replay"
+    if not args.api_key and not os.environ.get("OPENAI_API_KEY") and not replaying:
         logger.error(
             "OpenAI API key not provided. Please set the OPENAI_API_KEY environment variable "
             "or provide it using the --api_key argument."
@@ -84,12 +221,34 @@ def main():
     if sys.platform == 'win32':
         logger.info("Running on Windows: python_repl tool will be disabled due to incompatibility")
     
+    if args.cascade:
+        os.environ["MODEL_CASCADE"] = args.cascade
+    if os.environ.get("MODEL_CASCADE"):
+        logger.info(f"Model cascade: {os.environ['MODEL_CASCADE']}")
+    
+    if args.no_cache:
+        response_cache.enabled = False
+    if args.semantic_cache:
+        semantic_cache.enabled = True
+    
     # Create memory directory if it doesn't exist
     os.makedirs("./memory", exist_ok=True)
     
+    pre_router = PreRouter(min_confidence=args.route_threshold) if args.pre_route else None
+    
+    # Batch mode: process the JSONL input and exit
+    if args.batch_input:
+        run_batch_mode(args, pre_router)
+        return
+    
     # Create the Financial Advisor
     try:
-        advisor = FinancialAdvisor(user_id=args.user_id, model=args.model)
+        advisor = FinancialAdvisor(
+            user_id=args.user_id,
+            model=args.model,
+            parallel_dispatch=not args.sequential_dispatch,
+            pre_router=pre_router,
+        )
     except Exception as e:
         logger.error(f"Failed to create Financial Advisor: {str(e)}")
         if "api_key" in str(e).lower():
@@ -129,12 +288,27 @@ def main():
                 print("\nThank you for using the Financial Advisor. Goodbye!")
                 break
                 
-            # Process the query
-            print("\nProcessing your query...\n")
-            response = advisor.query(user_input)
+            if args.no_stream:
+                # Process the query
+                print("\nProcessing your query...\n")
+                response = advisor.query(user_input)
+                
+                # Print the response
+                print(f"Response: {response}\n")
+                print("-"*80 + "\n")
+                continue
+            
+            # Process the query, printing tokens as they arrive
+            print()
+            stream = TokenStream(on_token=ConsolePrinter(STREAM_LABELS))
+            response = advisor.query(user_input, stream=stream)
+            if not stream.chunks:
+                # Nothing was streamed (e.g. an error message); print the response as-is
+                print(f"Response: {response}", end="")
             
-            # Print the response
-            print(f"Response: {response}\n")
+            summary = stream.summary()
+            ttft = f"{summary['ttft_ms']}ms" if summary["ttft_ms"] is not None else "n/a"
+            print(f"\n\n(time to first token: {ttft}, total: {summary['total_ms']}ms)\n")
             print("-"*80 + "\n")
             
     except KeyboardInterrupt:
@@ -15,6 +15,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from aws_strands_poc.financial_advisor.simple_openai import FinancialAdvisor
+from aws_strands_poc.financial_advisor.streaming import ConsolePrinter, TokenStream
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +25,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger("financial_advisor_app")
 
+def format_token_usage(advisor):
+    """Describe the prompt tokens sent in the last turn and how many compaction saved."""
+    tokens = advisor.last_turn_tokens
+    if not tokens:
+        return "(prompt tokens: n/a)"
+    return f"(prompt tokens: {tokens['sent_tokens']} sent, {tokens['saved_tokens']} saved by history compaction)"
+
+def format_rounds(advisor):
+    """Describe the model and tool time of each round in the last turn."""
+    return f"(rounds: {advisor.round_summary() or 'n/a'})"
+
 def main():
     """Run the Financial Advisor application."""
     parser = argparse.ArgumentParser(description="Financial Advisor Assistant")
@@ -42,6 +54,29 @@ def main():
         default=None,
         help="OpenAI model name (defaults to MODEL environment variable or gpt-4o-mini)"
     )
+    parser.add_argument(
+        "--no_stream", 
+        action="store_true",
+        help="Print each response only once it is complete instead of streaming tokens"
+    )
+    parser.add_argument(
+        "--max_history_tokens", 
+        type=int,
+        default=4000,
+        help="Prompt token budget; older turns are summarized to stay within it (default: 4000)"
+    )
+    parser.add_argument(
+        "--max_tool_rounds", 
+        type=int,
+        default=5,
+        help="Maximum rounds of tool calls per question (default: 5)"
+    )
+    parser.add_argument(
+        "--tool_timeout", 
+        type=float,
+        default=30.0,
+        help="Seconds a tool call may take before it is reported as timed out (default: 30)"
+    )
     
     args = parser.parse_args()
     
@@ -76,7 +111,13 @@ def main():
     # Create the Financial Advisor
     try:
         model = args.model or os.environ.get("MODEL", "gpt-4o-mini")
-        advisor = FinancialAdvisor(user_id=args.user_id, model=model)
+        advisor = FinancialAdvisor(
+            user_id=args.user_id,
+            model=model,
+            max_history_tokens=args.max_history_tokens,
+            max_tool_rounds=args.max_tool_rounds,
+            tool_timeout=args.tool_timeout,
+        )
     except Exception as e:
         logger.error(f"Failed to create Financial Advisor: {str(e)}")
         if "api_key" in str(e).lower():
@@ -107,12 +148,31 @@ def main():
                 print("\nThank you for using the Financial Advisor. Goodbye!")
                 break
                 
-            # Process the query
-            print("\nProcessing your query...\n")
-            response = advisor.query(user_input)
+            if args.no_stream:
+                # Process the query
+                print("\nProcessing your query...\n")
+                response = advisor.query(user_input)
+                
+                # Print the response
+                print(f"Response: {response}\n")
+                print(f"{format_token_usage(advisor)}")
+                print(f"{format_rounds(advisor)}\n")
+                print("-"*80 + "\n")
+                continue
+            
+            # Process the query, printing tokens as they arrive
+            print()
+            stream = TokenStream(on_token=ConsolePrinter({"advisor": "Advisor"}))
+            response = advisor.query(user_input, stream=stream)
+            if not stream.chunks:
+                # Nothing was streamed (e.g. an error message); print the response as-is
+                print(f"Response: {response}", end="")
             
-            # Print the response
-            print(f"Response: {response}\n")
+            summary = stream.summary()
+            ttft = f"{summary['ttft_ms']}ms" if summary["ttft_ms"] is not None else "n/a"
+            print(f"\n\n(time to first token: {ttft}, total: {summary['total_ms']}ms)")
+            print(f"{format_token_usage(advisor)}")
+            print(f"{format_rounds(advisor)}\n")
             print("-"*80 + "\n")
             
     except KeyboardInterrupt:
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: the advisor modules build OpenAI clients at import time,
+so give them a placeholder key. Tests never reach the network.
+"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,73 @@
+"""Regression test: replay a recorded advisor conversation through the whole agent stack."""
+
+from pathlib import Path
+
+import pytest
+
+from aws_strands_poc.financial_advisor.cache import response_cache, semantic_cache
+from aws_strands_poc.financial_advisor.models.cassette import Cassette, set_active_cassette
+from aws_strands_poc.financial_advisor.specialists.pool import specialist_pool
+
+CASSETTE = Path(__file__).parent / "cassettes" / "advisor_aapl.cassette.jsonl"
+
+
+@pytest.fixture
+def cassette(tmp_path, monkeypatch):
+    # The advisor keeps its memory and REPL state in the working directory
+    monkeypatch.chdir(tmp_path)
+    response_cache.clear()
+    semantic_cache.clear()
+    # Pooled specialists keep the cassette they were created with
+    specialist_pool.clear()
+    cassette = Cassette(CASSETTE, mode="replay")
+    set_active_cassette(cassette)
+    yield cassette
+    set_active_cassette(None)
+    response_cache.clear()
+    semantic_cache.clear()
+    specialist_pool.clear()
+
+
+def test_advisor_answers_from_the_recorded_conversation(cassette):
+    from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+
+    answer = FinancialAdvisor(user_id="regression_user").query("How has AAPL performed this month?")
+
+    assert str(answer).strip() == (
+        "Based on the latest data, the position looks reasonably valued. Keep it sized to your risk "
+        "tolerance, diversify across sectors, and review it again after the next earnings report."
+    )
+    stats = cassette.stats()
+    assert stats["hits"] == stats["recordings"] == 4
+    assert stats["misses"] == 0
+
+
+def test_aquery_replays_the_same_conversation_on_the_event_loop(cassette):
+    import asyncio
+
+    from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+
+    advisor = FinancialAdvisor(user_id="regression_user")
+    assert advisor.async_model is not None
+    answer = asyncio.run(advisor.aquery("How has AAPL performed this month?", timeout=30))
+
+    assert str(answer).strip().startswith("Based on the latest data, the position looks reasonably valued.")
+    stats = cassette.stats()
+    assert stats["hits"] == 4
+    assert stats["misses"] == 0
+    # User prompt, tool call, tool result and final answer
+    assert [message["role"] for message in advisor.agent.messages] == ["user", "assistant", "user", "assistant"]
+
+
+def test_cancelled_aquery_rolls_the_conversation_back(cassette):
+    import asyncio
+
+    from aws_strands_poc.financial_advisor.advisor import FinancialAdvisor
+
+    cassette.latency = 5.0
+    advisor = FinancialAdvisor(user_id="regression_user")
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(advisor.aquery("How has AAPL performed this month?", timeout=0.2))
+
+    assert advisor.agent.messages == []
+    assert not advisor._query_lock.locked()
@@ -0,0 +1,90 @@
+"""Tests for the batch runner: checkpoints, resume after a crash and per-user ordering."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from aws_strands_poc.financial_advisor.batch import load_checkpoint, run_batch, truncate_partial_line
+from aws_strands_poc.financial_advisor.sessions import SessionManager
+
+
+class EchoAdvisor:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.agent = SimpleNamespace(messages=[])
+
+    async def aquery(self, message, timeout=None):
+        await asyncio.sleep(0)
+        if message == "fail":
+            raise RuntimeError("model unavailable")
+        self.agent.messages.append({"role": "user", "content": [{"text": message}]})
+        return f"answer {len(self.agent.messages)} to {message}"
+
+
+def write_lines(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def make_sessions(tmp_path):
+    return SessionManager(snapshot_dir=tmp_path / "sessions", advisor_factory=EchoAdvisor)
+
+
+def test_checkpoint_skips_a_truncated_last_line_and_failures(tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"id": "1", "response": "ok"}\n{"id": "2", "error": "boom"}\n{"id": "3", "resp')
+
+    assert load_checkpoint(output) == {"1"}
+
+
+def test_truncate_partial_line_keeps_complete_records(tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"id": "1"}\n{"id": "2"}\n{"id": "3", "resp')
+
+    assert truncate_partial_line(output) == len('{"id": "3", "resp')
+    assert output.read_text() == '{"id": "1"}\n{"id": "2"}\n'
+    assert truncate_partial_line(output) == 0
+
+    fragment_only = tmp_path / "fragment.jsonl"
+    fragment_only.write_text('{"id": "1", "resp')
+    truncate_partial_line(fragment_only)
+    assert fragment_only.read_text() == ""
+
+
+def test_resumed_run_reruns_the_cut_off_query_without_corrupting_the_output(tmp_path):
+    batch = tmp_path / "batch.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_lines(batch, [
+        {"id": "1", "user_id": "alice", "message": "hello"},
+        {"id": "2", "user_id": "alice", "message": "again"},
+        {"id": "3", "user_id": "bob", "message": "hi"},
+    ])
+    # A crash left the first result complete and the second one half written
+    output.write_text(json.dumps({"id": "1", "user_id": "alice", "response": "done"}) + '\n{"id": "2", "us')
+
+    summary = asyncio.run(run_batch(batch, output, make_sessions(tmp_path)))
+
+    assert summary["skipped"] == 1
+    assert summary["processed"] == 2
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["id"] for record in records) == ["1", "2", "3"]
+    assert load_checkpoint(output) == {"1", "2", "3"}
+
+
+def test_queries_of_one_user_run_in_order_and_failures_are_retried_on_resume(tmp_path):
+    batch = tmp_path / "batch.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_lines(batch, [
+        {"user_id": "alice", "message": "first"},
+        {"user_id": "alice", "message": "fail"},
+        {"user_id": "alice", "message": "second"},
+    ])
+
+    summary = asyncio.run(run_batch(batch, output, make_sessions(tmp_path), concurrency=4))
+    assert summary["failed"] == 1
+    results = {record["id"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert results["1"]["response"] == "answer 1 to first"
+    assert results["3"]["response"] == "answer 2 to second"
+    assert "error" in results["2"]
+
+    summary = asyncio.run(run_batch(batch, output, make_sessions(tmp_path)))
+    assert summary["processed"] == 1
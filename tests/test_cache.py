@@ -0,0 +1,125 @@
+"""Tests for the specialist response cache: TTLs, LRU eviction and the disk tier."""
+
+import pytest
+
+from aws_strands_poc.financial_advisor import cache as cache_module
+from aws_strands_poc.financial_advisor.cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_its_specialist_ttl(clock):
+    cache = ResponseCache(ttls={"market_analyst": 60})
+    cache.put("k", "market_analyst", "answer")
+
+    clock[0] += 59
+    assert cache.get("k", "market_analyst") == "answer"
+    clock[0] += 2
+    assert cache.get("k", "market_analyst") is None
+    assert cache.stats()["per_specialist"]["market_analyst"]["expired"] == 1
+
+
+def test_zero_ttl_opts_a_specialist_out():
+    cache = ResponseCache(ttls={"tax_specialist": 0})
+    cache.put("k", "tax_specialist", "answer")
+    assert cache.get("k", "tax_specialist") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResponseCache(max_entries=2, default_ttl=60)
+    cache.put("a", "s", "A")
+    cache.put("b", "s", "B")
+    assert cache.get("a", "s") == "A"  # b is now the least recently used
+    cache.put("c", "s", "C")
+
+    assert cache.get("b", "s") is None
+    assert cache.get("a", "s") == "A"
+    assert cache.get("c", "s") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_oversized_responses_are_skipped():
+    cache = ResponseCache(max_bytes=10, default_ttl=60)
+    cache.put("a", "s", "12345")
+    cache.put("b", "s", "67890")
+    cache.put("c", "s", "x")
+    assert cache.get("a", "s") is None
+    assert cache.stats()["bytes"] == 6
+
+    cache.put("big", "s", "y" * 11)
+    assert cache.get("big", "s") is None
+
+
+def test_disk_tier_serves_a_new_process(tmp_path, clock):
+    ResponseCache(default_ttl=60, cache_dir=tmp_path).put("k", "s", "answer")
+
+    fresh = ResponseCache(default_ttl=60, cache_dir=tmp_path)
+    assert fresh.get("k", "s") == "answer"
+    assert fresh.stats()["per_specialist"]["s"]["disk_hits"] == 1
+    # Promoted to memory on the first disk hit
+    assert fresh.get("k", "s") == "answer"
+    assert fresh.stats()["per_specialist"]["s"]["memory_hits"] == 1
+
+
+def test_expired_disk_entries_are_not_served(tmp_path, clock):
+    ResponseCache(default_ttl=60, cache_dir=tmp_path).put("k", "s", "answer")
+    clock[0] += 61
+    assert ResponseCache(default_ttl=60, cache_dir=tmp_path).get("k", "s") is None
+
+
+def test_paraphrases_that_normalize_alike_share_a_key():
+    cache = ResponseCache()
+    first = cache.make_key("What's the outlook for AAPL?", "market_analyst", "gpt-4o-mini", "prompt")
+    second = cache.make_key("  what's the OUTLOOK for aapl ", "market_analyst", "gpt-4o-mini", "prompt")
+    assert first == second
+    assert first != cache.make_key("What's the outlook for AAPL?", "market_analyst", "gpt-4o-mini", "other")
+
+
+def test_signs_are_kept_by_normalization():
+    cache = ResponseCache()
+    negative = cache.make_key("Is a -5% return bad?", "portfolio_manager", "gpt-4o-mini", "prompt")
+    positive = cache.make_key("Is a +5% return bad?", "portfolio_manager", "gpt-4o-mini", "prompt")
+    unsigned = cache.make_key("Is a 5% return bad?", "portfolio_manager", "gpt-4o-mini", "prompt")
+    assert len({negative, positive, unsigned}) == 3
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path, clock):
+    cache = ResponseCache(default_ttl=60, cache_dir=tmp_path, max_disk_entries=2)
+    cache.put("a", "s", "A")
+    cache.put("b", "s", "B")
+    cache._entries.clear()
+    assert cache.get("a", "s") == "A"  # b is now the least recently used file
+    cache.put("c", "s", "C")
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_disk_tier_byte_budget_holds_across_restarts(tmp_path):
+    cache = ResponseCache(default_ttl=60, cache_dir=tmp_path)
+    for key in "abcd":
+        cache.put(key, "s", key * 100)
+    # Room for the two largest files; sizes vary by a byte with the expiry timestamp
+    budget = sum(sorted(p.stat().st_size for p in tmp_path.glob("*.json"))[-2:])
+
+    reopened = ResponseCache(default_ttl=60, cache_dir=tmp_path, max_disk_bytes=budget)
+    assert reopened.stats()["disk_entries"] == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_expired_disk_entries_are_deleted(tmp_path, clock):
+    cache = ResponseCache(default_ttl=60, cache_dir=tmp_path)
+    cache.put("k", "s", "answer")
+    cache._entries.clear()
+    clock[0] += 61
+
+    assert cache.get("k", "s") is None
+    assert not list(tmp_path.glob("*.json"))
+    assert cache.stats()["per_specialist"]["s"]["expired"] == 1
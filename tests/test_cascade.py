@@ -0,0 +1,98 @@
+"""Tests for the model cascade and the cascade-aware specialist keys."""
+
+from types import SimpleNamespace
+
+from aws_strands_poc.financial_advisor.cache import ResponseCache, cached_specialist
+from aws_strands_poc.financial_advisor.model_config import model_label
+from aws_strands_poc.financial_advisor.models.cascade import CascadeMetrics, CascadeModel
+from aws_strands_poc.financial_advisor.semantic_cache import SemanticCache
+from aws_strands_poc.financial_advisor.specialists.pool import SpecialistAgentPool
+
+
+def text_stream(text, finish_reason="stop"):
+    """Streaming chunks answering with text, followed by a usage chunk."""
+    delta = SimpleNamespace(content=text, tool_calls=None)
+    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=None)
+    yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=20, completion_tokens=8, total_tokens=28))
+
+
+class TierClient:
+    """OpenAI client stand-in answering each model with its own text."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.models = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.models.append(request["model"])
+        return text_stream(self.answers[request["model"]])
+
+
+def cascade_answer(answers):
+    client = TierClient(answers)
+    metrics = CascadeMetrics()
+    model = CascadeModel(tiers=["small", "large"], client=client, metrics=metrics, schedule=False, coalesce=False)
+    request = model.format_request([{"role": "user", "content": [{"text": "Is AAPL a buy?"}]}],
+                                   system_prompt="You are a market analyst.")
+    events = list(model.stream(request))
+    text = "".join(e["data"] for e in events if e["chunk_type"] == "content_delta")
+    return text, client.models, metrics.stats()
+
+
+def test_cascade_escalates_when_the_cheap_tier_fails_a_check():
+    text, models, stats = cascade_answer({"small": "I'm sorry, I can't help with that.", "large": "Hold it."})
+
+    assert text == "Hold it."
+    assert models == ["small", "large"]
+    assert stats["tiers"]["small"]["escalated"] == 1
+    assert stats["tiers"]["small"]["escalation_reasons"] == {"refusal": 1}
+
+
+def test_cascade_keeps_a_passing_cheap_answer_without_its_confidence_line():
+    text, models, stats = cascade_answer({"small": "Hold it.\nConfidence: 0.9", "large": "unused"})
+
+    assert text == "Hold it."
+    assert models == ["small"]
+    assert stats["tiers"]["small"]["accepted"] == 1
+
+
+def test_model_label_reflects_the_cascade(monkeypatch):
+    monkeypatch.setenv("MODEL", "gpt-4o-mini")
+    monkeypatch.delenv("MODEL_CASCADE", raising=False)
+    assert model_label() == "gpt-4o-mini"
+    monkeypatch.setenv("MODEL_CASCADE", "gpt-4o-mini, gpt-4o")
+    assert model_label() == "cascade:gpt-4o-mini,gpt-4o"
+    assert model_label("gpt-4o", cascade=["gpt-4.1-nano", "gpt-4.1"]) == "cascade:gpt-4.1-nano,gpt-4.1"
+
+
+def test_cached_answer_is_not_shared_between_a_model_and_a_cascade(monkeypatch):
+    monkeypatch.setenv("MODEL", "gpt-4o-mini")
+    monkeypatch.delenv("MODEL_CASCADE", raising=False)
+    calls = []
+
+    @cached_specialist("market_analyst", "prompt", cache=ResponseCache(), semantic=SemanticCache())
+    def specialist(query):
+        calls.append(model_label())
+        return f"answer from {model_label()}"
+
+    assert specialist("Is AAPL a buy?") == "answer from gpt-4o-mini"
+    monkeypatch.setenv("MODEL_CASCADE", "gpt-4o-mini,gpt-4o")
+    assert specialist("Is AAPL a buy?") == "answer from cascade:gpt-4o-mini,gpt-4o"
+    assert specialist("Is AAPL a buy?") == "answer from cascade:gpt-4o-mini,gpt-4o"
+    assert calls == ["gpt-4o-mini", "cascade:gpt-4o-mini,gpt-4o"]
+
+
+def test_pooled_agent_is_not_reused_once_a_cascade_is_configured(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("MODEL_CASCADE", raising=False)
+    pool = SpecialistAgentPool()
+
+    with pool.checkout("market_analyst", system_prompt="prompt", tools=[], model="gpt-4o-mini") as agent:
+        assert not isinstance(agent.model, CascadeModel)
+    monkeypatch.setenv("MODEL_CASCADE", "gpt-4o-mini,gpt-4o")
+    with pool.checkout("market_analyst", system_prompt="prompt", tools=[], model="gpt-4o-mini") as agent:
+        assert isinstance(agent.model, CascadeModel)
+
+    assert pool.stats()["misses"] == 2
+    assert set(pool.stats()["idle"]) == {"market_analyst:gpt-4o-mini", "market_analyst:cascade:gpt-4o-mini,gpt-4o"}
@@ -0,0 +1,110 @@
+"""Tests for the shared OpenAI client registry: client reuse, request metering and pool statistics."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import MockOpenAIServer
+from aws_strands_poc.financial_advisor.models import client_registry as registry_module
+from aws_strands_poc.financial_advisor.models.client_registry import ClientRegistry
+
+
+def streaming_transport():
+    return httpx.MockTransport(lambda request: httpx.Response(200, stream=httpx.ByteStream(b"data")))
+
+
+def test_clients_are_shared_per_key_and_share_one_pool():
+    registry = ClientRegistry(transport=streaming_transport())
+    first = registry.get_client("key-a")
+
+    assert registry.get_client("key-a") is first
+    other = registry.get_client("key-b")
+    assert other is not first
+    assert other._client is first._client
+    assert registry.stats()["clients"] == 2
+    registry.close()
+
+
+def test_request_is_in_flight_until_its_response_is_closed():
+    registry = ClientRegistry(transport=streaming_transport())
+    registry.get_client("key")
+    http_client = registry._http_client
+
+    with http_client.stream("GET", "https://api.openai.com/v1/models") as response:
+        assert registry.stats()["in_flight"] == 1
+        response.read()
+    stats = registry.stats()
+    assert stats["in_flight"] == 0
+    assert stats["requests"] == 1
+    assert stats["peak_in_flight"] == 1
+
+    registry.close()
+
+
+def test_failed_request_is_no_longer_in_flight():
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    registry = ClientRegistry(transport=httpx.MockTransport(refuse))
+    registry.get_client("key")
+    with pytest.raises(httpx.ConnectError):
+        registry._http_client.get("https://api.openai.com/v1/models")
+
+    assert registry.stats()["in_flight"] == 0
+    assert registry.stats()["requests"] == 1
+    registry.close()
+
+
+def test_async_clients_belong_to_their_event_loop():
+    registry = ClientRegistry(transport=streaming_transport())
+
+    async def clients():
+        client = registry.get_async_client("key")
+        assert registry.get_async_client("key") is client
+        response = await client._client.get("https://api.openai.com/v1/models")
+        await response.aread()
+        return client
+
+    first = asyncio.run(clients())
+    second = asyncio.run(clients())
+    assert second is not first
+    assert registry.stats()["requests"] == 2
+    with pytest.raises(RuntimeError):
+        registry.get_async_client("key")
+
+
+def test_pool_reports_open_and_idle_connections(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    registry = ClientRegistry()
+    with MockOpenAIServer() as server:
+        client = registry.get_client("key", base_url=server.base_url)
+        for _ in range(3):
+            client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+        stats = registry.stats()
+    registry.close()
+
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connection_reuse_rate"] == pytest.approx(2 / 3)
+    assert stats["pool"] == {"open": 1, "idle": 1, "active": 0}
+
+
+def test_pool_statistics_survive_a_missing_httpcore_pool(monkeypatch):
+    registry = ClientRegistry()
+    registry.get_client("key")
+    for metered in registry._http_client.metered_transports:
+        monkeypatch.delattr(metered.transport, "_pool")
+
+    stats = registry.stats()
+    assert stats["pool"] is None
+    assert stats["requests"] == 0
+
+
+def test_transports_are_metered_without_the_httpx_hooks(monkeypatch):
+    monkeypatch.setattr(registry_module, "TRANSPORT_HOOKS_AVAILABLE", False)
+    registry = ClientRegistry()
+    registry.get_client("key")
+
+    assert len(registry._http_client.metered_transports) >= 1
+    assert registry.stats()["pool"] == {"open": 0, "idle": 0, "active": 0}
@@ -0,0 +1,80 @@
+"""Tests for single-flight coalescing of identical concurrent calls."""
+
+import threading
+import time
+
+import pytest
+
+from aws_strands_poc.financial_advisor.coalesce import SingleFlight
+
+FOLLOWERS = 4
+
+
+def run_concurrently(flight, fn):
+    """Start a leader and FOLLOWERS identical requests; return each request's result or exception."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def request():
+        try:
+            outcome = flight.do("same question", fn)
+        except Exception as e:
+            outcome = e
+        with lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=request) for _ in range(FOLLOWERS + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return outcomes
+
+
+def blocking(fn):
+    """Wrap fn so the leader waits until every follower is queued behind it."""
+    def call(flight):
+        deadline = time.monotonic() + 5
+        while flight.stats()["collapsed"] < FOLLOWERS and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return fn()
+    return call
+
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight("test")
+    calls = []
+    fn = blocking(lambda: calls.append(1) or "answer")
+    outcomes = run_concurrently(flight, lambda: fn(flight))
+
+    assert len(calls) == 1
+    assert sorted(outcomes, key=lambda o: o[1]) == [("answer", False)] + [("answer", True)] * FOLLOWERS
+    assert flight.stats()["executions"] == 1
+    assert flight.stats()["collapsed"] == FOLLOWERS
+
+
+def test_followers_receive_the_leaders_error():
+    flight = SingleFlight("test")
+    error = RuntimeError("upstream failed")
+
+    def fail():
+        raise error
+
+    fn = blocking(fail)
+    outcomes = run_concurrently(flight, lambda: fn(flight))
+
+    assert outcomes == [error] * (FOLLOWERS + 1)
+    stats = flight.stats()
+    assert stats["errors"] == 1
+    assert stats["executions"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_nothing_is_kept_after_the_call_returns():
+    flight = SingleFlight("test")
+    assert flight.do("key", lambda: 1) == (1, False)
+    assert flight.do("key", lambda: 2) == (2, False)
+
+    with pytest.raises(ValueError):
+        flight.do("key", lambda: int("x"))
+    assert flight.do("key", lambda: 3) == (3, False)
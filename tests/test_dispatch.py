@@ -0,0 +1,53 @@
+"""Tests for concurrent specialist dispatch: overlap, call order and context."""
+
+import concurrent.futures
+import contextvars
+import threading
+import time
+
+import pytest
+
+from aws_strands_poc.financial_advisor.dispatch import OrderedToolExecutor, dispatch_specialists
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_specialists_run_concurrently_and_answer_in_call_order():
+    # Every call waits for the others, so dispatch only finishes if they overlap
+    barrier = threading.Barrier(3, timeout=5)
+
+    def specialist(name, delay):
+        def run(query):
+            barrier.wait()
+            time.sleep(delay)
+            return f"{name}: {query}"
+        return run
+
+    calls = [(specialist("tax", 0.05), "q1"), (specialist("market", 0.0), "q2"), (specialist("compliance", 0.02), "q3")]
+    assert dispatch_specialists(calls) == ["tax: q1", "market: q2", "compliance: q3"]
+
+
+def test_executor_yields_futures_in_submission_order_and_carries_context():
+    executor = OrderedToolExecutor(max_workers=2)
+    token = request_id.set("req-7")
+    try:
+        futures = [
+            executor.submit(lambda: (time.sleep(0.05), "slow", request_id.get())[1:]),
+            executor.submit(lambda: ("fast", request_id.get())),
+        ]
+        assert [f.result() for f in executor.as_completed(futures)] == [("slow", "req-7"), ("fast", "req-7")]
+    finally:
+        request_id.reset(token)
+        executor.shutdown()
+
+
+def test_executor_times_out_on_a_hung_call():
+    executor = OrderedToolExecutor(max_workers=1)
+    release = threading.Event()
+    try:
+        future = executor.submit(release.wait)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            list(executor.as_completed([future], timeout=0.05))
+    finally:
+        release.set()
+        executor.shutdown()
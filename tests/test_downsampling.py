@@ -0,0 +1,43 @@
+"""Tests for downsampling: LTTB endpoints and the default bar cap in stock_data."""
+
+import numpy as np
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.downsampling import lttb_indices
+from aws_strands_poc.financial_advisor.tools.stock_data import DEFAULT_MAX_POINTS, stock_data
+
+
+def test_lttb_always_keeps_the_first_and_last_point():
+    x = np.arange(1000)
+    y = np.sin(x / 25.0)
+
+    for max_points in (3, 10, 250):
+        kept = lttb_indices(x, y, max_points)
+        assert len(kept) == max_points
+        assert kept[0] == 0 and kept[-1] == 999
+        assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_with_two_points_returns_only_the_endpoints():
+    x = np.arange(100)
+    assert lttb_indices(x, x * 2.0, 2).tolist() == [0, 99]
+
+
+def test_lttb_rejects_fewer_than_two_points():
+    x = np.arange(100)
+    with pytest.raises(ValueError):
+        lttb_indices(x, x * 2.0, 1)
+
+
+def test_stock_data_caps_long_series_by_default():
+    result = stock_data(ticker="DSTEST", timeframe="1y", interval="1m")
+
+    assert len(result["date"]) == DEFAULT_MAX_POINTS
+    assert result["downsampled_from"] > 90_000
+
+
+def test_stock_data_respects_an_explicit_max_points():
+    result = stock_data(ticker="DSTEST", timeframe="1y", interval="1m", max_points=40, method="lttb")
+
+    assert len(result["date"]) == 40
+    assert result["downsampled_from"] > 90_000
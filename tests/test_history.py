@@ -0,0 +1,52 @@
+"""Tests for token-bounded conversation history compaction."""
+
+from aws_strands_poc.financial_advisor.history import SUMMARY_PREFIX, ConversationHistory
+
+
+def tool_turn(n):
+    """A user turn answered through a tool call."""
+    call_id = f"call_{n}"
+    return [
+        {"role": "user", "content": f"Question {n} about AAPL " + "detail " * 20},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": call_id, "type": "function",
+             "function": {"name": "stock_data", "arguments": '{"ticker": "AAPL"}'}},
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "content": "price data " * 30},
+        {"role": "assistant", "content": f"Answer {n} " + "analysis " * 20},
+    ]
+
+
+def test_compaction_never_separates_tool_calls_from_their_results():
+    history = ConversationHistory("You are a financial advisor.", max_tokens=400)
+    for n in range(10):
+        history.extend(tool_turn(n))
+        messages = history.prompt_messages()
+
+        call_ids = {call["id"] for m in messages if m["role"] == "assistant" for call in m.get("tool_calls", [])}
+        result_ids = {m["tool_call_id"] for m in messages if m["role"] == "tool"}
+        assert call_ids == result_ids
+        # The window starts at a user message, after the system prompt and summary
+        window = [m for m in messages if m["role"] != "system"]
+        assert window[0]["role"] == "user"
+
+    assert history.compactions > 0
+    assert history.evicted_messages % 4 == 0
+    assert messages[1]["content"].startswith(SUMMARY_PREFIX)
+    assert history.prompt_tokens() <= 400
+
+
+def test_latest_turn_is_kept_even_over_budget():
+    history = ConversationHistory("You are a financial advisor.", max_tokens=50)
+    history.extend(tool_turn(0))
+    history.extend(tool_turn(1))
+    history.compact()
+
+    assert [m for m in history.messages() if m["role"] != "system"] == tool_turn(1)
+
+
+def test_history_within_budget_is_not_compacted():
+    history = ConversationHistory("You are a financial advisor.", max_tokens=4000)
+    history.extend(tool_turn(0))
+    assert history.compact() == 0
+    assert history.messages()[1:] == tool_turn(0)
@@ -0,0 +1,80 @@
+"""Tests for the vectorized indicators against per-bar Python loops."""
+
+import math
+
+import numpy as np
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.indicators import compute, ewm, rsi, sma
+from aws_strands_poc.financial_advisor.tools.price_series import generate_panel, generate_series
+
+
+def loop_ewm(values, alpha, initial):
+    out, previous = [], initial
+    for value in values:
+        previous = alpha * value + (1 - alpha) * previous
+        out.append(previous)
+    return out
+
+
+def loop_rsi(close, period):
+    changes = [0.0] + [close[i] - close[i - 1] for i in range(1, len(close))]
+
+    def wilder(values):
+        average = sum(values[1:1 + period]) / period
+        out = [math.nan] * period + [average]
+        for value in values[1 + period:]:
+            average = (average * (period - 1) + value) / period
+            out.append(average)
+        return out
+
+    gains = wilder([max(c, 0.0) for c in changes])
+    losses = wilder([max(-c, 0.0) for c in changes])
+    return [gain if math.isnan(gain) else 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+            for gain, loss in zip(gains, losses)]
+
+
+@pytest.fixture(scope="module")
+def close():
+    return generate_series("NVDA", "1y", interval="1h", seed=5, end="2025-06-30").close
+
+
+# alpha=0.5 splits the 1,764 bars into six closed-form blocks of 332; 0.01 fits them in one
+@pytest.mark.parametrize("alpha", [1.0, 0.5, 2 / 21, 0.01])
+def test_ewm_matches_the_recursion(close, alpha):
+    np.testing.assert_allclose(ewm(close, alpha, close[0]), loop_ewm(close.tolist(), alpha, close[0]), rtol=1e-9)
+
+
+def test_ewm_runs_each_row_of_a_matrix_on_its_own(close):
+    rows = np.vstack([close, close[::-1], np.full_like(close, 3.0)])
+    out = ewm(rows, 0.2, rows[:, 0])
+    for row in range(3):
+        np.testing.assert_allclose(out[row], loop_ewm(rows[row].tolist(), 0.2, rows[row, 0]), rtol=1e-9)
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_rsi_matches_a_wilder_loop(close, period):
+    np.testing.assert_allclose(rsi(close, period), loop_rsi(close.tolist(), period), rtol=1e-9, equal_nan=True)
+
+
+def test_rsi_is_100_without_losses_and_nan_before_enough_bars():
+    rising = np.arange(1.0, 31.0)
+    out = rsi(rising, 14)
+    assert np.isnan(out[:14]).all()
+    assert (out[14:] == 100.0).all()
+    assert np.isnan(rsi(rising[:10], 14)).all()
+
+
+def test_sma_matches_a_window_mean(close):
+    expected = [math.nan] * 19 + [float(np.mean(close[i - 19:i + 1])) for i in range(19, len(close))]
+    np.testing.assert_allclose(sma(close, 20), expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", ["ema", "rsi", "macd", "bollinger", "atr", "vwap"])
+def test_panel_rows_match_single_series(name):
+    panel = generate_panel(["AAPL", "MSFT"], "1mo", interval="15m", seed=2, end="2025-06-30")
+    together = compute(name, panel)
+    for row, ticker in enumerate(panel.tickers):
+        alone = compute(name, panel.series(ticker))
+        for component, values in alone.items():
+            np.testing.assert_allclose(together[component][row], values, rtol=1e-9, equal_nan=True)
@@ -0,0 +1,90 @@
+"""Tests for the mock OpenAI server: scripted answers, streaming, keep-alive and throttling."""
+
+import json
+
+import openai
+import pytest
+from openai import OpenAI
+
+from aws_strands_poc.financial_advisor.benchmarks.mock_server import ANSWER, Latency, MockOpenAIServer
+
+TAX_TOOL = {"type": "function", "function": {
+    "name": "tax_specialist",
+    "parameters": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]},
+}}
+MARKET_TOOL = {"type": "function", "function": {
+    "name": "market_analyst",
+    "parameters": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]},
+}}
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    # Keep local requests away from any proxy configured in the environment
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    servers = []
+
+    def connect(**options):
+        server = MockOpenAIServer(**options).start()
+        servers.append(server)
+        return server, OpenAI(api_key="test-key", base_url=server.base_url, max_retries=0)
+
+    yield connect
+    for server in servers:
+        server.stop()
+
+
+def ask(client, content, **kwargs):
+    return client.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": content}], **kwargs
+    )
+
+
+def test_script_calls_the_matching_tool_then_answers(connect):
+    server, client = connect()
+
+    response = ask(client, "What tax do I owe on capital gains?", tools=[MARKET_TOOL, TAX_TOOL])
+    [call] = response.choices[0].message.tool_calls
+    assert call.function.name == "tax_specialist"
+    assert json.loads(call.function.arguments) == {"query": "What tax do I owe on capital gains?"}
+
+    final = client.chat.completions.create(model="gpt-4o-mini", tools=[TAX_TOOL], messages=[
+        {"role": "user", "content": "What tax do I owe on capital gains?"},
+        {"role": "assistant", "content": None, "tool_calls": [call.model_dump()]},
+        {"role": "tool", "tool_call_id": call.id, "content": "15%"},
+    ])
+    assert final.choices[0].message.content == ANSWER
+    assert ask(client, "Hello").choices[0].message.content == "Echo: Hello"
+    # One keep-alive connection served every request
+    assert (server.requests, server.connections) == (3, 1)
+
+
+def test_streamed_answer_reassembles_and_reports_usage(connect):
+    _, client = connect()
+
+    chunks = list(ask(client, "Hello there", stream=True, stream_options={"include_usage": True}))
+    text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+    assert text == "Echo: Hello there"
+    assert chunks[-1].usage.completion_tokens == 3
+    assert [c.choices[0].finish_reason for c in chunks if c.choices][-1] == "stop"
+
+
+def test_quota_is_enforced_with_a_retry_after_header(connect):
+    server, client = connect(requests_per_minute=2)
+    ask(client, "one")
+    ask(client, "two")
+
+    with pytest.raises(openai.RateLimitError) as error:
+        ask(client, "three")
+    assert 0 < int(error.value.response.headers["retry-after-ms"]) <= 60_000
+    assert server.throttled == 1
+
+
+def test_latency_specs_parse_into_distributions():
+    assert Latency.parse(0.2).sample() == 0.2
+    assert Latency.parse("0.1").sample() == 0.1
+    uniform = Latency.parse("uniform:0.1:0.3")
+    assert all(0.1 <= uniform.sample() <= 0.3 for _ in range(100))
+    assert not Latency.parse(None)
+    with pytest.raises(ValueError):
+        Latency.parse("gamma:1:2")
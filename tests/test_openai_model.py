@@ -0,0 +1,98 @@
+"""Tests for the memoizing Strands-to-OpenAI message converter."""
+
+import copy
+
+from strands.event_loop.message_processor import find_last_message_with_tool_results, truncate_tool_results
+
+from aws_strands_poc.financial_advisor.models.openai_model import MessageConverter, convert_messages_to_openai_format
+
+
+def tool_round(n):
+    """An assistant tool call and the user message carrying its result."""
+    call_id = f"call_{n}"
+    return [
+        {"role": "assistant", "content": [
+            {"text": f"Looking up quote {n}"},
+            {"toolUse": {"toolUseId": call_id, "name": "stock_data", "input": {"ticker": "AAPL", "n": n}}},
+        ]},
+        {"role": "user", "content": [
+            {"toolResult": {"toolUseId": call_id, "status": "success", "content": [{"text": "price " * 50}]}},
+        ]},
+    ]
+
+
+def history(rounds):
+    messages = [{"role": "user", "content": [{"text": "How has AAPL performed?"}]}]
+    for n in range(rounds):
+        messages.extend(tool_round(n))
+    return messages
+
+
+def test_growing_history_reuses_the_converted_prefix():
+    converter = MessageConverter()
+    messages = history(1)
+    assert converter.convert(messages) == convert_messages_to_openai_format(messages)
+    assert converter.stats()["misses"] == 3
+
+    for n in range(1, 4):
+        messages.extend(tool_round(n))
+        assert converter.convert(messages) == convert_messages_to_openai_format(messages)
+
+    stats = converter.stats()
+    # Every message is converted once; later calls reuse it
+    assert stats["misses"] == len(messages)
+    assert stats["hits"] == 3 + 5 + 7
+
+
+def test_tool_result_truncated_before_a_retry_is_converted_again():
+    converter = MessageConverter()
+    messages = history(3)
+    converter.convert(messages)
+
+    # Strands' context-overflow recovery: truncate the newest tool result and retry the same history
+    assert truncate_tool_results(messages, find_last_message_with_tool_results(messages))
+    converted = converter.convert(messages)
+
+    assert converted == convert_messages_to_openai_format(messages)
+    assert converted[-1]["content"] == "The tool result was too large!"
+
+
+def test_earlier_tool_result_edited_in_place_is_converted_again_on_retry():
+    converter = MessageConverter()
+    messages = history(3)
+    converter.convert(messages)
+
+    assert truncate_tool_results(messages, 2)
+    assert converter.convert(messages) == convert_messages_to_openai_format(messages)
+
+
+def test_tool_result_truncated_before_the_history_grows_is_converted_again():
+    converter = MessageConverter()
+    messages = history(2)
+    converter.convert(messages)
+
+    truncate_tool_results(messages, find_last_message_with_tool_results(messages))
+    messages.append({"role": "assistant", "content": [{"text": "That result was too large to use."}]})
+    assert converter.convert(messages) == convert_messages_to_openai_format(messages)
+
+
+def test_rolled_back_and_replaced_messages_are_converted_from_scratch():
+    converter = MessageConverter()
+    messages = history(3)
+    converter.convert(messages)
+
+    rolled_back = messages[:3] + copy.deepcopy(tool_round(7))
+    assert converter.convert(rolled_back) == convert_messages_to_openai_format(rolled_back)
+
+    replaced = [{"role": "user", "content": [{"text": "Start over"}]}] + messages[1:]
+    assert converter.convert(replaced) == convert_messages_to_openai_format(replaced)
+
+
+def test_clear_forgets_conversions():
+    converter = MessageConverter()
+    messages = history(1)
+    converter.convert(messages)
+    converter.clear()
+    converter.convert(messages)
+    assert converter.stats()["entries"] == 3
+    assert converter.stats()["misses"] == 6
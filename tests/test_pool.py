@@ -0,0 +1,56 @@
+"""Tests for the specialist agent pool: reuse, reset, and discarding failed agents."""
+
+import pytest
+
+from aws_strands_poc.financial_advisor.specialists.pool import SpecialistAgentPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("MODEL_CASCADE", raising=False)
+    return SpecialistAgentPool(max_idle_per_key=1)
+
+
+def checkout(pool, specialist="tax_specialist", model="gpt-4o-mini"):
+    return pool.checkout(specialist, system_prompt="prompt", tools=[], model=model)
+
+
+def test_released_agent_is_reused_with_a_clean_conversation(pool):
+    with checkout(pool) as first:
+        first.messages.append({"role": "user", "content": [{"text": "How are dividends taxed?"}]})
+    with checkout(pool) as second:
+        assert second is first
+        assert second.messages == []
+
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["idle"] == {"tax_specialist:gpt-4o-mini": 1}
+
+
+def test_agents_are_not_shared_across_specialists_or_models(pool):
+    with checkout(pool) as tax:
+        pass
+    with checkout(pool, specialist="market_analyst") as market:
+        assert market is not tax
+    with checkout(pool, model="gpt-4o") as bigger:
+        assert bigger is not tax
+    assert pool.stats()["misses"] == 3
+
+
+def test_agent_that_raised_is_dropped(pool):
+    with pytest.raises(RuntimeError):
+        with checkout(pool) as failed:
+            raise RuntimeError("tool exploded")
+    with checkout(pool) as fresh:
+        assert fresh is not failed
+    assert pool.stats()["discarded"] == 1
+
+
+def test_concurrent_borrowers_get_distinct_agents_and_extras_are_discarded(pool):
+    with checkout(pool) as first, checkout(pool) as second:
+        assert first is not second
+    stats = pool.stats()
+    # max_idle_per_key=1 keeps one of the two
+    assert stats["idle"] == {"tax_specialist:gpt-4o-mini": 1}
+    assert stats["discarded"] == 1
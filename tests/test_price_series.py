@@ -0,0 +1,56 @@
+"""Tests for the seedable price generator: reproducibility, seeds and bar invariants."""
+
+import numpy as np
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.price_series import (
+    DEFAULT_SEED,
+    bar_count,
+    generate_panel,
+    generate_series,
+)
+
+END = "2025-06-30"
+
+
+def test_same_request_gives_the_same_series():
+    a = generate_series("AAPL", "1mo", seed=7, end=END)
+    b = generate_series("aapl", "1mo", seed=7, end=END)
+    assert a.ticker == "AAPL"
+    assert np.array_equal(a.close, b.close) and np.array_equal(a.volume, b.volume)
+
+
+def test_seed_zero_is_a_scenario_of_its_own():
+    unseeded = generate_series("AAPL", "1mo", end=END).close
+    assert not np.array_equal(generate_series("AAPL", "1mo", seed=0, end=END).close, unseeded)
+    assert np.array_equal(generate_series("AAPL", "1mo", seed=DEFAULT_SEED, end=END).close, unseeded)
+    assert not np.array_equal(generate_series("AAPL", "1mo", seed=1, end=END).close, unseeded)
+
+
+def test_panel_rows_match_single_ticker_series():
+    panel = generate_panel(["AAPL", "MSFT", "ZZZZ"], "6mo", seed=3, end=END)
+    for row, ticker in enumerate(panel.tickers):
+        series = generate_series(ticker, "6mo", seed=3, end=END)
+        assert np.array_equal(panel.close[row], series.close)
+        assert np.array_equal(panel.volume[row].astype(np.int64), series.volume)
+
+
+@pytest.mark.parametrize("timeframe, interval", [("1mo", "1d"), ("5d", "5m"), ("10y", "1wk")])
+def test_bars_are_consistent_ohlcv(timeframe, interval):
+    series = generate_series("TSLA", timeframe, interval=interval, seed=11, end=END)
+
+    assert len(series) == bar_count(timeframe, interval)
+    assert np.all(np.diff(series.dates.astype(np.int64)) > 0)
+    assert series.dates[-1].astype("datetime64[D]") <= np.datetime64(END)
+    assert np.all(series.high >= np.maximum(series.open, series.close))
+    assert np.all(series.low <= np.minimum(series.open, series.close))
+    assert np.all(series.low > 0) and np.all(series.volume >= 0)
+    # Each bar opens at the previous close
+    assert np.array_equal(series.open[1:], series.close[:-1])
+
+
+def test_unknown_timeframe_or_interval_is_rejected():
+    with pytest.raises(ValueError):
+        generate_series("AAPL", "3wk")
+    with pytest.raises(ValueError):
+        generate_series("AAPL", "1mo", interval="7m")
@@ -0,0 +1,81 @@
+"""Tests for the memory-mapped price store: merges, versions and the legacy layout."""
+
+import numpy as np
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.price_store import CURRENT, FIELDS, PriceStore
+
+
+def bars(dates, close):
+    """Columns for bars whose prices all equal close."""
+    close = np.asarray(close, dtype=np.float64)
+    return np.array(dates, dtype="datetime64[D]"), {
+        "open": close, "high": close, "low": close, "close": close, "volume": np.full(len(close), 100),
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(tmp_path)
+
+
+def test_merge_keeps_the_sorted_union_and_the_last_bar_wins(store):
+    store.write("AAPL", "1d", *bars(["2025-01-03", "2025-01-01"], [3.0, 1.0]))
+    count = store.write("aapl", "1d", *bars(["2025-01-02", "2025-01-03", "2025-01-02"], [2.0, 30.0, 20.0]))
+
+    series = store.read("AAPL", "1d")
+    assert count == 3
+    assert series.dates.tolist() == np.array(["2025-01-01", "2025-01-02", "2025-01-03"], dtype="datetime64[D]").tolist()
+    assert series.close.tolist() == [1.0, 20.0, 30.0]
+    assert series.volume.dtype == np.int64
+
+
+def test_write_without_merge_replaces_stored_bars(store):
+    store.write("AAPL", "1d", *bars(["2025-01-01", "2025-01-02"], [1.0, 2.0]))
+    store.write("AAPL", "1d", *bars(["2025-02-01"], [5.0]), merge=False)
+
+    assert store.read("AAPL", "1d").close.tolist() == [5.0]
+
+
+def test_date_range_reads_are_half_open(store):
+    store.write("MSFT", "1d", *bars(["2025-01-01", "2025-01-02", "2025-01-03"], [1.0, 2.0, 3.0]))
+    assert store.read("MSFT", "1d", start="2025-01-02", stop="2025-01-03").close.tolist() == [2.0]
+    assert store.read("MSFT", "1d", start="2025-01-04").close.tolist() == []
+
+
+def test_each_write_switches_current_and_removes_older_versions(store, tmp_path):
+    store.write("AAPL", "1d", *bars(["2025-01-01"], [1.0]))
+    first = store.path("AAPL", "1d")
+    assert store.read("AAPL", "1d").close.tolist() == [1.0]
+
+    store.write("AAPL", "1d", *bars(["2025-01-02"], [2.0]))
+    directory = tmp_path / "AAPL" / "1d"
+    assert store.path("AAPL", "1d") == directory / (directory / CURRENT).read_text()
+    assert store.path("AAPL", "1d") != first
+    assert not first.exists()
+    assert [p.name for p in directory.iterdir() if p.is_dir()] == [store.path("AAPL", "1d").name]
+    assert store.read("AAPL", "1d").close.tolist() == [1.0, 2.0]
+
+
+def test_unversioned_layout_is_readable_and_replaced_on_write(store, tmp_path):
+    directory = tmp_path / "AAPL" / "1d"
+    directory.mkdir(parents=True)
+    dates, columns = bars(["2025-01-01"], [1.0])
+    np.save(directory / "dates.npy", dates)
+    for name in FIELDS:
+        np.save(directory / f"{name}.npy", columns[name])
+
+    assert store.path("AAPL", "1d") == directory
+    assert store.read("AAPL", "1d").close.tolist() == [1.0]
+
+    store.write("AAPL", "1d", *bars(["2025-01-02"], [2.0]))
+    assert store.read("AAPL", "1d").close.tolist() == [1.0, 2.0]
+    assert not list(directory.glob("*.npy"))
+
+
+def test_missing_ticker_and_disabled_store(store):
+    assert store.read("NVDA", "1d") is None
+    assert not store.has("NVDA")
+    assert PriceStore().read("AAPL", "1d") is None
+    with pytest.raises(ValueError):
+        store.write("../etc", "1d", *bars(["2025-01-01"], [1.0]))
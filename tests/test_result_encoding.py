@@ -0,0 +1,54 @@
+"""Tests for the compact tool-result encodings."""
+
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.result_encoding import (
+    ENCODERS,
+    EncodedResult,
+    decode_result,
+    encode_result,
+    encoding_stats,
+)
+
+RESULT = {
+    "ticker": "AAPL",
+    "prices": [
+        {"date": "2025-05-01", "close": 211.5, "volume": 1200, "note": None},
+        {"date": "2025-05-02", "close": 213.25, "volume": 980, "note": "earnings, \"beat\""},
+    ],
+    "summary": {"change_pct": -1.5, "flags": [True, False], "empty": []},
+    "mixed": [{"a": 1}, {"b": 2}],
+}
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODERS))
+def test_every_encoder_round_trips(encoding):
+    text = encode_result(RESULT, encoding)
+    assert decode_result(text, encoding) == RESULT
+
+
+@pytest.mark.parametrize("encoding", ["json", "rows", "columnar", "csv"])
+def test_compact_encodings_are_smaller_than_repr(encoding):
+    assert len(encode_result(RESULT, encoding)) < len(str(RESULT))
+
+
+def test_values_that_would_not_round_trip_fall_back_to_repr():
+    value = {"pair": (1, 2), "nan": float("nan")}
+    assert encode_result(value, "rows") == str(value)
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        encode_result(RESULT, "xml")
+
+
+def test_encoded_result_reflects_later_changes_and_is_counted_once():
+    encoding_stats.clear()
+    result = EncodedResult({"ticker": "AAPL", "prices": [{"close": 1.0}]}, "rows", "stock_data")
+    first = str(result)
+    result["prices"].append({"close": 2.0})
+
+    assert decode_result(str(result), "rows") == {"ticker": "AAPL", "prices": [{"close": 1.0}, {"close": 2.0}]}
+    assert str(result) != first
+    assert encoding_stats.stats()["stock_data"]["results"] == 1
+    encoding_stats.clear()
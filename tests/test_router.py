@@ -0,0 +1,43 @@
+"""Tests for the local pre-router: clear-cut routing, fallbacks and counters."""
+
+import pytest
+
+from aws_strands_poc.financial_advisor.router import PreRouter
+
+
+@pytest.fixture(scope="module")
+def router():
+    return PreRouter()
+
+
+@pytest.mark.parametrize("query, specialist", [
+    ("Can you explain the rules around insider trading?", "compliance_officer"),
+    ("How are dividends taxed?", "tax_specialist"),
+    ("What is the Sharpe ratio of my portfolio?", "portfolio_manager"),
+])
+def test_clear_cut_queries_go_straight_to_their_specialist(router, query, specialist):
+    decision = router.classify(query)
+    assert decision.specialist == specialist
+    assert decision.confidence >= router.min_confidence
+
+
+@pytest.mark.parametrize("query", ["hi", "Hello there", "What is the weather like today?"])
+def test_queries_without_enough_evidence_fall_back_to_the_orchestrator(router, query):
+    assert not router.classify(query).routed
+
+
+def test_higher_threshold_routes_fewer_queries():
+    lenient = PreRouter(min_confidence=0.5).accuracy_report()
+    strict = PreRouter(min_confidence=0.99).accuracy_report()
+    assert strict["coverage"] < lenient["coverage"]
+    assert lenient["routed_accuracy"] >= 0.9
+
+
+def test_route_counts_routed_queries_and_fallbacks():
+    router = PreRouter()
+    router.route("How are dividends taxed?")
+    router.route("hi")
+
+    stats = router.stats()
+    assert (stats["routed"], stats["fallbacks"], stats["llm_hops_saved"]) == (1, 1, 1)
+    assert stats["routed_by_specialist"] == {"tax_specialist": 1}
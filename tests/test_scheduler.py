@@ -0,0 +1,201 @@
+"""Tests for the request scheduler: rate limits, lanes, retries and token accounting."""
+
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from aws_strands_poc.financial_advisor.models import scheduler as scheduler_module
+from aws_strands_poc.financial_advisor.models.openai_model import MessageConverter, OpenAIDirectModel
+from aws_strands_poc.financial_advisor.models.scheduler import RequestScheduler
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def rate_limit_error(headers=None):
+    response = httpx.Response(429, headers=headers or {}, request=REQUEST)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting them out."""
+    delays = []
+    monkeypatch.setattr(scheduler_module.time, "sleep", delays.append)
+    return delays
+
+
+def test_requests_per_minute_are_paced():
+    # 600 requests per minute with a 0.1s burst: one at once, then one every 0.1s
+    scheduler = RequestScheduler(requests_per_minute=600, burst_seconds=0.1)
+    start = time.monotonic()
+    waits = [scheduler.acquire() for _ in range(3)]
+
+    assert waits[0] < 0.05
+    assert time.monotonic() - start >= 0.18
+    assert scheduler.stats()["lanes"]["interactive"]["admitted"] == 3
+
+
+def test_tokens_per_minute_hold_back_large_requests():
+    # 1000 tokens per second with a 100-token bucket
+    scheduler = RequestScheduler(tokens_per_minute=60_000, burst_seconds=0.1)
+    assert scheduler.acquire(tokens=100) < 0.02
+    assert scheduler.acquire(tokens=50) >= 0.04
+
+
+def test_interactive_requests_are_admitted_before_batch():
+    scheduler = RequestScheduler(requests_per_minute=600, burst_seconds=0.1)
+    scheduler.acquire()  # drain the bucket so both requests queue
+    order = []
+
+    def request(lane):
+        scheduler.acquire(lane=lane)
+        order.append(lane)
+
+    batch = threading.Thread(target=request, args=("batch",))
+    batch.start()
+    time.sleep(0.01)
+    interactive = threading.Thread(target=request, args=("interactive",))
+    interactive.start()
+    batch.join(timeout=5)
+    interactive.join(timeout=5)
+
+    assert order == ["interactive", "batch"]
+
+
+def test_retry_after_header_sets_the_backoff(sleeps):
+    scheduler = RequestScheduler()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise rate_limit_error({"retry-after-ms": "250"})
+        return "ok"
+
+    assert scheduler.run(call) == "ok"
+    assert sleeps == [0.25]
+    lane = scheduler.stats()["lanes"]["interactive"]
+    assert lane["throttled"] == 1
+    assert lane["retry_after_honoured"] == 1
+
+
+def test_retried_request_is_charged_once(sleeps):
+    scheduler = RequestScheduler(tokens_per_minute=60, max_retries=3)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise openai.APIConnectionError(request=REQUEST)
+        return "ok"
+
+    scheduler.run(call, tokens=10)
+    scheduler.record_usage(10, 10)
+    assert len(attempts) == 3
+    assert 49.9 < scheduler.token_bucket.tokens <= 51
+
+
+def test_exhausted_retries_raise_the_last_error(sleeps):
+    scheduler = RequestScheduler(max_retries=2)
+
+    def call():
+        raise rate_limit_error()
+
+    with pytest.raises(openai.RateLimitError):
+        scheduler.run(call)
+    assert len(sleeps) == 2
+    assert scheduler.stats()["lanes"]["interactive"]["failed"] == 1
+
+
+def test_model_does_not_hand_exhausted_throttling_back_to_strands(sleeps):
+    class ThrottledClient:
+        def __init__(self):
+            self.calls = 0
+
+        def with_options(self, **options):
+            return self
+
+        @property
+        def chat(self):
+            return self
+
+        @property
+        def completions(self):
+            return self
+
+        def create(self, **request):
+            self.calls += 1
+            raise rate_limit_error()
+
+    client = ThrottledClient()
+    model = OpenAIDirectModel(client=client, scheduler=RequestScheduler(max_retries=2), coalesce=False)
+    request = model.format_request([{"role": "user", "content": [{"text": "hi"}]}])
+
+    # Strands only retries ModelThrottledException; the scheduler already did
+    with pytest.raises(openai.RateLimitError):
+        list(model.stream(request))
+    assert client.calls == 3
+
+
+def test_prompt_tokens_are_counted_once_per_message(monkeypatch):
+    from aws_strands_poc.financial_advisor.models import openai_model
+
+    counted = []
+    monkeypatch.setattr(openai_model, "message_tokens", lambda message, model: counted.append(message) or 10)
+    converter = MessageConverter()
+    messages = [{"role": "user", "content": [{"text": f"question {n}"}]} for n in range(5)]
+
+    assert converter.count_tokens(converter.convert(messages[:3]), "gpt-4o-mini") == 30
+    assert converter.count_tokens(converter.convert(messages), "gpt-4o-mini") == 50
+    assert len(counted) == 5
+
+
+def test_async_requests_are_paced_without_blocking_the_loop():
+    import asyncio
+
+    scheduler = RequestScheduler(requests_per_minute=600, burst_seconds=0.1)
+    ticks = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        start = time.monotonic()
+        ticking = asyncio.create_task(ticker())
+        for _ in range(3):
+            await scheduler.aacquire()
+        elapsed = time.monotonic() - start
+        await ticking
+        return elapsed
+
+    assert asyncio.run(main()) >= 0.18
+    # The loop kept running other tasks while requests waited for admission
+    assert len(ticks) == 10
+    assert scheduler.stats()["lanes"]["interactive"]["admitted"] == 3
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+def test_async_run_retries_and_charges_tokens_once():
+    import asyncio
+
+    scheduler = RequestScheduler(tokens_per_minute=60_000, base_delay=0.01, jitter=0)
+    attempts = []
+
+    async def request():
+        attempts.append(scheduler.token_bucket.tokens)
+        if len(attempts) < 3:
+            raise rate_limit_error({"retry-after-ms": "10"})
+        return "ok"
+
+    assert asyncio.run(scheduler.arun(request, tokens=500)) == "ok"
+    assert len(attempts) == 3
+    # Only the first admission charged the 500 tokens
+    assert attempts[2] >= attempts[1] >= attempts[0]
+    lane = scheduler.stats()["lanes"]["interactive"]
+    assert lane["retries"] == 2
+    assert lane["retry_after_honoured"] == 2
@@ -0,0 +1,51 @@
+"""Tests for the semantic cache: paraphrase hits and rejected near-duplicates."""
+
+import pytest
+
+from aws_strands_poc.financial_advisor.semantic_cache import SemanticCache
+
+NAMESPACE = "market_analyst:gpt-4o-mini:prompt"
+
+
+@pytest.fixture
+def cache():
+    cache = SemanticCache(threshold=0.5)
+    cache.put("What is the outlook for AAPL stock this quarter?", NAMESPACE, "market_analyst", "AAPL answer")
+    return cache
+
+
+def test_paraphrase_is_served_from_the_cache(cache):
+    match = cache.get("What's the outlook for AAPL stock this quarter", NAMESPACE, "market_analyst")
+    assert match is not None and match.response == "AAPL answer"
+    assert cache.stats()["hits"] == 1
+
+
+def test_query_about_another_ticker_is_rejected_despite_similar_wording(cache):
+    assert cache.get("What is the outlook for MSFT stock this quarter?", NAMESPACE, "market_analyst") is None
+    stats = cache.stats()
+    assert stats["entity_rejects"] == 1 and stats["hits"] == 0
+
+
+def test_query_with_another_amount_is_rejected():
+    cache = SemanticCache(threshold=0.5)
+    cache.put("How much will $10,000 grow to at 7% over 5 years?", NAMESPACE, "market_analyst", "14,026")
+    assert cache.get("How much will $20,000 grow to at 7% over 5 years?", NAMESPACE, "market_analyst") is None
+    assert cache.stats()["entity_rejects"] == 1
+
+
+def test_swapped_content_word_is_a_substitution_not_a_hit(cache):
+    query = "What is the outlook for AAPL bonds this quarter?"
+    assert cache.get(query, NAMESPACE, "market_analyst") is None
+    assert cache.stats()["substitution_rejects"] == 1
+    permissive = SemanticCache(threshold=0.5, allow_substitutions=True)
+    permissive.put("What is the outlook for AAPL stock this quarter?", NAMESPACE, "market_analyst", "AAPL answer")
+    assert permissive.get(query, NAMESPACE, "market_analyst") is not None
+
+
+def test_entries_do_not_cross_namespaces_or_uncached_specialists(cache):
+    query = "What is the outlook for AAPL stock this quarter?"
+    assert cache.get(query, "market_analyst:gpt-4o:prompt", "market_analyst") is None
+    restricted = SemanticCache(specialists=["market_analyst"])
+    restricted.put("How are dividends taxed?", NAMESPACE, "tax_specialist", "Tax answer")
+    assert restricted.get("How are dividends taxed?", NAMESPACE, "tax_specialist") is None
+    assert restricted.stats()["entries"] == 0
@@ -0,0 +1,81 @@
+"""Tests for SessionManager eviction to snapshots and restore."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from aws_strands_poc.financial_advisor.sessions import SessionManager
+
+
+def fake_advisor(user_id):
+    return SimpleNamespace(user_id=user_id, agent=SimpleNamespace(messages=[]))
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    return SessionManager(max_sessions=2, idle_timeout=None, snapshot_dir=tmp_path, advisor_factory=fake_advisor)
+
+
+def test_evicted_session_round_trips_through_its_snapshot(sessions, tmp_path):
+    messages = [
+        {"role": "user", "content": [{"text": "Chart attached"},
+                                     {"image": {"format": "png", "source": {"bytes": b"\x89PNG\x00"}}}]},
+        {"role": "assistant", "content": [{"text": "Looks like an uptrend."}]},
+    ]
+    sessions.get("alice").agent.messages.extend(messages)
+
+    assert sessions.evict("alice")
+    assert [p.name for p in tmp_path.iterdir()] == ["alice.json.gz"]
+
+    restored = sessions.get("alice")
+    assert restored.agent.messages == messages
+    assert sessions.stats()["restores"] == 1
+    # The restored session is the live copy; its snapshot is gone
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_least_recently_used_session_is_evicted_over_capacity(sessions, tmp_path):
+    sessions.get("alice").agent.messages.append({"role": "user", "content": [{"text": "hi"}]})
+    sessions.get("bob")
+    sessions.get("carol")
+
+    assert sessions.stats()["active_sessions"] == 2
+    assert (tmp_path / "alice.json.gz").exists()
+    assert sessions.get("alice").agent.messages == [{"role": "user", "content": [{"text": "hi"}]}]
+
+
+def test_session_with_unstorable_values_stays_in_memory(sessions, tmp_path):
+    advisor = sessions.get("alice")
+    advisor.agent.messages.append({"role": "user", "content": [{"text": "hi", "extra": object()}]})
+
+    with pytest.raises(TypeError):
+        sessions.evict("alice")
+    assert sessions.get("alice") is advisor
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_busy_session_is_not_evicted(sessions):
+    session = sessions._begin("alice")
+    try:
+        assert not sessions.evict("alice")
+    finally:
+        sessions._end(session)
+    assert sessions.evict("alice")
+
+
+def test_corrupt_snapshot_is_moved_aside_and_not_overwritten(sessions, tmp_path):
+    (tmp_path / "alice.json.gz").write_bytes(b"not gzip")
+
+    advisor = sessions.get("alice")
+    assert advisor.agent.messages == []
+    stats = sessions.stats()
+    assert stats["restore_failures"] == 1
+    assert stats["restores"] == 0 and stats["created"] == 1
+    [corrupt] = tmp_path.glob("alice.json.gz.*.corrupt")
+    assert corrupt.read_bytes() == b"not gzip"
+
+    # The next eviction writes a fresh snapshot next to the preserved one
+    advisor.agent.messages.append({"role": "user", "content": [{"text": "hi"}]})
+    assert sessions.evict("alice")
+    assert corrupt.read_bytes() == b"not gzip"
+    assert sessions.get("alice").agent.messages == [{"role": "user", "content": [{"text": "hi"}]}]
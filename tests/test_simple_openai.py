@@ -0,0 +1,98 @@
+"""Tests for the simple OpenAI advisor: concurrent tool rounds and turn rollback."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import ChatCompletionMessage
+
+from aws_strands_poc.financial_advisor.simple_openai import CALCULATOR_SCHEMA, FinancialAdvisor
+
+
+def tool_call_message(*calls):
+    """An assistant message calling tools, given (id, name, arguments) triples."""
+    return ChatCompletionMessage(role="assistant", content=None, tool_calls=[
+        {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+        for call_id, name, arguments in calls
+    ])
+
+
+def answer(text):
+    return ChatCompletionMessage(role="assistant", content=text)
+
+
+class ScriptedClient:
+    """OpenAI client stand-in answering each request with the next scripted message or error."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.requests.append(request)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(choices=[SimpleNamespace(message=reply)])
+
+
+@pytest.fixture
+def advisor(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    advisor = FinancialAdvisor(max_tool_rounds=2)
+    yield advisor
+    advisor.close()
+
+
+def roles(advisor):
+    return [message["role"] for message in advisor.conversation_history.messages()[1:]]
+
+
+def test_tool_calls_of_one_message_run_concurrently_and_keep_their_order(advisor):
+    # Each call waits for the other, so they only finish if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def lookup(symbol=""):
+        barrier.wait()
+        return f"{symbol} ok"
+
+    advisor.register_tool({**CALCULATOR_SCHEMA, "function": {**CALCULATOR_SCHEMA["function"], "name": "lookup"}},
+                          lookup)
+    advisor.client = ScriptedClient(
+        tool_call_message(("call_a", "lookup", '{"symbol": "AAPL"}'), ("call_b", "lookup", '{"symbol": "MSFT"}')),
+        answer("Both look fine."),
+    )
+
+    assert advisor.query("Compare AAPL and MSFT") == "Both look fine."
+    tool_messages = [m for m in advisor.conversation_history.messages() if m["role"] == "tool"]
+    assert [(m["tool_call_id"], m["content"]) for m in tool_messages] == [("call_a", "AAPL ok"), ("call_b", "MSFT ok")]
+    assert [t["status"] for t in advisor.last_turn_rounds[0]["tools"]] == ["ok", "ok"]
+
+
+def test_failed_turn_is_rolled_back_out_of_the_history(advisor):
+    advisor.client = ScriptedClient(answer("Hello."))
+    advisor.query("Hi")
+    before = advisor.conversation_history.messages()
+
+    advisor.client = ScriptedClient(
+        tool_call_message(("call_1", "calculator", '{"expression": "2 + 2"}')),
+        RuntimeError("connection reset"),
+    )
+    assert advisor.query("What is 2 + 2?").startswith("Sorry, I encountered an error")
+
+    assert advisor.conversation_history.messages() == before
+    assert advisor.conversation_history.stats()["turns"] == 1
+
+
+def test_turn_cut_off_at_the_tool_round_limit_leaves_no_unanswered_messages(advisor):
+    calls = [tool_call_message((f"call_{n}", "calculator", '{"expression": "1 + 1"}')) for n in range(3)]
+    advisor.client = ScriptedClient(*calls, answer("Two."))
+
+    assert "tool call limit" in advisor.query("What is 1 + 1?")
+    assert roles(advisor) == []
+
+    # The next turn starts from a clean history
+    assert advisor.query("And 1 + 1 again?") == "Two."
+    assert roles(advisor) == ["user", "assistant"]
+    assert [m["role"] for m in advisor.client.requests[-1]["messages"][1:]] == ["user"]
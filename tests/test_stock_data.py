@@ -0,0 +1,47 @@
+"""Tests for stock_data batches: the shared date axis and the per-response bar limit."""
+
+import numpy as np
+
+from aws_strands_poc.financial_advisor.tools.price_series import PriceSeries, align_series
+from aws_strands_poc.financial_advisor.tools.stock_data import MAX_RESPONSE_BARS, stock_data
+
+
+def daily(ticker, dates, close):
+    """A daily series whose prices all equal close."""
+    close = np.asarray(close, dtype=np.float64)
+    return PriceSeries(
+        ticker=ticker, timeframe="5d", interval="1d", dates=np.array(dates, dtype="datetime64[D]"),
+        open=close, high=close, low=close, close=close, volume=np.full(len(close), 100, dtype=np.int64),
+    )
+
+
+def test_align_series_puts_every_ticker_on_the_union_of_dates():
+    panel = align_series([
+        daily("AAA", ["2025-01-01", "2025-01-02", "2025-01-03"], [1.0, 2.0, 3.0]),
+        daily("BBB", ["2025-01-02", "2025-01-06"], [20.0, 60.0]),
+    ])
+
+    assert np.datetime_as_string(panel.dates).tolist() == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-06"]
+    assert panel.close[0].tolist()[:3] == [1.0, 2.0, 3.0] and np.isnan(panel.close[0, 3])
+    assert np.isnan(panel.close[1, [0, 2]]).all() and panel.close[1, [1, 3]].tolist() == [20.0, 60.0]
+    assert panel.to_dict()["series"]["BBB"]["close"] == [None, 20.0, None, 60.0]
+    # A ticker read back from the panel drops the dates it had no bar on
+    assert panel.series("BBB").close.tolist() == [20.0, 60.0]
+    assert panel.series("BBB").volume.dtype == np.int64
+
+
+def test_batch_default_cap_shrinks_with_the_number_of_tickers():
+    tickers = [f"LIM{i}" for i in range(50)]
+    result = stock_data(tickers=tickers, timeframe="1y", interval="1m")
+
+    assert len(result["date"]) == MAX_RESPONSE_BARS // 50
+    assert result["downsampled_from"] > 90_000
+    assert set(result["series"]) == set(tickers)
+
+
+def test_explicit_max_points_may_not_exceed_the_response_limit():
+    result = stock_data(tickers=["LIMA", "LIMB"], timeframe="1y", interval="1m", max_points=6000)
+
+    assert "error" in result and "at most 5000 points" in result["error"]
+    allowed = stock_data(tickers=["LIMA", "LIMB"], timeframe="1y", interval="1m", max_points=5000)
+    assert len(allowed["date"]) <= 5000
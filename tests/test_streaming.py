@@ -0,0 +1,42 @@
+"""Tests for assembling streamed OpenAI tool-call deltas."""
+
+from types import SimpleNamespace
+
+from aws_strands_poc.financial_advisor.streaming import ToolCallAccumulator
+
+
+def delta(index=None, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_interleaved_deltas_assemble_into_calls_in_index_order():
+    accumulator = ToolCallAccumulator()
+    started = [
+        accumulator.add(delta(1, "call_b", "portfolio_manager", "")),
+        accumulator.add(delta(0, "call_a", "market_analyst", '{"query": ')),
+        accumulator.add(delta(1, arguments='{"query": "rebalance"}')),
+        accumulator.add(delta(0, arguments='"AAPL outlook"}')),
+    ]
+
+    assert started == [True, True, False, False]
+    assert len(accumulator) == 2
+    assert accumulator.tool_calls() == [
+        {"id": "call_a", "type": "function",
+         "function": {"name": "market_analyst", "arguments": '{"query": "AAPL outlook"}'}},
+        {"id": "call_b", "type": "function",
+         "function": {"name": "portfolio_manager", "arguments": '{"query": "rebalance"}'}},
+    ]
+
+
+def test_delta_without_index_belongs_to_the_first_call():
+    accumulator = ToolCallAccumulator()
+    accumulator.add(delta(None, "call_a", "stock_data", '{"ticker"'))
+    accumulator.add(SimpleNamespace(index=None, id=None, function=SimpleNamespace(name=None, arguments=': "MSFT"}')))
+
+    assert accumulator.tool_calls() == [
+        {"id": "call_a", "type": "function", "function": {"name": "stock_data", "arguments": '{"ticker": "MSFT"}'}}
+    ]
+
+
+def test_no_deltas_means_no_calls():
+    assert ToolCallAccumulator().tool_calls() == []
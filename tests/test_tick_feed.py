@@ -0,0 +1,99 @@
+"""Tests for the tick feed: bus filtering and rolling indicators against batch ones."""
+
+import numpy as np
+import pytest
+
+from aws_strands_poc.financial_advisor.tools.indicators import bollinger, ema, rsi, sma
+from aws_strands_poc.financial_advisor.tools.tick_feed import RollingIndicators, TickBus, TickSimulator
+
+START = np.datetime64("2025-06-30T14:00:00")
+
+
+def collect(bus, tickers=None):
+    batches = []
+    bus.subscribe(batches.append, tickers)
+    return batches
+
+
+def test_subscribers_receive_only_their_tickers_until_they_unsubscribe():
+    bus = TickBus()
+    simulator = TickSimulator(bus, ["AAPL", "MSFT"], seed=1, start=START)
+    everything = collect(bus)
+    apple = []
+    unsubscribe = bus.subscribe(apple.append, ["aapl"])
+
+    simulator.step()
+    # Tickers added later are outside the existing watchlist
+    simulator.add_tickers(["NVDA"])
+    simulator.step()
+    unsubscribe()
+    simulator.step()
+
+    assert [len(b) for b in everything] == [2, 3, 3]
+    assert [b.rows.tolist() for b in apple] == [[bus.row("AAPL")]] * 2
+    assert bus.stats()["delivered"] == 2 + 3 + 3 + 2
+
+
+def test_failing_subscriber_does_not_stop_delivery():
+    bus = TickBus()
+    simulator = TickSimulator(bus, ["AAPL"], seed=1, start=START)
+    bus.subscribe(lambda batch: 1 / 0)
+    received = collect(bus)
+    simulator.run(3)
+    assert len(received) == 3
+
+
+def test_same_seed_gives_the_same_ticks():
+    def prices(seed):
+        bus = TickBus()
+        ticks = collect(bus)
+        TickSimulator(bus, ["AAPL", "TSLA"], seed=seed, start=START, activity=0.5).run(20)
+        return [(b.rows.tolist(), b.price.tolist()) for b in ticks]
+
+    assert prices(4) == prices(4)
+    assert prices(4) != prices(5)
+
+
+@pytest.mark.parametrize("ticks", [10, 20, 57, 400])
+def test_rolling_indicators_match_batch_indicators_over_the_same_ticks(ticks):
+    bus = TickBus()
+    indicators = RollingIndicators(bus, window=20, ema_period=20, rsi_period=14)
+    bus.subscribe(indicators)
+    received = collect(bus, ["TSLA"])
+    simulator = TickSimulator(bus, ["TSLA", "AAPL"], seed=9, start=START, activity=0.7)
+    while sum(len(b) for b in received) < ticks:
+        simulator.step()
+
+    price = np.concatenate([b.price for b in received])
+    size = np.concatenate([b.size for b in received]).astype(np.float64)
+    snapshot = indicators.snapshot("TSLA")
+
+    assert snapshot["ticks"] == len(price)
+    assert snapshot["price"] == pytest.approx(price[-1], abs=0.006)
+    assert (snapshot["high"], snapshot["low"]) == pytest.approx((price.max(), price.min()), abs=0.006)
+    assert snapshot["vwap"] == pytest.approx((price * size).sum() / size.sum(), abs=0.006)
+
+    def latest(values):
+        value = values[-1]
+        return None if np.isnan(value) else pytest.approx(value, abs=0.006)
+
+    assert snapshot["sma_20"] == latest(sma(price, 20))
+    assert snapshot["ema_20"] == (pytest.approx(ema(price, 20)[-1], abs=0.006) if len(price) >= 20 else None)
+    assert snapshot["rsi_14"] == latest(rsi(price, 14))
+    bands = bollinger(price, 20)
+    if len(price) >= 20:
+        assert snapshot["bollinger_20_2"] == {
+            name: pytest.approx(bands[name][-1], abs=0.006) for name in ("middle", "upper", "lower")
+        }
+    else:
+        assert snapshot["bollinger_20_2"] is None
+
+
+def test_snapshot_of_an_unknown_or_silent_ticker_is_none():
+    bus = TickBus()
+    indicators = RollingIndicators(bus)
+    bus.subscribe(indicators)
+    TickSimulator(bus, ["AAPL", "MSFT"], seed=1, start=START).step(["AAPL"])
+    assert indicators.snapshot("AAPL") is not None
+    assert indicators.snapshot("MSFT") is None
+    assert indicators.snapshot("ZZZZ") is None